@@ -0,0 +1,4 @@
+"""Performance benchmarks for the DMJEDI compile and generate pipeline.
+
+Run ``python -m benchmarks.run --help`` for usage.
+"""
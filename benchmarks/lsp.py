@@ -0,0 +1,101 @@
+"""LSP benchmark: hover lookups and re-analysis after an edit on a large single document.
+
+Usage:
+    python -m benchmarks.lsp                               # one 10,000-line file
+    python -m benchmarks.lsp --lines 1000,10000,50000 --hovers 5000 --max-hover-us 200
+
+A synthetic document (``benchmarks.synthetic.single_file_source``) is analyzed once against
+a workspace index, then ``document_hover`` is timed at declaration names and references
+spread over the whole file. The report lists the analysis time and microseconds per hover
+for each size; with indexed lookups the per-hover cost stays flat as the file grows.
+``reanalyze_seconds`` is the time to re-analyze, including workspace diagnostics, after a
+one-line edit, which is what the server does once typing pauses.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+from lsprotocol import types
+
+from benchmarks.synthetic import single_file_source
+from dmjedi.lsp.analysis import analyze_document, forget_document
+from dmjedi.lsp.server import document_hover
+from dmjedi.lsp.workspace import WorkspaceIndex, file_symbols
+
+DEFAULT_LINES = (10_000,)
+
+
+def run(sizes: list[int], hovers: int = 2_000) -> dict[str, Any]:
+    """Analyze a document of each size and time ``hovers`` hover requests on it."""
+    runs: list[dict[str, Any]] = []
+    for size in sizes:
+        uri = f"file:///benchmarks/hover_{size}.dv"
+        source = single_file_source(size)
+        workspace = WorkspaceIndex()
+        start = time.perf_counter()
+        analysis = analyze_document(uri, source, version=1, workspace=workspace)
+        analyzed = time.perf_counter() - start
+        workspace.update(uri, file_symbols(analysis))
+
+        edited = source.replace("\n}\n", "\n  edited : int\n}\n", 1)
+        start = time.perf_counter()
+        analyze_document(uri, edited, version=2, workspace=workspace)
+        reanalyzed = time.perf_counter() - start
+        forget_document(uri)
+
+        spans = list(analysis.spans)
+        step = max(1, len(spans) // hovers)
+        positions = [
+            types.Position(line=span.line, character=span.start + 1) for span in spans[::step]
+        ][:hovers]
+        hits = 0
+        start = time.perf_counter()
+        for position in positions:
+            if document_hover(analysis, position) is not None:
+                hits += 1
+        elapsed = time.perf_counter() - start
+        runs.append(
+            {
+                "lines": len(analysis.lines),
+                "spans": len(spans),
+                "analyze_seconds": round(analyzed, 6),
+                "reanalyze_seconds": round(reanalyzed, 6),
+                "hovers": len(positions),
+                "hits": hits,
+                "us_per_hover": round(elapsed / max(1, len(positions)) * 1e6, 3),
+            }
+        )
+    return {"runs": runs}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.lsp", description=__doc__)
+    parser.add_argument(
+        "--lines",
+        default=",".join(str(size) for size in DEFAULT_LINES),
+        help="Comma-separated document sizes in lines (default: %(default)s).",
+    )
+    parser.add_argument("--hovers", type=int, default=2_000, help="Hover requests per size.")
+    parser.add_argument(
+        "--max-hover-us",
+        type=float,
+        default=None,
+        help="Exit 1 if a hover takes longer than this many microseconds on average.",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.lines.split(",") if size.strip()]
+    report = run(sizes, hovers=args.hovers)
+    print(json.dumps(report, indent=2))
+    slowest = max((entry["us_per_hover"] for entry in report["runs"]), default=0.0)
+    if args.max_hover_us is not None and slowest > args.max_hover_us:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
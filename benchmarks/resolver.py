@@ -0,0 +1,106 @@
+"""Resolver scaling benchmark: is ``resolve()`` linear in the number of entities?
+
+Usage:
+    python -m benchmarks.resolver                          # 1,000 .. 100,000 entities
+    python -m benchmarks.resolver --sizes 1000,100000 --max-growth 2.0
+
+Modules are built in memory (no parsing) with the same shape as ``benchmarks.synthetic``,
+so only resolution is timed. The report lists seconds and microseconds per entity for each
+size; ``growth`` is the per-entity cost at the largest size divided by the cost at the
+smallest, which stays near 1.0 when resolution scales linearly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+from benchmarks.synthetic import ModelShape
+from dmjedi.lang.ast import BusinessKeyDef, DVMLModule, FieldDef, HubDecl, LinkDecl, SatelliteDecl
+from dmjedi.model.resolver import gc_paused, resolve
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+def build_modules(shape: ModelShape) -> list[DVMLModule]:
+    """Build resolver input for ``shape``; links reference hubs across namespaces."""
+    per_file = -(-shape.hubs // shape.files)
+    modules = [DVMLModule(namespace=f"bench{i:04d}") for i in range(shape.files)]
+    fields = [
+        FieldDef(name="label", data_type="string"),
+        FieldDef(name="amount", data_type="decimal"),
+    ]
+
+    def qualified(hub: int) -> str:
+        return f"bench{hub // per_file:04d}.Hub{hub:06d}"
+
+    for hub in range(shape.hubs):
+        module = modules[hub // per_file]
+        name = f"Hub{hub:06d}"
+        module.hubs.append(
+            HubDecl(name=name, business_keys=[BusinessKeyDef(name="id", data_type="int")])
+        )
+        module.satellites.extend(
+            SatelliteDecl(name=f"{name}Sat{sat}", parent_ref=name, fields=fields)
+            for sat in range(shape.sats_per_hub)
+        )
+    for link in range(shape.links):
+        left = link % shape.hubs
+        right = (left * 7 + 3) % shape.hubs
+        modules[left // per_file].links.append(
+            LinkDecl(name=f"Link{link:06d}", references=[qualified(left), qualified(right)])
+        )
+    return modules
+
+
+def run(sizes: list[int], repeat: int = 3) -> dict[str, Any]:
+    """Time ``resolve()`` (best of ``repeat``) for each size."""
+    runs: list[dict[str, Any]] = []
+    for size in sizes:
+        shape = ModelShape.for_entities(size)
+        modules = build_modules(shape)
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with gc_paused():
+                resolve(modules)
+            best = min(best, time.perf_counter() - start)
+        runs.append(
+            {
+                "entities": shape.entities,
+                "seconds": round(best, 6),
+                "us_per_entity": round(best / shape.entities * 1e6, 3),
+            }
+        )
+    growth = runs[-1]["us_per_entity"] / runs[0]["us_per_entity"] if runs else 1.0
+    return {"runs": runs, "growth": round(growth, 3)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.resolver", description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated entity counts (default: %(default)s).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; best is kept.")
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=None,
+        help="Exit 1 if per-entity cost grows by more than this factor across sizes.",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run(sizes, repeat=args.repeat)
+    print(json.dumps(report, indent=2))
+    if args.max_growth is not None and report["growth"] > args.max_growth:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
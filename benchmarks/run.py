@@ -0,0 +1,202 @@
+"""Stage-by-stage benchmark of the DMJEDI pipeline over synthetic models.
+
+Usage:
+    python -m benchmarks.run                              # 10 .. 50,000 entities
+    python -m benchmarks.run --sizes 10,100,1000 --output bench.json
+    python -m benchmarks.run --sizes 1000 --baseline main.json --max-regression 1.5
+
+Each stage (parse, imports, lint, resolve, every generator target/dialect, docs) is timed
+separately with its peak traced memory. Tracing adds overhead; pass ``--no-memory`` for
+timings that are comparable with untraced runs. Results are written as JSON so runs from
+different versions can be compared in CI with ``--baseline``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any, TypeVar
+
+from benchmarks.synthetic import ModelShape, write_model
+from dmjedi.docs.markdown import generate_markdown
+from dmjedi.generators import registry
+from dmjedi.lang.discovery import discover_dv_files
+from dmjedi.lang.imports import resolve_imports
+from dmjedi.lang.linter import lint
+from dmjedi.lang.parser import parse_file
+from dmjedi.model.resolver import gc_paused, resolve
+from dmjedi.model.types import SUPPORTED_DIALECTS
+
+RESULT_SCHEMA = 1
+DEFAULT_SIZES = (10, 100, 1_000, 10_000, 50_000)
+
+# (stage name, generator name, generator kwargs)
+GENERATE_STAGES: tuple[tuple[str, str, dict[str, Any]], ...] = (
+    *(
+        (f"generate:sql-jinja:{dialect}", "sql-jinja", {"dialect": dialect})
+        for dialect in SUPPORTED_DIALECTS
+    ),
+    ("generate:spark-declarative:batch", "spark-declarative", {"mode": "batch"}),
+    ("generate:spark-declarative:layer", "spark-declarative", {"packaging": "layer"}),
+    ("generate:manifest", "manifest", {}),
+)
+
+T = TypeVar("T")
+
+
+def run_size(entities: int, workdir: Path, *, memory: bool = True) -> dict[str, Any]:
+    """Benchmark every pipeline stage for a synthetic model of ``entities`` entities."""
+    shape = ModelShape.for_entities(entities)
+    paths = write_model(workdir / f"n{entities}", shape)
+    stages: list[dict[str, Any]] = []
+
+    def measure(name: str, fn: Callable[[], T]) -> T:
+        result, stage = _measure(name, fn, memory=memory)
+        stages.append(stage)
+        return result
+
+    modules = measure("parse", lambda: [parse_file(p) for p in discover_dv_files(paths)])
+    modules = measure("imports", lambda: resolve_imports(modules))
+    measure("lint", lambda: [diag for module in modules for diag in lint(module)])
+    with gc_paused():
+        model = measure("resolve", lambda: resolve(modules))
+    for name, target, kwargs in GENERATE_STAGES:
+        generator = registry.get(target, **kwargs)
+        result = measure(name, lambda generator=generator: generator.generate(model))
+        stages[-1]["files"] = len(result.files)
+        stages[-1]["bytes"] = sum(len(content) for content in result.files.values())
+    measure("docs", lambda: generate_markdown(model))
+
+    return {
+        "entities": shape.entities,
+        "requested_entities": entities,
+        "shape": {
+            "hubs": shape.hubs,
+            "links": shape.links,
+            "sats_per_hub": shape.sats_per_hub,
+            "files": shape.files,
+        },
+        "source_bytes": sum(p.stat().st_size for p in paths),
+        "total_seconds": round(sum(stage["seconds"] for stage in stages), 6),
+        "stages": stages,
+    }
+
+
+def run(sizes: list[int], *, memory: bool = True) -> dict[str, Any]:
+    """Benchmark all sizes and return the JSON-serializable report."""
+    with tempfile.TemporaryDirectory(prefix="dmjedi-bench-") as tmp:
+        runs = [run_size(size, Path(tmp), memory=memory) for size in sizes]
+    return {
+        "schema": RESULT_SCHEMA,
+        "dmjedi_version": _version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "memory_traced": memory,
+        "runs": runs,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> list[dict[str, Any]]:
+    """Return per-stage time ratios (current / baseline) for sizes present in both."""
+    base_runs = {r["requested_entities"]: r for r in baseline["runs"]}
+    rows: list[dict[str, Any]] = []
+    for current_run in current["runs"]:
+        base_run = base_runs.get(current_run["requested_entities"])
+        if base_run is None:
+            continue
+        base_stages = {s["name"]: s for s in base_run["stages"]}
+        for stage in current_run["stages"]:
+            base_stage = base_stages.get(stage["name"])
+            if base_stage is None or base_stage["seconds"] <= 0:
+                continue
+            rows.append(
+                {
+                    "entities": current_run["requested_entities"],
+                    "stage": stage["name"],
+                    "baseline_seconds": base_stage["seconds"],
+                    "seconds": stage["seconds"],
+                    "ratio": round(stage["seconds"] / base_stage["seconds"], 3),
+                }
+            )
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated entity counts (default: %(default)s).",
+    )
+    parser.add_argument("--output", "-o", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc tracing.")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare with.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        help="Exit 1 if any stage is slower than baseline by more than this ratio.",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run(sizes, memory=not args.no_memory)
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    else:
+        print(payload)
+
+    for entry in report["runs"]:
+        print(f"{entry['entities']:>8} entities  {entry['total_seconds']:>10.3f}s", file=sys.stderr)
+
+    if args.baseline:
+        rows = compare(json.loads(args.baseline.read_text()), report)
+        regressions = [
+            row for row in rows
+            if args.max_regression is not None and row["ratio"] > args.max_regression
+        ]
+        for row in regressions:
+            print(
+                f"REGRESSION {row['stage']} @ {row['entities']}: "
+                f"{row['baseline_seconds']:.4f}s -> {row['seconds']:.4f}s (x{row['ratio']})",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+def _measure(name: str, fn: Callable[[], T], *, memory: bool) -> tuple[T, dict[str, Any]]:
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return result, {"name": name, "seconds": round(elapsed, 6), "peak_bytes": peak}
+
+
+def _version() -> str:
+    try:
+        return metadata.version("dmjedi")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
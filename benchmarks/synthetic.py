@@ -0,0 +1,116 @@
+"""Synthetic DVML model generator for benchmarks.
+
+Builds a multi-file DVML project of a requested size: hubs with satellites spread across
+files, plus links that reference hubs in earlier files through ``import`` declarations.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ModelShape:
+    """Entity counts for a synthetic model."""
+
+    hubs: int
+    links: int
+    sats_per_hub: int
+    files: int
+
+    @property
+    def entities(self) -> int:
+        return self.hubs + self.links + self.hubs * self.sats_per_hub
+
+    @classmethod
+    def for_entities(cls, entities: int, sats_per_hub: int = 2) -> ModelShape:
+        """Pick a shape with roughly ``entities`` entities (one link per hub).
+
+        Files hold about 200 entities each so import resolution is exercised at every size.
+        """
+        hubs = max(2, entities // (sats_per_hub + 2))
+        files = max(1, min(hubs, entities // 200))
+        return cls(hubs=hubs, links=hubs, sats_per_hub=sats_per_hub, files=files)
+
+
+def write_model(directory: Path, shape: ModelShape) -> list[Path]:
+    """Write a synthetic DVML project into ``directory`` and return the file paths."""
+    directory.mkdir(parents=True, exist_ok=True)
+    # Contiguous hub ranges per file; file i may only import files < i (no cycles).
+    per_file = -(-shape.hubs // shape.files)
+    owner = [min(hub // per_file, shape.files - 1) for hub in range(shape.hubs)]
+    blocks: list[list[str]] = [[] for _ in range(shape.files)]
+    imports: list[set[int]] = [set() for _ in range(shape.files)]
+
+    for hub in range(shape.hubs):
+        blocks[owner[hub]].append(_hub_block(hub, shape.sats_per_hub))
+
+    for link in range(shape.links):
+        left = link % shape.hubs
+        right = (left * 7 + 3) % shape.hubs
+        if right == left:
+            right = (left + 1) % shape.hubs
+        # Place the link with whichever hub lives in the later file and import the other.
+        home = max(owner[left], owner[right])
+        for hub in (left, right):
+            if owner[hub] != home:
+                imports[home].add(owner[hub])
+        blocks[home].append(_link_block(link, left, right))
+
+    paths: list[Path] = []
+    for index in range(shape.files):
+        lines = [f"namespace bench{index:04d}", ""]
+        lines.extend(f'import "{_file_name(dep)}"' for dep in sorted(imports[index]))
+        lines.append("")
+        lines.extend(blocks[index])
+        path = directory / _file_name(index)
+        path.write_text("\n".join(lines))
+        paths.append(path)
+    return paths
+
+
+def single_file_source(min_lines: int, sats_per_hub: int = 2) -> str:
+    """One-namespace DVML source of at least ``min_lines`` lines (hubs, satellites, links).
+
+    Every hub after the first is followed by a link to the previous hub, so the file mixes
+    declarations with ``of`` and ``references`` lines throughout.
+    """
+    blocks = ["namespace bench\n"]
+    lines = 2
+    hub = 0
+    while lines < min_lines:
+        added = [_hub_block(hub, sats_per_hub)]
+        if hub:
+            added.append(_link_block(hub, hub - 1, hub))
+        lines += sum(block.count("\n") + 1 for block in added)
+        blocks.extend(added)
+        hub += 1
+    return "\n".join(blocks)
+
+
+def _file_name(index: int) -> str:
+    return f"part_{index:04d}.dv"
+
+
+def _hub_block(hub: int, sats_per_hub: int) -> str:
+    name = f"Hub{hub:06d}"
+    parts = [f"hub {name} {{\n    business_key {name.lower()}_id : int\n}}\n"]
+    for sat in range(sats_per_hub):
+        parts.append(
+            f"satellite {name}Sat{sat} of {name} {{\n"
+            "    label : string\n"
+            "    amount : decimal\n"
+            "    updated_at : timestamp\n"
+            "}\n"
+        )
+    return "\n".join(parts)
+
+
+def _link_block(link: int, left: int, right: int) -> str:
+    return (
+        f"link Link{link:06d} {{\n"
+        f"    references Hub{left:06d}, Hub{right:06d}\n"
+        "    quantity : int\n"
+        "}\n"
+    )
@@ -7,6 +7,8 @@ from pyspark.sql.types import *
     name="hub_Customer",
     comment="Hub: Customer"
 )
+@dlt.expect_or_drop("valid_customer_id", "customer_id IS NOT NULL")
+@dlt.expect_or_drop("valid_Customer_hk", "Customer_hk IS NOT NULL")
 def hub_Customer():
     """Hub entity with business keys: customer_id."""
     df = dlt.read("src_Customer")
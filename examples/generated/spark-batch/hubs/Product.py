@@ -7,6 +7,9 @@ from pyspark.sql.types import *
     name="hub_Product",
     comment="Hub: Product"
 )
+@dlt.expect_or_drop("valid_product_id", "product_id IS NOT NULL")
+@dlt.expect_or_drop("valid_sku", "sku IS NOT NULL")
+@dlt.expect_or_drop("valid_Product_hk", "Product_hk IS NOT NULL")
 def hub_Product():
     """Hub entity with business keys: product_id, sku."""
     df = dlt.read("src_Product")
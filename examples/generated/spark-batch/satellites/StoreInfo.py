@@ -7,6 +7,7 @@ from pyspark.sql.types import *
     name="sat_StoreInfo",
     comment="Satellite: StoreInfo (parent: Store)"
 )
+@dlt.expect_or_drop("valid_Store_hk", "Store_hk IS NOT NULL")
 def sat_StoreInfo():
     """Satellite entity attached to Store."""
     df = dlt.read("src_StoreInfo")
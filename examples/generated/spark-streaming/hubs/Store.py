@@ -7,6 +7,8 @@ from pyspark.sql.types import *
     name="hub_Store",
     comment="Hub: Store"
 )
+@dlt.expect_or_drop("valid_store_id", "store_id IS NOT NULL")
+@dlt.expect_or_drop("valid_Store_hk", "Store_hk IS NOT NULL")
 def hub_Store():
     """Hub entity with business keys: store_id."""
     df = dlt.read_stream("src_Store")
@@ -7,6 +7,10 @@ from pyspark.sql.types import *
     name="link_Sale",
     comment="Link: Sale"
 )
+@dlt.expect_or_drop("valid_Sale_hk", "Sale_hk IS NOT NULL")
+@dlt.expect_or_drop("valid_Customer_hk", "Customer_hk IS NOT NULL")
+@dlt.expect_or_drop("valid_Product_hk", "Product_hk IS NOT NULL")
+@dlt.expect_or_drop("valid_Store_hk", "Store_hk IS NOT NULL")
 def link_Sale():
     """Link entity referencing: Customer, Product, Store."""
     df = dlt.read_stream("src_Sale")
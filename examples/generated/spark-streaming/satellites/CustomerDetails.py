@@ -7,6 +7,7 @@ from pyspark.sql.types import *
     name="sat_CustomerDetails",
     comment="Satellite: CustomerDetails (parent: Customer)"
 )
+@dlt.expect_or_drop("valid_Customer_hk", "Customer_hk IS NOT NULL")
 def sat_CustomerDetails():
     """Satellite entity attached to Customer."""
     df = dlt.read_stream("src_CustomerDetails")
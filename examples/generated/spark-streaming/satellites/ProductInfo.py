@@ -7,6 +7,7 @@ from pyspark.sql.types import *
     name="sat_ProductInfo",
     comment="Satellite: ProductInfo (parent: Product)"
 )
+@dlt.expect_or_drop("valid_Product_hk", "Product_hk IS NOT NULL")
 def sat_ProductInfo():
     """Satellite entity attached to Product."""
     df = dlt.read_stream("src_ProductInfo")
@@ -7,6 +7,7 @@ from pyspark.sql.types import *
     name="sat_SaleContext",
     comment="Satellite: SaleContext (parent: Sale)"
 )
+@dlt.expect_or_drop("valid_Sale_hk", "Sale_hk IS NOT NULL")
 def sat_SaleContext():
     """Satellite entity attached to Sale."""
     df = dlt.read_stream("src_SaleContext")
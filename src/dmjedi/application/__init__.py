@@ -1,7 +1,8 @@
 """Shared application-layer request/result contracts for machine interfaces."""
 
-from dmjedi.application.requests import CompileRequest
+from dmjedi.application.requests import CompileRequest, ResultFilter
 from dmjedi.application.results import (
+    ArtifactManifestResult,
     ArtifactResult,
     DiagnosticResult,
     DocsResult,
@@ -12,6 +13,7 @@ from dmjedi.application.results import (
 )
 
 __all__ = [
+    "ArtifactManifestResult",
     "ArtifactResult",
     "CompileRequest",
     "DiagnosticResult",
@@ -19,5 +21,6 @@ __all__ = [
     "ExplainEntityResult",
     "ExplainResult",
     "GenerateResult",
+    "ResultFilter",
     "ValidateResult",
 ]
@@ -0,0 +1,178 @@
+"""Compile cache for long-lived processes such as the MCP server.
+
+Agents call ``explain`` and then ``generate`` on the same path within seconds; without a
+cache every call rediscovers, reparses, relints and re-resolves every file. ``CompileCache``
+keeps the compile result of recent requests, keyed by the request's path set (or inline
+source), and revalidates it on every lookup against a fingerprint of its inputs:
+
+- the discovered ``.dv`` files, so added and deleted files invalidate the entry;
+- ``(st_mtime_ns, st_size)`` of every loaded file, imports included, falling back to a
+  content hash when the stamp changed, so a touch or a checkout of identical bytes still
+  hits;
+- the lint config governing each file.
+
+When an entry is stale, only the files that changed are parsed again: ``parse_file`` keeps
+each file's module next to its fingerprint.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from dmjedi.application.requests import CompileRequest
+from dmjedi.lang.ast import DVMLModule
+from dmjedi.lang.discovery import discover_dv_files
+from dmjedi.lang.lint_config import LintConfig, LintConfigError, config_for
+from dmjedi.lang.parser import parse
+
+_ResultT = TypeVar("_ResultT")
+
+DEFAULT_MAX_ENTRIES = 8
+
+
+@dataclass(slots=True)
+class _FileState:
+    stamp: tuple[int, int]
+    digest: str
+    module: DVMLModule
+
+
+@dataclass(slots=True)
+class _Entry(Generic[_ResultT]):
+    discovered: list[Path]
+    sources: list[str]  # source_file of every loaded module, imports included
+    configs: list[LintConfig]
+    result: _ResultT
+
+
+class CompileCache(Generic[_ResultT]):
+    """Compile results of the most recent requests, reused while their inputs are unchanged.
+
+    Holds at most ``max_entries`` requests, least recently used first out. Safe to share
+    between threads; compiling happens outside the lock, so concurrent misses on the same
+    request may both compile.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, ...], _Entry[_ResultT]] = OrderedDict()
+        self._files: dict[str, _FileState] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, request: CompileRequest) -> _ResultT | None:
+        """The cached result of ``request`` if none of its inputs changed, else None."""
+        key = _request_key(request)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or not self._is_current(request, entry):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry.result
+
+    def put(
+        self,
+        request: CompileRequest,
+        discovered: list[Path],
+        modules: list[DVMLModule],
+        result: _ResultT,
+    ) -> None:
+        """Remember ``result`` for ``request``, compiled from ``modules``."""
+        sources = [module.source_file for module in modules]
+        entry = _Entry(
+            discovered=discovered,
+            sources=sources,
+            configs=[config_for(source) for source in sources],
+            result=result,
+        )
+        with self._lock:
+            self._entries[_request_key(request)] = entry
+            self._entries.move_to_end(_request_key(request))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            referenced = {source for cached in self._entries.values() for source in cached.sources}
+            for source in set(self._files) - referenced:
+                del self._files[source]
+
+    def parse_file(self, path: Path) -> DVMLModule:
+        """Parse ``path`` like ``parser.parse_file``, reusing the module of unchanged files."""
+        key = str(path)
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            state = self._files.get(key)
+        if state is not None and state.stamp == stamp:
+            return state.module
+        data = path.read_bytes()
+        digest = _digest(data)
+        if state is None or state.digest != digest:
+            state = _FileState(stamp, digest, parse(data.decode(), source_file=key))
+        else:
+            state = _FileState(stamp, digest, state.module)
+        with self._lock:
+            self._files[key] = state
+        return state.module
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._files.clear()
+
+    def _is_current(self, request: CompileRequest, entry: _Entry[_ResultT]) -> bool:
+        if request.paths:
+            try:
+                if discover_dv_files(request.paths) != entry.discovered:
+                    return False
+            except FileNotFoundError:
+                return False
+            if not all(self._unchanged(source) for source in entry.sources):
+                return False
+        try:
+            return [config_for(source) for source in entry.sources] == entry.configs
+        except LintConfigError:
+            # Recompile so the broken config is reported.
+            return False
+
+    def _unchanged(self, source: str) -> bool:
+        with self._lock:
+            state = self._files.get(source)
+        if state is None:
+            return False
+        path = Path(source)
+        try:
+            stat = path.stat()
+            if (stat.st_mtime_ns, stat.st_size) == state.stamp:
+                return True
+            if _digest(path.read_bytes()) != state.digest:
+                return False
+        except OSError:
+            return False
+        with self._lock:
+            self._files[source] = _FileState(
+                (stat.st_mtime_ns, stat.st_size), state.digest, state.module
+            )
+        return True
+
+
+def _request_key(request: CompileRequest) -> tuple[str, ...]:
+    if request.paths:
+        return ("paths", *sorted(str(path.resolve()) for path in request.paths))
+    return ("inline", request.source_name, _digest((request.source or "").encode()))
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
@@ -30,3 +30,20 @@ class CompileRequest(BaseModel):
     @property
     def source_mode(self) -> str:
         return "paths" if self.paths else "inline"
+
+
+class ResultFilter(BaseModel):
+    """Narrow and page the artifacts of a generate result or the entities of an explain result.
+
+    ``entities`` and ``artifact_paths`` hold ``fnmatch`` patterns; an entity pattern matches a
+    qualified name or a bare entity name. ``kinds`` are entity kinds such as ``hub`` or
+    ``satellite``. ``artifact_paths`` applies to artifacts only. Results are sorted, so ``cursor``
+    (the ``next_cursor`` of the previous page) resumes after the last item returned, and
+    ``limit`` caps the page size.
+    """
+
+    entities: list[str] = Field(default_factory=list)
+    kinds: list[str] = Field(default_factory=list)
+    artifact_paths: list[str] = Field(default_factory=list)
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
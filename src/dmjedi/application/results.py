@@ -14,16 +14,34 @@ class DiagnosticResult(BaseModel):
     column: int | None = None
 
 
+class StageTimingResult(BaseModel):
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    allocated_bytes: int | None = None
+    count: int = 0
+
+
 class ArtifactResult(BaseModel):
     path: str
     content: str
 
 
+class ArtifactManifestResult(BaseModel):
+    """An artifact without its content, as returned by a manifest-only generate."""
+
+    path: str
+    size: int
+    sha256: str
+    entities: list[str] = Field(default_factory=list)
+
+
 class ValidateResult(BaseModel):
     ok: bool
     source_mode: str
     module_count: int = 0
     diagnostics: list[DiagnosticResult] = Field(default_factory=list)
+    timings: list[StageTimingResult] | None = None
 
 
 class GenerateResult(BaseModel):
@@ -35,6 +53,10 @@ class GenerateResult(BaseModel):
     module_count: int = 0
     diagnostics: list[DiagnosticResult] = Field(default_factory=list)
     artifacts: list[ArtifactResult] = Field(default_factory=list)
+    manifest: list[ArtifactManifestResult] | None = None
+    total: int = 0
+    next_cursor: str | None = None
+    timings: list[StageTimingResult] | None = None
 
 
 class DocsResult(BaseModel):
@@ -43,6 +65,7 @@ class DocsResult(BaseModel):
     module_count: int = 0
     diagnostics: list[DiagnosticResult] = Field(default_factory=list)
     artifacts: list[ArtifactResult] = Field(default_factory=list)
+    timings: list[StageTimingResult] | None = None
 
 
 class ExplainEntityResult(BaseModel):
@@ -52,6 +75,14 @@ class ExplainEntityResult(BaseModel):
     references: list[str] = Field(default_factory=list)
 
 
+class ExplainGraphResult(BaseModel):
+    focus: str | None = None
+    upstream: list[str] = Field(default_factory=list)
+    downstream: list[str] = Field(default_factory=list)
+    load_order: list[list[str]] = Field(default_factory=list)
+    components: list[list[str]] = Field(default_factory=list)
+
+
 class ExplainResult(BaseModel):
     ok: bool
     source_mode: str
@@ -60,3 +91,27 @@ class ExplainResult(BaseModel):
     summary: str = ""
     entity_counts: dict[str, int] = Field(default_factory=dict)
     entities: list[ExplainEntityResult] = Field(default_factory=list)
+    graph: ExplainGraphResult | None = None
+    total: int = 0
+    next_cursor: str | None = None
+    timings: list[StageTimingResult] | None = None
+
+
+class RunStatementResult(BaseModel):
+    wave: str
+    entity: str
+    kind: str
+    index: int
+    seconds: float
+
+
+class RunResult(BaseModel):
+    ok: bool
+    source_mode: str
+    database: str
+    workers: int
+    module_count: int = 0
+    diagnostics: list[DiagnosticResult] = Field(default_factory=list)
+    statements: list[RunStatementResult] = Field(default_factory=list)
+    wall_seconds: float = 0.0
+    timings: list[StageTimingResult] | None = None
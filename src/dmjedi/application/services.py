@@ -2,35 +2,183 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+import bisect
+import hashlib
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from fnmatch import fnmatchcase
 from pathlib import Path
+from typing import Any, TypeVar
 
-from dmjedi.application.requests import CompileRequest
+from dmjedi import profiling
+from dmjedi.application.cache import CompileCache
+from dmjedi.application.requests import CompileRequest, ResultFilter
 from dmjedi.application.results import (
+    ArtifactManifestResult,
     ArtifactResult,
     DiagnosticResult,
     DocsResult,
     ExplainEntityResult,
+    ExplainGraphResult,
     ExplainResult,
     GenerateResult,
+    RunResult,
+    RunStatementResult,
+    StageTimingResult,
     ValidateResult,
 )
 from dmjedi.docs.markdown import generate_markdown
 from dmjedi.generators import registry
+from dmjedi.generators.base import GeneratorResult
 from dmjedi.lang.ast import DVMLModule
 from dmjedi.lang.discovery import discover_dv_files
 from dmjedi.lang.imports import CircularImportError, resolve_imports
-from dmjedi.lang.linter import LintDiagnostic, Severity, lint
+from dmjedi.lang.lint_config import LintConfigError
+from dmjedi.lang.linter import (
+    LintDiagnostic,
+    LintRule,
+    RuleScope,
+    RuleStats,
+    Severity,
+    lint_modules,
+    select_rules,
+)
 from dmjedi.lang.parser import DVMLParseError, parse, parse_file
-from dmjedi.model.core import DataVaultModel
+from dmjedi.model.core import Column, DataVaultModel
 from dmjedi.model.resolver import ResolverErrors, resolve
+from dmjedi.model.symbols import ENTITY_KINDS, SymbolIndex, references
+from dmjedi.runtime.local import SOURCE_WAVE, find_sources, run_local
+from dmjedi.runtime.plan import PlanExecutionError, StatementTiming, build_plan
+
+
+def validate_request(
+    request: CompileRequest,
+    profile: bool = False,
+    jobs: int = 1,
+    cache: CompileCache[CompileOutcome] | None = None,
+) -> ValidateResult:
+    """Validate a compile request and return a stable machine-readable result.
+
+    ``jobs`` > 1 lints modules in parallel worker processes (0 means one per CPU).
+    With ``profile=True`` (or inside an active ``profiling.session()``), per-stage
+    timings are attached to the result's ``timings`` field. Long-lived callers pass a
+    ``cache`` to reuse the compiled model of an unchanged request (see
+    ``dmjedi.application.cache``); every ``*_request`` function accepts one.
+    """
+    with _profiling(profile):
+        return _attach_timings(_validate(request, jobs, cache))
+
+
+def generate_request(
+    request: CompileRequest,
+    target: str,
+    dialect: str,
+    mode: str,
+    quarantine: bool = False,
+    packaging: str = "entity",
+    jobs: int = 1,
+    profile: bool = False,
+    cache: CompileCache[CompileOutcome] | None = None,
+    filters: ResultFilter | None = None,
+    manifest_only: bool = False,
+) -> GenerateResult:
+    """Generate artifacts in-memory without writing to disk.
+
+    ``jobs`` > 1 lints modules and renders entities in parallel worker processes
+    (0 means one per CPU). ``filters`` selects artifacts by the entities rendered into
+    them, entity kind and path, and pages through them in path order. ``manifest_only``
+    returns each selected artifact's path, size and SHA-256 in ``manifest`` instead of
+    its content.
+    """
+    with _profiling(profile):
+        return _attach_timings(
+            _generate(
+                request,
+                target,
+                dialect,
+                mode,
+                quarantine,
+                packaging,
+                jobs,
+                cache,
+                filters or ResultFilter(),
+                manifest_only,
+            )
+        )
+
 
-_MODEL_AWARE_RULES = {"effsat-parent-must-be-link"}
+def docs_request(
+    request: CompileRequest,
+    profile: bool = False,
+    cache: CompileCache[CompileOutcome] | None = None,
+) -> DocsResult:
+    """Render markdown docs in-memory without writing to disk."""
+    with _profiling(profile):
+        return _attach_timings(_docs(request, cache))
+
+
+def explain_request(
+    request: CompileRequest,
+    profile: bool = False,
+    entity: str | None = None,
+    depth: int | None = None,
+    graph: bool = False,
+    cache: CompileCache[CompileOutcome] | None = None,
+    filters: ResultFilter | None = None,
+) -> ExplainResult:
+    """Return a deterministic summary of the resolved model.
+
+    ``entity`` (a qualified or unambiguous short name) narrows the entity list to that
+    entity and its upstream/downstream dependencies, up to ``depth`` hops. ``graph`` adds
+    the dependency graph view: traversal, load waves and connected components.
+    ``filters`` further selects entities by name pattern and kind and pages through them;
+    the summary and counts always describe the whole model.
+    """
+    with _profiling(profile):
+        return _attach_timings(
+            _explain(request, entity, depth, graph, cache, filters or ResultFilter())
+        )
 
 
-def validate_request(request: CompileRequest) -> ValidateResult:
-    """Validate a compile request and return a stable machine-readable result."""
-    loaded = _load_modules(request)
-    if loaded.diagnostics:
+def run_request(
+    request: CompileRequest,
+    sources: Path | None = None,
+    database: str = ":memory:",
+    workers: int = 4,
+    profile: bool = False,
+    cache: CompileCache[CompileOutcome] | None = None,
+) -> RunResult:
+    """Build the DuckDB load plan and execute it, reporting per-statement timings.
+
+    ``sources`` is a directory of ``<Entity>.parquet``/``.csv`` files loaded into ``src_*``
+    tables first; without it the ``src_*`` tables must already exist in ``database``.
+    """
+    with _profiling(profile):
+        return _attach_timings(_run(request, sources, database, workers, cache))
+
+
+def stage_timing_results(profiler: profiling.Profiler) -> list[StageTimingResult]:
+    """Convert a profiler's stage timings to result models (as attached to ``timings``)."""
+    return [
+        StageTimingResult(
+            name=timing.name,
+            wall_seconds=round(timing.wall_seconds, 6),
+            cpu_seconds=round(timing.cpu_seconds, 6),
+            allocated_bytes=timing.allocated_bytes,
+            count=timing.count,
+        )
+        for timing in profiler.timings()
+    ]
+
+
+def _validate(
+    request: CompileRequest, jobs: int = 1, cache: CompileCache[CompileOutcome] | None = None
+) -> ValidateResult:
+    loaded, compiled = _load_and_compile(request, jobs, cache)
+    if compiled is None:
         return ValidateResult(
             ok=False,
             source_mode=request.source_mode,
@@ -38,7 +186,6 @@ def validate_request(request: CompileRequest) -> ValidateResult:
             diagnostics=loaded.diagnostics,
         )
 
-    compiled = _compile_modules(loaded.modules)
     return ValidateResult(
         ok=compiled.ok,
         source_mode=request.source_mode,
@@ -47,10 +194,20 @@ def validate_request(request: CompileRequest) -> ValidateResult:
     )
 
 
-def generate_request(request: CompileRequest, target: str, dialect: str, mode: str) -> GenerateResult:
-    """Generate artifacts in-memory without writing to disk."""
-    loaded = _load_modules(request)
-    if loaded.diagnostics:
+def _generate(
+    request: CompileRequest,
+    target: str,
+    dialect: str,
+    mode: str,
+    quarantine: bool,
+    packaging: str,
+    jobs: int,
+    cache: CompileCache[CompileOutcome] | None = None,
+    filters: ResultFilter | None = None,
+    manifest_only: bool = False,
+) -> GenerateResult:
+    loaded, compiled = _load_and_compile(request, jobs, cache)
+    if compiled is None:
         return GenerateResult(
             ok=False,
             source_mode=request.source_mode,
@@ -62,7 +219,6 @@ def generate_request(request: CompileRequest, target: str, dialect: str, mode: s
             artifacts=[],
         )
 
-    compiled = _compile_modules(loaded.modules)
     if not compiled.ok or compiled.model is None:
         return GenerateResult(
             ok=False,
@@ -76,8 +232,15 @@ def generate_request(request: CompileRequest, target: str, dialect: str, mode: s
         )
 
     try:
-        generator = registry.get(target, dialect=dialect, mode=mode)
-    except KeyError as err:
+        generator = registry.get(
+            target,
+            dialect=dialect,
+            mode=mode,
+            quarantine=quarantine,
+            packaging=packaging,
+            jobs=jobs,
+        )
+    except (KeyError, ValueError) as err:
         return GenerateResult(
             ok=False,
             source_mode=request.source_mode,
@@ -95,11 +258,44 @@ def generate_request(request: CompileRequest, target: str, dialect: str, mode: s
             artifacts=[],
         )
 
-    result = generator.generate(compiled.model)
-    artifacts = [
-        ArtifactResult(path=path, content=content)
-        for path, content in sorted(result.files.items())
+    with profiling.stage("render") as call:
+        result = generator.generate(compiled.model)
+        call.count = len(result.files)
+
+    filters = filters or ResultFilter()
+    kinds = _entity_kinds(compiled.model)
+    selected = [
+        path
+        for path in sorted(result.files)
+        if _path_matches(filters, path)
+        and (
+            not (filters.entities or filters.kinds)
+            or any(
+                _entity_matches(filters, name, kinds.get(name, ""))
+                for name in result.entities.get(path, ())
+            )
+        )
     ]
+    page = _page(filters, selected)
+    if isinstance(page, DiagnosticResult):
+        return GenerateResult(
+            ok=False,
+            source_mode=request.source_mode,
+            target=target,
+            dialect=dialect,
+            mode=mode,
+            module_count=len(loaded.modules),
+            diagnostics=[*compiled.diagnostics, page],
+        )
+
+    window, next_cursor = page
+    paths = selected[window]
+    artifacts: list[ArtifactResult] = []
+    manifest: list[ArtifactManifestResult] | None = None
+    if manifest_only:
+        manifest = [_manifest_entry(result, path) for path in paths]
+    else:
+        artifacts = [ArtifactResult(path=path, content=result.files[path]) for path in paths]
     return GenerateResult(
         ok=True,
         source_mode=request.source_mode,
@@ -109,13 +305,15 @@ def generate_request(request: CompileRequest, target: str, dialect: str, mode: s
         module_count=len(loaded.modules),
         diagnostics=compiled.diagnostics,
         artifacts=artifacts,
+        manifest=manifest,
+        total=len(selected),
+        next_cursor=next_cursor,
     )
 
 
-def docs_request(request: CompileRequest) -> DocsResult:
-    """Render markdown docs in-memory without writing to disk."""
-    loaded = _load_modules(request)
-    if loaded.diagnostics:
+def _docs(request: CompileRequest, cache: CompileCache[CompileOutcome] | None = None) -> DocsResult:
+    loaded, compiled = _load_and_compile(request, 1, cache)
+    if compiled is None:
         return DocsResult(
             ok=False,
             source_mode=request.source_mode,
@@ -124,7 +322,6 @@ def docs_request(request: CompileRequest) -> DocsResult:
             artifacts=[],
         )
 
-    compiled = _compile_modules(loaded.modules)
     if not compiled.ok or compiled.model is None:
         return DocsResult(
             ok=False,
@@ -134,19 +331,27 @@ def docs_request(request: CompileRequest) -> DocsResult:
             artifacts=[],
         )
 
+    with profiling.stage("render"):
+        markdown = generate_markdown(compiled.model)
     return DocsResult(
         ok=True,
         source_mode=request.source_mode,
         module_count=len(loaded.modules),
         diagnostics=compiled.diagnostics,
-        artifacts=[ArtifactResult(path="model.md", content=generate_markdown(compiled.model))],
+        artifacts=[ArtifactResult(path="model.md", content=markdown)],
     )
 
 
-def explain_request(request: CompileRequest) -> ExplainResult:
-    """Return a deterministic summary of the resolved model."""
-    loaded = _load_modules(request)
-    if loaded.diagnostics:
+def _explain(
+    request: CompileRequest,
+    entity: str | None,
+    depth: int | None,
+    graph: bool,
+    cache: CompileCache[CompileOutcome] | None = None,
+    filters: ResultFilter | None = None,
+) -> ExplainResult:
+    loaded, compiled = _load_and_compile(request, 1, cache)
+    if compiled is None:
         return ExplainResult(
             ok=False,
             source_mode=request.source_mode,
@@ -157,7 +362,6 @@ def explain_request(request: CompileRequest) -> ExplainResult:
             entities=[],
         )
 
-    compiled = _compile_modules(loaded.modules)
     if not compiled.ok or compiled.model is None:
         return ExplainResult(
             ok=False,
@@ -169,22 +373,138 @@ def explain_request(request: CompileRequest) -> ExplainResult:
             entities=[],
         )
 
-    entity_counts = _entity_counts(compiled.model)
+    model = compiled.model
+    diagnostics = compiled.diagnostics
+    graph_result: ExplainGraphResult | None = None
+    with profiling.stage("render"):
+        entity_counts = _entity_counts(model)
+        entities = _build_entities(model)
+        if entity is not None or graph:
+            focus = _find_focus(model, entity) if entity is not None else None
+            if isinstance(focus, DiagnosticResult):
+                diagnostics = [*diagnostics, focus]
+                entities = []
+            else:
+                graph_result = _build_graph(model, focus, depth)
+                if focus is not None:
+                    selected = {focus, *graph_result.upstream, *graph_result.downstream}
+                    entities = [e for e in entities if e.qualified_name in selected]
+
+    filters = filters or ResultFilter()
+    entities = [e for e in entities if _entity_matches(filters, e.qualified_name, e.kind)]
+    total = len(entities)
+    next_cursor: str | None = None
+    page = _page(filters, [e.qualified_name for e in entities])
+    if isinstance(page, DiagnosticResult):
+        diagnostics = [*diagnostics, page]
+        entities = []
+    else:
+        window, next_cursor = page
+        entities = entities[window]
     return ExplainResult(
-        ok=True,
+        ok=not any(d.severity == Severity.ERROR.value for d in diagnostics),
         source_mode=request.source_mode,
         module_count=len(loaded.modules),
-        diagnostics=compiled.diagnostics,
+        diagnostics=diagnostics,
         summary=_build_summary(entity_counts),
         entity_counts=entity_counts,
-        entities=_build_entities(compiled.model),
+        entities=entities,
+        graph=graph_result,
+        total=total,
+        next_cursor=next_cursor,
     )
 
 
+def _run(
+    request: CompileRequest,
+    sources: Path | None,
+    database: str,
+    workers: int,
+    cache: CompileCache[CompileOutcome] | None = None,
+) -> RunResult:
+    result = RunResult(
+        ok=False, source_mode=request.source_mode, database=database, workers=workers
+    )
+    loaded, compiled = _load_and_compile(request, 1, cache)
+    result.module_count = len(loaded.modules)
+    if compiled is None:
+        result.diagnostics = loaded.diagnostics
+        return result
+
+    result.diagnostics = list(compiled.diagnostics)
+    if not compiled.ok or compiled.model is None:
+        return result
+
+    source_files: dict[str, Path] = {}
+    if sources is not None:
+        source_files, missing = find_sources(compiled.model, sources)
+        if missing:
+            result.diagnostics.append(
+                DiagnosticResult(
+                    severity=Severity.ERROR.value,
+                    code="source-error",
+                    message=f"No Parquet/CSV source file in {sources} for: {', '.join(missing)}",
+                )
+            )
+            return result
+
+    with profiling.stage("plan"):
+        plan = build_plan(compiled.model, dialect="duckdb")
+
+    def record(timing: StatementTiming) -> None:
+        # Called from worker threads; list.append is atomic.
+        result.statements.append(
+            RunStatementResult(
+                wave=timing.wave,
+                entity=timing.entity,
+                kind=timing.kind,
+                index=timing.index,
+                seconds=round(timing.seconds, 6),
+            )
+        )
+
+    start = time.perf_counter()
+    with profiling.stage("execute") as call:
+        try:
+            run_local(plan, database, source_files, workers, on_statement=record)
+        except (PlanExecutionError, RuntimeError) as err:
+            result.diagnostics.append(
+                DiagnosticResult(
+                    severity=Severity.ERROR.value, code="runtime-error", message=str(err)
+                )
+            )
+        call.count = len(result.statements)
+    waves = {name: i for i, name in enumerate([SOURCE_WAVE, *(w.name for w in plan.waves)])}
+    result.statements.sort(key=lambda s: (waves[s.wave], s.entity, s.kind, s.index))
+    result.wall_seconds = round(time.perf_counter() - start, 6)
+    result.ok = not any(d.severity == Severity.ERROR.value for d in result.diagnostics)
+    return result
+
+
+def _profiling(profile: bool) -> AbstractContextManager[object]:
+    return profiling.session() if profile else nullcontext()
+
+
+_ResultT = TypeVar("_ResultT", ValidateResult, GenerateResult, DocsResult, ExplainResult, RunResult)
+
+
+def _attach_timings(result: _ResultT) -> _ResultT:
+    profiler = profiling.active()
+    if profiler is not None:
+        result.timings = stage_timing_results(profiler)
+    return result
+
+
 class _LoadedModules:
-    def __init__(self, modules: list[DVMLModule], diagnostics: list[DiagnosticResult]) -> None:
+    def __init__(
+        self,
+        modules: list[DVMLModule],
+        diagnostics: list[DiagnosticResult],
+        discovered: list[Path] | None = None,
+    ) -> None:
         self.modules = modules
         self.diagnostics = diagnostics
+        self.discovered = discovered or []
 
 
 class _CompiledModules:
@@ -201,15 +521,46 @@ class _CompiledModules:
         return not any(diag.severity == Severity.ERROR.value for diag in self.diagnostics)
 
 
-def _load_modules(request: CompileRequest) -> _LoadedModules:
+# (loaded, compiled) as stored in a ``CompileCache``; compiled is None if loading failed.
+CompileOutcome = tuple[_LoadedModules, "_CompiledModules | None"]
+
+
+def _load_and_compile(
+    request: CompileRequest, jobs: int, cache: CompileCache[CompileOutcome] | None
+) -> CompileOutcome:
+    if cache is not None:
+        with profiling.stage("cache") as call:
+            cached = cache.get(request)
+            call.count = int(cached is not None)
+        if cached is not None:
+            return cached
+    loaded = _load_modules(request, parse_file if cache is None else cache.parse_file)
+    if loaded.diagnostics:
+        return loaded, None
+    try:
+        compiled = _compile_modules(loaded.modules, jobs)
+    except LintConfigError as err:
+        return loaded, _CompiledModules(None, [_config_error_to_diagnostic(err)])
+    if cache is not None:
+        cache.put(request, loaded.discovered, loaded.modules, (loaded, compiled))
+    return loaded, compiled
+
+
+def _load_modules(
+    request: CompileRequest, parse_fn: Callable[[Path], DVMLModule] = parse_file
+) -> _LoadedModules:
     if request.paths:
-        return _load_path_modules(request.paths)
+        return _load_path_modules(request.paths, parse_fn)
     return _load_inline_module(request)
 
 
-def _load_path_modules(paths: list[Path]) -> _LoadedModules:
+def _load_path_modules(
+    paths: list[Path], parse_fn: Callable[[Path], DVMLModule] = parse_file
+) -> _LoadedModules:
     try:
-        dv_files = discover_dv_files(paths)
+        with profiling.stage("discovery") as call:
+            dv_files = discover_dv_files(paths)
+            call.count = len(dv_files)
     except FileNotFoundError as err:
         return _LoadedModules(
             [],
@@ -229,14 +580,20 @@ def _load_path_modules(paths: list[Path]) -> _LoadedModules:
         )
 
     modules: list[DVMLModule] = []
-    for path in dv_files:
-        try:
-            modules.append(parse_file(path))
-        except DVMLParseError as err:
-            return _LoadedModules([], [_parse_error_to_diagnostic(err)])
+    with profiling.stage("parse") as call:
+        call.count = len(dv_files)
+        for path in dv_files:
+            try:
+                with profiling.stage(f"parse:{path}"):
+                    modules.append(parse_fn(path))
+            except DVMLParseError as err:
+                return _LoadedModules([], [_parse_error_to_diagnostic(err)])
 
     try:
-        return _LoadedModules(resolve_imports(modules), [])
+        with profiling.stage("imports") as call:
+            resolved = resolve_imports(modules, parse_fn)
+            call.count = len(resolved)
+        return _LoadedModules(resolved, [], dv_files)
     except CircularImportError as err:
         return _LoadedModules(
             [],
@@ -263,7 +620,8 @@ def _load_path_modules(paths: list[Path]) -> _LoadedModules:
 
 def _load_inline_module(request: CompileRequest) -> _LoadedModules:
     try:
-        module = parse(request.source or "", source_file=request.source_name)
+        with profiling.stage("parse"):
+            module = parse(request.source or "", source_file=request.source_name)
     except DVMLParseError as err:
         return _LoadedModules([], [_parse_error_to_diagnostic(err)])
 
@@ -288,13 +646,24 @@ def _load_inline_module(request: CompileRequest) -> _LoadedModules:
     return _LoadedModules([module], [])
 
 
-def _compile_modules(modules: list[DVMLModule]) -> _CompiledModules:
-    diagnostics = [_lint_to_diagnostic(diag) for diag in _lint_modules(modules)]
+def _compile_modules(modules: list[DVMLModule], jobs: int = 1) -> _CompiledModules:
+    # Each rule runs exactly once per compile: module-local rules now, model-aware
+    # rules after resolution. Each module uses the .dvml-lint.toml files governing its
+    # directory; parsed configs are cached, so the second pass costs no file reads.
+    with profiling.stage("lint") as call:
+        call.count = len(modules)
+        diagnostics = [
+            _lint_to_diagnostic(diag)
+            for diag in _lint_modules(
+                modules, select_rules(scope=RuleScope.MODULE), jobs=jobs
+            )
+        ]
     if any(diag.severity == Severity.ERROR.value for diag in diagnostics):
         return _CompiledModules(None, diagnostics)
 
     try:
-        model = resolve(modules)
+        with profiling.stage("resolve"):
+            model = resolve(modules)
     except ResolverErrors as err:
         resolver_diags = [
             DiagnosticResult(
@@ -309,11 +678,14 @@ def _compile_modules(modules: list[DVMLModule]) -> _CompiledModules:
         ]
         return _CompiledModules(None, resolver_diags)
 
-    model_diags = [
-        _lint_to_diagnostic(diag)
-        for diag in _lint_modules(modules, model=model)
-        if diag.rule in _MODEL_AWARE_RULES
-    ]
+    with profiling.stage("model-lint") as call:
+        call.count = len(modules)
+        model_diags = [
+            _lint_to_diagnostic(diag)
+            for diag in _lint_modules(
+                modules, select_rules(scope=RuleScope.MODEL), model=model, jobs=jobs
+            )
+        ]
     all_diags = [*diagnostics, *model_diags]
     if any(diag.severity == Severity.ERROR.value for diag in all_diags):
         return _CompiledModules(None, all_diags)
@@ -323,11 +695,23 @@ def _compile_modules(modules: list[DVMLModule]) -> _CompiledModules:
 
 def _lint_modules(
     modules: list[DVMLModule],
+    rules: list[LintRule],
     model: DataVaultModel | None = None,
+    jobs: int = 1,
 ) -> list[LintDiagnostic]:
-    diagnostics: list[LintDiagnostic] = []
-    for module in modules:
-        diagnostics.extend(lint(module, model=model))
+    # Per-rule timings are only collected while profiling; they appear as
+    # ``lint-rule:<id>`` stages next to the ``lint``/``model-lint`` totals.
+    profiler = profiling.active()
+    stats: dict[str, RuleStats] | None = {} if profiler is not None else None
+    diagnostics = lint_modules(modules, model, rules=rules, stats=stats, jobs=jobs)
+    if profiler is not None and stats:
+        for name, rule_stats in stats.items():
+            profiler.record(
+                f"lint-rule:{name}",
+                rule_stats.wall_seconds,
+                rule_stats.cpu_seconds,
+                rule_stats.calls,
+            )
     return diagnostics
 
 
@@ -342,6 +726,15 @@ def _parse_error_to_diagnostic(err: DVMLParseError) -> DiagnosticResult:
     )
 
 
+def _config_error_to_diagnostic(err: LintConfigError) -> DiagnosticResult:
+    return DiagnosticResult(
+        severity=Severity.ERROR.value,
+        code="config-error",
+        message=str(err),
+        file=str(err.path),
+    )
+
+
 def _lint_to_diagnostic(diag: LintDiagnostic) -> DiagnosticResult:
     return DiagnosticResult(
         severity=diag.severity.value,
@@ -386,101 +779,129 @@ def _build_summary(entity_counts: dict[str, int]) -> str:
 
 
 def _build_entities(model: DataVaultModel) -> list[ExplainEntityResult]:
-    entities: list[ExplainEntityResult] = []
-    entities.extend(_build_hub_entities(model.hubs.values()))
-    entities.extend(_build_satellite_entities(model.satellites.values()))
-    entities.extend(_build_link_entities(model.links.values()))
-    entities.extend(_build_satellite_entities(model.nhsats.values(), kind="nhsat"))
-    entities.extend(_build_link_entities(model.nhlinks.values(), kind="nhlink"))
-    entities.extend(_build_satellite_entities(model.effsats.values(), kind="effsat"))
-    entities.extend(_build_samlink_entities(model.samlinks.values()))
-    entities.extend(_build_bridge_entities(model.bridges.values()))
-    entities.extend(_build_pit_entities(model.pits.values()))
-    return sorted(entities, key=lambda entity: entity.qualified_name)
-
-
-def _build_hub_entities(hubs: object) -> list[ExplainEntityResult]:
-    return [
+    symbols = model.symbols
+    entities = [
         ExplainEntityResult(
-            qualified_name=hub.qualified_name,
-            kind="hub",
-            columns=[column.name for column in [*hub.business_keys, *hub.columns]],
-            references=[],
+            qualified_name=entity.qualified_name,
+            kind=kind,
+            columns=[column.name for column in _explain_columns(entity, kind)],
+            references=_explain_references(entity, kind, symbols),
         )
-        for hub in sorted(hubs, key=lambda item: item.qualified_name)
+        for attr, kind in ENTITY_KINDS.items()
+        for entity in getattr(model, attr).values()
     ]
+    return sorted(entities, key=lambda entity: entity.qualified_name)
 
 
-def _build_satellite_entities(
-    satellites: object,
-    kind: str = "satellite",
-) -> list[ExplainEntityResult]:
-    return [
-        ExplainEntityResult(
-            qualified_name=satellite.qualified_name,
-            kind=kind,
-            columns=[column.name for column in satellite.columns],
-            references=[_qualify_reference(satellite.parent_ref, satellite.namespace)],
-        )
-        for satellite in sorted(satellites, key=lambda item: item.qualified_name)
+def _find_focus(model: DataVaultModel, name: str) -> str | DiagnosticResult:
+    graph = model.graph
+    if name in graph:
+        return name
+    matches = sorted({entry.qualified_name for entry in model.symbols.candidates(name)})
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        message = f"Entity name '{name}' is ambiguous: {', '.join(matches)}"
+    else:
+        message = f"Unknown entity '{name}'"
+    return DiagnosticResult(severity=Severity.ERROR.value, code="unknown-entity", message=message)
+
+
+def _build_graph(model: DataVaultModel, focus: str | None, depth: int | None) -> ExplainGraphResult:
+    graph = model.graph
+    if focus is None:
+        return ExplainGraphResult(load_order=graph.load_waves(), components=graph.components())
+    upstream = graph.upstream(focus, depth)
+    downstream = graph.downstream(focus, depth)
+    selected = {focus, *upstream, *downstream}
+    components = [
+        [name for name in component if name in selected]
+        for component in graph.components()
+        if focus in component
     ]
+    return ExplainGraphResult(
+        focus=focus,
+        upstream=upstream,
+        downstream=downstream,
+        load_order=graph.load_waves(selected),
+        components=components,
+    )
 
 
-def _build_link_entities(links: object, kind: str = "link") -> list[ExplainEntityResult]:
-    return [
-        ExplainEntityResult(
-            qualified_name=link.qualified_name,
-            kind=kind,
-            columns=[column.name for column in link.columns],
-            references=[_qualify_reference(reference, link.namespace) for reference in link.hub_references],
-        )
-        for link in sorted(links, key=lambda item: item.qualified_name)
-    ]
+def _entity_kinds(model: DataVaultModel) -> dict[str, str]:
+    return {
+        entity.qualified_name: kind
+        for attr, kind in ENTITY_KINDS.items()
+        for entity in getattr(model, attr).values()
+    }
 
 
-def _build_samlink_entities(samlinks: object) -> list[ExplainEntityResult]:
-    return [
-        ExplainEntityResult(
-            qualified_name=samlink.qualified_name,
-            kind="samlink",
-            columns=[column.name for column in samlink.columns],
-            references=[
-                _qualify_reference(samlink.master_ref, samlink.namespace),
-                _qualify_reference(samlink.duplicate_ref, samlink.namespace),
-            ],
-        )
-        for samlink in sorted(samlinks, key=lambda item: item.qualified_name)
-    ]
+def _entity_matches(filters: ResultFilter, name: str, kind: str) -> bool:
+    if filters.kinds and kind not in filters.kinds:
+        return False
+    short = name.rpartition(".")[2]
+    return not filters.entities or any(
+        fnmatchcase(name, pattern) or fnmatchcase(short, pattern) for pattern in filters.entities
+    )
 
 
-def _build_bridge_entities(bridges: object) -> list[ExplainEntityResult]:
-    return [
-        ExplainEntityResult(
-            qualified_name=bridge.qualified_name,
-            kind="bridge",
-            columns=[],
-            references=[_qualify_reference(reference, bridge.namespace) for reference in bridge.path],
-        )
-        for bridge in sorted(bridges, key=lambda item: item.qualified_name)
-    ]
+def _path_matches(filters: ResultFilter, path: str) -> bool:
+    return not filters.artifact_paths or any(
+        fnmatchcase(path, pattern) for pattern in filters.artifact_paths
+    )
 
 
-def _build_pit_entities(pits: object) -> list[ExplainEntityResult]:
-    return [
-        ExplainEntityResult(
-            qualified_name=pit.qualified_name,
-            kind="pit",
-            columns=[],
-            references=[
-                _qualify_reference(pit.anchor_ref, pit.namespace),
-                *[_qualify_reference(reference, pit.namespace) for reference in pit.tracked_satellites],
-            ],
+def _page(filters: ResultFilter, keys: list[str]) -> tuple[slice, str | None] | DiagnosticResult:
+    """The window of sorted ``keys`` after ``filters.cursor``, at most ``filters.limit`` long,
+    and the cursor of the next page; an error diagnostic if the filters are invalid."""
+    unknown = [kind for kind in filters.kinds if kind not in ENTITY_KINDS.values()]
+    if unknown:
+        return DiagnosticResult(
+            severity=Severity.ERROR.value,
+            code="invalid-filter",
+            message=(
+                f"Unknown entity kind '{unknown[0]}'. "
+                f"Choose from: {', '.join(ENTITY_KINDS.values())}"
+            ),
         )
-        for pit in sorted(pits, key=lambda item: item.qualified_name)
-    ]
+    start = 0
+    if filters.cursor is not None:
+        try:
+            after = base64.b64decode(filters.cursor, altchars=b"-_", validate=True).decode()
+        except (binascii.Error, UnicodeError):
+            return DiagnosticResult(
+                severity=Severity.ERROR.value,
+                code="invalid-filter",
+                message=f"Invalid cursor '{filters.cursor}'",
+            )
+        start = bisect.bisect_right(keys, after)
+    end = len(keys) if filters.limit is None else min(len(keys), start + filters.limit)
+    next_cursor = None
+    if start < end < len(keys):
+        # Opaque to clients: the last key returned, so the next page survives regeneration.
+        next_cursor = base64.urlsafe_b64encode(keys[end - 1].encode()).decode()
+    return slice(start, end), next_cursor
+
+
+def _manifest_entry(result: GeneratorResult, path: str) -> ArtifactManifestResult:
+    data = result.files[path].encode()
+    return ArtifactManifestResult(
+        path=path,
+        size=len(data),
+        sha256=hashlib.sha256(data).hexdigest(),
+        entities=result.entities.get(path, []),
+    )
+
 
+def _explain_columns(entity: Any, kind: str) -> list[Column]:
+    if kind == "hub":
+        return [*entity.business_keys, *entity.columns]
+    return list(getattr(entity, "columns", []))
 
-def _qualify_reference(reference: str, namespace: str) -> str:
-    if "." in reference or not namespace:
-        return reference
-    return f"{namespace}.{reference}"
+
+def _explain_references(entity: Any, kind: str, symbols: SymbolIndex) -> list[str]:
+    # References are reported as the qualified names they resolve to in the model's
+    # symbol index, falling back to textual qualification for unresolved names.
+    return [
+        symbols.qualify(ref, entity.namespace, kinds) for ref, kinds in references(entity, kind)
+    ]
@@ -0,0 +1,113 @@
+"""Incremental compile session over a changing set of modules.
+
+``validate_request`` and friends compile a fixed set of files from scratch: parse, lint,
+resolve and model-lint every module on each call. Editors and long-lived servers compile
+the same workspace over and over with one module changed at a time. ``CompileSession``
+runs the resolve and model-lint stages of that pipeline incrementally: each module's
+entities are built once per version of the module (``resolve_module``, the expensive
+part) and cached; the workspace model is re-merged from the cached entities, and
+references and model-aware lint rules are re-checked only for the modules asked about.
+
+Module-local lint is left to the caller, which usually runs it while parsing.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+from dmjedi import profiling
+from dmjedi.lang.ast import DVMLModule
+from dmjedi.lang.lint_config import LintConfig
+from dmjedi.lang.linter import LintDiagnostic, RuleScope, lint_modules, select_rules
+from dmjedi.model.core import DataVaultModel
+from dmjedi.model.resolver import (
+    ModuleResolution,
+    ResolverError,
+    check_references,
+    is_merged,
+    merge_resolution,
+    resolve_module,
+)
+
+
+@dataclass(slots=True)
+class ModuleDiagnostics:
+    """Workspace-level problems found in one module."""
+
+    resolver: list[ResolverError] = field(default_factory=list)
+    lint: list[LintDiagnostic] = field(default_factory=list)
+
+
+class CompileSession:
+    """Resolved state of a set of modules keyed by file (path or URI), kept current.
+
+    Safe to share between threads; every operation holds the session lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._modules: dict[str, DVMLModule] = {}
+        self._resolutions: dict[str, ModuleResolution] = {}
+        self._model: DataVaultModel | None = None
+        self._merge_errors: dict[str, list[ResolverError]] = {}
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._modules
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+    def update(self, key: str, module: DVMLModule) -> None:
+        """Replace the module stored under ``key``, rebuilding only its entities."""
+        with self._lock:
+            if self._modules.get(key) is module:
+                return
+            with profiling.stage("resolve-module"):
+                resolution = resolve_module(module)
+            self._modules[key] = module
+            self._resolutions[key] = resolution
+            self._model = None
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            if self._modules.pop(key, None) is not None:
+                del self._resolutions[key]
+                self._model = None
+
+    def model(self) -> DataVaultModel:
+        """The merged model of every module; the first definition of a name wins."""
+        with self._lock:
+            if self._model is None:
+                with profiling.stage("resolve") as call:
+                    call.count = len(self._resolutions)
+                    model = DataVaultModel()
+                    self._merge_errors = {}
+                    for key, resolution in self._resolutions.items():
+                        errors = merge_resolution(model, resolution)
+                        if errors:
+                            self._merge_errors[key] = errors
+                    self._model = model
+            return self._model
+
+    def diagnostics(self, key: str, config: LintConfig | None = None) -> ModuleDiagnostics:
+        """Resolver errors and model-aware lint diagnostics of the module under ``key``.
+
+        ``config`` overrides the lint settings discovered for the module's source file.
+        """
+        with self._lock:
+            module = self._modules.get(key)
+            if module is None:
+                return ModuleDiagnostics()
+            model = self.model()
+            resolution = self._resolutions[key]
+            symbols = model.symbols
+            resolver = list(self._merge_errors.get(key, ()))
+            for resolved in resolution.entities:
+                if is_merged(model, resolved):
+                    resolver.extend(check_references(resolved, symbols))
+            with profiling.stage("model-lint"):
+                lint = lint_modules(
+                    [module], model, config=config, rules=select_rules(scope=RuleScope.MODEL)
+                )
+            return ModuleDiagnostics(resolver=resolver, lint=lint)
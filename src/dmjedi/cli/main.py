@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
 
 import typer
 from rich.console import Console
+from rich.table import Table
 
-from dmjedi.application.requests import CompileRequest
+from dmjedi import profiling
+from dmjedi.application.requests import CompileRequest, ResultFilter
 from dmjedi.application.results import ArtifactResult, DiagnosticResult, DocsResult, GenerateResult
-from dmjedi.application.results import ValidateResult
-from dmjedi.application.services import docs_request, generate_request, validate_request
+from dmjedi.application.results import (
+    ExplainResult,
+    RunResult,
+    StageTimingResult,
+    ValidateResult,
+)
+from dmjedi.application.services import (
+    docs_request,
+    explain_request,
+    generate_request,
+    run_request,
+    stage_timing_results,
+    validate_request,
+)
 from dmjedi.cli.errors import format_lint_diagnostic, print_diagnostics
 from dmjedi.generators.base import GeneratorResult
 from dmjedi.lang.ast import SourceLocation
 from dmjedi.lang.linter import LintDiagnostic, Severity
+from dmjedi.model.resolver import gc_paused
 from dmjedi.lsp.server import start_server as start_lsp_server
 from dmjedi.mcp.server import start_server as start_mcp_server
 
@@ -26,6 +42,8 @@ app = typer.Typer(
 
 _OUTPUT_FORMATS = {"text", "json"}
 _GENERATOR_MODES = {"batch", "streaming"}
+_PACKAGING_MODES = ("entity", "namespace", "layer")
+_DIALECT_TARGETS = {"sql-jinja", "plan"}
 _STRUCTURED_ERROR_CODES = {
     "generator-error",
     "import-error",
@@ -38,15 +56,37 @@ _STRUCTURED_ERROR_CODES = {
 start_server = start_lsp_server
 
 
+# Long-running servers compile on worker threads and must keep the garbage collector on.
+_SERVER_COMMANDS = {"lsp", "mcp"}
+
+
+@app.callback()
+def main(ctx: typer.Context) -> None:
+    # Batch commands build a model once and exit; pausing the cyclic GC keeps resolving
+    # large models linear (see dmjedi.model.resolver).
+    if ctx.invoked_subcommand not in _SERVER_COMMANDS:
+        ctx.with_resource(gc_paused())
+
+
 @app.command()
 def validate(
     paths: list[Path] = typer.Argument(..., help="DVML files or directories to validate"),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Lint modules in N parallel worker processes (0 = one per CPU).",
+    ),
     format: str = typer.Option("text", "--format", help="Output format: text or json."),
+    profile: bool = typer.Option(
+        False, "--profile", help="Report per-stage wall/CPU time, allocations and counts."
+    ),
 ) -> None:
     """Validate DVML model files."""
     console = Console(stderr=True)
     output_format = _parse_output_format(format, console)
-    result = validate_request(CompileRequest(paths=paths))
+    result = validate_request(CompileRequest(paths=paths), profile=profile, jobs=jobs)
 
     if output_format == "json":
         typer.echo(result.model_dump_json(indent=2))
@@ -55,6 +95,7 @@ def validate(
         return
 
     _print_result_diagnostics(result.diagnostics, console)
+    _print_timings(result.timings, console)
     if not result.ok:
         raise typer.Exit(code=1)
     if not result.diagnostics:
@@ -70,63 +111,135 @@ def generate(
     dialect: str = typer.Option(
         "default",
         "--dialect",
-        help="SQL dialect for type mapping. Only applies to --target sql-jinja.",
+        help="SQL dialect for type mapping. Only applies to --target sql-jinja and plan.",
+    ),
+    quarantine: bool = typer.Option(
+        False,
+        "--quarantine",
+        help=(
+            "Route rows failing expectations into quarantine tables instead of dropping "
+            "them. Only applies to --target spark-declarative."
+        ),
+    ),
+    packaging: str = typer.Option(
+        "entity",
+        "--packaging",
+        help=(
+            "Spark module layout: entity (one file per entity), namespace or layer "
+            "(one consolidated pipeline module per group). Only applies to "
+            "--target spark-declarative."
+        ),
+    ),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        min=0,
+        help="Lint modules and render entities in N worker processes (0 = one per CPU).",
+    ),
+    entities: list[str] | None = typer.Option(
+        None,
+        "--entity",
+        "-e",
+        help="Only artifacts rendered from entities matching this name or glob (repeatable).",
+    ),
+    kinds: list[str] | None = typer.Option(
+        None, "--kind", "-k", help="Only artifacts of entities of this kind (repeatable)."
+    ),
+    artifact_paths: list[str] | None = typer.Option(
+        None, "--artifact-path", help="Only artifacts whose path matches this glob (repeatable)."
+    ),
+    cursor: str | None = typer.Option(
+        None, "--cursor", help="Resume after the page that returned this next_cursor."
+    ),
+    limit: int | None = typer.Option(None, "--limit", min=1, help="Return at most N artifacts."),
+    manifest_only: bool = typer.Option(
+        False,
+        "--manifest-only",
+        help="List artifact paths, sizes and SHA-256 hashes instead of writing content.",
     ),
     format: str = typer.Option("text", "--format", help="Output format: text or json."),
+    profile: bool = typer.Option(
+        False, "--profile", help="Report per-stage wall/CPU time, allocations and counts."
+    ),
 ) -> None:
     """Generate pipeline code from DVML models."""
     console = Console(stderr=True)
     output_format = _parse_output_format(format, console)
     generator_mode = _parse_generator_mode(mode, console)
+    packaging_mode = _parse_packaging(packaging, console)
 
     # Validate dialect against supported dialects from type mapping (D-08)
     from dmjedi.model.types import SUPPORTED_DIALECTS
 
-    if dialect not in SUPPORTED_DIALECTS:
-        result = GenerateResult(
-            ok=False,
-            source_mode="paths",
-            target=target,
-            dialect=dialect,
-            mode=generator_mode,
-            diagnostics=[
-                DiagnosticResult(
-                    severity=Severity.ERROR.value,
-                    code="generator-error",
-                    message=(
-                        f"Invalid dialect '{dialect}'. "
-                        f"Choose from: {', '.join(SUPPORTED_DIALECTS)}"
-                    ),
-                )
-            ],
-        )
-    else:
-        result = generate_request(
-            CompileRequest(paths=paths),
-            target=target,
-            dialect=dialect,
-            mode=generator_mode,
-        )
+    with _profiling(profile):
+        if dialect not in SUPPORTED_DIALECTS:
+            result = GenerateResult(
+                ok=False,
+                source_mode="paths",
+                target=target,
+                dialect=dialect,
+                mode=generator_mode,
+                diagnostics=[
+                    DiagnosticResult(
+                        severity=Severity.ERROR.value,
+                        code="generator-error",
+                        message=(
+                            f"Invalid dialect '{dialect}'. "
+                            f"Choose from: {', '.join(SUPPORTED_DIALECTS)}"
+                        ),
+                    )
+                ],
+            )
+        else:
+            result = generate_request(
+                CompileRequest(paths=paths),
+                target=target,
+                dialect=dialect,
+                mode=generator_mode,
+                quarantine=quarantine,
+                packaging=packaging_mode,
+                jobs=jobs,
+                profile=profile,
+                filters=ResultFilter(
+                    entities=entities or [],
+                    kinds=kinds or [],
+                    artifact_paths=artifact_paths or [],
+                    cursor=cursor,
+                    limit=limit,
+                ),
+                manifest_only=manifest_only,
+            )
 
-    if output_format == "json":
-        typer.echo(result.model_dump_json(indent=2))
+        if output_format == "json":
+            typer.echo(result.model_dump_json(indent=2))
+            if not result.ok:
+                raise typer.Exit(code=1)
+            return
+
+        _print_result_diagnostics(result.diagnostics, console)
         if not result.ok:
+            _print_timings(result.timings, console)
             raise typer.Exit(code=1)
-        return
 
-    _print_result_diagnostics(result.diagnostics, console)
-    if not result.ok:
-        raise typer.Exit(code=1)
+        if dialect != "default" and target not in _DIALECT_TARGETS:
+            console.print(
+                "[yellow]Warning:[/yellow] --dialect is only used with --target sql-jinja"
+                " and plan; ignoring."
+            )
 
-    if dialect != "default" and target != "sql-jinja":
-        console.print(
-            "[yellow]Warning:[/yellow] --dialect is only used with --target sql-jinja; ignoring."
-        )
+        if result.manifest is not None:
+            _print_manifest(result, Console())
+            _print_next_cursor(result.next_cursor, console)
+            _print_timings(result.timings, console)
+            return
 
-    written = _write_artifacts(result.artifacts, output)
-    console.print(f"[green]Generated {len(written)} file(s) into {output}/[/green]")
-    for p in written:
-        console.print(f"  {p}")
+        written = _timed_write(result, output)
+        console.print(f"[green]Generated {len(written)} file(s) into {output}/[/green]")
+        for p in written:
+            console.print(f"  {p}")
+        _print_next_cursor(result.next_cursor, console)
+        _print_timings(result.timings, console)
 
 
 @app.command()
@@ -134,11 +247,71 @@ def docs(
     paths: list[Path] = typer.Argument(..., help="DVML files or directories"),
     output: Path = typer.Option("output/docs", "--output", "-o", help="Output directory"),
     format: str = typer.Option("text", "--format", help="Output format: text or json."),
+    profile: bool = typer.Option(
+        False, "--profile", help="Report per-stage wall/CPU time, allocations and counts."
+    ),
 ) -> None:
     """Generate markdown documentation from DVML models."""
     console = Console(stderr=True)
     output_format = _parse_output_format(format, console)
-    result = docs_request(CompileRequest(paths=paths))
+    with _profiling(profile):
+        result = docs_request(CompileRequest(paths=paths), profile=profile)
+
+        if output_format == "json":
+            typer.echo(result.model_dump_json(indent=2))
+            if not result.ok:
+                raise typer.Exit(code=1)
+            return
+
+        _print_result_diagnostics(result.diagnostics, console)
+        if not result.ok:
+            _print_timings(result.timings, console)
+            raise typer.Exit(code=1)
+
+        written = _timed_write(result, output)
+        doc_path = written[0] if written else output / "model.md"
+        console.print(f"[green]Documentation written to {doc_path}[/green]")
+        _print_timings(result.timings, console)
+
+
+@app.command()
+def explain(
+    paths: list[Path] = typer.Argument(..., help="DVML files or directories"),
+    entity: str | None = typer.Option(
+        None, "--entity", "-e", help="Focus on one entity and its dependency neighbourhood."
+    ),
+    depth: int | None = typer.Option(
+        None, "--depth", min=1, help="Limit upstream/downstream traversal to N hops."
+    ),
+    graph: bool = typer.Option(
+        False, "--graph", help="Include load waves and connected components."
+    ),
+    match: list[str] | None = typer.Option(
+        None, "--match", help="Only list entities matching this name or glob (repeatable)."
+    ),
+    kinds: list[str] | None = typer.Option(
+        None, "--kind", "-k", help="Only list entities of this kind (repeatable)."
+    ),
+    cursor: str | None = typer.Option(
+        None, "--cursor", help="Resume after the page that returned this next_cursor."
+    ),
+    limit: int | None = typer.Option(None, "--limit", min=1, help="List at most N entities."),
+    format: str = typer.Option("text", "--format", help="Output format: text or json."),
+    profile: bool = typer.Option(
+        False, "--profile", help="Report per-stage wall/CPU time, allocations and counts."
+    ),
+) -> None:
+    """Explain the resolved model and its dependency graph."""
+    console = Console(stderr=True)
+    output_format = _parse_output_format(format, console)
+    result = explain_request(
+        CompileRequest(paths=paths),
+        profile=profile,
+        entity=entity,
+        depth=depth,
+        graph=graph,
+        filters=ResultFilter(entities=match or [], kinds=kinds or [], cursor=cursor, limit=limit),
+    )
 
     if output_format == "json":
         typer.echo(result.model_dump_json(indent=2))
@@ -147,12 +320,58 @@ def docs(
         return
 
     _print_result_diagnostics(result.diagnostics, console)
+    if result.ok:
+        _print_explain(result, Console())
+        _print_next_cursor(result.next_cursor, console)
+    _print_timings(result.timings, console)
     if not result.ok:
         raise typer.Exit(code=1)
 
-    written = _write_artifacts(result.artifacts, output)
-    doc_path = written[0] if written else output / "model.md"
-    console.print(f"[green]Documentation written to {doc_path}[/green]")
+
+@app.command()
+def run(
+    paths: list[Path] = typer.Argument(..., help="DVML files or directories"),
+    sources: Path | None = typer.Option(
+        None,
+        "--sources",
+        "-s",
+        help="Directory of <Entity>.parquet/.csv files loaded into src_* tables first.",
+    ),
+    database: str = typer.Option(
+        ":memory:", "--database", "-d", help="DuckDB database file (default: in memory)."
+    ),
+    workers: int = typer.Option(
+        4, "--workers", "-w", min=1, help="Concurrent DuckDB cursors per wave."
+    ),
+    top: int = typer.Option(20, "--top", min=0, help="Show the N slowest statements."),
+    format: str = typer.Option("text", "--format", help="Output format: text or json."),
+    profile: bool = typer.Option(
+        False, "--profile", help="Report per-stage wall/CPU time, allocations and counts."
+    ),
+) -> None:
+    """Load the model into DuckDB wave by wave and report per-statement timings."""
+    console = Console(stderr=True)
+    output_format = _parse_output_format(format, console)
+    result = run_request(
+        CompileRequest(paths=paths),
+        sources=sources,
+        database=database,
+        workers=workers,
+        profile=profile,
+    )
+
+    if output_format == "json":
+        typer.echo(result.model_dump_json(indent=2))
+        if not result.ok:
+            raise typer.Exit(code=1)
+        return
+
+    _print_result_diagnostics(result.diagnostics, console)
+    if result.statements:
+        _print_run(result, top, Console())
+    _print_timings(result.timings, console)
+    if not result.ok:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -183,6 +402,16 @@ def _parse_generator_mode(value: str, console: Console) -> str:
     raise typer.Exit(code=1)
 
 
+def _parse_packaging(value: str, console: Console) -> str:
+    if value in _PACKAGING_MODES:
+        return value
+
+    console.print(
+        f"[red]Error:[/red] Invalid packaging. Choose from: {', '.join(_PACKAGING_MODES)}"
+    )
+    raise typer.Exit(code=1)
+
+
 def _print_result_diagnostics(diagnostics: list[DiagnosticResult], console: Console) -> None:
     lint_diagnostics: list[LintDiagnostic] = []
 
@@ -226,6 +455,127 @@ def _print_structured_diagnostic(diagnostic: DiagnosticResult, console: Console)
     console.print(f"{label} {diagnostic.message}")
 
 
+def _print_explain(result: ExplainResult, console: Console) -> None:
+    console.print(result.summary)
+    table = Table(title="Entities")
+    for column in ("Entity", "Kind", "References"):
+        table.add_column(column)
+    for entity in result.entities:
+        table.add_row(entity.qualified_name, entity.kind, ", ".join(entity.references))
+    console.print(table)
+
+    graph = result.graph
+    if graph is None:
+        return
+    if graph.focus is not None:
+        console.print(f"Upstream of {graph.focus}: {', '.join(graph.upstream) or '-'}")
+        console.print(f"Downstream of {graph.focus}: {', '.join(graph.downstream) or '-'}")
+    for number, wave in enumerate(graph.load_order, start=1):
+        console.print(f"Load wave {number}: {', '.join(wave)}")
+    console.print(f"Connected components: {len(graph.components)}")
+    for component in graph.components:
+        console.print(f"  {', '.join(component)}")
+
+
+def _print_manifest(result: GenerateResult, console: Console) -> None:
+    table = Table(title="Artifacts")
+    for column in ("Path", "Bytes", "SHA-256", "Entities"):
+        table.add_column(column, justify="right" if column == "Bytes" else "left")
+    for entry in result.manifest or []:
+        table.add_row(entry.path, str(entry.size), entry.sha256, ", ".join(entry.entities))
+    console.print(table)
+
+
+def _print_next_cursor(next_cursor: str | None, console: Console) -> None:
+    if next_cursor is not None:
+        console.print(f"More results: rerun with --cursor {next_cursor}")
+
+
+def _print_run(result: RunResult, top: int, console: Console) -> None:
+    waves: dict[str, list[float]] = {}
+    for statement in result.statements:
+        waves.setdefault(statement.wave, []).append(statement.seconds)
+    wave_table = Table(title="Waves")
+    for column in ("Wave", "Statements", "Sum ms", "Max ms"):
+        wave_table.add_column(column, justify="left" if column == "Wave" else "right")
+    for name, seconds in waves.items():
+        wave_table.add_row(
+            name, str(len(seconds)), f"{sum(seconds) * 1000:.2f}", f"{max(seconds) * 1000:.2f}"
+        )
+    console.print(wave_table)
+
+    if top:
+        slowest = sorted(result.statements, key=lambda s: s.seconds, reverse=True)[:top]
+        table = Table(title=f"Slowest statements (top {len(slowest)})")
+        for column in ("Wave", "Entity", "Kind", "#", "ms"):
+            table.add_column(column, justify="right" if column in ("#", "ms") else "left")
+        for statement in slowest:
+            table.add_row(
+                statement.wave,
+                statement.entity,
+                statement.kind,
+                str(statement.index + 1),
+                f"{statement.seconds * 1000:.2f}",
+            )
+        console.print(table)
+    console.print(
+        f"Executed {len(result.statements)} statement(s) in {result.wall_seconds:.3f}s"
+        f" on {result.workers} worker(s)."
+    )
+
+
+def _profiling(profile: bool) -> AbstractContextManager[object]:
+    """Profile a whole command, so stages after the request (``write``) join its timings."""
+    return profiling.session() if profile else nullcontext()
+
+
+def _timed_write(result: GenerateResult | DocsResult, output_dir: Path) -> list[Path]:
+    """Write the result's artifacts as the ``write`` stage of the active profiling session."""
+    with profiling.stage("write") as call:
+        written = _write_artifacts(result.artifacts, output_dir)
+        call.count = len(written)
+    profiler = profiling.active()
+    if profiler is not None:
+        result.timings = stage_timing_results(profiler)
+    return written
+
+
+def _print_timings(timings: list[StageTimingResult] | None, console: Console) -> None:
+    """Print top-level stage timings and lint rules by cost; per-file rows are JSON-only."""
+    if timings is None:
+        return
+    table = Table(title="Stage timings")
+    for column in ("Stage", "Count", "Wall ms", "CPU ms", "Alloc KiB"):
+        table.add_column(column, justify="left" if column == "Stage" else "right")
+    rows = [t for t in timings if ":" not in t.name]
+    for timing in rows:
+        alloc = "-" if timing.allocated_bytes is None else f"{timing.allocated_bytes / 1024:.1f}"
+        table.add_row(
+            timing.name,
+            str(timing.count),
+            f"{timing.wall_seconds * 1000:.2f}",
+            f"{timing.cpu_seconds * 1000:.2f}",
+            alloc,
+        )
+    console.print(table)
+
+    rule_prefix = "lint-rule:"
+    rules = [t for t in timings if t.name.startswith(rule_prefix)]
+    if not rules:
+        return
+    rule_table = Table(title="Lint rule timings")
+    for column in ("Rule", "Nodes", "Wall ms", "CPU ms"):
+        rule_table.add_column(column, justify="left" if column == "Rule" else "right")
+    for timing in sorted(rules, key=lambda t: t.wall_seconds, reverse=True):
+        rule_table.add_row(
+            timing.name.removeprefix(rule_prefix),
+            str(timing.count),
+            f"{timing.wall_seconds * 1000:.2f}",
+            f"{timing.cpu_seconds * 1000:.2f}",
+        )
+    console.print(rule_table)
+
+
 def _write_artifacts(artifacts: list[ArtifactResult], output_dir: Path) -> list[Path]:
     result = GeneratorResult()
     for artifact in artifacts:
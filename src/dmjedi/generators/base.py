@@ -1,19 +1,31 @@
 """Abstract base for pluggable code generators."""
 
+import os
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
+from typing import Any
 
+from dmjedi import profiling
 from dmjedi.model.core import DataVaultModel
 
+RenderTask = tuple[str, Callable[[], str]]
+
 
 class GeneratorResult:
     """Container for generated output files."""
 
     def __init__(self) -> None:
         self.files: dict[str, str] = {}  # relative path -> content
+        # relative path -> qualified names of the entities rendered into it; files built
+        # from the whole model (plans, manifests) have no entry.
+        self.entities: dict[str, list[str]] = {}
 
-    def add_file(self, path: str, content: str) -> None:
+    def add_file(self, path: str, content: str, entities: Sequence[str] = ()) -> None:
         self.files[path] = content
+        if entities:
+            self.entities[path] = list(entities)
 
     def write(self, output_dir: Path) -> list[Path]:
         """Write all generated files to disk. Returns list of written paths."""
@@ -30,8 +42,23 @@ class BaseGenerator(ABC):
     """Abstract base class for pipeline code generators.
 
     Implement this interface to add a new generation target (e.g., dbt, SQL, Spark).
+
+    Per-entity rendering goes through ``render_files``, which runs serially by default.
+    Pass ``jobs`` > 1 (0 means one per CPU) to render in a process pool, or ``executor`` to
+    plug in any ``concurrent.futures.Executor``. Render tasks must then be picklable, e.g.
+    ``functools.partial`` over module-level functions or methods of this generator.
     """
 
+    def __init__(self, jobs: int = 1, executor: Executor | None = None, **kwargs: Any) -> None:
+        self._jobs = jobs if jobs > 0 else os.cpu_count() or 1
+        self._executor = executor
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Executors cannot be pickled; workers only need the rendering configuration.
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -40,3 +67,48 @@ class BaseGenerator(ABC):
     @abstractmethod
     def generate(self, model: DataVaultModel) -> GeneratorResult:
         """Generate pipeline code from a resolved Data Vault model."""
+
+    def render_files(
+        self, tasks: Sequence[RenderTask], owners: Sequence[str] = ()
+    ) -> GeneratorResult:
+        """Run ``(path, render)`` tasks and collect their output in task order.
+
+        Results are gathered with ``Executor.map``, so ``GeneratorResult.files`` has the
+        same ordering whether rendering ran serially or in parallel. ``owners``, if given,
+        holds the qualified name of the entity each task renders.
+
+        Each path is recorded as a ``render:<path>`` stage in either mode; in parallel it
+        measures how long the parent waited for that result.
+        """
+        paths = [path for path, _ in tasks]
+        renders = [render for _, render in tasks]
+        if self._executor is not None:
+            chunksize = self._chunksize(tasks)
+            contents = _timed(paths, self._executor.map(_call, renders, chunksize=chunksize))
+        elif self._jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(self._jobs, len(tasks))) as pool:
+                contents = _timed(paths, pool.map(_call, renders, chunksize=self._chunksize(tasks)))
+        else:
+            contents = _timed(paths, map(_call, renders))
+
+        result = GeneratorResult()
+        for index, ((path, _), content) in enumerate(zip(tasks, contents, strict=True)):
+            result.add_file(path, content, owners[index : index + 1])
+        return result
+
+    def _chunksize(self, tasks: Sequence[RenderTask]) -> int:
+        # A few chunks per worker keeps IPC overhead low while still balancing load.
+        return max(1, len(tasks) // (self._jobs * 4))
+
+
+def _call(render: Callable[[], str]) -> str:
+    return render()
+
+
+def _timed(paths: list[str], contents: Iterator[str]) -> list[str]:
+    # Results are produced lazily (serially) or arrive in order (parallel map).
+    collected: list[str] = []
+    for path in paths:
+        with profiling.stage(f"render:{path}"):
+            collected.append(next(contents))
+    return collected
@@ -0,0 +1,30 @@
+"""Generator for a single metadata manifest consumed by the generic runtime loaders."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from dmjedi.generators.base import BaseGenerator, GeneratorResult
+from dmjedi.model.core import DataVaultModel
+from dmjedi.runtime.manifest import dump_manifest
+
+
+class ManifestGenerator(BaseGenerator):
+    """Emit ``manifest.json`` instead of per-entity code.
+
+    Tables are built at run time by ``dmjedi.runtime.sql`` or ``dmjedi.runtime.spark``, so
+    generation cost and output size no longer grow with one rendered file per entity.
+    """
+
+    def __init__(self, hash_algo: str = "sha256", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._hash_algo = hash_algo
+
+    @property
+    def name(self) -> str:
+        return "manifest"
+
+    def generate(self, model: DataVaultModel) -> GeneratorResult:
+        result = GeneratorResult()
+        result.add_file("manifest.json", dump_manifest(model, self._hash_algo))
+        return result
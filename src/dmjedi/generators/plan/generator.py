@@ -0,0 +1,32 @@
+"""Generator for a dependency-wave load plan consumed by ``dmjedi.runtime.plan``."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from dmjedi.generators.base import BaseGenerator, GeneratorResult
+from dmjedi.model.core import DataVaultModel
+from dmjedi.runtime.plan import build_plan, dump_plan
+
+
+class PlanGenerator(BaseGenerator):
+    """Emit ``plan.json``: every load statement grouped into parallel-safe waves.
+
+    The first wave creates tables and staging views; later waves follow the model's
+    dependency graph (hubs, then links and satellites, then effectivity satellites, PITs
+    and bridges). Execute it with ``dmjedi.runtime.plan.run_plan``.
+    """
+
+    def __init__(self, dialect: str = "default", hash_algo: str = "sha256", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._dialect = dialect
+        self._hash_algo = hash_algo
+
+    @property
+    def name(self) -> str:
+        return "plan"
+
+    def generate(self, model: DataVaultModel) -> GeneratorResult:
+        result = GeneratorResult()
+        result.add_file("plan.json", dump_plan(build_plan(model, self._dialect, self._hash_algo)))
+        return result
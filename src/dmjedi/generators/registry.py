@@ -39,9 +39,13 @@ def available() -> list[str]:
 
 def _auto_register() -> None:
     """Register built-in generators."""
+    from dmjedi.generators.manifest.generator import ManifestGenerator
+    from dmjedi.generators.plan.generator import PlanGenerator
     from dmjedi.generators.spark_declarative.generator import SparkDeclarativeGenerator
     from dmjedi.generators.sql_jinja.generator import SqlJinjaGenerator
 
+    register(ManifestGenerator)
+    register(PlanGenerator)
     register(SparkDeclarativeGenerator)
     register(SqlJinjaGenerator)
 
@@ -1,10 +1,19 @@
 """Generator for Databricks Spark Declarative Pipelines (DLT)."""
 
+import json
+from functools import partial
 from typing import Any
 
-from dmjedi.generators.base import BaseGenerator, GeneratorResult
+from dmjedi.generators.base import BaseGenerator, GeneratorResult, RenderTask
+from dmjedi.generators.spark_declarative.packaging import (
+    PACKAGING_MODES,
+    TableSpec,
+    group_key,
+    render_pipeline_module,
+)
 from dmjedi.model.core import (
     Bridge,
+    Column,
     DataVaultModel,
     EffSat,
     Hub,
@@ -27,69 +36,219 @@ _IMPORTS_VIEW = (
 
 
 class SparkDeclarativeGenerator(BaseGenerator):
-    def __init__(self, mode: str = "batch", **kwargs: Any) -> None:
+    def __init__(
+        self,
+        mode: str = "batch",
+        quarantine: bool = False,
+        packaging: str = "entity",
+        **kwargs: Any,
+    ) -> None:
+        if packaging not in PACKAGING_MODES:
+            msg = f"Unknown packaging '{packaging}'. Choose from: {', '.join(PACKAGING_MODES)}"
+            raise ValueError(msg)
+        super().__init__(**kwargs)
         self._mode = mode
+        self._quarantine = quarantine
+        self._packaging = packaging
 
     @property
     def name(self) -> str:
         return "spark-declarative"
 
     def generate(self, model: DataVaultModel) -> GeneratorResult:
-        result = GeneratorResult()
+        if self._packaging != "entity":
+            return self._generate_consolidated(model)
+        tasks: list[RenderTask] = []
+        owners: list[str] = []
         for hub in model.hubs.values():
-            result.add_file(f"hubs/{hub.name}.py", self._generate_hub(hub))
+            tasks.append((f"hubs/{hub.name}.py", partial(self._generate_hub, hub)))
+            owners.append(hub.qualified_name)
         for sat in model.satellites.values():
-            result.add_file(f"satellites/{sat.name}.py", self._generate_satellite(sat))
+            tasks.append((f"satellites/{sat.name}.py", partial(self._generate_satellite, sat)))
+            owners.append(sat.qualified_name)
         for link in model.links.values():
-            result.add_file(f"links/{link.name}.py", self._generate_link(link))
+            tasks.append((f"links/{link.name}.py", partial(self._generate_link, link)))
+            owners.append(link.qualified_name)
         for nhsat in model.nhsats.values():
-            result.add_file(
-                f"satellites/nhsat_{nhsat.name}.py", self._generate_nhsat(nhsat)
+            tasks.append(
+                (f"satellites/nhsat_{nhsat.name}.py", partial(self._generate_nhsat, nhsat))
             )
+            owners.append(nhsat.qualified_name)
         for nhlink in model.nhlinks.values():
-            result.add_file(
-                f"links/nhlink_{nhlink.name}.py", self._generate_nhlink(nhlink)
+            tasks.append(
+                (f"links/nhlink_{nhlink.name}.py", partial(self._generate_nhlink, nhlink))
             )
+            owners.append(nhlink.qualified_name)
         for bridge in model.bridges.values():
-            result.add_file(
-                f"views/bridge_{bridge.name}.py", self._generate_bridge(bridge)
+            tasks.append(
+                (f"views/bridge_{bridge.name}.py", partial(self._generate_bridge, bridge))
             )
+            owners.append(bridge.qualified_name)
         for pit in model.pits.values():
-            result.add_file(
-                f"views/pit_{pit.name}.py", self._generate_pit(pit)
-            )
+            tasks.append((f"views/pit_{pit.name}.py", partial(self._generate_pit, pit)))
+            owners.append(pit.qualified_name)
         for effsat in model.effsats.values():
-            result.add_file(
-                f"satellites/effsat_{effsat.name}.py", self._generate_effsat(effsat)
+            tasks.append(
+                (f"satellites/effsat_{effsat.name}.py", partial(self._generate_effsat, effsat))
             )
+            owners.append(effsat.qualified_name)
         for samlink in model.samlinks.values():
+            tasks.append(
+                (f"links/samlink_{samlink.name}.py", partial(self._generate_samlink, samlink))
+            )
+            owners.append(samlink.qualified_name)
+        return self.render_files(tasks, owners)
+
+    def _generate_consolidated(self, model: DataVaultModel) -> GeneratorResult:
+        """Emit one pipeline module per namespace or layer driven by a table factory."""
+        specs = [
+            *(self._hub_spec(hub) for hub in model.hubs.values()),
+            *(self._link_spec(link) for link in model.links.values()),
+            *(self._satellite_spec(sat) for sat in model.satellites.values()),
+            *(
+                _cdc_spec(nhsat, "nhsat", "NhSat", "satellites", f"{nhsat.parent_ref}_hk")
+                for nhsat in model.nhsats.values()
+            ),
+            *(
+                _cdc_spec(nhlink, "nhlink", "NhLink", "links", f"{nhlink.name}_hk")
+                for nhlink in model.nhlinks.values()
+            ),
+            *(
+                _cdc_spec(effsat, "effsat", "EffSat", "satellites", f"{effsat.parent_ref}_hk")
+                for effsat in model.effsats.values()
+            ),
+            *(
+                _cdc_spec(samlink, "samlink", "SamLink", "links", f"{samlink.name}_hk")
+                for samlink in model.samlinks.values()
+            ),
+            *(self._bridge_spec(bridge) for bridge in model.bridges.values() if bridge.path),
+            *(_pit_spec(pit) for pit in model.pits.values()),
+        ]
+        # Qualified entity name of each spec, in the same order.
+        owners = [
+            entity.qualified_name
+            for attr in ("hubs", "links", "satellites", "nhsats", "nhlinks", "effsats", "samlinks")
+            for entity in getattr(model, attr).values()
+        ]
+        owners += [bridge.qualified_name for bridge in model.bridges.values() if bridge.path]
+        owners += [pit.qualified_name for pit in model.pits.values()]
+        groups: dict[str, list[TableSpec]] = {}
+        members: dict[str, list[str]] = {}
+        for spec, owner in zip(specs, owners, strict=True):
+            key = group_key(spec, self._packaging)
+            groups.setdefault(key, []).append(spec)
+            members.setdefault(key, []).append(owner)
+
+        result = GeneratorResult()
+        for key in sorted(groups):
             result.add_file(
-                f"links/samlink_{samlink.name}.py", self._generate_samlink(samlink)
+                f"pipelines/{key}.py",
+                render_pipeline_module(groups[key], self._mode, self._quarantine),
+                members[key],
             )
         return result
 
+    def _hub_spec(self, hub: Hub) -> TableSpec:
+        bk_names = [bk.name for bk in hub.business_keys]
+        return TableSpec(
+            kind="hub",
+            namespace=hub.namespace,
+            layer="hubs",
+            values={
+                "name": f"hub_{hub.name}",
+                "comment": f"Hub: {hub.name}",
+                "source": f"src_{hub.name}",
+                "hash_key": f"{hub.name}_hk",
+                "business_keys": bk_names,
+                "rules": dict([*_not_null_rules(bk_names), *_column_rules(hub.columns)]),
+            },
+            code_values={"columns": _typed_columns(hub.columns)},
+        )
+
+    def _link_spec(self, link: Link) -> TableSpec:
+        ref_hk_names = [f"{ref}_hk" for ref in link.hub_references]
+        return TableSpec(
+            kind="link",
+            namespace=link.namespace,
+            layer="links",
+            values={
+                "name": f"link_{link.name}",
+                "comment": f"Link: {link.name}",
+                "source": f"src_{link.name}",
+                "hash_key": f"{link.name}_hk",
+                "hub_keys": ref_hk_names,
+                "rules": dict(
+                    [
+                        *_not_null_rules([f"{link.name}_hk", *ref_hk_names]),
+                        *_column_rules(link.columns),
+                    ]
+                ),
+            },
+            code_values={"columns": _typed_columns(link.columns)},
+        )
+
+    def _satellite_spec(self, sat: Satellite) -> TableSpec:
+        return TableSpec(
+            kind="satellite",
+            namespace=sat.namespace,
+            layer="satellites",
+            values={
+                "name": f"sat_{sat.name}",
+                "comment": f"Satellite: {sat.name} (parent: {sat.parent_ref})",
+                "source": f"src_{sat.name}",
+                "parent_hk": f"{sat.parent_ref}_hk",
+                "rules": dict(
+                    [
+                        *_not_null_rules([f"{sat.parent_ref}_hk"]),
+                        *_column_rules(sat.columns),
+                    ]
+                ),
+            },
+            code_values={"columns": _typed_columns(sat.columns)},
+        )
+
+    def _bridge_spec(self, bridge: Bridge) -> TableSpec:
+        return TableSpec(
+            kind="bridge",
+            namespace=bridge.namespace,
+            layer="views",
+            values={
+                "name": f"bridge_{bridge.name}",
+                "comment": f"Bridge: {bridge.name}",
+                "path": [self._table_ref(ref) for ref in bridge.path],
+            },
+        )
+
     def _generate_hub(self, hub: Hub) -> str:
         table_name = f"hub_{hub.name}"
         bk_names = [bk.name for bk in hub.business_keys]
         bk_concat = ", ".join(f'F.col("{bk}")' for bk in bk_names)
         bk_selects = "".join(f'        F.col("{bk}"),\n' for bk in bk_names)
+        col_selects = "".join(
+            f'        F.col("{c.name}").cast({map_pyspark_type(c.data_type)}),\n'
+            for c in hub.columns
+        )
         bk_doc = ", ".join(bk_names)
+        # sha2(concat_ws(...)) never yields NULL, so the hash key itself needs no expectation.
+        rules = [
+            *_not_null_rules(bk_names),
+            *_column_rules(hub.columns),
+        ]
 
-        return (
-            f"{_IMPORTS}\n\n"
-            f"@dlt.table(\n"
-            f'    name="{table_name}",\n'
-            f'    comment="Hub: {hub.name}"\n'
-            f")\n"
-            f"def {table_name}():\n"
-            f'    """Hub entity with business keys: {bk_doc}."""\n'
-            f'    df = {self._source_read(f"src_{hub.name}")}\n'
-            f"    return df.select(\n"
-            f'        F.sha2(F.concat_ws("||", {bk_concat}), 256).alias("{hub.name}_hk"),\n'
-            f'        F.current_timestamp().alias("load_ts"),\n'
-            f'        F.lit("dmjedi").alias("record_source"),\n'
-            f"{bk_selects}"
-            f"    ).distinct()\n"
+        return self._render_table(
+            table_name=table_name,
+            comment=f"Hub: {hub.name}",
+            doc=f"Hub entity with business keys: {bk_doc}.",
+            source_name=f"src_{hub.name}",
+            select_lines=(
+                f'        F.sha2(F.concat_ws("||", {bk_concat}), 256).alias("{hub.name}_hk"),\n'
+                f'        F.current_timestamp().alias("load_ts"),\n'
+                f'        F.lit("dmjedi").alias("record_source"),\n'
+                f"{bk_selects}"
+                f"{col_selects}"
+            ),
+            rules=rules,
+            distinct=True,
         )
 
     def _generate_satellite(self, sat: Satellite) -> str:
@@ -111,23 +270,24 @@ class SparkDeclarativeGenerator(BaseGenerator):
             hash_diff_line = (
                 '        F.sha2(F.lit(""), 256).alias("hash_diff"),\n'
             )
+        rules = [
+            *_not_null_rules([f"{sat.parent_ref}_hk"]),
+            *_column_rules(sat.columns),
+        ]
 
-        return (
-            f"{_IMPORTS}\n\n"
-            f"@dlt.table(\n"
-            f'    name="{table_name}",\n'
-            f'    comment="Satellite: {sat.name} (parent: {sat.parent_ref})"\n'
-            f")\n"
-            f"def {table_name}():\n"
-            f'    """Satellite entity attached to {sat.parent_ref}."""\n'
-            f'    df = {self._source_read(f"src_{sat.name}")}\n'
-            f"    return df.select(\n"
-            f'        F.col("{sat.parent_ref}_hk"),\n'
-            f'        F.current_timestamp().alias("load_ts"),\n'
-            f'        F.lit("dmjedi").alias("record_source"),\n'
-            f"{hash_diff_line}"
-            f"{col_selects}"
-            f"    )\n"
+        return self._render_table(
+            table_name=table_name,
+            comment=f"Satellite: {sat.name} (parent: {sat.parent_ref})",
+            doc=f"Satellite entity attached to {sat.parent_ref}.",
+            source_name=f"src_{sat.name}",
+            select_lines=(
+                f'        F.col("{sat.parent_ref}_hk"),\n'
+                f'        F.current_timestamp().alias("load_ts"),\n'
+                f'        F.lit("dmjedi").alias("record_source"),\n'
+                f"{hash_diff_line}"
+                f"{col_selects}"
+            ),
+            rules=rules,
         )
 
     def _generate_link(self, link: Link) -> str:
@@ -140,24 +300,121 @@ class SparkDeclarativeGenerator(BaseGenerator):
             for c in link.columns
         )
         refs_doc = ", ".join(link.hub_references)
+        rules = [
+            *_not_null_rules([f"{link.name}_hk", *ref_hk_names]),
+            *_column_rules(link.columns),
+        ]
+
+        return self._render_table(
+            table_name=table_name,
+            comment=f"Link: {link.name}",
+            doc=f"Link entity referencing: {refs_doc}.",
+            source_name=f"src_{link.name}",
+            select_lines=(
+                f'        F.sha2(F.concat_ws("||", {ref_concat}), 256)'
+                f'.alias("{link.name}_hk"),\n'
+                f'        F.current_timestamp().alias("load_ts"),\n'
+                f'        F.lit("dmjedi").alias("record_source"),\n'
+                f"{ref_selects}"
+                f"{col_selects}"
+            ),
+            rules=rules,
+        )
 
+    def _render_table(
+        self,
+        *,
+        table_name: str,
+        comment: str,
+        doc: str,
+        source_name: str,
+        select_lines: str,
+        rules: list[tuple[str, str]],
+        distinct: bool = False,
+    ) -> str:
+        """Render a source-backed DLT table, dropping or quarantining rows that fail rules."""
+        suffix = ".distinct()" if distinct else ""
+        if self._quarantine and rules:
+            return self._render_quarantined_table(
+                table_name=table_name,
+                comment=comment,
+                doc=doc,
+                source_name=source_name,
+                select_lines=select_lines,
+                rules=rules,
+                suffix=suffix,
+            )
+
+        expectations = "".join(
+            f'@dlt.expect_or_drop("{rule}", {_string_literal(expr)})\n' for rule, expr in rules
+        )
         return (
             f"{_IMPORTS}\n\n"
             f"@dlt.table(\n"
             f'    name="{table_name}",\n'
-            f'    comment="Link: {link.name}"\n'
+            f'    comment="{comment}"\n'
             f")\n"
+            f"{expectations}"
             f"def {table_name}():\n"
-            f'    """Link entity referencing: {refs_doc}."""\n'
-            f'    df = {self._source_read(f"src_{link.name}")}\n'
+            f'    """{doc}"""\n'
+            f"    df = {self._source_read(source_name)}\n"
             f"    return df.select(\n"
-            f'        F.sha2(F.concat_ws("||", {ref_concat}), 256)'
-            f'.alias("{link.name}_hk"),\n'
-            f'        F.current_timestamp().alias("load_ts"),\n'
-            f'        F.lit("dmjedi").alias("record_source"),\n'
-            f"{ref_selects}"
-            f"{col_selects}"
+            f"{select_lines}"
+            f"    ){suffix}\n"
+        )
+
+    def _render_quarantined_table(
+        self,
+        *,
+        table_name: str,
+        comment: str,
+        doc: str,
+        source_name: str,
+        select_lines: str,
+        rules: list[tuple[str, str]],
+        suffix: str,
+    ) -> str:
+        """Render the quarantine pattern: one tagged table read once, split by partition.
+
+        Rows are tagged with ``is_quarantined`` in a single pass over the source and the
+        quarantine table is partitioned on that flag, so the valid table only reads the
+        clean partition instead of scanning the source a second time. Rules that evaluate
+        to NULL pass, matching SQL ``CHECK`` semantics.
+        """
+        quarantine_name = f"{table_name}_quarantine"
+        rule_lines = "".join(f'    "{rule}": {_string_literal(expr)},\n' for rule, expr in rules)
+        passing = " AND ".join(f"({expr})" for _, expr in rules)
+        quarantine_expr = _string_literal(f"NOT ({passing})")
+        return (
+            f"{_IMPORTS}\n"
+            f"_RULES = {{\n"
+            f"{rule_lines}"
+            f"}}\n\n\n"
+            f"@dlt.table(\n"
+            f'    name="{quarantine_name}",\n'
+            f'    comment="Quarantine: {comment}",\n'
+            f'    partition_cols=["is_quarantined"]\n'
+            f")\n"
+            f"@dlt.expect_all(_RULES)\n"
+            f"def {quarantine_name}():\n"
+            f'    """Rows for {table_name} tagged with is_quarantined when a rule fails."""\n'
+            f"    df = {self._source_read(source_name)}\n"
+            f"    df = df.select(\n"
+            f"{select_lines}"
             f"    )\n"
+            f"    return df.withColumn(\n"
+            f'        "is_quarantined",\n'
+            f"        F.coalesce(F.expr({quarantine_expr}), F.lit(False)),\n"
+            f"    )\n"
+            f"\n\n"
+            f"@dlt.table(\n"
+            f'    name="{table_name}",\n'
+            f'    comment="{comment}"\n'
+            f")\n"
+            f"def {table_name}():\n"
+            f'    """{doc}"""\n'
+            f"    df = {self._source_read(quarantine_name)}\n"
+            f'    return df.filter(~F.col("is_quarantined")).drop("is_quarantined"){suffix}\n'
         )
 
     def _generate_nhsat(self, nhsat: NhSat) -> str:
@@ -322,3 +579,64 @@ class SparkDeclarativeGenerator(BaseGenerator):
             f"{sat_lines}"
             f"    return df\n"
         )
+
+
+def _cdc_spec(
+    entity: NhSat | NhLink | EffSat | SamLink, prefix: str, label: str, layer: str, key: str
+) -> TableSpec:
+    """Build metadata for an ``apply_changes`` current-state table."""
+    parent = getattr(entity, "parent_ref", None)
+    detail = f" (parent: {parent})" if parent else ""
+    return TableSpec(
+        kind="cdc",
+        namespace=entity.namespace,
+        layer=layer,
+        values={
+            "name": f"{prefix}_{entity.name}",
+            "comment": f"{label}: {entity.name}{detail} — current-state",
+            "source": f"src_{entity.name}",
+            "keys": [key],
+        },
+    )
+
+
+def _pit_spec(pit: Pit) -> TableSpec:
+    return TableSpec(
+        kind="pit",
+        namespace=pit.namespace,
+        layer="views",
+        values={
+            "name": f"pit_{pit.name}",
+            "comment": f"PIT: {pit.name} (anchor: {pit.anchor_ref})",
+            "anchor": pit.anchor_ref,
+            "satellites": pit.tracked_satellites,
+        },
+    )
+
+
+def _typed_columns(columns: list[Column]) -> str:
+    """Render ``(name, PySpark type)`` pairs as a Python list expression."""
+    pairs = ", ".join(f'("{c.name}", {map_pyspark_type(c.data_type)})' for c in columns)
+    return f"[{pairs}]"
+
+
+def _string_literal(value: str) -> str:
+    """Quote a user-written expression as a Python string literal for generated code."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _not_null_rules(columns: list[str]) -> list[tuple[str, str]]:
+    """Build ``expect_or_drop`` rules rejecting NULLs in key columns."""
+    return [(f"valid_{column}", f"{column} IS NOT NULL") for column in columns]
+
+
+def _column_rules(columns: list[Column]) -> list[tuple[str, str]]:
+    """Build rules from user-declared ``not null`` and ``check`` column constraints."""
+    rules: list[tuple[str, str]] = []
+    for column in columns:
+        if not column.nullable:
+            rules.extend(_not_null_rules([column.name]))
+        for index, expr in enumerate(column.checks, start=1):
+            suffix = f"_{index}" if len(column.checks) > 1 else ""
+            rules.append((f"check_{column.name}{suffix}", expr))
+    return rules
@@ -0,0 +1,244 @@
+"""Consolidated DLT pipeline modules built from entity metadata and a table factory.
+
+Per-entity packaging emits one Python file per table, each repeating the same imports and
+table boilerplate. Consolidated packaging instead emits one module per namespace or per
+layer: entity metadata is rendered as plain lists of dicts, and a small factory loops over
+them to register every table with DLT. Import and graph-initialization cost is then paid
+once per module rather than once per entity.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+
+PACKAGING_MODES = ("entity", "namespace", "layer")
+
+# Entity kind -> metadata list name in consolidated modules.
+_SPEC_LISTS: dict[str, str] = {
+    "hub": "HUBS",
+    "satellite": "SATELLITES",
+    "link": "LINKS",
+    "cdc": "CDC_TABLES",
+    "bridge": "BRIDGES",
+    "pit": "PITS",
+}
+
+_SPEC_ORDER = ("HUBS", "LINKS", "SATELLITES", "CDC_TABLES", "BRIDGES", "PITS")
+
+_IMPORTS = (
+    "import dlt\n"
+    "from pyspark.sql import functions as F\n"
+    "from pyspark.sql.types import *\n"
+)
+
+_SOURCE_TABLE = '''
+
+def _source_table(spec, select, distinct=False):
+    @dlt.table(name=spec["name"], comment=spec["comment"])
+    @dlt.expect_all_or_drop(spec["rules"])
+    def _table():
+        df = select(_read(spec["source"]))
+        return df.distinct() if distinct else df
+'''
+
+_SOURCE_TABLE_QUARANTINE = '''
+
+def _source_table(spec, select, distinct=False):
+    quarantine_name = f"{spec['name']}_quarantine"
+    quarantine_rule = "NOT ({})".format(" AND ".join(f"({r})" for r in spec["rules"].values()))
+
+    @dlt.table(
+        name=quarantine_name,
+        comment=f"Quarantine: {spec['comment']}",
+        partition_cols=["is_quarantined"],
+    )
+    @dlt.expect_all(spec["rules"])
+    def _quarantine():
+        df = select(_read(spec["source"]))
+        return df.withColumn(
+            "is_quarantined",
+            F.coalesce(F.expr(quarantine_rule), F.lit(False)),
+        )
+
+    @dlt.table(name=spec["name"], comment=spec["comment"])
+    def _table():
+        df = _read(quarantine_name)
+        df = df.filter(~F.col("is_quarantined")).drop("is_quarantined")
+        return df.distinct() if distinct else df
+'''
+
+_FACTORIES: dict[str, str] = {
+    "HUBS": '''
+
+def _hub_table(spec):
+    def _select(df):
+        keys = [F.col(bk) for bk in spec["business_keys"]]
+        return df.select(
+            F.sha2(F.concat_ws("||", *keys), 256).alias(spec["hash_key"]),
+            F.current_timestamp().alias("load_ts"),
+            F.lit("dmjedi").alias("record_source"),
+            *keys,
+            *[F.col(name).cast(data_type) for name, data_type in spec["columns"]],
+        )
+
+    _source_table(spec, _select, distinct=True)
+''',
+    "LINKS": '''
+
+def _link_table(spec):
+    def _select(df):
+        hub_keys = [F.col(hk) for hk in spec["hub_keys"]]
+        return df.select(
+            F.sha2(F.concat_ws("||", *hub_keys), 256).alias(spec["hash_key"]),
+            F.current_timestamp().alias("load_ts"),
+            F.lit("dmjedi").alias("record_source"),
+            *hub_keys,
+            *[F.col(name).cast(data_type) for name, data_type in spec["columns"]],
+        )
+
+    _source_table(spec, _select)
+''',
+    "SATELLITES": '''
+
+def _satellite_table(spec):
+    def _select(df):
+        columns = [F.col(name) for name, _ in spec["columns"]]
+        hash_input = F.concat_ws("||", *columns) if columns else F.lit("")
+        return df.select(
+            F.col(spec["parent_hk"]),
+            F.current_timestamp().alias("load_ts"),
+            F.lit("dmjedi").alias("record_source"),
+            F.sha2(hash_input, 256).alias("hash_diff"),
+            *[F.col(name).cast(data_type) for name, data_type in spec["columns"]],
+        )
+
+    _source_table(spec, _select)
+''',
+    "CDC_TABLES": '''
+
+def _cdc_table(spec):
+    @dlt.table(name=spec["name"], comment=spec["comment"])
+    def _target():
+        pass
+
+    dlt.apply_changes(
+        target=spec["name"],
+        source=spec["source"],
+        keys=spec["keys"],
+        sequence_by=F.col("load_ts"),
+        stored_as_scd_type=1,
+    )
+''',
+    "BRIDGES": '''
+
+def _bridge_view(spec):
+    @dlt.view(name=spec["name"], comment=spec["comment"])
+    def _view():
+        path = spec["path"]
+        df = dlt.read(path[0])
+        for i in range(1, len(path), 2):
+            prev_hub, link_name, next_hub = path[i - 1], path[i], path[i + 1]
+            link_df = dlt.read(link_name)
+            hub_df = dlt.read(next_hub)
+            df = df.join(link_df, df[f"{prev_hub}_hk"] == link_df[f"{prev_hub}_hk"])
+            df = df.join(hub_df, link_df[f"{next_hub}_hk"] == hub_df[f"{next_hub}_hk"])
+        return df
+''',
+    "PITS": '''
+
+def _pit_view(spec):
+    @dlt.view(name=spec["name"], comment=spec["comment"])
+    def _view():
+        anchor_hk = f"{spec['anchor']}_hk"
+        df = dlt.read(spec["anchor"])
+        for sat_ref in spec["satellites"]:
+            w = Window.partitionBy(anchor_hk).orderBy(F.col("load_ts").desc())
+            sat_latest = (
+                dlt.read(sat_ref)
+                .withColumn("_rn", F.row_number().over(w))
+                .filter(F.col("_rn") == 1)
+                .drop("_rn")
+            )
+            df = df.join(sat_latest, anchor_hk, "left")
+        return df
+''',
+}
+
+_FACTORY_CALLS: dict[str, str] = {
+    "HUBS": "_hub_table",
+    "LINKS": "_link_table",
+    "SATELLITES": "_satellite_table",
+    "CDC_TABLES": "_cdc_table",
+    "BRIDGES": "_bridge_view",
+    "PITS": "_pit_view",
+}
+
+_SOURCE_BACKED = {"HUBS", "LINKS", "SATELLITES"}
+
+
+@dataclass
+class TableSpec:
+    """Metadata for one DLT table or view in a consolidated pipeline module.
+
+    ``layer`` matches the per-entity output directory (``hubs``, ``links``, ``satellites``,
+    ``views``). ``values`` are rendered as Python literals; ``code_values`` are rendered
+    verbatim and hold pre-formatted expressions such as ``[("email", StringType())]``.
+    """
+
+    kind: str
+    namespace: str
+    layer: str
+    values: dict[str, object]
+    code_values: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def spec_list(self) -> str:
+        return _SPEC_LISTS[self.kind]
+
+
+def group_key(spec: TableSpec, packaging: str) -> str:
+    """Return the module name a table spec belongs to for the given packaging mode."""
+    if packaging == "layer":
+        return spec.layer
+    return spec.namespace or "default"
+
+
+def render_pipeline_module(specs: list[TableSpec], mode: str, quarantine: bool) -> str:
+    """Render one consolidated DLT module containing metadata lists and their factories."""
+    by_list: dict[str, list[TableSpec]] = {}
+    for spec in specs:
+        by_list.setdefault(spec.spec_list, []).append(spec)
+    present = [name for name in _SPEC_ORDER if name in by_list]
+
+    read_fn = "dlt.read_stream" if mode == "streaming" else "dlt.read"
+    parts = [_IMPORTS]
+    if "PITS" in by_list:
+        parts.append("from pyspark.sql.window import Window\n")
+    if _SOURCE_BACKED.intersection(present):
+        parts.append(f"\n_read = {read_fn}\n")
+
+    for name in present:
+        parts.append(f"\n{name} = [\n")
+        parts.extend(_render_spec(spec) for spec in by_list[name])
+        parts.append("]\n")
+
+    if _SOURCE_BACKED.intersection(present):
+        parts.append(_SOURCE_TABLE_QUARANTINE if quarantine else _SOURCE_TABLE)
+    for name in present:
+        parts.append(_FACTORIES[name])
+
+    parts.append("\n")
+    for name in present:
+        parts.append(f"\nfor spec in {name}:\n    {_FACTORY_CALLS[name]}(spec)\n")
+    return "".join(parts)
+
+
+def _render_spec(spec: TableSpec) -> str:
+    lines = ["    {\n"]
+    for key, value in spec.values.items():
+        lines.append(f"        {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+    for key, code in spec.code_values.items():
+        lines.append(f"        {json.dumps(key)}: {code},\n")
+    lines.append("    },\n")
+    return "".join(lines)
@@ -2,22 +2,75 @@
 
 from __future__ import annotations
 
+from functools import cache, partial
 from pathlib import Path
+from typing import Any
 
 from jinja2 import Environment, FileSystemLoader
 
-from dmjedi.generators.base import BaseGenerator, GeneratorResult
+from dmjedi.generators.base import BaseGenerator, GeneratorResult, RenderTask
 from dmjedi.generators.sql_jinja.hash import build_hash_expr
 from dmjedi.generators.sql_jinja.types import map_type
 from dmjedi.model.core import DataVaultModel
 
 _TEMPLATES_DIR = Path(__file__).parent / "templates"
 
+# Model attribute -> (template context name, [(template, output path format), ...]).
+# Order matches the historical output order: entity kinds in turn, DDL before staging.
+_ENTITY_TEMPLATES: dict[str, tuple[str, tuple[tuple[str, str], ...]]] = {
+    "hubs": (
+        "hub",
+        (("hub.sql.j2", "hubs/{}.sql"), ("staging_hub.sql.j2", "staging/hubs/{}.sql")),
+    ),
+    "satellites": (
+        "sat",
+        (
+            ("satellite.sql.j2", "satellites/{}.sql"),
+            ("staging_satellite.sql.j2", "staging/satellites/{}.sql"),
+        ),
+    ),
+    "links": (
+        "link",
+        (("link.sql.j2", "links/{}.sql"), ("staging_link.sql.j2", "staging/links/{}.sql")),
+    ),
+    "nhsats": (
+        "nhsat",
+        (
+            ("nhsat.sql.j2", "satellites/nhsat_{}.sql"),
+            ("staging_nhsat.sql.j2", "staging/satellites/nhsat_{}.sql"),
+        ),
+    ),
+    "nhlinks": (
+        "nhlink",
+        (
+            ("nhlink.sql.j2", "links/nhlink_{}.sql"),
+            ("staging_nhlink.sql.j2", "staging/links/nhlink_{}.sql"),
+        ),
+    ),
+    "bridges": ("bridge", (("bridge.sql.j2", "views/bridge_{}.sql"),)),
+    "pits": ("pit", (("pit.sql.j2", "views/pit_{}.sql"),)),
+    "effsats": (
+        "effsat",
+        (
+            ("effsat.sql.j2", "satellites/effsat_{}.sql"),
+            ("staging_effsat.sql.j2", "staging/satellites/effsat_{}.sql"),
+        ),
+    ),
+    "samlinks": (
+        "samlink",
+        (
+            ("samlink.sql.j2", "links/samlink_{}.sql"),
+            ("staging_samlink.sql.j2", "staging/links/samlink_{}.sql"),
+        ),
+    ),
+}
+
 
 class SqlJinjaGenerator(BaseGenerator):
     def __init__(
-        self, dialect: str = "default", hash_algo: str = "sha256", **kwargs: object
+        self, dialect: str = "default", hash_algo: str = "sha256", **kwargs: Any
     ) -> None:
+        super().__init__(**kwargs)
         self._dialect = dialect
         self._hash_algo = hash_algo
 
@@ -26,91 +79,38 @@ class SqlJinjaGenerator(BaseGenerator):
         return "sql-jinja"
 
     def generate(self, model: DataVaultModel) -> GeneratorResult:
-        env = Environment(
-            loader=FileSystemLoader(str(_TEMPLATES_DIR)),
-            keep_trailing_newline=True,
-            autoescape=False,
-        )
-        env.globals["map_type"] = lambda t: map_type(t, self._dialect)
-        env.filters["q"] = lambda name: f'"{name}"'
-        env.globals["hash_expr"] = lambda cols: build_hash_expr(
-            cols, self._dialect, self._hash_algo
-        )
-        env.globals["dialect"] = self._dialect
-        result = GeneratorResult()
-
-        hub_tpl = env.get_template("hub.sql.j2")
-        staging_hub_tpl = env.get_template("staging_hub.sql.j2")
-        for hub in model.hubs.values():
-            result.add_file(f"hubs/{hub.name}.sql", hub_tpl.render(hub=hub))
-            result.add_file(f"staging/hubs/{hub.name}.sql", staging_hub_tpl.render(hub=hub))
-
-        sat_tpl = env.get_template("satellite.sql.j2")
-        staging_sat_tpl = env.get_template("staging_satellite.sql.j2")
-        for sat in model.satellites.values():
-            result.add_file(f"satellites/{sat.name}.sql", sat_tpl.render(sat=sat))
-            result.add_file(f"staging/satellites/{sat.name}.sql", staging_sat_tpl.render(sat=sat))
-
-        link_tpl = env.get_template("link.sql.j2")
-        staging_link_tpl = env.get_template("staging_link.sql.j2")
-        for link in model.links.values():
-            result.add_file(f"links/{link.name}.sql", link_tpl.render(link=link))
-            result.add_file(f"staging/links/{link.name}.sql", staging_link_tpl.render(link=link))
-
-        nhsat_tpl = env.get_template("nhsat.sql.j2")
-        staging_nhsat_tpl = env.get_template("staging_nhsat.sql.j2")
-        for nhsat in model.nhsats.values():
-            result.add_file(
-                f"satellites/nhsat_{nhsat.name}.sql", nhsat_tpl.render(nhsat=nhsat)
-            )
-            result.add_file(
-                f"staging/satellites/nhsat_{nhsat.name}.sql",
-                staging_nhsat_tpl.render(nhsat=nhsat),
-            )
-
-        nhlink_tpl = env.get_template("nhlink.sql.j2")
-        staging_nhlink_tpl = env.get_template("staging_nhlink.sql.j2")
-        for nhlink in model.nhlinks.values():
-            result.add_file(
-                f"links/nhlink_{nhlink.name}.sql", nhlink_tpl.render(nhlink=nhlink)
-            )
-            result.add_file(
-                f"staging/links/nhlink_{nhlink.name}.sql",
-                staging_nhlink_tpl.render(nhlink=nhlink),
-            )
-
-        bridge_tpl = env.get_template("bridge.sql.j2")
-        for bridge in model.bridges.values():
-            result.add_file(
-                f"views/bridge_{bridge.name}.sql", bridge_tpl.render(bridge=bridge)
-            )
-
-        pit_tpl = env.get_template("pit.sql.j2")
-        for pit in model.pits.values():
-            result.add_file(
-                f"views/pit_{pit.name}.sql", pit_tpl.render(pit=pit)
-            )
-
-        effsat_tpl = env.get_template("effsat.sql.j2")
-        staging_effsat_tpl = env.get_template("staging_effsat.sql.j2")
-        for effsat in model.effsats.values():
-            result.add_file(
-                f"satellites/effsat_{effsat.name}.sql", effsat_tpl.render(effsat=effsat)
-            )
-            result.add_file(
-                f"staging/satellites/effsat_{effsat.name}.sql",
-                staging_effsat_tpl.render(effsat=effsat),
-            )
-
-        samlink_tpl = env.get_template("samlink.sql.j2")
-        staging_samlink_tpl = env.get_template("staging_samlink.sql.j2")
-        for samlink in model.samlinks.values():
-            result.add_file(
-                f"links/samlink_{samlink.name}.sql", samlink_tpl.render(samlink=samlink)
-            )
-            result.add_file(
-                f"staging/links/samlink_{samlink.name}.sql",
-                staging_samlink_tpl.render(samlink=samlink),
-            )
-
-        return result
+        tasks: list[RenderTask] = []
+        owners: list[str] = []
+        for attr, (context_name, templates) in _ENTITY_TEMPLATES.items():
+            for entity in getattr(model, attr).values():
+                for template, path in templates:
+                    render = partial(
+                        _render,
+                        self._dialect,
+                        self._hash_algo,
+                        template,
+                        **{context_name: entity},
+                    )
+                    tasks.append((path.format(entity.name), render))
+                    owners.append(entity.qualified_name)
+        return self.render_files(tasks, owners)
+
+
+@cache
+def _environment(dialect: str, hash_algo: str) -> Environment:
+    """Build (once per process and configuration) the Jinja environment for a dialect."""
+    env = Environment(
+        loader=FileSystemLoader(str(_TEMPLATES_DIR)),
+        keep_trailing_newline=True,
+        autoescape=False,
+    )
+    env.globals["map_type"] = lambda t: map_type(t, dialect)
+    env.filters["q"] = lambda name: f'"{name}"'
+    env.globals["hash_expr"] = lambda cols: build_hash_expr(cols, dialect, hash_algo)
+    env.globals["dialect"] = dialect
+    return env
+
+
+def _render(dialect: str, hash_algo: str, template: str, **context: object) -> str:
+    # Module-level so render tasks stay picklable for process-pool executors.
+    return _environment(dialect, hash_algo).get_template(template).render(**context)
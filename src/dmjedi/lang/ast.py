@@ -12,10 +12,12 @@ class SourceLocation(BaseModel):
 
 
 class FieldDef(BaseModel):
-    """A typed field (column) in an entity."""
+    """A typed field (column) in an entity, with optional data quality constraints."""
 
     name: str
     data_type: str
+    not_null: bool = False
+    checks: list[str] = []
     loc: SourceLocation = SourceLocation()
 
 
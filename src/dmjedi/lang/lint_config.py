@@ -0,0 +1,142 @@
+"""Lint configuration discovery — finds and caches ``.dvml-lint.toml`` files.
+
+A DVML file is linted with the settings of every ``.dvml-lint.toml`` from its directory up
+to the filesystem root, nearer files overriding keys of farther ones; a file containing
+``root = true`` stops the upward search. Parsed files are memoized by path and modification
+time, so repeated lookups (per module, per pass, per LSP keystroke) only cost a ``stat``.
+"""
+
+from __future__ import annotations
+
+import threading
+import tomllib
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dmjedi.lang.linter import LintRule
+
+CONFIG_FILENAME = ".dvml-lint.toml"
+
+
+class LintConfigError(ValueError):
+    """Raised when a ``.dvml-lint.toml`` holds a value of the wrong type."""
+
+    def __init__(self, path: Path, key: str, message: str) -> None:
+        self.path = path
+        self.key = key
+        super().__init__(f"{path}: {key}: {message}")
+
+
+@dataclass(frozen=True)
+class LintConfig:
+    """Settings loaded from ``.dvml-lint.toml``.
+
+    ``naming`` maps entity types to required name prefixes (``[naming]`` table) and
+    ``rules`` maps rule ids to ``true``/``false`` to enable or disable them (``[rules]``).
+    """
+
+    naming: dict[str, str] = field(default_factory=dict)
+    rules: dict[str, bool] = field(default_factory=dict)
+
+    def is_enabled(self, rule: LintRule) -> bool:
+        return self.rules.get(rule.name, rule.enabled_by_default)
+
+
+class LintConfigLoader:
+    """Resolves the effective ``LintConfig`` for source files, caching parsed TOML.
+
+    Cache entries are keyed by resolved path and revalidated against ``st_mtime_ns`` and
+    ``st_size``, so edits to a config file are picked up without restarting long-lived
+    processes such as the LSP or MCP servers. Safe to share between threads.
+    """
+
+    def __init__(self, filename: str = CONFIG_FILENAME) -> None:
+        self._filename = filename
+        self._files: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def load_file(self, path: Path) -> dict[str, Any] | None:
+        """Return the parsed TOML at ``path``, or None if it does not exist."""
+        try:
+            stat = path.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        key = path.resolve()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._files.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with path.open("rb") as f:
+            data = tomllib.load(f)
+        with self._lock:
+            self._files[key] = (stamp, data)
+        return data
+
+    def load(self, config_path: Path) -> LintConfig:
+        """Load exactly one config file; a missing file yields defaults.
+
+        Raises ``LintConfigError`` if a ``[rules]`` value is not a boolean.
+        """
+        return _to_config([(config_path, self.load_file(config_path) or {})])
+
+    def for_path(self, source: str | Path | None) -> LintConfig:
+        """Return the merged config governing ``source`` (a file or directory).
+
+        Sources that do not live in an existing directory (inline text, ``<string>``) are
+        resolved from the current working directory. Raises ``LintConfigError`` if a
+        ``[rules]`` value in any of the files is not a boolean.
+        """
+        start = Path(source) if source else Path()
+        directory = start if start.is_dir() else start.parent
+        directory = directory.resolve() if directory.is_dir() else Path.cwd()
+
+        layers: list[tuple[Path, dict[str, Any]]] = []
+        for candidate in (directory, *directory.parents):
+            path = candidate / self._filename
+            data = self.load_file(path)
+            if data is None:
+                continue
+            layers.append((path, data))
+            if data.get("root", False):
+                break
+        return _to_config(reversed(layers))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+
+
+def _to_config(layers: Iterable[tuple[Path, dict[str, Any]]]) -> LintConfig:
+    naming: dict[str, str] = {}
+    rules: dict[str, bool] = {}
+    for path, data in layers:
+        naming.update(data.get("naming", {}))
+        for rule, enabled in data.get("rules", {}).items():
+            # A string such as "off" is truthy and would silently enable the rule.
+            if not isinstance(enabled, bool):
+                msg = f"expected true or false, got {enabled!r}"
+                raise LintConfigError(path, f"rules.{rule}", msg)
+            rules[rule] = enabled
+    return LintConfig(naming=naming, rules=rules)
+
+
+_DEFAULT_LOADER = LintConfigLoader()
+
+
+def default_loader() -> LintConfigLoader:
+    """Process-wide loader shared by the CLI, MCP and LSP entrypoints."""
+    return _DEFAULT_LOADER
+
+
+def config_for(source: str | Path | None) -> LintConfig:
+    """Return the effective lint config for a source file using the shared cache."""
+    return _DEFAULT_LOADER.for_path(source)
+
+
+def load_lint_config(config_path: Path = Path(CONFIG_FILENAME)) -> LintConfig:
+    """Load lint settings from one ``.dvml-lint.toml``; a missing file yields defaults."""
+    return _DEFAULT_LOADER.load(config_path)
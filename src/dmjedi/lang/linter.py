@@ -1,14 +1,36 @@
-"""DVML linter — validates AST nodes against Data Vault 2.1 modeling rules."""
+"""DVML linter — validates AST nodes against Data Vault 2.1 modeling rules.
+
+Rules register for the AST node kinds they inspect (``module``, ``hub``, ``satellite``, ...).
+``lint()`` walks each module once and dispatches every node to the rules subscribed to its
+kind, so adding a rule adds work only for the nodes it cares about, not another pass.
+"""
 
 from __future__ import annotations
 
-import tomllib
+import os
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import StrEnum
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from dmjedi.lang.ast import DVMLModule, SourceLocation
+from dmjedi.lang.ast import (
+    BridgeDecl,
+    DVMLModule,
+    EffSatDecl,
+    HubDecl,
+    LinkDecl,
+    NhLinkDecl,
+    NhSatDecl,
+    PitDecl,
+    SamLinkDecl,
+    SatelliteDecl,
+    SourceLocation,
+)
+from dmjedi.lang.lint_config import LintConfig, config_for, load_lint_config
 
 if TYPE_CHECKING:
     from dmjedi.model.core import DataVaultModel
@@ -28,170 +50,436 @@ class LintDiagnostic:
     rule: str
 
 
+class RuleScope(StrEnum):
+    """When a rule can run: on a parsed module alone, or once the model is resolved."""
+
+    MODULE = "module"
+    MODEL = "model"
+
+
+# Node kind -> DVMLModule attribute holding those nodes, in traversal order.
+# The module itself is visited first under the kind "module".
+NODE_KINDS: dict[str, str] = {
+    "hub": "hubs",
+    "satellite": "satellites",
+    "link": "links",
+    "nhsat": "nhsats",
+    "nhlink": "nhlinks",
+    "effsat": "effsats",
+    "samlink": "samlinks",
+    "bridge": "bridges",
+    "pit": "pits",
+}
+
+_ENTITY_KINDS = tuple(NODE_KINDS)
+
+
+@dataclass(frozen=True)
+class LintContext:
+    """Inputs shared by every rule while one module is visited."""
+
+    module: DVMLModule
+    config: LintConfig
+    model: DataVaultModel | None = None
+
+
+RuleCheck = Callable[[Any, LintContext], list[LintDiagnostic]]
+
+
+@dataclass(frozen=True)
+class LintRule:
+    """A registered lint rule; ``name`` is the rule id its diagnostics carry."""
+
+    name: str
+    scope: RuleScope
+    node_kinds: tuple[str, ...]
+    check: RuleCheck
+    enabled_by_default: bool = True
+
+
+@dataclass
+class RuleStats:
+    """Accumulated cost of one rule across ``lint()`` calls that share a stats dict."""
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    calls: int = 0
+
+
+_RULES: dict[str, LintRule] = {}
+
+
+def register_rule(
+    name: str,
+    nodes: Iterable[str],
+    scope: RuleScope = RuleScope.MODULE,
+    *,
+    enabled_by_default: bool = True,
+) -> Callable[[RuleCheck], RuleCheck]:
+    """Decorator registering ``check(node, context)`` for the given node kinds."""
+    node_kinds = tuple(nodes)
+    unknown = set(node_kinds) - {"module", *NODE_KINDS}
+    if unknown:
+        msg = f"Unknown node kind(s) for rule '{name}': {', '.join(sorted(unknown))}"
+        raise ValueError(msg)
+
+    def register(check: RuleCheck) -> RuleCheck:
+        _RULES[name] = LintRule(
+            name=name,
+            scope=scope,
+            node_kinds=node_kinds,
+            check=check,
+            enabled_by_default=enabled_by_default,
+        )
+        return check
+
+    return register
+
+
+def available_rules(scope: RuleScope | None = None) -> list[str]:
+    """List registered rule ids, optionally restricted to one scope."""
+    return [name for name, rule in _RULES.items() if scope is None or rule.scope == scope]
+
+
+def select_rules(
+    names: Iterable[str] | None = None,
+    *,
+    scope: RuleScope | None = None,
+) -> list[LintRule]:
+    """Return registered rules by id and/or scope, in registration order.
+
+    Raises KeyError for unknown rule ids.
+    """
+    if names is not None:
+        wanted = set(names)
+        unknown = wanted - _RULES.keys()
+        if unknown:
+            msg = f"Unknown lint rule(s): {', '.join(sorted(unknown))}"
+            raise KeyError(msg)
+    return [
+        rule
+        for rule in _RULES.values()
+        if (names is None or rule.name in wanted) and (scope is None or rule.scope == scope)
+    ]
+
+
 def lint(
     module: DVMLModule,
     model: DataVaultModel | None = None,
     config_path: Path | None = None,
+    *,
+    config: LintConfig | None = None,
+    rules: Iterable[LintRule] | None = None,
+    stats: dict[str, RuleStats] | None = None,
 ) -> list[LintDiagnostic]:
-    """Run all lint rules against a parsed DVML module."""
+    """Run lint rules against a parsed DVML module in a single traversal.
+
+    By default every enabled module-local rule runs, plus the model-aware rules when
+    ``model`` is given. Pass ``rules`` (see ``select_rules``) to run a subset. Settings come
+    from ``config``, else the file at ``config_path``, else the ``.dvml-lint.toml`` files
+    governing the module's source file (see ``lint_config``). When a ``stats`` dict is
+    given, per-rule wall/CPU time and call counts are added to it.
+    """
+    if config is None:
+        config = (
+            load_lint_config(config_path)
+            if config_path is not None
+            else config_for(module.source_file)
+        )
+    if rules is None:
+        rules = _default_rules(model)
+
+    subscribers: dict[str, list[LintRule]] = {}
+    for rule in rules:
+        if (rule.scope == RuleScope.MODEL and model is None) or not config.is_enabled(rule):
+            continue
+        for kind in rule.node_kinds:
+            subscribers.setdefault(kind, []).append(rule)
+    if not subscribers:
+        return []
+
+    context = LintContext(module=module, config=config, model=model)
+    dispatch = _dispatch if stats is None else _timed_dispatch(stats)
     diagnostics: list[LintDiagnostic] = []
-    diagnostics.extend(_check_namespace(module))
-    diagnostics.extend(_check_hubs(module))
-    diagnostics.extend(_check_satellites(module))
-    diagnostics.extend(_check_links(module))
-    diagnostics.extend(_check_effsats(module, model))
-    diagnostics.extend(_check_samlinks(module))
-    naming_config = _load_lint_config(config_path or Path(".dvml-lint.toml"))
-    diagnostics.extend(_check_naming(module, naming_config))
+    if "module" in subscribers:
+        dispatch(subscribers["module"], module, context, diagnostics)
+    for kind, attr in NODE_KINDS.items():
+        kind_rules = subscribers.get(kind)
+        if not kind_rules:
+            continue
+        for node in getattr(module, attr):
+            dispatch(kind_rules, node, context, diagnostics)
     return diagnostics
 
 
-def _check_namespace(module: DVMLModule) -> list[LintDiagnostic]:
-    diags: list[LintDiagnostic] = []
-    if not module.namespace:
-        diags.append(
-            LintDiagnostic(
-                message=f"No namespace declared in '{module.source_file or '<string>'}'",
-                severity=Severity.WARNING,
-                loc=SourceLocation(file=module.source_file),
-                rule="missing-namespace",
-            )
-        )
-    return diags
-
-
-def _check_hubs(module: DVMLModule) -> list[LintDiagnostic]:
-    diags: list[LintDiagnostic] = []
-    for hub in module.hubs:
-        if not hub.business_keys:
-            diags.append(
-                LintDiagnostic(
-                    message=f"Hub '{hub.name}' has no business keys defined",
-                    severity=Severity.ERROR,
-                    loc=hub.loc,
-                    rule="hub-requires-business-key",
-                )
-            )
-    return diags
-
-
-def _check_satellites(module: DVMLModule) -> list[LintDiagnostic]:
-    diags: list[LintDiagnostic] = []
-    for sat in module.satellites:
-        if not sat.fields:
-            diags.append(
-                LintDiagnostic(
-                    message=f"Satellite '{sat.name}' has no fields defined",
-                    severity=Severity.WARNING,
-                    loc=sat.loc,
-                    rule="satellite-requires-fields",
-                )
-            )
-    return diags
-
-
-def _check_links(module: DVMLModule) -> list[LintDiagnostic]:
-    diags: list[LintDiagnostic] = []
-    for link in module.links:
-        if len(link.references) < 2:
-            diags.append(
-                LintDiagnostic(
-                    message=f"Link '{link.name}' must reference at least 2 hubs",
-                    severity=Severity.ERROR,
-                    loc=link.loc,
-                    rule="link-requires-two-refs",
-                )
-            )
-    return diags
-
-
-def _check_effsats(
-    module: DVMLModule, model: DataVaultModel | None
+def lint_modules(
+    modules: Sequence[DVMLModule],
+    model: DataVaultModel | None = None,
+    *,
+    config: LintConfig | None = None,
+    rules: Iterable[LintRule] | None = None,
+    stats: dict[str, RuleStats] | None = None,
+    jobs: int = 1,
+    executor: Executor | None = None,
 ) -> list[LintDiagnostic]:
+    """Lint many modules, optionally in parallel, with diagnostics in file/line order.
+
+    Each module uses ``config`` if given, else the config discovered for its source file.
+    Modules are independent, so they are split into chunks and fanned out to ``executor``
+    or, when ``jobs`` > 1 (0 means one per CPU), to a process pool whose workers receive
+    the model and rule ids once. Rules are passed by id so workers use their own
+    registry, and treat the model as a read-only snapshot. Diagnostics are merged and
+    stably sorted by (file, line, column), so the result does not depend on scheduling.
+    """
+    selected = list(rules) if rules is not None else _default_rules(model)
+    timed = stats is not None
+    units = [
+        (module, config if config is not None else config_for(module.source_file))
+        for module in modules
+    ]
+    jobs = jobs if jobs > 0 else os.cpu_count() or 1
+    if executor is None and (jobs <= 1 or len(units) < 2):
+        results = [_lint_serial(units, model, selected, timed)]
+    else:
+        rule_names = tuple(rule.name for rule in selected)
+        workers = jobs if executor is None else max(jobs, os.cpu_count() or 1)
+        chunks = _chunks(units, workers)
+        if executor is not None:
+            task = partial(_lint_chunk, model=model, rule_names=rule_names, timed=timed)
+            results = list(executor.map(task, chunks))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chunks)),
+                initializer=_init_worker,
+                initargs=(model, rule_names, timed),
+            ) as pool:
+                results = list(pool.map(_lint_worker_chunk, chunks))
+
+    diagnostics: list[LintDiagnostic] = []
+    for chunk_diagnostics, chunk_stats in results:
+        diagnostics.extend(chunk_diagnostics)
+        if stats is not None:
+            for name, entry in chunk_stats.items():
+                total = stats.setdefault(name, RuleStats())
+                total.wall_seconds += entry.wall_seconds
+                total.cpu_seconds += entry.cpu_seconds
+                total.calls += entry.calls
+    diagnostics.sort(key=_diagnostic_order)
+    return diagnostics
+
+
+def _default_rules(model: DataVaultModel | None) -> list[LintRule]:
+    return select_rules(scope=None if model is not None else RuleScope.MODULE)
+
+
+def _diagnostic_order(diag: LintDiagnostic) -> tuple[str, int, int]:
+    return (diag.loc.file or "", diag.loc.line, diag.loc.column)
+
+
+# A module paired with the config it is linted under.
+_LintUnit = tuple[DVMLModule, LintConfig]
+_ChunkResult = tuple[list[LintDiagnostic], dict[str, RuleStats]]
+
+
+def _chunks(units: list[_LintUnit], workers: int) -> list[list[_LintUnit]]:
+    # A few chunks per worker balances uneven module sizes without per-module overhead.
+    size = max(1, -(-len(units) // (workers * 4)))
+    return [units[i : i + size] for i in range(0, len(units), size)]
+
+
+def _lint_chunk(
+    units: list[_LintUnit],
+    model: DataVaultModel | None,
+    rule_names: tuple[str, ...],
+    timed: bool,
+) -> _ChunkResult:
+    return _lint_serial(units, model, select_rules(rule_names), timed)
+
+
+def _lint_serial(
+    units: list[_LintUnit],
+    model: DataVaultModel | None,
+    rules: list[LintRule],
+    timed: bool,
+) -> _ChunkResult:
+    stats: dict[str, RuleStats] | None = {} if timed else None
+    diagnostics: list[LintDiagnostic] = []
+    for module, config in units:
+        diagnostics.extend(lint(module, model, config=config, rules=rules, stats=stats))
+    return diagnostics, stats or {}
+
+
+# Per-process state for ``ProcessPoolExecutor`` workers, set once by ``_init_worker``
+# so each chunk only ships its modules and their configs.
+_WORKER_STATE: dict[str, Any] = {}
+
+
+def _init_worker(
+    model: DataVaultModel | None,
+    rule_names: tuple[str, ...],
+    timed: bool,
+) -> None:
+    _WORKER_STATE.update(model=model, rule_names=rule_names, timed=timed)
+
+
+def _lint_worker_chunk(units: list[_LintUnit]) -> _ChunkResult:
+    return _lint_chunk(units, **_WORKER_STATE)
+
+
+def _dispatch(
+    rules: list[LintRule], node: Any, context: LintContext, out: list[LintDiagnostic]
+) -> None:
+    for rule in rules:
+        out.extend(rule.check(node, context))
+
+
+def _timed_dispatch(
+    stats: dict[str, RuleStats],
+) -> Callable[[list[LintRule], Any, LintContext, list[LintDiagnostic]], None]:
+    def dispatch(
+        rules: list[LintRule], node: Any, context: LintContext, out: list[LintDiagnostic]
+    ) -> None:
+        for rule in rules:
+            wall, cpu = time.perf_counter(), time.process_time()
+            out.extend(rule.check(node, context))
+            entry = stats.setdefault(rule.name, RuleStats())
+            entry.wall_seconds += time.perf_counter() - wall
+            entry.cpu_seconds += time.process_time() - cpu
+            entry.calls += 1
+
+    return dispatch
+
+
+# ---------------------------------------------------------------------------
+# Built-in rules
+# ---------------------------------------------------------------------------
+
+
+@register_rule("missing-namespace", nodes=["module"])
+def _check_namespace(module: DVMLModule, context: LintContext) -> list[LintDiagnostic]:
+    if module.namespace:
+        return []
+    return [
+        LintDiagnostic(
+            message=f"No namespace declared in '{module.source_file or '<string>'}'",
+            severity=Severity.WARNING,
+            loc=SourceLocation(file=module.source_file),
+            rule="missing-namespace",
+        )
+    ]
+
+
+@register_rule("hub-requires-business-key", nodes=["hub"])
+def _check_hub(hub: Any, context: LintContext) -> list[LintDiagnostic]:
+    if hub.business_keys:
+        return []
+    return [
+        LintDiagnostic(
+            message=f"Hub '{hub.name}' has no business keys defined",
+            severity=Severity.ERROR,
+            loc=hub.loc,
+            rule="hub-requires-business-key",
+        )
+    ]
+
+
+@register_rule("satellite-requires-fields", nodes=["satellite"])
+def _check_satellite(sat: Any, context: LintContext) -> list[LintDiagnostic]:
+    if sat.fields:
+        return []
+    return [
+        LintDiagnostic(
+            message=f"Satellite '{sat.name}' has no fields defined",
+            severity=Severity.WARNING,
+            loc=sat.loc,
+            rule="satellite-requires-fields",
+        )
+    ]
+
+
+@register_rule("link-requires-two-refs", nodes=["link"])
+def _check_link(link: Any, context: LintContext) -> list[LintDiagnostic]:
+    if len(link.references) >= 2:
+        return []
+    return [
+        LintDiagnostic(
+            message=f"Link '{link.name}' must reference at least 2 hubs",
+            severity=Severity.ERROR,
+            loc=link.loc,
+            rule="link-requires-two-refs",
+        )
+    ]
+
+
+@register_rule("effsat-parent-must-be-link", nodes=["effsat"], scope=RuleScope.MODEL)
+def _check_effsat(effsat: Any, context: LintContext) -> list[LintDiagnostic]:
     """LINT-01: EffSat parent must be a link, not a hub."""
-    diags: list[LintDiagnostic] = []
+    model = context.model
     if model is None:
-        return diags
-    for effsat in module.effsats:
-        ref = effsat.parent_ref
-        ns = module.namespace
-        ns_ref = f"{ns}.{ref}" if ns else ref
-        in_links = ref in model.links or ns_ref in model.links
-        in_hubs = ref in model.hubs or ns_ref in model.hubs
-        if not in_links and in_hubs:
-            diags.append(
-                LintDiagnostic(
-                    message=f"EffSat '{effsat.name}' parent '{ref}' is a hub, not a link",
-                    severity=Severity.ERROR,
-                    loc=effsat.loc,
-                    rule="effsat-parent-must-be-link",
-                )
-            )
-    return diags
-
-
-def _check_samlinks(module: DVMLModule) -> list[LintDiagnostic]:
+        return []
+    ref = effsat.parent_ref
+    parent = model.symbols.resolve(ref, context.module.namespace, ("link", "hub"))
+    if parent is None or parent.kind == "link":
+        return []
+    return [
+        LintDiagnostic(
+            message=f"EffSat '{effsat.name}' parent '{ref}' is a hub, not a link",
+            severity=Severity.ERROR,
+            loc=effsat.loc,
+            rule="effsat-parent-must-be-link",
+        )
+    ]
+
+
+@register_rule("samlink-same-hub", nodes=["samlink"])
+def _check_samlink(samlink: Any, context: LintContext) -> list[LintDiagnostic]:
     """LINT-02: SamLink master and duplicate should reference the same hub."""
-    diags: list[LintDiagnostic] = []
-    for samlink in module.samlinks:
-        if samlink.master_ref != samlink.duplicate_ref:
-            diags.append(
-                LintDiagnostic(
-                    message=(
-                        f"SamLink '{samlink.name}' master '{samlink.master_ref}' and "
-                        f"duplicate '{samlink.duplicate_ref}' reference different hubs"
-                    ),
-                    severity=Severity.WARNING,
-                    loc=samlink.loc,
-                    rule="samlink-same-hub",
-                )
-            )
-    return diags
-
-
-def _load_lint_config(config_path: Path) -> dict[str, str]:
-    """Load naming prefixes from .dvml-lint.toml if present."""
-    if not config_path.exists():
-        return {}
-    with config_path.open("rb") as f:
-        data = tomllib.load(f)
-    naming: dict[str, str] = data.get("naming", {})
-    return naming
-
-
-def _check_naming(
-    module: DVMLModule, config: dict[str, str]
-) -> list[LintDiagnostic]:
+    if samlink.master_ref == samlink.duplicate_ref:
+        return []
+    return [
+        LintDiagnostic(
+            message=(
+                f"SamLink '{samlink.name}' master '{samlink.master_ref}' and "
+                f"duplicate '{samlink.duplicate_ref}' reference different hubs"
+            ),
+            severity=Severity.WARNING,
+            loc=samlink.loc,
+            rule="samlink-same-hub",
+        )
+    ]
+
+
+# Declaration class -> key of the ``[naming]`` table in ``.dvml-lint.toml``.
+_NAMING_KEYS: dict[type, str] = {
+    HubDecl: "hub",
+    SatelliteDecl: "sat",
+    LinkDecl: "link",
+    NhSatDecl: "nhsat",
+    NhLinkDecl: "nhlink",
+    EffSatDecl: "effsat",
+    SamLinkDecl: "samlink",
+    BridgeDecl: "bridge",
+    PitDecl: "pit",
+}
+
+
+@register_rule("naming-convention", nodes=_ENTITY_KINDS)
+def _check_naming(entity: Any, context: LintContext) -> list[LintDiagnostic]:
     """LINT-03: Entity names must match configured prefix conventions."""
-    if not config:
+    if not context.config.naming:
         return []
-    diags: list[LintDiagnostic] = []
-    checks: list[tuple[str, list[Any]]] = [
-        ("hub", module.hubs),
-        ("sat", module.satellites),
-        ("link", module.links),
-        ("nhsat", module.nhsats),
-        ("nhlink", module.nhlinks),
-        ("effsat", module.effsats),
-        ("samlink", module.samlinks),
-        ("bridge", module.bridges),
-        ("pit", module.pits),
+    entity_type = _NAMING_KEYS[type(entity)]
+    prefix = context.config.naming.get(entity_type)
+    if not prefix or entity.name.startswith(prefix):
+        return []
+    return [
+        LintDiagnostic(
+            message=(
+                f"{entity_type.capitalize()} '{entity.name}' does not start "
+                f"with required prefix '{prefix}'"
+            ),
+            severity=Severity.WARNING,
+            loc=entity.loc,
+            rule="naming-convention",
+        )
     ]
-    for entity_type, entities in checks:
-        prefix = config.get(entity_type)
-        if not prefix:
-            continue
-        for entity in entities:
-            if not entity.name.startswith(prefix):
-                diags.append(
-                    LintDiagnostic(
-                        message=(
-                            f"{entity_type.capitalize()} '{entity.name}' does not start "
-                            f"with required prefix '{prefix}'"
-                        ),
-                        severity=Severity.WARNING,
-                        loc=entity.loc,
-                        rule="naming-convention",
-                    )
-                )
-    return diags
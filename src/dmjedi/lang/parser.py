@@ -166,9 +166,22 @@ class DVMLTransformer(Transformer):  # type: ignore[type-arg]
         children = tree.children  # type: ignore[union-attr]
         return str(children[0])
 
+    def not_null_constraint(self, tree: object) -> tuple[str, str]:
+        return ("not_null", "")
+
+    def check_constraint(self, tree: object) -> tuple[str, str]:
+        return ("check", tree.children[0])  # type: ignore[attr-defined]
+
     def field_decl(self, tree: object) -> FieldDef:
         children = tree.children  # type: ignore[union-attr]
-        return FieldDef(name=children[0], data_type=children[1], loc=self._loc(tree))
+        constraints = children[2:]
+        return FieldDef(
+            name=children[0],
+            data_type=children[1],
+            not_null=any(kind == "not_null" for kind, _ in constraints),
+            checks=[expr for kind, expr in constraints if kind == "check"],
+            loc=self._loc(tree),
+        )
 
     def business_key_decl(self, tree: object) -> BusinessKeyDef:
         children = tree.children  # type: ignore[union-attr]
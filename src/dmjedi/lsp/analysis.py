@@ -3,9 +3,13 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import threading
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, TypeVar
 
 from lsprotocol import types
+from pygls.uris import to_fs_path
 
 from dmjedi.lang.ast import (
     BridgeDecl,
@@ -21,9 +25,23 @@ from dmjedi.lang.ast import (
     SatelliteDecl,
     SourceLocation,
 )
+from dmjedi.lang.lint_config import LintConfig, LintConfigError, config_for
 from dmjedi.lang.linter import lint
-from dmjedi.lang.parser import DVMLParseError, parse
-from dmjedi.lsp.protocol import lint_diagnostic_to_lsp, parse_error_to_lsp, semantic_diagnostic
+from dmjedi.lsp.incremental import IncrementalParser
+from dmjedi.lsp.lines import LineIndex, as_line_index
+from dmjedi.lsp.protocol import (
+    config_error_to_lsp,
+    lint_diagnostic_to_lsp,
+    parse_error_to_lsp,
+    resolver_error_to_lsp,
+    semantic_diagnostic,
+)
+from dmjedi.lsp.spans import Span, SpanIndex
+
+if TYPE_CHECKING:
+    from dmjedi.lsp.workspace import WorkspaceIndex
+
+_PayloadT = TypeVar("_PayloadT")
 
 _DECLARATION_KEYWORDS = (
     "namespace",
@@ -71,6 +89,22 @@ _REFERENCE_LIST_TRAILING_COMMA_RE = re.compile(
     r"^(?:references|tracks)\s+[A-Za-z_][A-Za-z0-9_.]*"
     r"(?:\s*,\s*[A-Za-z_][A-Za-z0-9_.]*)*\s*,\s*$"
 )
+# Every reference context contains one of these words; other lines skip the context regexes.
+_REFERENCE_LINE_RE = re.compile(r"\b(?:of|master|duplicate|references|tracks|path)\b")
+# Completion context kind -> entity kinds a reference in that context may resolve to.
+_CONTEXT_KINDS: dict[str, tuple[str, ...] | None] = {
+    "entity_reference_parent": ("hub", "link", "nhlink"),
+    "entity_reference_link": ("link", "nhlink"),
+    "entity_reference_hub": ("hub",),
+    "entity_reference_any": None,
+}
+# Parent checks ``semantic_diagnostics`` already reports, with ranges on the reference.
+_PARENT_CHECKS = frozenset({"unknown-parent", "effsat-parent-must-be-link"})
+# Resolver errors about a reference in the entity's body rather than the entity itself.
+_REFERENCE_ERRORS = frozenset({"bridge-path-kind", "pit-unknown-satellite", "pit-satellite-anchor"})
+# One block cache per open document, keyed by URI.
+_PARSERS: dict[str, IncrementalParser] = {}
+_PARSERS_LOCK = threading.Lock()
 
 
 @dataclass(slots=True)
@@ -103,6 +137,23 @@ class SymbolLookup:
     is_reference: bool
 
 
+@dataclass(frozen=True, slots=True)
+class ReferenceToken:
+    """An entity reference as written in the document (0-based line, code point columns)."""
+
+    name: str
+    line: int
+    start: int
+    end: int
+    kinds: tuple[str, ...] | None  # kinds the reference may resolve to; None for any
+
+    def to_range(self, lines: LineIndex) -> types.Range:
+        return types.Range(
+            start=types.Position(line=self.line, character=lines.to_utf16(self.line, self.start)),
+            end=types.Position(line=self.line, character=lines.to_utf16(self.line, self.end)),
+        )
+
+
 @dataclass(slots=True)
 class DocumentAnalysis:
     """Analysis result for a single in-memory DVML document."""
@@ -110,28 +161,49 @@ class DocumentAnalysis:
     uri: str
     version: int | None
     source: str
-    module: DVMLModule | None
+    module: DVMLModule
     diagnostics: list[types.Diagnostic]
     declarations: dict[str, DeclarationInfo]
+    lines: LineIndex
+    references: list[ReferenceToken]
+    spans: SpanIndex[DeclarationInfo | ReferenceToken]
 
 
-def analyze_document(uri: str, source: str, version: int | None) -> DocumentAnalysis:
-    """Parse and lint the current document without consulting workspace state."""
-    try:
-        module = parse(source, source_file=uri)
-    except DVMLParseError as error:
-        return DocumentAnalysis(
-            uri=uri,
-            version=version,
-            source=source,
-            module=None,
-            diagnostics=[parse_error_to_lsp(error, source)],
-            declarations={},
-        )
-
+def analyze_document(
+    uri: str,
+    source: str,
+    version: int | None,
+    workspace: WorkspaceIndex | None = None,
+) -> DocumentAnalysis:
+    """Parse and lint the current document.
+
+    Parsing is incremental per declaration (see ``dmjedi.lsp.incremental``): declarations
+    that parse are analyzed even when another declaration in the document is broken. With
+    a ``workspace`` index, parents declared in other files are resolved through it and the
+    document is compiled against the workspace (see ``workspace_diagnostics``).
+    """
+    # Split once; every range below is built from this index.
+    lines = LineIndex(source)
+    parsed = _parser_for(uri).parse(source)
+    module = parsed.module
     declarations = build_declaration_index(module)
-    diagnostics = [lint_diagnostic_to_lsp(diagnostic, source) for diagnostic in lint(module)]
-    diagnostics.extend(semantic_diagnostics(module, declarations, source))
+    # Use the same cached, per-directory .dvml-lint.toml lookup as the CLI and MCP.
+    diagnostics = [parse_error_to_lsp(error, lines) for error in parsed.errors]
+    try:
+        config = config_for(to_fs_path(uri))
+    except LintConfigError as error:
+        # Keep analyzing with default settings; the broken file is reported instead.
+        config = LintConfig()
+        diagnostics.append(config_error_to_lsp(error))
+    diagnostics.extend(
+        lint_diagnostic_to_lsp(diagnostic, lines) for diagnostic in lint(module, config=config)
+    )
+    if not parsed.errors:
+        # A parent may be declared in the broken block; don't report it as unknown.
+        diagnostics.extend(semantic_diagnostics(module, declarations, lines, workspace))
+    references = reference_tokens(lines)
+    if not parsed.errors and workspace is not None:
+        diagnostics.extend(workspace_diagnostics(workspace, uri, module, lines, references, config))
     return DocumentAnalysis(
         uri=uri,
         version=version,
@@ -139,9 +211,26 @@ def analyze_document(uri: str, source: str, version: int | None) -> DocumentAnal
         module=module,
         diagnostics=diagnostics,
         declarations=declarations,
+        lines=lines,
+        references=references,
+        spans=symbol_spans(lines, declarations, references),
     )
 
 
+def forget_document(uri: str) -> None:
+    """Drop the cached declaration blocks of a closed document."""
+    with _PARSERS_LOCK:
+        _PARSERS.pop(uri, None)
+
+
+def _parser_for(uri: str) -> IncrementalParser:
+    with _PARSERS_LOCK:
+        parser = _PARSERS.get(uri)
+        if parser is None:
+            parser = _PARSERS[uri] = IncrementalParser(source_file=uri)
+        return parser
+
+
 def build_declaration_index(module: DVMLModule) -> dict[str, DeclarationInfo]:
     """Collect same-document declarations keyed by entity name."""
     declarations: dict[str, DeclarationInfo] = {}
@@ -195,10 +284,12 @@ def build_declaration_index(module: DVMLModule) -> dict[str, DeclarationInfo]:
     return declarations
 
 
-def completion_context(source: str, line: int, character: int) -> CompletionContext | None:
-    """Classify the active cursor position for conservative completion behavior."""
-    line_text = _line_at(source, line)
-    prefix = line_text[:character]
+def completion_context(
+    source: str | LineIndex, line: int, character: int
+) -> CompletionContext | None:
+    """Classify the active cursor position (an LSP, UTF-16 based position) for completion."""
+    lines = as_line_index(source)
+    prefix = lines.line(line)[: lines.from_utf16(line, character)]
     stripped = prefix.lstrip()
     current_prefix = _identifier_prefix(prefix)
 
@@ -260,10 +351,50 @@ def lookup_symbol_at_position(
     analysis: DocumentAnalysis, position: types.Position
 ) -> SymbolLookup | None:
     """Resolve a declaration or same-document reference under the cursor."""
-    declaration_match = _lookup_declaration_at_position(analysis, position)
-    if declaration_match is not None:
-        return declaration_match
-    return _lookup_reference_at_position(analysis, position)
+    span = _span_at_position(analysis, position)
+    if span is None:
+        return None
+    target = span.payload
+    if isinstance(target, DeclarationInfo):
+        declaration, is_reference = target, False
+    else:
+        referenced = analysis.declarations.get(target.name)
+        if referenced is None:
+            return None
+        declaration, is_reference = referenced, True
+    return SymbolLookup(
+        name=declaration.name,
+        declaration=declaration,
+        range=_span_range(analysis.lines, span),
+        is_reference=is_reference,
+    )
+
+
+def reference_at_position(
+    analysis: DocumentAnalysis, position: types.Position
+) -> ReferenceToken | None:
+    """The reference token under an LSP position, whether or not it resolves locally."""
+    span = _span_at_position(analysis, position)
+    if span is None or not isinstance(span.payload, ReferenceToken):
+        return None
+    return span.payload
+
+
+def symbol_spans(
+    lines: LineIndex,
+    declarations: dict[str, DeclarationInfo],
+    references: list[ReferenceToken],
+) -> SpanIndex[DeclarationInfo | ReferenceToken]:
+    """Interval index of declaration names and reference tokens for position lookups."""
+    spans: list[Span[DeclarationInfo | ReferenceToken]] = [
+        Span(token.line, token.start, token.end, token) for token in references
+    ]
+    for declaration in declarations.values():
+        found = _entity_name_start(lines, declaration)
+        if found is not None:
+            line, start = found
+            spans.append(Span(line, start, start + len(declaration.name), declaration))
+    return SpanIndex(spans)
 
 
 def declaration_infos(analysis: DocumentAnalysis) -> list[DeclarationInfo]:
@@ -274,20 +405,100 @@ def declaration_infos(analysis: DocumentAnalysis) -> list[DeclarationInfo]:
 def semantic_diagnostics(
     module: DVMLModule,
     declarations: dict[str, DeclarationInfo],
-    source: str,
+    source: str | LineIndex,
+    workspace: WorkspaceIndex | None = None,
 ) -> list[types.Diagnostic]:
-    """Build same-document semantic diagnostics without widening into workspace scope."""
+    """Build semantic diagnostics, widening parent lookups to ``workspace`` when given."""
+
+    def parent_kind(ref: str, allowed_kinds: set[str]) -> str | None:
+        local = declarations.get(ref)
+        if local is None and module.namespace:
+            local = declarations.get(ref.removeprefix(f"{module.namespace}."))
+        if local is not None:
+            return local.kind
+        if workspace is None:
+            return None
+        # The index still holds the previous version of this document; skip it.
+        own = module.source_file
+        symbol = workspace.resolve(ref, module.namespace, tuple(sorted(allowed_kinds)), own)
+        symbol = symbol or workspace.resolve(ref, module.namespace, exclude=own)
+        return symbol.kind if symbol is not None else None
+
     diagnostics: list[types.Diagnostic] = []
+    diagnostics.extend(_parent_diagnostics(module.satellites, parent_kind, source, {"hub", "link"}))
+    diagnostics.extend(_parent_diagnostics(module.nhsats, parent_kind, source, {"hub", "link"}))
+    diagnostics.extend(_parent_diagnostics(module.effsats, parent_kind, source, {"link", "nhlink"}))
+    return diagnostics
+
+
+def workspace_diagnostics(
+    workspace: WorkspaceIndex,
+    uri: str,
+    module: DVMLModule,
+    source: str | LineIndex,
+    references: list[ReferenceToken],
+    config: LintConfig | None = None,
+) -> list[types.Diagnostic]:
+    """Resolver and model-aware lint diagnostics of ``module`` within the workspace.
+
+    Uses the workspace's incremental compile session, so only this module's entities are
+    rebuilt; parent checks are left to ``semantic_diagnostics``. Errors about a reference
+    are anchored on the first matching reference token in the entity's body.
+    """
+    compiled = workspace.compile(uri, module, config)
+    diagnostics: list[types.Diagnostic] = []
+    for error in compiled.resolver:
+        if error.code in _PARENT_CHECKS:
+            continue
+        if error.code in _REFERENCE_ERRORS:
+            token = next(
+                (
+                    token
+                    for token in references
+                    if token.line >= error.line - 1 and token.name == error.subject
+                ),
+                None,
+            )
+            if token is not None:
+                error = replace(error, line=token.line + 1)
+        diagnostics.append(resolver_error_to_lsp(error, source))
     diagnostics.extend(
-        _parent_diagnostics(module.satellites, declarations, source, {"hub", "link"})
-    )
-    diagnostics.extend(_parent_diagnostics(module.nhsats, declarations, source, {"hub", "link"}))
-    diagnostics.extend(
-        _parent_diagnostics(module.effsats, declarations, source, {"link", "nhlink"})
+        lint_diagnostic_to_lsp(diagnostic, source)
+        for diagnostic in compiled.lint
+        if diagnostic.rule not in _PARENT_CHECKS
     )
     return diagnostics
 
 
+def reference_tokens(source: str | LineIndex) -> list[ReferenceToken]:
+    """Every entity reference in the document, in source order.
+
+    Uses the same reference contexts as hover and definition (``of``, ``references``,
+    ``tracks``, ``path``, ``master``/``duplicate``), so any token found here can be looked up.
+    """
+    lines = as_line_index(source)
+    tokens: list[ReferenceToken] = []
+    for index in range(len(lines)):
+        text = lines.line(index)
+        if not _REFERENCE_LINE_RE.search(text):
+            continue
+        code = text.split("#", 1)[0]
+        for match in _IDENTIFIER_RE.finditer(code):
+            context = _reference_context_kind(code[: match.start()].lstrip())
+            if context is None:
+                continue
+            tokens.append(
+                ReferenceToken(
+                    name=match.group(0),
+                    line=index,
+                    start=match.start(),
+                    end=match.end(),
+                    kinds=_CONTEXT_KINDS[context],
+                )
+            )
+    return tokens
+
+
 def _entity_info(
     declaration: SatelliteDecl
     | LinkDecl
@@ -312,15 +523,15 @@ def _entity_info(
 
 
 def _parent_diagnostics(
-    declarations_with_parent: list[SatelliteDecl | NhSatDecl | EffSatDecl],
-    declarations: dict[str, DeclarationInfo],
-    source: str,
+    declarations_with_parent: Sequence[SatelliteDecl | NhSatDecl | EffSatDecl],
+    parent_kind: Callable[[str, set[str]], str | None],
+    source: str | LineIndex,
     allowed_kinds: set[str],
 ) -> list[types.Diagnostic]:
     diagnostics: list[types.Diagnostic] = []
     for declaration in declarations_with_parent:
-        parent = declarations.get(declaration.parent_ref)
-        if parent is None:
+        kind = parent_kind(declaration.parent_ref, allowed_kinds)
+        if kind is None:
             diagnostics.append(
                 semantic_diagnostic(
                     source=source,
@@ -331,7 +542,7 @@ def _parent_diagnostics(
                 )
             )
             continue
-        if parent.kind not in allowed_kinds:
+        if kind not in allowed_kinds:
             allowed = " or ".join(sorted(allowed_kinds))
             diagnostics.append(
                 semantic_diagnostic(
@@ -355,79 +566,36 @@ def _sorted_declarations(analysis: DocumentAnalysis) -> list[DeclarationInfo]:
     )
 
 
-def _lookup_declaration_at_position(
-    analysis: DocumentAnalysis, position: types.Position
-) -> SymbolLookup | None:
-    for declaration in analysis.declarations.values():
-        match_range = _entity_name_range(analysis.source, declaration)
-        if match_range is not None and _position_in_range(position, match_range):
-            return SymbolLookup(
-                name=declaration.name,
-                declaration=declaration,
-                range=match_range,
-                is_reference=False,
-            )
-    return None
-
-
-def _lookup_reference_at_position(
-    analysis: DocumentAnalysis, position: types.Position
-) -> SymbolLookup | None:
-    word = _word_at_position(analysis.source, position.line, position.character)
-    if word is None:
-        return None
-    name, start, end = word
-    declaration = analysis.declarations.get(name)
-    if declaration is None:
-        return None
-
-    prefix = _line_at(analysis.source, position.line)[:start].lstrip()
-    if not _is_reference_context(prefix):
+def entity_name_range(lines: LineIndex, declaration: DeclarationInfo) -> types.Range | None:
+    """LSP range of a declaration's name, found after its keyword on the declaration line."""
+    found = _entity_name_start(lines, declaration)
+    if found is None:
         return None
+    line, start = found
+    return _span_range(lines, Span(line, start, start + len(declaration.name), declaration))
 
-    return SymbolLookup(
-        name=name,
-        declaration=declaration,
-        range=types.Range(
-            start=types.Position(line=position.line, character=start),
-            end=types.Position(line=position.line, character=end),
-        ),
-        is_reference=True,
-    )
 
-
-def _entity_name_range(source: str, declaration: DeclarationInfo) -> types.Range | None:
+def _entity_name_start(lines: LineIndex, declaration: DeclarationInfo) -> tuple[int, int] | None:
     line_index = max(declaration.loc.line - 1, 0)
-    line_text = _line_at(source, line_index)
     keyword_start = max(declaration.loc.column - 1, 0)
-    name_start = line_text.find(declaration.name, keyword_start)
+    name_start = lines.line(line_index).find(declaration.name, keyword_start)
     if name_start < 0:
         return None
-    return types.Range(
-        start=types.Position(line=line_index, character=name_start),
-        end=types.Position(line=line_index, character=name_start + len(declaration.name)),
-    )
-
-
-def _position_in_range(position: types.Position, target: types.Range) -> bool:
-    if position.line != target.start.line:
-        return False
-    return target.start.character <= position.character <= target.end.character
+    return line_index, name_start
 
 
-def _word_at_position(source: str, line: int, character: int) -> tuple[str, int, int] | None:
-    line_text = _line_at(source, line)
-    for match in _IDENTIFIER_RE.finditer(line_text):
-        if match.start() <= character <= match.end():
-            return (match.group(0), match.start(), match.end())
-    return None
+def _span_at_position(
+    analysis: DocumentAnalysis, position: types.Position
+) -> Span[DeclarationInfo | ReferenceToken] | None:
+    column = analysis.lines.from_utf16(position.line, position.character)
+    return analysis.spans.at(position.line, column)
 
 
-def _line_at(source: str, line: int) -> str:
-    lines = source.splitlines()
-    if 0 <= line < len(lines):
-        return lines[line]
-    return ""
+def _span_range(lines: LineIndex, span: Span[_PayloadT]) -> types.Range:
+    return types.Range(
+        start=types.Position(line=span.line, character=lines.to_utf16(span.line, span.start)),
+        end=types.Position(line=span.line, character=lines.to_utf16(span.line, span.end)),
+    )
 
 
 def _identifier_prefix(prefix: str) -> str:
@@ -435,10 +603,6 @@ def _identifier_prefix(prefix: str) -> str:
     return match.group(0) if match is not None else ""
 
 
-def _is_reference_context(prefix: str) -> bool:
-    return _reference_context_kind(prefix) is not None
-
-
 def _reference_context_kind(prefix: str) -> str | None:
     if re.search(r"^(?:satellite|nhsat)\s+\w+\s+of\s+[A-Za-z_][A-Za-z0-9_.]*?$", prefix):
         return "entity_reference_parent"
@@ -0,0 +1,46 @@
+"""Folding ranges for DVML documents.
+
+Computed from a cached ``DocumentAnalysis``: one range per declaration body (from the
+declaration line to its closing brace), one per run of consecutive full-line comments and
+one per run of consecutive ``import`` lines.
+"""
+
+from __future__ import annotations
+
+from lsprotocol import types
+
+from dmjedi.lsp.analysis import DocumentAnalysis, declaration_infos
+from dmjedi.lsp.protocol import block_range_from_location
+
+
+def folding_ranges(analysis: DocumentAnalysis) -> list[types.FoldingRange]:
+    """Foldable declaration bodies, comment blocks and import groups, by start line."""
+    ranges: list[types.FoldingRange] = []
+    for declaration in declaration_infos(analysis):
+        block = block_range_from_location(analysis.lines, declaration.loc)
+        if block.end.line > block.start.line:
+            ranges.append(types.FoldingRange(start_line=block.start.line, end_line=block.end.line))
+    import_lines = [item.loc.line - 1 for item in analysis.module.imports]
+    ranges.extend(_runs(import_lines, types.FoldingRangeKind.Imports))
+    comment_lines = [
+        index
+        for index in range(len(analysis.lines))
+        if analysis.lines.line(index).lstrip().startswith("#")
+    ]
+    ranges.extend(_runs(comment_lines, types.FoldingRangeKind.Comment))
+    ranges.sort(key=lambda folding: (folding.start_line, folding.end_line))
+    return ranges
+
+
+def _runs(lines: list[int], kind: types.FoldingRangeKind) -> list[types.FoldingRange]:
+    """A range for every run of two or more consecutive line numbers."""
+    runs: list[types.FoldingRange] = []
+    start = 0
+    ordered = sorted(lines)
+    for index, line in enumerate(ordered):
+        if index + 1 < len(ordered) and ordered[index + 1] == line + 1:
+            continue
+        if line > ordered[start]:
+            runs.append(types.FoldingRange(start_line=ordered[start], end_line=line, kind=kind))
+        start = index + 1
+    return runs
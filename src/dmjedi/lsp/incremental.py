@@ -0,0 +1,186 @@
+"""Declaration-level incremental parsing for the DVML LSP.
+
+A whole-document ``parse`` reruns Earley over every declaration on each edit, and a single
+syntax error anywhere raises, leaving the server without any declarations for completion,
+hover or the outline. ``IncrementalParser`` splits the document at top-level declaration
+boundaries, parses each block on its own and caches the result by the block's text hash, so
+an edit reparses only the block it touched. A block that fails to parse contributes a parse
+error instead of declarations; every other block still contributes its AST.
+
+Blocks are parsed as if they started on line 1 and their locations are shifted to the
+block's position when assembled, so inserting lines above a block does not invalidate it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, replace
+
+from pydantic import BaseModel
+
+from dmjedi.lang.ast import DVMLModule, SourceLocation
+from dmjedi.lang.parser import DVMLParseError, parse
+
+_BLOCK_START_RE = re.compile(
+    r"(?:namespace|import|hub|satellite|link|nhsat|nhlink|effsat|samlink|bridge|pit)\b(?!\s*:)"
+)
+_DECLARATION_LISTS = (
+    "imports",
+    "hubs",
+    "satellites",
+    "links",
+    "nhsats",
+    "nhlinks",
+    "effsats",
+    "samlinks",
+    "bridges",
+    "pits",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SourceBlock:
+    """A run of whole lines holding (usually) one top-level declaration."""
+
+    line: int  # 0-based line of the block's first line
+    text: str
+
+    @property
+    def key(self) -> str:
+        """Cache key; trailing blank lines do not change how a block parses."""
+        return hashlib.blake2b(self.text.rstrip().encode(), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class IncrementalParse:
+    """The module assembled from every block that parsed, plus one error per broken block."""
+
+    module: DVMLModule
+    errors: list[DVMLParseError]
+    blocks: int
+    reparsed: int  # blocks that missed the cache on this pass
+
+
+def split_blocks(source: str) -> list[SourceBlock]:
+    """Split ``source`` into blocks at top-level declaration keywords.
+
+    A keyword line starts a new block when it is outside any ``{}`` body, or when it is not
+    indented, so a body left unclosed while typing does not swallow the declarations after
+    it. Comments and blank lines stay with the block they follow.
+    """
+    lines = source.split("\n")
+    starts: list[int] = []
+    depth = 0
+    for index, line in enumerate(lines):
+        stripped = line.lstrip()
+        if _BLOCK_START_RE.match(stripped) and (depth <= 0 or stripped == line):
+            starts.append(index)
+            depth = 0
+        depth += _brace_delta(line)
+    if not starts:
+        return [] if _is_trivia(lines) else [SourceBlock(line=0, text=source)]
+    starts[0] = 0
+    ends = [*starts[1:], len(lines)]
+    return [
+        SourceBlock(line=start, text="\n".join(lines[start:end]))
+        for start, end in zip(starts, ends, strict=True)
+    ]
+
+
+class IncrementalParser:
+    """Parses one document block by block, reusing cached ASTs of unchanged blocks.
+
+    The cache only keeps blocks of the most recent parse, so it stays proportional to the
+    document. Safe to share between the LSP worker thread and request handlers.
+    """
+
+    def __init__(self, source_file: str) -> None:
+        self.source_file = source_file
+        self._cache: dict[str, DVMLModule | DVMLParseError] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, source: str) -> IncrementalParse:
+        blocks = split_blocks(source)
+        with self._lock:
+            previous = self._cache
+        current: dict[str, DVMLModule | DVMLParseError] = {}
+        module = DVMLModule(source_file=self.source_file)
+        errors: list[DVMLParseError] = []
+        reparsed = 0
+        for block in blocks:
+            key = block.key
+            result = current.get(key)
+            if result is None:
+                result = previous.get(key)
+            if result is None:
+                reparsed += 1
+                try:
+                    result = parse(block.text, source_file=self.source_file)
+                except DVMLParseError as error:
+                    result = error
+            current[key] = result
+            if isinstance(result, DVMLParseError):
+                errors.append(_shift_error(result, block))
+            else:
+                _merge(module, result, block.line)
+        with self._lock:
+            self._cache = current
+        return IncrementalParse(module=module, errors=errors, blocks=len(blocks), reparsed=reparsed)
+
+
+def _merge(module: DVMLModule, block: DVMLModule, offset: int) -> None:
+    if block.namespace:
+        module.namespace = block.namespace
+    for name in _DECLARATION_LISTS:
+        getattr(module, name).extend(_shift(node, offset) for node in getattr(block, name))
+
+
+def _shift(node: BaseModel, offset: int) -> BaseModel:
+    """Copy of an AST node with every ``SourceLocation`` moved down ``offset`` lines."""
+    if offset == 0:
+        return node
+    if isinstance(node, SourceLocation):
+        return node.model_copy(update={"line": node.line + offset})
+    update: dict[str, object] = {}
+    for name in type(node).model_fields:
+        value = getattr(node, name)
+        if isinstance(value, BaseModel):
+            update[name] = _shift(value, offset)
+        elif isinstance(value, list) and value and isinstance(value[0], BaseModel):
+            update[name] = [_shift(item, offset) for item in value]
+    return node.model_copy(update=update)
+
+
+def _shift_error(error: DVMLParseError, block: SourceBlock) -> DVMLParseError:
+    detail = error.error
+    if detail.line > 0:
+        return DVMLParseError(replace(detail, line=detail.line + block.line))
+    # End of input: point at the end of the block's last non-blank line.
+    lines = block.text.split("\n")
+    last = max((i for i, line in enumerate(lines) if line.strip()), default=0)
+    return DVMLParseError(
+        replace(detail, line=block.line + last + 1, column=len(lines[last].rstrip()) + 1)
+    )
+
+
+def _brace_delta(line: str) -> int:
+    delta = 0
+    in_string = False
+    for char in line:
+        if char == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char == "#":
+            break
+        elif char == "{":
+            delta += 1
+        elif char == "}":
+            delta -= 1
+    return delta
+
+
+def _is_trivia(lines: list[str]) -> bool:
+    return all(not line.strip() or line.lstrip().startswith("#") for line in lines)
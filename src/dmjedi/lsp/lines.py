@@ -0,0 +1,72 @@
+"""Line-offset index for converting between DVML source locations and LSP positions.
+
+DVML locations (from the parser) are 1-based lines and 1-based code point columns; LSP
+positions are 0-based lines and UTF-16 code unit characters. A ``LineIndex`` splits the
+document once, so protocol builders get O(1) line access instead of re-splitting the source
+for every diagnostic, symbol and hover, and column conversion only looks at one line (and
+is free on ASCII lines, the common case).
+"""
+
+from __future__ import annotations
+
+
+class LineIndex:
+    """Lines of one document, split on ``\\n`` like the parser (a trailing ``\\r`` is dropped)."""
+
+    __slots__ = ("_ascii", "_lines", "_starts", "source")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        raw = source.split("\n")
+        self._lines = [line[:-1] if line.endswith("\r") else line for line in raw]
+        self._ascii = [line.isascii() for line in self._lines]
+        starts = [0]
+        for line in raw[:-1]:
+            starts.append(starts[-1] + len(line) + 1)
+        self._starts = starts
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def line(self, index: int) -> str:
+        """Text of the 0-based line ``index`` without its line ending; ``""`` if out of range."""
+        if 0 <= index < len(self._lines):
+            return self._lines[index]
+        return ""
+
+    def offset(self, index: int, column: int) -> int:
+        """Source offset of a 0-based line and code point column (clamped to the document)."""
+        if index < 0:
+            return 0
+        if index >= len(self._starts):
+            return len(self.source)
+        return self._starts[index] + min(max(column, 0), len(self._lines[index]))
+
+    def to_utf16(self, index: int, column: int) -> int:
+        """Convert a 0-based code point column on a line to UTF-16 code units."""
+        if column <= 0 or not 0 <= index < len(self._lines) or self._ascii[index]:
+            return max(column, 0)
+        text = self._lines[index]
+        if column > len(text):
+            return _utf16_length(text) + column - len(text)
+        return _utf16_length(text[:column])
+
+    def from_utf16(self, index: int, character: int) -> int:
+        """Convert a UTF-16 ``character`` from an LSP position to a code point column."""
+        if character <= 0 or not 0 <= index < len(self._lines) or self._ascii[index]:
+            return max(character, 0)
+        units = 0
+        for column, char in enumerate(self._lines[index]):
+            if units >= character:
+                return column
+            units += 2 if ord(char) > 0xFFFF else 1
+        return len(self._lines[index]) + character - units
+
+
+def as_line_index(source: str | LineIndex) -> LineIndex:
+    """Accept raw text or a prebuilt index, so callers that hold one never re-split."""
+    return source if isinstance(source, LineIndex) else LineIndex(source)
+
+
+def _utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
@@ -1,12 +1,19 @@
-"""Typed mapping helpers between DMJEDI diagnostics and LSP diagnostics."""
+"""Typed mapping helpers between DMJEDI diagnostics and LSP diagnostics.
+
+Builders take the document text or, preferably, the ``LineIndex`` built once per analysis;
+ranges are returned in UTF-16 characters as LSP requires.
+"""
 
 from __future__ import annotations
 
 from lsprotocol import types
 
 from dmjedi.lang.ast import SourceLocation
+from dmjedi.lang.lint_config import LintConfigError
 from dmjedi.lang.linter import LintDiagnostic, Severity
 from dmjedi.lang.parser import DVMLParseError
+from dmjedi.lsp.lines import LineIndex, as_line_index
+from dmjedi.model.resolver import ResolverError
 
 _WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.-")
 _SEVERITY_MAP = {
@@ -17,12 +24,12 @@ _SEVERITY_MAP = {
 
 
 def range_from_location(
-    source: str,
+    source: str | LineIndex,
     location: SourceLocation,
     fallback_length: int = 1,
 ) -> types.Range:
     """Build an LSP range from a start-only source location and current document text."""
-    lines = source.splitlines(keepends=True)
+    lines = as_line_index(source)
     line_index = max(location.line - 1, 0)
     character = max(location.column - 1, 0)
 
@@ -33,16 +40,11 @@ def range_from_location(
             end=types.Position(line=line_index, character=end_character),
         )
 
-    line_text = lines[line_index].rstrip("\r\n")
-    token_length = _token_length_at_column(line_text, character, fallback_length)
-
-    return types.Range(
-        start=types.Position(line=line_index, character=character),
-        end=types.Position(line=line_index, character=character + token_length),
-    )
+    token_length = _token_length_at_column(lines.line(line_index), character, fallback_length)
+    return _line_range(lines, line_index, character, character + token_length)
 
 
-def parse_error_to_lsp(error: DVMLParseError, source: str) -> types.Diagnostic:
+def parse_error_to_lsp(error: DVMLParseError, source: str | LineIndex) -> types.Diagnostic:
     """Convert a structured parse error into an LSP diagnostic."""
     return types.Diagnostic(
         range=range_from_location(source, _parse_error_location(error), fallback_length=1),
@@ -52,7 +54,19 @@ def parse_error_to_lsp(error: DVMLParseError, source: str) -> types.Diagnostic:
     )
 
 
-def lint_diagnostic_to_lsp(diagnostic: LintDiagnostic, source: str) -> types.Diagnostic:
+def config_error_to_lsp(error: LintConfigError) -> types.Diagnostic:
+    """Report an invalid ``.dvml-lint.toml`` at the start of the document it governs."""
+    start = types.Position(line=0, character=0)
+    return types.Diagnostic(
+        range=types.Range(start=start, end=start),
+        message=str(error),
+        severity=types.DiagnosticSeverity.Error,
+        code="config-error",
+        source="dmjedi",
+    )
+
+
+def lint_diagnostic_to_lsp(diagnostic: LintDiagnostic, source: str | LineIndex) -> types.Diagnostic:
     """Convert a lint diagnostic into an LSP diagnostic."""
     return types.Diagnostic(
         range=range_from_location(source, diagnostic.loc, fallback_length=1),
@@ -63,9 +77,20 @@ def lint_diagnostic_to_lsp(diagnostic: LintDiagnostic, source: str) -> types.Dia
     )
 
 
+def resolver_error_to_lsp(error: ResolverError, source: str | LineIndex) -> types.Diagnostic:
+    """Convert a resolver error into an LSP diagnostic on the name it is about."""
+    return types.Diagnostic(
+        range=token_range_on_line(source, error.line, error.subject),
+        message=error.message,
+        severity=types.DiagnosticSeverity.Error,
+        code=error.code,
+        source="dmjedi",
+    )
+
+
 def semantic_diagnostic(
     *,
-    source: str,
+    source: str | LineIndex,
     line: int,
     token: str,
     message: str,
@@ -89,59 +114,62 @@ def _parse_error_location(error: DVMLParseError) -> SourceLocation:
     )
 
 
-def name_range_from_location(source: str, location: SourceLocation, name: str) -> types.Range:
+def name_range_from_location(
+    source: str | LineIndex, location: SourceLocation, name: str
+) -> types.Range:
     """Build a range for an entity name that appears after a declaration keyword."""
+    lines = as_line_index(source)
     line_index = max(location.line - 1, 0)
     character = max(location.column - 1, 0)
-    line_text = source.splitlines()[line_index] if line_index < len(source.splitlines()) else ""
-    name_start = line_text.find(name, character)
+    name_start = lines.line(line_index).find(name, character)
     if name_start < 0:
         name_start = character
-    return types.Range(
-        start=types.Position(line=line_index, character=name_start),
-        end=types.Position(line=line_index, character=name_start + max(len(name), 1)),
-    )
+    return _line_range(lines, line_index, name_start, name_start + max(len(name), 1))
 
 
-def block_range_from_location(source: str, location: SourceLocation) -> types.Range:
+def block_range_from_location(source: str | LineIndex, location: SourceLocation) -> types.Range:
     """Build a coarse declaration block range from its opening line to closing brace."""
-    lines = source.splitlines()
+    lines = as_line_index(source)
     line_index = max(location.line - 1, 0)
     if line_index >= len(lines):
-        return range_from_location(source, location, fallback_length=1)
+        return range_from_location(lines, location, fallback_length=1)
 
     end_line = line_index
     for candidate in range(line_index, len(lines)):
         end_line = candidate
-        if "}" in lines[candidate]:
+        if "}" in lines.line(candidate):
             break
+    end_text = lines.line(end_line)
     return types.Range(
         start=types.Position(line=line_index, character=0),
-        end=types.Position(line=end_line, character=len(lines[end_line])),
+        end=types.Position(line=end_line, character=lines.to_utf16(end_line, len(end_text))),
     )
 
 
-def token_range_on_line(source: str, line: int, token: str) -> types.Range:
+def token_range_on_line(source: str | LineIndex, line: int, token: str) -> types.Range:
     """Build a range for the first occurrence of a token on a given 1-based line."""
-    lines = source.splitlines()
+    lines = as_line_index(source)
     line_index = max(line - 1, 0)
     if line_index >= len(lines):
         start = types.Position(line=line_index, character=0)
         return types.Range(start=start, end=start)
 
-    line_text = lines[line_index]
-    start_character = line_text.find(token)
+    start_character = lines.line(line_index).find(token)
     if start_character < 0:
         start_character = 0
+    return _line_range(lines, line_index, start_character, start_character + max(len(token), 1))
 
+
+def _line_range(lines: LineIndex, line_index: int, start: int, end: int) -> types.Range:
+    """Range on one line from code point columns, in LSP (UTF-16) characters."""
     return types.Range(
-        start=types.Position(line=line_index, character=start_character),
-        end=types.Position(line=line_index, character=start_character + max(len(token), 1)),
+        start=types.Position(line=line_index, character=lines.to_utf16(line_index, start)),
+        end=types.Position(line=line_index, character=lines.to_utf16(line_index, end)),
     )
 
 
 def build_hover(
-    source: str,
+    source: str | LineIndex,
     name: str,
     kind: str,
     location: SourceLocation,
@@ -169,7 +197,7 @@ def build_hover(
 
 def build_definition_location(
     uri: str,
-    source: str,
+    source: str | LineIndex,
     name: str,
     location: SourceLocation,
 ) -> types.Location:
@@ -181,19 +209,32 @@ def build_definition_location(
 
 
 def build_document_symbol(
-    source: str,
+    source: str | LineIndex,
     name: str,
     kind: str,
     location: SourceLocation,
     detail: str,
 ) -> types.DocumentSymbol:
     """Build a document symbol entry for a DVML declaration."""
+    lines = as_line_index(source)
     return types.DocumentSymbol(
         name=name,
         detail=detail,
         kind=_symbol_kind(kind),
-        range=block_range_from_location(source, location),
-        selection_range=name_range_from_location(source, location, name),
+        range=block_range_from_location(lines, location),
+        selection_range=name_range_from_location(lines, location, name),
+    )
+
+
+def build_workspace_symbol(
+    name: str, kind: str, namespace: str, location: types.Location
+) -> types.WorkspaceSymbol:
+    """Build a workspace symbol entry for a declaration in any workspace file."""
+    return types.WorkspaceSymbol(
+        name=name,
+        kind=_symbol_kind(kind),
+        location=location,
+        container_name=namespace or None,
     )
 
 
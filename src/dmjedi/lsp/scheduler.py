@@ -0,0 +1,129 @@
+"""Debounced background analysis for open documents.
+
+Re-parsing and re-linting inside ``didChange`` blocks the server from reading the next
+message, so typing in a large ``.dv`` file queues up one full analysis per keystroke.
+``AnalysisScheduler`` waits for a pause in edits (``delay``) and then analyzes on a single
+worker thread. A newer edit cancels the pending timer, a queued analysis of an older
+version is skipped, and a result that completes after a newer edit arrived is dropped, so
+only the latest version of a document is ever published.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Generic, TypeVar
+
+_AnalysisT = TypeVar("_AnalysisT")
+
+DEFAULT_DELAY = 0.15
+
+
+class AnalysisScheduler(Generic[_AnalysisT]):
+    """Runs ``analyze(uri, source, version)`` off the request thread, latest edit wins.
+
+    ``publish`` receives each result that is still current when it completes; it runs
+    while the scheduler lock is held, so a concurrent ``schedule``/``cancel`` for the same
+    document cannot slip in between the staleness check and the publish.
+    """
+
+    def __init__(
+        self,
+        analyze: Callable[[str, str, int | None], _AnalysisT],
+        publish: Callable[[_AnalysisT], None],
+        delay: float = DEFAULT_DELAY,
+    ) -> None:
+        self.delay = delay
+        self._analyze = analyze
+        self._publish = publish
+        # Reentrant: a future that is already done runs its callback in the submitting thread.
+        self._lock = threading.RLock()
+        self._tickets: dict[str, int] = {}
+        self._timers: dict[str, threading.Timer] = {}
+        self._futures: set[Future[None]] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dmjedi-lsp")
+
+    def schedule(
+        self, uri: str, source: str, version: int | None, delay: float | None = None
+    ) -> None:
+        """Analyze ``source`` once edits to ``uri`` pause, superseding earlier requests.
+
+        ``delay`` overrides the debounce interval; ``0`` queues the analysis right away.
+        """
+        delay = self.delay if delay is None else delay
+        with self._lock:
+            ticket = self._next_ticket(uri)
+            if delay <= 0:
+                self._submit_locked(uri, ticket, source, version)
+                return
+            timer = threading.Timer(delay, self._submit, (uri, ticket, source, version))
+            timer.daemon = True
+            self._timers[uri] = timer
+            timer.start()
+
+    def cancel(self, uri: str) -> None:
+        """Drop pending and in-flight analyses of ``uri`` (e.g. when it is closed)."""
+        with self._lock:
+            self._next_ticket(uri)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until no analysis is pending; returns False if ``timeout`` expires first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                waiters: list[threading.Timer | Future[None]] = [
+                    *self._timers.values(),
+                    *self._futures,
+                ]
+            if not waiters:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            waiter = waiters[0]
+            if isinstance(waiter, threading.Timer):
+                waiter.join(remaining)
+            else:
+                futures.wait([waiter], remaining)
+
+    def shutdown(self) -> None:
+        """Cancel every pending analysis and stop the worker thread."""
+        with self._lock:
+            for uri in list(self._tickets):
+                self._next_ticket(uri)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _next_ticket(self, uri: str) -> int:
+        ticket = self._tickets.get(uri, 0) + 1
+        self._tickets[uri] = ticket
+        timer = self._timers.pop(uri, None)
+        if timer is not None:
+            timer.cancel()
+        return ticket
+
+    def _submit(self, uri: str, ticket: int, source: str, version: int | None) -> None:
+        with self._lock:
+            if self._tickets.get(uri) != ticket:
+                return
+            self._timers.pop(uri, None)
+            self._submit_locked(uri, ticket, source, version)
+
+    def _submit_locked(self, uri: str, ticket: int, source: str, version: int | None) -> None:
+        future = self._executor.submit(self._run, uri, ticket, source, version)
+        self._futures.add(future)
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future: Future[None]) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run(self, uri: str, ticket: int, source: str, version: int | None) -> None:
+        if self._tickets.get(uri) != ticket:
+            return
+        result = self._analyze(uri, source, version)
+        with self._lock:
+            if self._tickets.get(uri) == ticket:
+                self._publish(result)
@@ -0,0 +1,226 @@
+"""Semantic tokens for DVML documents, full and delta.
+
+Tokens are computed from a cached ``DocumentAnalysis``: each line is scanned once for
+comments, strings, numbers, operators and words, and words are classified through the
+analysis' ``SpanIndex`` (declaration names and entity references, by the kind of entity
+they name) before falling back to field names, data types and keywords. The result is the
+LSP integer encoding: five integers per token, positions relative to the previous token and
+columns in UTF-16 code units.
+
+``SemanticTokensCache`` remembers the last result sent for each document, so a
+``semanticTokens/full/delta`` request is answered with the one edit that turns the previous
+array into the current one. Because positions are relative, an edit in a large model
+usually changes only a handful of integers around it.
+"""
+
+from __future__ import annotations
+
+import itertools
+import re
+from dataclasses import dataclass
+
+from lsprotocol import types
+
+from dmjedi.lsp.analysis import DeclarationInfo, DocumentAnalysis
+
+TOKEN_TYPES = (
+    "namespace",
+    "class",
+    "struct",
+    "interface",
+    "function",
+    "variable",
+    "property",
+    "type",
+    "keyword",
+    "string",
+    "number",
+    "comment",
+    "operator",
+)
+TOKEN_MODIFIERS = ("declaration",)
+LEGEND = types.SemanticTokensLegend(
+    token_types=list(TOKEN_TYPES), token_modifiers=list(TOKEN_MODIFIERS)
+)
+
+_TYPE_INDEX = {name: index for index, name in enumerate(TOKEN_TYPES)}
+_DECLARATION = 1 << TOKEN_MODIFIERS.index("declaration")
+# Entity kind -> token type; mirrors the symbol kinds of the document outline.
+_KIND_TOKEN_TYPES = {
+    "hub": "class",
+    "satellite": "struct",
+    "nhsat": "struct",
+    "effsat": "struct",
+    "link": "interface",
+    "nhlink": "interface",
+    "samlink": "interface",
+    "bridge": "function",
+    "pit": "variable",
+}
+_KEYWORDS = frozenset(
+    {
+        "namespace",
+        "import",
+        "hub",
+        "satellite",
+        "link",
+        "nhsat",
+        "nhlink",
+        "effsat",
+        "samlink",
+        "bridge",
+        "pit",
+        "business_key",
+        "of",
+        "references",
+        "tracks",
+        "path",
+        "master",
+        "duplicate",
+        "not",
+        "null",
+        "check",
+    }
+)
+_LEXEME_RE = re.compile(
+    r'(?P<string>"[^"]*"?)|(?P<comment>#.*)|(?P<operator>->)|(?P<number>\d+)'
+    r"|(?P<word>[A-Za-z_][A-Za-z0-9_.]*)"
+)
+_NAMESPACE_PREFIX_RE = re.compile(r"^\s*namespace\s+$")
+
+
+def semantic_token_data(analysis: DocumentAnalysis) -> list[int]:
+    """Encoded semantic tokens of the whole document."""
+    lines = analysis.lines
+    data: list[int] = []
+    previous_line = 0
+    previous_start = 0
+    for index in range(len(lines)):
+        text = lines.line(index)
+        for match in _LEXEME_RE.finditer(text):
+            classified = _classify(analysis, index, text, match)
+            if classified is None:
+                continue
+            token_type, modifiers = classified
+            start = lines.to_utf16(index, match.start())
+            length = lines.to_utf16(index, match.end()) - start
+            data += (
+                index - previous_line,
+                start - previous_start if index == previous_line else start,
+                length,
+                _TYPE_INDEX[token_type],
+                modifiers,
+            )
+            previous_line, previous_start = index, start
+    return data
+
+
+def token_edits(previous: list[int], current: list[int]) -> list[types.SemanticTokensEdit]:
+    """The single edit replacing the differing middle of ``previous`` with ``current``.
+
+    Empty when both arrays are equal.
+    """
+    limit = min(len(previous), len(current))
+    prefix = 0
+    while prefix < limit and previous[prefix] == current[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < limit - prefix
+        and previous[len(previous) - 1 - suffix] == current[len(current) - 1 - suffix]
+    ):
+        suffix += 1
+    if prefix == len(previous) == len(current):
+        return []
+    return [
+        types.SemanticTokensEdit(
+            start=prefix,
+            delete_count=len(previous) - prefix - suffix,
+            data=current[prefix : len(current) - suffix],
+        )
+    ]
+
+
+@dataclass(slots=True)
+class _SentTokens:
+    analysis: DocumentAnalysis
+    result_id: str
+    data: list[int]
+
+
+class SemanticTokensCache:
+    """Last semantic tokens sent per document, for delta responses.
+
+    Tokens are recomputed only when the document has a new analysis; repeated requests
+    against the same analysis reuse the cached array and result id.
+    """
+
+    def __init__(self) -> None:
+        self._sent: dict[str, _SentTokens] = {}
+        self._ids = itertools.count(1)
+
+    def full(self, analysis: DocumentAnalysis) -> types.SemanticTokens:
+        sent = self._update(analysis)
+        return types.SemanticTokens(data=sent.data, result_id=sent.result_id)
+
+    def delta(
+        self, analysis: DocumentAnalysis, previous_result_id: str
+    ) -> types.SemanticTokens | types.SemanticTokensDelta:
+        """Edits against ``previous_result_id``, or the full array if it is not the last
+        result sent for the document."""
+        previous = self._sent.get(analysis.uri)
+        if previous is None or previous.result_id != previous_result_id:
+            return self.full(analysis)
+        sent = self._update(analysis)
+        return types.SemanticTokensDelta(
+            edits=token_edits(previous.data, sent.data), result_id=sent.result_id
+        )
+
+    def forget(self, uri: str) -> None:
+        self._sent.pop(uri, None)
+
+    def _update(self, analysis: DocumentAnalysis) -> _SentTokens:
+        sent = self._sent.get(analysis.uri)
+        if sent is None or sent.analysis is not analysis:
+            sent = _SentTokens(analysis, str(next(self._ids)), semantic_token_data(analysis))
+            self._sent[analysis.uri] = sent
+        return sent
+
+
+def _classify(
+    analysis: DocumentAnalysis, line: int, text: str, match: re.Match[str]
+) -> tuple[str, int] | None:
+    group = match.lastgroup
+    if group is None:
+        return None
+    if group != "word":
+        return group, 0
+    start, end = match.span()
+    span = analysis.spans.at(line, start)
+    if span is not None and span.start == start:
+        target = span.payload
+        if isinstance(target, DeclarationInfo):
+            return _KIND_TOKEN_TYPES.get(target.kind, "class"), _DECLARATION
+        return _reference_token_type(analysis, target.name, target.kinds), 0
+    if _NAMESPACE_PREFIX_RE.match(text[:start]):
+        return "namespace", 0
+    if text[:start].rstrip().endswith(":"):
+        return "type", 0
+    if text[end:].lstrip().startswith(":"):
+        return "property", 0
+    if match.group() in _KEYWORDS:
+        return "keyword", 0
+    return None
+
+
+def _reference_token_type(
+    analysis: DocumentAnalysis, name: str, kinds: tuple[str, ...] | None
+) -> str:
+    namespace = analysis.module.namespace
+    declaration = analysis.declarations.get(name)
+    if declaration is None and namespace:
+        declaration = analysis.declarations.get(name.removeprefix(f"{namespace}."))
+    if declaration is not None:
+        return _KIND_TOKEN_TYPES.get(declaration.kind, "class")
+    # Declared in another file: the first kind the reference context allows.
+    return _KIND_TOKEN_TYPES.get(kinds[0], "class") if kinds else "class"
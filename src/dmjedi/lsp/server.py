@@ -1,9 +1,32 @@
-"""DVML Language Server bootstrap and diagnostics handlers."""
+"""DVML Language Server bootstrap and diagnostics handlers.
+
+Documents are synced incrementally (pygls applies each edit to its workspace copy) and
+diagnostics are computed by an ``AnalysisScheduler``: edits are debounced and analyzed on
+a background thread, and only the latest version of a document is published. Requests
+such as hover and completion analyze synchronously when the cached analysis is older
+than the document they are asked about.
+
+A ``WorkspaceIndex`` of every ``.dv`` file in the workspace folders is built on a
+background thread after ``initialized`` and kept current from published analyses and
+watched-file notifications. It backs cross-file definition, references, workspace symbols
+and parent diagnostics; open documents whose references are affected by a change
+elsewhere are re-analyzed. Its compile session resolves each analyzed document against
+the whole workspace, so duplicate definitions, bridge paths, PIT tracking and model-aware
+lint rules are reported across files.
+
+Semantic tokens and folding ranges are derived from the cached analysis; semantic tokens
+remember the last result per document so ``full/delta`` requests send only the changes.
+"""
 
 from __future__ import annotations
 
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
 from lsprotocol import types
 from pygls.lsp.server import LanguageServer
+from pygls.uris import to_fs_path
 
 from dmjedi.lsp.analysis import (
     DocumentAnalysis,
@@ -11,17 +34,32 @@ from dmjedi.lsp.analysis import (
     completion_context,
     completion_items_for_context,
     declaration_infos,
+    forget_document,
     lookup_symbol_at_position,
+    reference_at_position,
+)
+from dmjedi.lsp.folding import folding_ranges
+from dmjedi.lsp.protocol import (
+    build_definition_location,
+    build_document_symbol,
+    build_hover,
+    build_workspace_symbol,
 )
-from dmjedi.lsp.protocol import build_definition_location, build_document_symbol, build_hover
+from dmjedi.lsp.scheduler import AnalysisScheduler
+from dmjedi.lsp.semantic_tokens import LEGEND, SemanticTokensCache
+from dmjedi.lsp.workspace import WorkspaceIndex, file_symbols, read_file_symbols
 
-SERVER = LanguageServer("dmjedi", "0.2.0")
+SERVER = LanguageServer(
+    "dmjedi", "0.2.0", text_document_sync_kind=types.TextDocumentSyncKind.Incremental
+)
 _ANALYSES: dict[str, DocumentAnalysis] = {}
+_WORKSPACE = WorkspaceIndex()
+_SEMANTIC_TOKENS = SemanticTokensCache()
 
 
 def refresh_document(uri: str, source: str, version: int | None) -> DocumentAnalysis:
     """Analyze and cache the current in-memory contents for a document URI."""
-    analysis = analyze_document(uri=uri, source=source, version=version)
+    analysis = analyze_document(uri=uri, source=source, version=version, workspace=_WORKSPACE)
     _ANALYSES[uri] = analysis
     return analysis
 
@@ -33,15 +71,56 @@ def publish_document_diagnostics(
     version: int | None,
 ) -> DocumentAnalysis:
     """Publish current-document diagnostics for a single text document."""
-    analysis = refresh_document(uri=uri, source=source, version=version)
+    analysis = analyze_document(uri=uri, source=source, version=version, workspace=_WORKSPACE)
+    publish_analysis(server, analysis)
+    return analysis
+
+
+def publish_analysis(server: LanguageServer, analysis: DocumentAnalysis) -> None:
+    """Cache a finished analysis and publish its diagnostics for the analyzed version."""
+    _ANALYSES[analysis.uri] = analysis
     server.text_document_publish_diagnostics(
         types.PublishDiagnosticsParams(
-            uri=uri,
+            uri=analysis.uri,
             diagnostics=analysis.diagnostics,
-            version=version,
+            version=analysis.version,
         )
     )
-    return analysis
+
+
+def _analyze(uri: str, source: str, version: int | None) -> DocumentAnalysis:
+    return analyze_document(uri=uri, source=source, version=version, workspace=_WORKSPACE)
+
+
+def _publish_and_index(analysis: DocumentAnalysis) -> None:
+    publish_analysis(SERVER, analysis)
+    _reanalyze(_WORKSPACE.update(analysis.uri, file_symbols(analysis)))
+
+
+_SCHEDULER: AnalysisScheduler[DocumentAnalysis] = AnalysisScheduler(_analyze, _publish_and_index)
+
+
+def _reanalyze(uris: Iterable[str]) -> None:
+    """Queue fresh analyses of the open documents among ``uris``."""
+    for uri in uris:
+        analysis = _ANALYSES.get(uri)
+        if analysis is not None:
+            _SCHEDULER.schedule(uri, analysis.source, analysis.version)
+
+
+def _index_file(uri: str) -> set[str]:
+    """Re-read a workspace file from disk into the index; returns affected documents."""
+    try:
+        source = Path(to_fs_path(uri) or uri).read_text()
+    except (OSError, UnicodeDecodeError):
+        return _WORKSPACE.remove(uri)
+    return _WORKSPACE.update(uri, read_file_symbols(uri, source))
+
+
+def _scan_workspace(roots: list[Path]) -> None:
+    # Open documents are indexed from their buffers when their analyses are published.
+    _WORKSPACE.scan(roots, skip=list(_ANALYSES))
+    _reanalyze(list(_ANALYSES))
 
 
 def get_analysis(uri: str) -> DocumentAnalysis | None:
@@ -53,7 +132,7 @@ def document_completions(
     analysis: DocumentAnalysis, position: types.Position
 ) -> list[types.CompletionItem]:
     """Return conservative completions for the current document and cursor position."""
-    context = completion_context(analysis.source, position.line, position.character)
+    context = completion_context(analysis.lines, position.line, position.character)
     return completion_items_for_context(analysis, context)
 
 
@@ -65,7 +144,7 @@ def document_hover(analysis: DocumentAnalysis, position: types.Position) -> type
 
     declaration = match.declaration
     return build_hover(
-        source=analysis.source,
+        source=analysis.lines,
         name=declaration.name,
         kind=declaration.kind,
         location=declaration.loc,
@@ -76,25 +155,72 @@ def document_hover(analysis: DocumentAnalysis, position: types.Position) -> type
 
 
 def document_definition(
-    analysis: DocumentAnalysis, position: types.Position
+    analysis: DocumentAnalysis,
+    position: types.Position,
+    workspace: WorkspaceIndex | None = None,
 ) -> types.Location | None:
-    """Build a definition target for a same-document reference."""
+    """Build a definition target for a reference, in this document or (with a workspace
+    index) in any other workspace file."""
     match = lookup_symbol_at_position(analysis, position)
-    if match is None or not match.is_reference:
+    if match is not None:
+        if not match.is_reference:
+            return None
+        return build_definition_location(
+            uri=analysis.uri,
+            source=analysis.lines,
+            name=match.declaration.name,
+            location=match.declaration.loc,
+        )
+    token = reference_at_position(analysis, position)
+    if token is None or workspace is None:
         return None
-    return build_definition_location(
-        uri=analysis.uri,
-        source=analysis.source,
-        name=match.declaration.name,
-        location=match.declaration.loc,
-    )
+    symbol = workspace.resolve(token.name, analysis.module.namespace, token.kinds)
+    return symbol.location if symbol is not None else None
+
+
+def document_references(
+    analysis: DocumentAnalysis,
+    position: types.Position,
+    workspace: WorkspaceIndex,
+    include_declaration: bool = True,
+) -> list[types.Location]:
+    """Find every workspace reference to the declaration or reference under the cursor."""
+    namespace = analysis.module.namespace
+    match = lookup_symbol_at_position(analysis, position)
+    kinds: tuple[str, ...] | None
+    if match is not None:
+        name, kinds = match.name, (match.declaration.kind,)
+    else:
+        token = reference_at_position(analysis, position)
+        if token is None:
+            return []
+        name, kinds = token.name, token.kinds
+    symbol = workspace.resolve(name, namespace, kinds)
+    if symbol is not None:
+        qualified_name = symbol.qualified_name
+    elif match is not None:
+        qualified_name = f"{namespace}.{name}" if namespace else name
+    else:
+        return []
+    locations = [reference.location for reference in workspace.references(qualified_name)]
+    if include_declaration:
+        locations[:0] = [found.location for found in workspace.definitions(qualified_name)]
+    return locations
+
+
+def workspace_symbols(workspace: WorkspaceIndex, query: str) -> list[types.WorkspaceSymbol]:
+    """Declarations across the workspace whose name contains ``query``."""
+    return [
+        build_workspace_symbol(symbol.name, symbol.kind, symbol.namespace, symbol.location)
+        for symbol in workspace.symbols(query)
+    ]
 
 
 def document_symbols(analysis: DocumentAnalysis) -> list[types.DocumentSymbol]:
     """Build the document symbol outline for the active document."""
     return [
         build_document_symbol(
-            source=analysis.source,
+            source=analysis.lines,
             name=declaration.name,
             kind=declaration.kind,
             location=declaration.loc,
@@ -105,26 +231,91 @@ def document_symbols(analysis: DocumentAnalysis) -> list[types.DocumentSymbol]:
 
 
 def _current_analysis(server: LanguageServer, uri: str) -> DocumentAnalysis:
+    document = server.workspace.get_text_document(uri)
     analysis = get_analysis(uri)
-    if analysis is not None:
+    if analysis is not None and analysis.version == document.version:
         return analysis
-
-    document = server.workspace.get_text_document(uri)
+    # Typed ahead of the debounced analysis: answer from the text the client sees.
     return refresh_document(document.uri, document.source, document.version)
 
 
+def _workspace_roots(server: LanguageServer) -> list[Path]:
+    folders = [folder.uri for folder in server.workspace.folders.values()]
+    if not folders and server.workspace.root_uri:
+        folders = [server.workspace.root_uri]
+    return [Path(path) for uri in folders if (path := to_fs_path(uri))]
+
+
+@SERVER.feature(types.INITIALIZED)
+def initialized(server: LanguageServer, params: types.InitializedParams) -> None:
+    """Index the workspace in the background and ask the client to report .dv file changes."""
+    threading.Thread(
+        target=_scan_workspace,
+        args=(_workspace_roots(server),),
+        name="dmjedi-lsp-index",
+        daemon=True,
+    ).start()
+    workspace = server.client_capabilities.workspace
+    watched = workspace.did_change_watched_files if workspace else None
+    if watched is not None and watched.dynamic_registration:
+        server.client_register_capability(
+            types.RegistrationParams(
+                registrations=[
+                    types.Registration(
+                        id="dmjedi-watch-dv",
+                        method=types.WORKSPACE_DID_CHANGE_WATCHED_FILES,
+                        register_options=types.DidChangeWatchedFilesRegistrationOptions(
+                            watchers=[types.FileSystemWatcher(glob_pattern="**/*.dv")]
+                        ),
+                    )
+                ]
+            )
+        )
+
+
+@SERVER.feature(types.WORKSPACE_DID_CHANGE_WATCHED_FILES)
+def did_change_watched_files(
+    server: LanguageServer, params: types.DidChangeWatchedFilesParams
+) -> None:
+    """Re-index .dv files changed on disk and refresh documents that reference them."""
+    affected: set[str] = set()
+    for change in params.changes:
+        if not change.uri.endswith(".dv") or change.uri in _ANALYSES:
+            continue  # open documents are indexed from their buffers
+        if change.type == types.FileChangeType.Deleted:
+            affected |= _WORKSPACE.remove(change.uri)
+        else:
+            affected |= _index_file(change.uri)
+    _reanalyze(affected)
+
+
 @SERVER.feature(types.TEXT_DOCUMENT_DID_OPEN)
 def did_open(server: LanguageServer, params: types.DidOpenTextDocumentParams) -> None:
-    """Publish diagnostics for newly opened documents."""
+    """Analyze newly opened documents in the background without debouncing."""
     document = server.workspace.get_text_document(params.text_document.uri)
-    publish_document_diagnostics(server, document.uri, document.source, document.version)
+    _SCHEDULER.schedule(document.uri, document.source, document.version, delay=0)
 
 
 @SERVER.feature(types.TEXT_DOCUMENT_DID_CHANGE)
 def did_change(server: LanguageServer, params: types.DidChangeTextDocumentParams) -> None:
-    """Re-analyze and publish diagnostics after document edits."""
+    """Schedule a debounced re-analysis of the edited document."""
     document = server.workspace.get_text_document(params.text_document.uri)
-    publish_document_diagnostics(server, document.uri, document.source, document.version)
+    _SCHEDULER.schedule(document.uri, document.source, document.version)
+
+
+@SERVER.feature(types.TEXT_DOCUMENT_DID_CLOSE)
+def did_close(server: LanguageServer, params: types.DidCloseTextDocumentParams) -> None:
+    """Drop pending analyses and clear diagnostics for a closed document."""
+    uri = params.text_document.uri
+    _SCHEDULER.cancel(uri)
+    _ANALYSES.pop(uri, None)
+    _SEMANTIC_TOKENS.forget(uri)
+    forget_document(uri)
+    server.text_document_publish_diagnostics(
+        types.PublishDiagnosticsParams(uri=uri, diagnostics=[])
+    )
+    # Unsaved edits are gone; the index goes back to what is on disk.
+    _reanalyze(_index_file(uri))
 
 
 @SERVER.feature(types.TEXT_DOCUMENT_COMPLETION)
@@ -147,9 +338,26 @@ def hover(server: LanguageServer, params: types.HoverParams) -> types.Hover | No
 def definition(
     server: LanguageServer, params: types.DefinitionParams
 ) -> types.Location | None:
-    """Resolve same-document definitions for references."""
+    """Resolve definitions for references, falling back to the workspace index."""
+    analysis = _current_analysis(server, params.text_document.uri)
+    return document_definition(analysis, params.position, _WORKSPACE)
+
+
+@SERVER.feature(types.TEXT_DOCUMENT_REFERENCES)
+def references(server: LanguageServer, params: types.ReferenceParams) -> list[types.Location]:
+    """Return references to an entity from every workspace file."""
     analysis = _current_analysis(server, params.text_document.uri)
-    return document_definition(analysis, params.position)
+    return document_references(
+        analysis, params.position, _WORKSPACE, params.context.include_declaration
+    )
+
+
+@SERVER.feature(types.WORKSPACE_SYMBOL)
+def workspace_symbol(
+    server: LanguageServer, params: types.WorkspaceSymbolParams
+) -> list[types.WorkspaceSymbol]:
+    """Search declarations across the workspace by name."""
+    return workspace_symbols(_WORKSPACE, params.query)
 
 
 @SERVER.feature(types.TEXT_DOCUMENT_DOCUMENT_SYMBOL)
@@ -161,6 +369,33 @@ def document_symbol(
     return document_symbols(analysis)
 
 
+@SERVER.feature(types.TEXT_DOCUMENT_SEMANTIC_TOKENS_FULL, LEGEND)
+def semantic_tokens_full(
+    server: LanguageServer, params: types.SemanticTokensParams
+) -> types.SemanticTokens:
+    """Return the current document's semantic tokens."""
+    analysis = _current_analysis(server, params.text_document.uri)
+    return _SEMANTIC_TOKENS.full(analysis)
+
+
+@SERVER.feature(types.TEXT_DOCUMENT_SEMANTIC_TOKENS_FULL_DELTA)
+def semantic_tokens_delta(
+    server: LanguageServer, params: types.SemanticTokensDeltaParams
+) -> types.SemanticTokens | types.SemanticTokensDelta:
+    """Return semantic token edits since the client's previous result."""
+    analysis = _current_analysis(server, params.text_document.uri)
+    return _SEMANTIC_TOKENS.delta(analysis, params.previous_result_id)
+
+
+@SERVER.feature(types.TEXT_DOCUMENT_FOLDING_RANGE)
+def folding_range(
+    server: LanguageServer, params: types.FoldingRangeParams
+) -> list[types.FoldingRange]:
+    """Return foldable declaration bodies, comment blocks and import groups."""
+    analysis = _current_analysis(server, params.text_document.uri)
+    return folding_ranges(analysis)
+
+
 def start_server() -> None:
     """Start the DMJEDI language server over stdio."""
     SERVER.start_io()
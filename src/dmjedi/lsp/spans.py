@@ -0,0 +1,53 @@
+"""Sorted interval index over the symbol spans of one document.
+
+Hover and definition used to test every declaration of the document against the cursor,
+recomputing each name's range from the source text. ``SpanIndex`` is built once per
+analysis from the declaration names and reference tokens; spans never overlap, so the
+span under a position is found with one ``bisect`` over the sorted span starts.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+_PayloadT = TypeVar("_PayloadT")
+
+
+@dataclass(frozen=True, slots=True)
+class Span(Generic[_PayloadT]):
+    """A token on one line: 0-based line, code point columns ``[start, end]``."""
+
+    line: int
+    start: int
+    end: int
+    payload: _PayloadT
+
+
+class SpanIndex(Generic[_PayloadT]):
+    """Spans sorted by position, searchable by (line, column)."""
+
+    __slots__ = ("_keys", "_spans")
+
+    def __init__(self, spans: Iterable[Span[_PayloadT]]) -> None:
+        self._spans = sorted(spans, key=lambda span: (span.line, span.start))
+        self._keys = [(span.line, span.start) for span in self._spans]
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __iter__(self) -> Iterator[Span[_PayloadT]]:
+        return iter(self._spans)
+
+    def at(self, line: int, column: int) -> Span[_PayloadT] | None:
+        """The span containing ``column`` on ``line`` (end inclusive, like a cursor after
+        the last character), or None."""
+        index = bisect_right(self._keys, (line, column)) - 1
+        if index < 0:
+            return None
+        span = self._spans[index]
+        if span.line == line and column <= span.end:
+            return span
+        return None
@@ -0,0 +1,317 @@
+"""Workspace-wide symbol index for the DVML LSP.
+
+Document analysis only sees the open file, so a satellite whose hub lives in an imported
+file could neither jump to it nor be checked against it. ``WorkspaceIndex`` holds every
+``.dv`` file of the workspace: declarations by qualified and short name, and an inverted
+index from names to the references that may resolve to them. Files are scanned once in
+the background, then kept current from analyses of open documents and file-change
+notifications; each update only replaces the entries of the file that changed.
+
+References resolve like ``SymbolIndex.resolve``: the name as written first, then qualified
+with the referencing file's namespace, trying the allowed kinds in order. Lookups are dict
+probes, independent of the size of the workspace.
+
+The index also feeds a ``CompileSession`` with the module of every file that parses, so
+an open document is resolved against the whole workspace (duplicate definitions, bridge
+paths, PIT tracking, model-aware lint rules) by rebuilding only its own entities.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from lsprotocol import types
+from pygls.uris import from_fs_path
+
+from dmjedi.application.session import CompileSession, ModuleDiagnostics
+from dmjedi.lang.ast import DVMLModule
+from dmjedi.lang.discovery import discover_dv_files
+from dmjedi.lang.lint_config import LintConfig
+from dmjedi.lsp.analysis import (
+    DeclarationInfo,
+    DocumentAnalysis,
+    ReferenceToken,
+    build_declaration_index,
+    entity_name_range,
+    reference_tokens,
+)
+from dmjedi.lsp.incremental import IncrementalParser
+from dmjedi.lsp.lines import LineIndex
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedSymbol:
+    """A declaration somewhere in the workspace."""
+
+    name: str
+    namespace: str
+    kind: str
+    uri: str
+    range: types.Range
+
+    @property
+    def qualified_name(self) -> str:
+        return f"{self.namespace}.{self.name}" if self.namespace else self.name
+
+    @property
+    def location(self) -> types.Location:
+        return types.Location(uri=self.uri, range=self.range)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedReference:
+    """A reference token somewhere in the workspace, as written."""
+
+    name: str
+    namespace: str  # namespace of the referencing file
+    kinds: tuple[str, ...] | None
+    uri: str
+    range: types.Range
+
+    @property
+    def location(self) -> types.Location:
+        return types.Location(uri=self.uri, range=self.range)
+
+
+@dataclass(slots=True)
+class FileSymbols:
+    """What one file contributes to the index."""
+
+    symbols: list[IndexedSymbol]
+    references: list[IndexedReference]
+    # The parsed module of a file read from disk, if it parsed cleanly. Open documents
+    # hand their modules to the compile session from ``analyze_document`` instead.
+    module: DVMLModule | None = None
+
+
+def file_symbols(analysis: DocumentAnalysis) -> FileSymbols:
+    """Index entries for an analyzed (usually open) document."""
+    return _file_symbols(
+        analysis.uri,
+        analysis.module.namespace,
+        analysis.lines,
+        analysis.declarations,
+        analysis.references,
+    )
+
+
+def read_file_symbols(uri: str, source: str) -> FileSymbols:
+    """Index entries for a file on disk; parses without linting or caching its blocks."""
+    parsed = IncrementalParser(source_file=uri).parse(source)
+    module = parsed.module
+    lines = LineIndex(source)
+    entry = _file_symbols(
+        uri, module.namespace, lines, build_declaration_index(module), reference_tokens(lines)
+    )
+    if not parsed.errors:
+        entry.module = module
+    return entry
+
+
+def _file_symbols(
+    uri: str,
+    namespace: str,
+    lines: LineIndex,
+    declarations: dict[str, DeclarationInfo],
+    tokens: list[ReferenceToken],
+) -> FileSymbols:
+    symbols: list[IndexedSymbol] = []
+    for declaration in declarations.values():
+        name_range = entity_name_range(lines, declaration)
+        if name_range is not None:
+            symbols.append(
+                IndexedSymbol(declaration.name, namespace, declaration.kind, uri, name_range)
+            )
+    references = [
+        IndexedReference(token.name, namespace, token.kinds, uri, token.to_range(lines))
+        for token in tokens
+    ]
+    return FileSymbols(symbols=symbols, references=references)
+
+
+# name -> uri -> entries of that file, so replacing one file never scans other files' entries.
+_EntryT = TypeVar("_EntryT")
+_Table = dict[str, dict[str, list[_EntryT]]]
+
+
+class WorkspaceIndex:
+    """Inverted symbol/reference index over every ``.dv`` file of a workspace.
+
+    Safe to share between the LSP message loop, the analysis worker and the scan thread.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._files: dict[str, FileSymbols] = {}
+        self._definitions: _Table[IndexedSymbol] = {}
+        self._by_short: _Table[IndexedSymbol] = {}
+        # Keyed by every qualified name a reference may resolve to (see ``_candidates``).
+        self._references: _Table[IndexedReference] = {}
+        self.session = CompileSession()
+        self.scanned = threading.Event()
+
+    def __contains__(self, uri: object) -> bool:
+        return uri in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def scan(self, roots: Iterable[Path], skip: Iterable[str] = ()) -> int:
+        """Index every ``.dv`` file under ``roots`` not indexed yet or listed in ``skip``.
+
+        Returns the number of files read. Unreadable files are skipped.
+        """
+        skipped = set(skip)
+        count = 0
+        for path in discover_dv_files([root for root in roots if root.is_dir()]):
+            uri = from_fs_path(str(path)) or path.as_uri()
+            if uri in skipped or uri in self:
+                continue
+            try:
+                source = path.read_text()
+            except (OSError, UnicodeDecodeError):
+                continue
+            self.update(uri, read_file_symbols(uri, source))
+            count += 1
+        self.scanned.set()
+        return count
+
+    def update(self, uri: str, entry: FileSymbols) -> set[str]:
+        """Replace the entries of ``uri``.
+
+        Returns the other files holding references to names whose declarations appeared,
+        disappeared or changed kind, or declaring those names too, so their cross-file
+        diagnostics can be refreshed.
+        """
+        with self._lock:
+            previous = self._remove(uri)
+            self._files[uri] = entry
+            if entry.module is not None:
+                self.session.update(uri, entry.module)
+            for symbol in entry.symbols:
+                _add(self._definitions, symbol.qualified_name, uri, symbol)
+                _add(self._by_short, symbol.name, uri, symbol)
+            for reference in entry.references:
+                for key in _candidates(reference.name, reference.namespace):
+                    _add(self._references, key, uri, reference)
+            return self._affected(uri, previous, entry)
+
+    def remove(self, uri: str) -> set[str]:
+        """Forget a deleted file; returns the files referencing its declarations."""
+        with self._lock:
+            self.session.remove(uri)
+            previous = self._remove(uri)
+            return self._affected(uri, previous, None)
+
+    def resolve(
+        self,
+        ref: str,
+        namespace: str = "",
+        kinds: tuple[str, ...] | None = None,
+        exclude: str | None = None,
+    ) -> IndexedSymbol | None:
+        """Declaration ``ref`` resolves to from a file in ``namespace``, if any.
+
+        ``exclude`` skips the entries of one file, e.g. the stale copy of a document that
+        is being re-analyzed.
+        """
+        with self._lock:
+            found = [
+                [symbol for symbol in _values(self._definitions, key) if symbol.uri != exclude]
+                for key in _candidates(ref, namespace)
+            ]
+        if kinds is None:
+            return next((symbols[0] for symbols in found if symbols), None)
+        for kind in kinds:
+            for symbols in found:
+                for symbol in symbols:
+                    if symbol.kind == kind:
+                        return symbol
+        return None
+
+    def compile(
+        self, uri: str, module: DVMLModule, config: LintConfig | None = None
+    ) -> ModuleDiagnostics:
+        """Resolve ``module`` as the current contents of ``uri`` against the workspace."""
+        self.session.update(uri, module)
+        return self.session.diagnostics(uri, config)
+
+    def definitions(self, qualified_name: str) -> list[IndexedSymbol]:
+        """Every declaration of ``qualified_name`` (more than one if it is duplicated)."""
+        with self._lock:
+            return _values(self._definitions, qualified_name)
+
+    def references(self, qualified_name: str) -> list[IndexedReference]:
+        """References across the workspace that resolve to ``qualified_name``."""
+        with self._lock:
+            candidates = _values(self._references, qualified_name)
+            return [
+                reference
+                for reference in candidates
+                if (target := self.resolve(reference.name, reference.namespace, reference.kinds))
+                is not None
+                and target.qualified_name == qualified_name
+            ]
+
+    def symbols(self, query: str = "", limit: int = 500) -> list[IndexedSymbol]:
+        """Declarations whose short name contains ``query`` (case-insensitive), sorted."""
+        needle = query.lower()
+        with self._lock:
+            found = [
+                symbol
+                for name in self._by_short
+                if needle in name.lower()
+                for symbol in _values(self._by_short, name)
+            ]
+        found.sort(key=lambda symbol: (symbol.name, symbol.qualified_name, symbol.uri))
+        return found[:limit]
+
+    def _remove(self, uri: str) -> FileSymbols | None:
+        entry = self._files.pop(uri, None)
+        if entry is None:
+            return None
+        for symbol in entry.symbols:
+            _drop(self._definitions, symbol.qualified_name, uri)
+            _drop(self._by_short, symbol.name, uri)
+        for reference in entry.references:
+            for key in _candidates(reference.name, reference.namespace):
+                _drop(self._references, key, uri)
+        return entry
+
+    def _affected(
+        self, uri: str, previous: FileSymbols | None, entry: FileSymbols | None
+    ) -> set[str]:
+        before = {(s.qualified_name, s.kind) for s in previous.symbols} if previous else set()
+        after = {(s.qualified_name, s.kind) for s in entry.symbols} if entry else set()
+        affected = {
+            other
+            for name, _ in before ^ after
+            for table in (self._references, self._definitions)
+            for other in table.get(name, ())
+        }
+        affected.discard(uri)
+        return affected
+
+
+def _candidates(ref: str, namespace: str) -> tuple[str, ...]:
+    return (ref, f"{namespace}.{ref}") if namespace else (ref,)
+
+
+def _add(table: _Table[_EntryT], key: str, uri: str, value: _EntryT) -> None:
+    table.setdefault(key, {}).setdefault(uri, []).append(value)
+
+
+def _drop(table: _Table[_EntryT], key: str, uri: str) -> None:
+    files = table.get(key)
+    if files is not None:
+        files.pop(uri, None)
+        if not files:
+            del table[key]
+
+
+def _values(table: _Table[_EntryT], key: str) -> list[_EntryT]:
+    return [value for values in table.get(key, {}).values() for value in values]
@@ -1,48 +1,153 @@
-"""Thin MCP tool adapters over the shared application services."""
+"""Thin MCP tool adapters over the shared application services.
+
+The server process is long-lived, so tools share one ``CompileCache``: repeated calls on
+the same path (an ``explain`` followed by a ``generate``, say) reuse the compiled model
+until a ``.dv`` file or lint config under it changes.
+
+Large models produce large payloads, so ``generate`` and ``explain`` accept the filters of
+``ResultFilter`` and page through their results with ``cursor``/``limit``; ``generate`` can
+also return a manifest of paths, sizes and hashes instead of artifact content.
+
+Tools are async: each call compiles in a worker thread so the event loop keeps serving
+other requests, reports every pipeline stage as an MCP progress notification, and, once
+the request is cancelled, stops at the next stage boundary.
+"""
 
 from __future__ import annotations
 
+import itertools
+import threading
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
+from typing import TypeVar
+
+import anyio
+import anyio.from_thread
+import anyio.to_thread
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.session import ServerSession
+from pydantic import BaseModel
+
+from dmjedi import profiling
+from dmjedi.application.cache import CompileCache
+from dmjedi.application.requests import CompileRequest, ResultFilter
+from dmjedi.application.services import (
+    CompileOutcome,
+    explain_request,
+    generate_request,
+    validate_request,
+)
 
-from mcp.server.fastmcp import FastMCP
+_CACHE: CompileCache[CompileOutcome] = CompileCache()
 
-from dmjedi.application.requests import CompileRequest
-from dmjedi.application.services import explain_request, generate_request, validate_request
+_ResultT = TypeVar("_ResultT", bound=BaseModel)
+# FastMCP injects the request context into tool parameters annotated with this type.
+_Context = Context[ServerSession, object, object]
 
 
-def validate(
+class _Cancelled(Exception):
+    """Raised in a worker thread at the first stage after its request was cancelled."""
+
+
+async def validate(
     source: str | None = None,
     path: str | None = None,
     source_name: str = "<string>",
+    jobs: int = 1,
+    profile: bool = False,
+    ctx: _Context | None = None,
 ) -> dict[str, object]:
     """Validate DVML from inline source or a filesystem path."""
     request = _build_request(source=source, path=path, source_name=source_name)
-    result = validate_request(request)
+    result = await _in_worker(
+        ctx, partial(validate_request, request, profile=profile, jobs=jobs, cache=_CACHE)
+    )
     return result.model_dump(mode="json")
 
 
-def generate(
+async def generate(
     source: str | None = None,
     path: str | None = None,
     source_name: str = "<string>",
     target: str = "spark-declarative",
     dialect: str = "default",
     mode: str = "batch",
+    quarantine: bool = False,
+    packaging: str = "entity",
+    jobs: int = 1,
+    profile: bool = False,
+    entities: list[str] | None = None,
+    kinds: list[str] | None = None,
+    artifact_paths: list[str] | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    manifest_only: bool = False,
+    ctx: _Context | None = None,
 ) -> dict[str, object]:
-    """Generate in-memory artifacts from inline source or a filesystem path."""
+    """Generate in-memory artifacts from inline source or a filesystem path.
+
+    ``entities`` (names or globs), ``kinds`` and ``artifact_paths`` (globs) select artifacts;
+    ``limit`` caps the page and ``cursor`` takes the previous page's ``next_cursor``.
+    ``manifest_only`` returns paths, sizes and SHA-256 hashes without content.
+    """
     request = _build_request(source=source, path=path, source_name=source_name)
-    result = generate_request(request, target=target, dialect=dialect, mode=mode)
+    call = partial(
+        generate_request,
+        request,
+        target=target,
+        dialect=dialect,
+        mode=mode,
+        quarantine=quarantine,
+        packaging=packaging,
+        jobs=jobs,
+        profile=profile,
+        cache=_CACHE,
+        filters=ResultFilter(
+            entities=entities or [],
+            kinds=kinds or [],
+            artifact_paths=artifact_paths or [],
+            cursor=cursor,
+            limit=limit,
+        ),
+        manifest_only=manifest_only,
+    )
+    result = await _in_worker(ctx, call)
     return result.model_dump(mode="json")
 
 
-def explain(
+async def explain(
     source: str | None = None,
     path: str | None = None,
     source_name: str = "<string>",
+    entity: str | None = None,
+    depth: int | None = None,
+    graph: bool = False,
+    profile: bool = False,
+    match: list[str] | None = None,
+    kinds: list[str] | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    ctx: _Context | None = None,
 ) -> dict[str, object]:
-    """Explain the resolved model from inline source or a filesystem path."""
+    """Explain the resolved model from inline source or a filesystem path.
+
+    ``entity`` narrows the result to one entity's upstream/downstream dependencies (up to
+    ``depth`` hops); ``graph`` adds load waves and connected components. ``match`` (names
+    or globs) and ``kinds`` filter the entity list, which is paged by ``cursor``/``limit``.
+    """
     request = _build_request(source=source, path=path, source_name=source_name)
-    result = explain_request(request)
+    call = partial(
+        explain_request,
+        request,
+        profile=profile,
+        entity=entity,
+        depth=depth,
+        graph=graph,
+        cache=_CACHE,
+        filters=ResultFilter(entities=match or [], kinds=kinds or [], cursor=cursor, limit=limit),
+    )
+    result = await _in_worker(ctx, call)
     return result.model_dump(mode="json")
 
 
@@ -52,6 +157,41 @@ def register_tools(server: FastMCP) -> None:
         server.add_tool(tool, structured_output=True)
 
 
+async def _in_worker(ctx: _Context | None, call: Callable[[], _ResultT]) -> _ResultT:
+    """Run ``call`` in a worker thread, reporting its pipeline stages as progress.
+
+    Cancelling the request returns immediately; the thread is abandoned and stops at its
+    next stage. Per-item stages are not reported but are checked for cancellation.
+    """
+    cancelled = threading.Event()
+    steps = itertools.count(1)
+    report = ctx is not None and _wants_progress(ctx)
+
+    def on_stage(name: str) -> None:
+        if cancelled.is_set():
+            raise _Cancelled(name)
+        if report and ctx is not None and ":" not in name:
+            anyio.from_thread.run(partial(ctx.report_progress, next(steps), message=name))
+
+    def work() -> _ResultT:
+        with profiling.listen(on_stage):
+            return call()
+
+    try:
+        return await anyio.to_thread.run_sync(work, abandon_on_cancel=True)
+    except anyio.get_cancelled_exc_class():
+        cancelled.set()
+        raise
+
+
+def _wants_progress(ctx: _Context) -> bool:
+    try:
+        meta = ctx.request_context.meta
+    except ValueError:  # called outside of an MCP request
+        return False
+    return meta is not None and meta.progressToken is not None
+
+
 def _build_request(
     *,
     source: str | None,
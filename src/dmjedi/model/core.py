@@ -1,6 +1,13 @@
 """Data Vault 2.1 domain model — resolved, validated model objects."""
 
-from pydantic import BaseModel, model_validator
+import itertools
+from collections.abc import Callable
+from typing import Any, Self
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator, model_validator
+
+from dmjedi.model.graph import ModelGraph
+from dmjedi.model.symbols import ENTITY_KINDS, SymbolIndex
 
 
 class Column(BaseModel):
@@ -10,6 +17,7 @@ class Column(BaseModel):
     data_type: str
     is_business_key: bool = False
     nullable: bool = True
+    checks: list[str] = []
 
 
 class Hub(BaseModel):
@@ -153,9 +161,63 @@ class Pit(BaseModel):
         return f"{self.namespace}.{self.name}" if self.namespace else self.name
 
 
+_versions = itertools.count(1)
+
+
+class _EntityDict(dict[str, Any]):
+    """A dict that takes a fresh, process-unique ``version`` on every mutation."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.version = next(_versions)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.version = next(_versions)
+
+    def __ior__(self, other: Any) -> Self:  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def pop(self, *args: Any) -> Any:
+        value = super().pop(*args)
+        self.version = next(_versions)
+        return value
+
+    def popitem(self) -> tuple[str, Any]:
+        item = super().popitem()
+        self.version = next(_versions)
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self.version = next(_versions)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.version = next(_versions)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self.version = next(_versions)
+        return value
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Versions are only meaningful within one process; unpickled copies start fresh.
+        return (_EntityDict, (dict(self),))
+
+
 class DataVaultModel(BaseModel):
     """A complete, resolved Data Vault 2.1 model built from one or more DVML modules."""
 
+    model_config = ConfigDict(validate_assignment=True, validate_default=True)
+
     hubs: dict[str, Hub] = {}
     satellites: dict[str, Satellite] = {}
     links: dict[str, Link] = {}
@@ -165,3 +227,56 @@ class DataVaultModel(BaseModel):
     samlinks: dict[str, SamLink] = {}
     bridges: dict[str, Bridge] = {}
     pits: dict[str, Pit] = {}
+
+    # Derived lookup structures: not fields, so they are never dumped or serialized.
+    _derived: dict[str, Any] = PrivateAttr(default_factory=dict)
+    _derived_key: tuple[tuple[int, int], ...] = PrivateAttr(default=())
+
+    @field_validator(*ENTITY_KINDS, mode="after")
+    @classmethod
+    def _track_versions(cls, value: dict[str, Any]) -> dict[str, Any]:
+        return _EntityDict(value)
+
+    def _cached(self, name: str, factory: Callable[["DataVaultModel"], Any]) -> Any:
+        # Rebuilt when an entity dict is replaced or mutated. Dicts that bypassed validation
+        # (``model_construct``) carry no version and fall back to their size.
+        key = tuple(
+            (id(d), getattr(d, "version", len(d)))
+            for d in (getattr(self, attr) for attr in ENTITY_KINDS)
+        )
+        if self._derived_key != key:
+            self._derived = {}
+            self._derived_key = key
+        if name not in self._derived:
+            self._derived[name] = factory(self)
+        return self._derived[name]
+
+    @property
+    def symbols(self) -> SymbolIndex:
+        """Symbol index over all entities, built on first use.
+
+        The index is rebuilt when an entity dict is replaced or any entry is added, replaced or
+        removed; after mutating an entity object itself, call ``invalidate_indexes()``.
+        """
+        return self._cached("symbols", SymbolIndex)  # type: ignore[no-any-return]
+
+    @property
+    def graph(self) -> ModelGraph:
+        """Dependency graph over all entities, cached like ``symbols``."""
+        return self._cached("graph", ModelGraph)  # type: ignore[no-any-return]
+
+    def invalidate_indexes(self) -> None:
+        """Drop the cached symbol index and graph."""
+        self._derived = {}
+
+    def __eq__(self, other: object) -> bool:
+        # Compare entities only; cached indexes are not part of a model's value.
+        if not isinstance(other, DataVaultModel):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr in ENTITY_KINDS)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        # Worker processes rebuild indexes on demand instead of receiving a copy.
+        state = super().__getstate__()
+        state["__pydantic_private__"] = {"_derived": {}, "_derived_key": ()}
+        return state
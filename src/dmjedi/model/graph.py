@@ -0,0 +1,151 @@
+"""Dependency graph over a resolved DataVaultModel.
+
+Nodes are entity qualified names. An edge ``A -> B`` means *A depends on B*: a satellite on
+its parent, a link on its hubs, a same-as link on its master/duplicate hub, a bridge on
+the hubs and links of its path, and a PIT on its anchor hub and tracked satellites.
+Adjacency lists are built once (``DataVaultModel.graph`` caches the graph on the model),
+so traversals only touch the part of the model they return.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from dmjedi.model.symbols import ENTITY_KINDS, references
+
+if TYPE_CHECKING:
+    from dmjedi.model.core import DataVaultModel
+
+
+class ModelGraph:
+    """Upstream/downstream adjacency lists for one model."""
+
+    def __init__(self, model: DataVaultModel) -> None:
+        symbols = model.symbols
+        self._kinds: dict[str, str] = {}
+        self._upstream: dict[str, list[str]] = {}
+        self._downstream: dict[str, list[str]] = {}
+        for attr, kind in ENTITY_KINDS.items():
+            for qname in getattr(model, attr):
+                # Names shared across kinds collapse into one node; the first kind wins.
+                self._kinds.setdefault(qname, kind)
+                self._upstream.setdefault(qname, [])
+                self._downstream.setdefault(qname, [])
+
+        for attr, kind in ENTITY_KINDS.items():
+            for qname, entity in getattr(model, attr).items():
+                ns = entity.namespace
+                for ref, kinds in references(entity, kind):
+                    target = symbols.resolve(ref, ns, kinds)
+                    if target is None:
+                        continue
+                    dependency = target.qualified_name
+                    if dependency == qname or dependency in self._upstream[qname]:
+                        continue
+                    self._upstream[qname].append(dependency)
+                    self._downstream[dependency].append(qname)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._kinds
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    @property
+    def nodes(self) -> list[str]:
+        return list(self._kinds)
+
+    def kind(self, name: str) -> str:
+        """Entity kind of a node (``"hub"``, ``"satellite"``, ...)."""
+        return self._kinds[name]
+
+    def dependencies(self, name: str) -> list[str]:
+        """Direct upstream neighbours: what ``name`` depends on."""
+        return list(self._upstream[name])
+
+    def dependents(self, name: str) -> list[str]:
+        """Direct downstream neighbours: what depends on ``name``."""
+        return list(self._downstream[name])
+
+    def upstream(self, name: str, depth: int | None = None) -> list[str]:
+        """Everything ``name`` transitively depends on, nearest first."""
+        return _walk(self._upstream, name, depth)
+
+    def downstream(self, name: str, depth: int | None = None) -> list[str]:
+        """Everything that transitively depends on ``name``, nearest first."""
+        return _walk(self._downstream, name, depth)
+
+    def load_waves(self, names: Iterable[str] | None = None) -> list[list[str]]:
+        """Group nodes into topological waves: each wave only depends on earlier ones.
+
+        Entities within a wave are independent of each other and can be loaded
+        concurrently. Pass ``names`` to order a subset (edges to other nodes are ignored).
+        Raises ValueError if the graph has a cycle.
+        """
+        selected = set(self._kinds if names is None else names)
+        pending = {
+            name: sum(1 for dep in self._upstream[name] if dep in selected) for name in selected
+        }
+        wave = sorted(name for name, count in pending.items() if count == 0)
+        waves: list[list[str]] = []
+        while wave:
+            waves.append(wave)
+            following: list[str] = []
+            for name in wave:
+                del pending[name]
+                for dependent in self._downstream[name]:
+                    if dependent in pending:
+                        pending[dependent] -= 1
+                        if pending[dependent] == 0:
+                            following.append(dependent)
+            wave = sorted(following)
+        if pending:
+            msg = f"Dependency cycle between: {', '.join(sorted(pending))}"
+            raise ValueError(msg)
+        return waves
+
+    def topological_order(self) -> list[str]:
+        """All nodes, dependencies before dependents (wave by wave, sorted within a wave)."""
+        return [name for wave in self.load_waves() for name in wave]
+
+    def components(self) -> list[list[str]]:
+        """Weakly connected components, each sorted, ordered by their first member."""
+        seen: set[str] = set()
+        components: list[list[str]] = []
+        for start in sorted(self._kinds):
+            if start in seen:
+                continue
+            seen.add(start)
+            members = [start]
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for neighbour in (*self._upstream[node], *self._downstream[node]):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        members.append(neighbour)
+                        queue.append(neighbour)
+            components.append(sorted(members))
+        return components
+
+
+def _walk(adjacency: dict[str, list[str]], start: str, depth: int | None) -> list[str]:
+    if start not in adjacency:
+        raise KeyError(start)
+    seen = {start}
+    order: list[str] = []
+    frontier = [start]
+    level = 0
+    while frontier and (depth is None or level < depth):
+        level += 1
+        following: list[str] = []
+        for node in frontier:
+            for neighbour in adjacency[node]:
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    order.append(neighbour)
+                    following.append(neighbour)
+        frontier = following
+    return order
@@ -1,8 +1,33 @@
-"""Resolves parsed DVML AST modules into a unified DataVaultModel."""
+"""Resolves parsed DVML AST modules into a unified DataVaultModel.
 
-from dataclasses import dataclass
+Resolution is table driven: ``_ENTITY_SPECS`` describes, per entity kind, which module
+declarations to read, how to build the model entity and which ``DataVaultModel`` dict it
+lands in, keyed by its interned qualified name. References are then checked in one pass
+over the resolved entities against the model's symbol index (``DataVaultModel.symbols``),
+so each costs at most two dict probes (bare and namespace-qualified name) regardless of
+how many kinds it may point at; the index stays cached on the model for later consumers.
 
-from dmjedi.lang.ast import DVMLModule
+Building a large model allocates hundreds of thousands of long-lived Pydantic objects, and
+the cyclic garbage collector's repeated full-heap scans (which find nothing to free) make
+resolution superlinear in model size. Pausing the collector is process-wide, so the
+resolver never does it itself: single-threaded batch entry points (the CLI, benchmarks)
+wrap their work in ``gc_paused()``, while the threaded LSP and MCP servers leave it on.
+
+The phases are also exposed one by one for callers that re-resolve a changing set of
+modules: ``resolve_module`` builds one module's entities (the expensive, module-local
+part), ``merge_resolution`` adds them to a model and ``check_references`` validates one
+merged entity, so only modules that changed are rebuilt and only affected entities are
+re-checked.
+"""
+
+import gc
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from dmjedi.lang.ast import DVMLModule, FieldDef
 from dmjedi.model.core import (
     Bridge,
     Column,
@@ -16,6 +41,7 @@ from dmjedi.model.core import (
     SamLink,
     Satellite,
 )
+from dmjedi.model.symbols import PARENT_KINDS, SymbolIndex
 
 
 @dataclass
@@ -25,6 +51,8 @@ class ResolverError:
     message: str
     source_file: str = ""
     line: int = 0
+    code: str = "resolver-error"
+    subject: str = ""  # the name the error is about, as written in the source
 
 
 class ResolverErrors(Exception):
@@ -36,367 +64,306 @@ class ResolverErrors(Exception):
         super().__init__(f"Resolver found {len(errors)} error(s):\n" + "\n".join(messages))
 
 
+def _field_column(field: FieldDef) -> Column:
+    """Build a resolved column from a field declaration, carrying its constraints."""
+    return Column(
+        name=field.name,
+        data_type=field.data_type,
+        nullable=not field.not_null,
+        checks=field.checks,
+    )
+
+
+def _build_hub(decl: Any, ns: str) -> Hub:
+    return Hub(
+        name=decl.name,
+        namespace=ns,
+        business_keys=[
+            Column(name=bk.name, data_type=bk.data_type, is_business_key=True, nullable=False)
+            for bk in decl.business_keys
+        ],
+        columns=[_field_column(f) for f in decl.fields],
+    )
+
+
+def _build_satellite(cls: type[Satellite] | type[NhSat] | type[EffSat]) -> Callable[..., Any]:
+    def build(decl: Any, ns: str) -> Any:
+        return cls(
+            name=decl.name,
+            namespace=ns,
+            parent_ref=decl.parent_ref,
+            columns=[_field_column(f) for f in decl.fields],
+        )
+
+    return build
+
+
+def _build_link(cls: type[Link] | type[NhLink]) -> Callable[..., Any]:
+    def build(decl: Any, ns: str) -> Any:
+        return cls(
+            name=decl.name,
+            namespace=ns,
+            hub_references=decl.references,
+            columns=[_field_column(f) for f in decl.fields],
+        )
+
+    return build
+
+
+def _build_samlink(decl: Any, ns: str) -> SamLink:
+    return SamLink(
+        name=decl.name,
+        namespace=ns,
+        master_ref=decl.master_ref,
+        duplicate_ref=decl.duplicate_ref,
+        columns=[_field_column(f) for f in decl.fields],
+    )
+
+
+def _build_bridge(decl: Any, ns: str) -> Bridge:
+    return Bridge(name=decl.name, namespace=ns, path=decl.path)
+
+
+def _build_pit(decl: Any, ns: str) -> Pit:
+    return Pit(
+        name=decl.name,
+        namespace=ns,
+        anchor_ref=decl.anchor_ref,
+        tracked_satellites=decl.tracked_satellites,
+    )
+
+
+@dataclass(frozen=True)
+class _EntitySpec:
+    """How one entity kind is resolved: ``kind`` is also the DataVaultModel attribute."""
+
+    kind: str
+    label: str  # used in duplicate-definition messages
+    build: Callable[[Any, str], Any]
+
+
+# Order matches the historical resolution order (and therefore error order).
+_ENTITY_SPECS: tuple[_EntitySpec, ...] = (
+    _EntitySpec("hubs", "hub", _build_hub),
+    _EntitySpec("satellites", "satellite", _build_satellite(Satellite)),
+    _EntitySpec("links", "link", _build_link(Link)),
+    _EntitySpec("nhsats", "nhsat", _build_satellite(NhSat)),
+    _EntitySpec("nhlinks", "nhlink", _build_link(NhLink)),
+    _EntitySpec("effsats", "effsat", _build_satellite(EffSat)),
+    _EntitySpec("samlinks", "samlink", _build_samlink),
+    _EntitySpec("bridges", "bridge", _build_bridge),
+    _EntitySpec("pits", "pit", _build_pit),
+)
+
+
+_PIT_SATELLITE_KINDS = ("satellite", "nhsat")
+_REFERENCE_LABELS = {"satellites": "Satellite", "nhsats": "NhSat", "effsats": "EffSat"}
+
+
+_SPEC_ORDER = {spec.kind: index for index, spec in enumerate(_ENTITY_SPECS)}
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedEntity:
+    """A model entity built from one declaration, with where it was declared."""
+
+    kind: str  # DataVaultModel attribute, e.g. "hubs"
+    label: str
+    entity: Any
+    source_file: str
+    line: int
+
+    @property
+    def qualified_name(self) -> str:
+        return self.entity.qualified_name  # type: ignore[no-any-return]
+
+
+@dataclass(slots=True)
+class ModuleResolution:
+    """The entities one module contributes, plus errors found within the module alone.
+
+    ``error_slots[i]`` is the number of entities built before ``errors[i]`` was found, so
+    merging can report module errors and redefinitions in declaration order.
+    """
+
+    entities: list[ResolvedEntity]
+    errors: list[ResolverError]
+    error_slots: list[int] = field(default_factory=list)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Disable the cyclic garbage collector for the enclosed code, restoring it afterwards.
+
+    This affects every thread of the process; only use it in single-threaded batch runs.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def merge_resolution(model: DataVaultModel, resolution: ModuleResolution) -> list[ResolverError]:
+    """Add a module's entities to ``model``; redefining a qualified name is an error.
+
+    Returns the module's own errors and its redefinitions, in spec and declaration order.
+    """
+    # Sort keys: a module error found before entity i precedes that entity's redefinition.
+    ordered = [
+        ((slot, 0), error)
+        for slot, error in zip(resolution.error_slots, resolution.errors, strict=True)
+    ]
+    for index, resolved in enumerate(resolution.entities):
+        target: dict[str, Any] = getattr(model, resolved.kind)
+        qname = sys.intern(resolved.qualified_name)
+        if qname not in target:
+            target[qname] = resolved.entity
+            continue
+        source = resolved.source_file or "<string>"
+        error = ResolverError(
+            message=f"Duplicate {resolved.label} '{qname}' redefined in {source}:{resolved.line}",
+            source_file=resolved.source_file,
+            line=resolved.line,
+            code="duplicate-definition",
+            subject=resolved.entity.name,
+        )
+        ordered.append(((index, 1), error))
+    ordered.sort(key=lambda item: item[0])
+    return [error for _, error in ordered]
+
+
+def is_merged(model: DataVaultModel, resolved: ResolvedEntity) -> bool:
+    """Whether ``resolved`` is the definition ``model`` kept for its qualified name."""
+    return getattr(model, resolved.kind).get(resolved.qualified_name) is resolved.entity
+
+
+def check_references(resolved: ResolvedEntity, symbols: SymbolIndex) -> list[ResolverError]:
+    """Validate the outgoing references of one merged entity against ``symbols``."""
+    return [
+        replace(error, source_file=resolved.source_file, line=resolved.line)
+        for error in _check_references(resolved.kind, resolved.entity, symbols)
+    ]
+
+
 def resolve(modules: list[DVMLModule]) -> DataVaultModel:
     """Merge and resolve multiple DVML modules into a single DataVaultModel."""
     model = DataVaultModel()
     errors: list[ResolverError] = []
+    merged: list[ResolvedEntity] = []
 
     for module in modules:
-        ns = module.namespace
-
-        for hub_decl in module.hubs:
-            hub = Hub(
-                name=hub_decl.name,
-                namespace=ns,
-                business_keys=[
-                    Column(name=bk.name, data_type=bk.data_type, is_business_key=True)
-                    for bk in hub_decl.business_keys
-                ],
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in hub_decl.fields
-                ],
-            )
-            qname = hub.qualified_name
-            if qname in model.hubs:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate hub '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{hub_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=hub_decl.loc.line,
-                    )
-                )
-            else:
-                model.hubs[qname] = hub
-
-        for sat_decl in module.satellites:
-            sat = Satellite(
-                name=sat_decl.name,
-                namespace=ns,
-                parent_ref=sat_decl.parent_ref,
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in sat_decl.fields
-                ],
-            )
-            qname = sat.qualified_name
-            if qname in model.satellites:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate satellite '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{sat_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=sat_decl.loc.line,
-                    )
-                )
-            else:
-                model.satellites[qname] = sat
-
-        for link_decl in module.links:
-            link = Link(
-                name=link_decl.name,
-                namespace=ns,
-                hub_references=link_decl.references,
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in link_decl.fields
-                ],
-            )
-            qname = link.qualified_name
-            if qname in model.links:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate link '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{link_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=link_decl.loc.line,
-                    )
-                )
-            else:
-                model.links[qname] = link
-
-        for nhsat_decl in module.nhsats:
-            nhsat = NhSat(
-                name=nhsat_decl.name,
-                namespace=ns,
-                parent_ref=nhsat_decl.parent_ref,
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in nhsat_decl.fields
-                ],
-            )
-            qname = nhsat.qualified_name
-            if qname in model.nhsats:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate nhsat '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{nhsat_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=nhsat_decl.loc.line,
-                    )
-                )
-            else:
-                model.nhsats[qname] = nhsat
-
-        for nhlink_decl in module.nhlinks:
-            nhlink = NhLink(
-                name=nhlink_decl.name,
-                namespace=ns,
-                hub_references=nhlink_decl.references,
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in nhlink_decl.fields
-                ],
-            )
-            qname = nhlink.qualified_name
-            if qname in model.nhlinks:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate nhlink '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{nhlink_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=nhlink_decl.loc.line,
-                    )
-                )
-            else:
-                model.nhlinks[qname] = nhlink
-
-        for effsat_decl in module.effsats:
-            effsat = EffSat(
-                name=effsat_decl.name,
-                namespace=ns,
-                parent_ref=effsat_decl.parent_ref,
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in effsat_decl.fields
-                ],
-            )
-            qname = effsat.qualified_name
-            if qname in model.effsats:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate effsat '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{effsat_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=effsat_decl.loc.line,
-                    )
-                )
-            else:
-                model.effsats[qname] = effsat
+        resolution = resolve_module(module)
+        errors.extend(merge_resolution(model, resolution))
+        merged.extend(resolved for resolved in resolution.entities if is_merged(model, resolved))
 
-        for samlink_decl in module.samlinks:
-            if not samlink_decl.master_ref or not samlink_decl.duplicate_ref:
-                errors.append(
+    symbols = model.symbols
+    # Stable sort: references are checked kind by kind, in declaration order within a kind.
+    merged.sort(key=lambda resolved: _SPEC_ORDER[resolved.kind])
+    for resolved in merged:
+        errors.extend(check_references(resolved, symbols))
+
+    if errors:
+        raise ResolverErrors(errors)
+
+    return model
+
+
+def resolve_module(module: DVMLModule) -> ModuleResolution:
+    """Build the entities of one module without looking at any other module."""
+    ns = module.namespace
+    source = module.source_file or "<string>"
+    resolution = ModuleResolution(entities=[], errors=[])
+    for spec in _ENTITY_SPECS:
+        for decl in getattr(module, spec.kind):
+            if spec.kind == "samlinks" and (not decl.master_ref or not decl.duplicate_ref):
+                resolution.errors.append(
                     ResolverError(
                         message=(
-                            f"SamLink '{samlink_decl.name}' missing master or duplicate"
-                            f" reference in"
-                            f" {module.source_file or '<string>'}:{samlink_decl.loc.line}"
+                            f"SamLink '{decl.name}' missing master or duplicate"
+                            f" reference in {source}:{decl.loc.line}"
                         ),
                         source_file=module.source_file,
-                        line=samlink_decl.loc.line,
+                        line=decl.loc.line,
+                        code="samlink-missing-reference",
+                        subject=decl.name,
                     )
                 )
+                resolution.error_slots.append(len(resolution.entities))
                 continue
-            samlink = SamLink(
-                name=samlink_decl.name,
-                namespace=ns,
-                master_ref=samlink_decl.master_ref,
-                duplicate_ref=samlink_decl.duplicate_ref,
-                columns=[
-                    Column(name=f.name, data_type=f.data_type) for f in samlink_decl.fields
-                ],
-            )
-            qname = samlink.qualified_name
-            if qname in model.samlinks:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate samlink '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{samlink_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=samlink_decl.loc.line,
-                    )
-                )
-            else:
-                model.samlinks[qname] = samlink
-
-        for bridge_decl in module.bridges:
-            bridge = Bridge(
-                name=bridge_decl.name,
-                namespace=ns,
-                path=bridge_decl.path,
-            )
-            qname = bridge.qualified_name
-            if qname in model.bridges:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate bridge '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{bridge_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=bridge_decl.loc.line,
-                    )
+            resolution.entities.append(
+                ResolvedEntity(
+                    kind=spec.kind,
+                    label=spec.label,
+                    entity=spec.build(decl, ns),
+                    source_file=module.source_file,
+                    line=decl.loc.line,
                 )
-            else:
-                model.bridges[qname] = bridge
-
-        for pit_decl in module.pits:
-            pit = Pit(
-                name=pit_decl.name,
-                namespace=ns,
-                anchor_ref=pit_decl.anchor_ref,
-                tracked_satellites=pit_decl.tracked_satellites,
             )
-            qname = pit.qualified_name
-            if qname in model.pits:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"Duplicate pit '{qname}' redefined"
-                            f" in {module.source_file or '<string>'}:{pit_decl.loc.line}"
-                        ),
-                        source_file=module.source_file,
-                        line=pit_decl.loc.line,
-                    )
-                )
-            else:
-                model.pits[qname] = pit
-
-    # Post-resolution validation: satellite parent refs
-    for sat in model.satellites.values():
-        ref = sat.parent_ref
-        ns_ref = f"{sat.namespace}.{ref}" if sat.namespace else ref
-        if (
-            ref not in model.hubs
-            and ref not in model.links
-            and ns_ref not in model.hubs
-            and ns_ref not in model.links
-        ):
-            errors.append(
-                ResolverError(
-                    message=(
-                        f"Satellite '{sat.qualified_name}'"
-                        f" references unknown parent '{ref}'"
-                    ),
-                )
+    return resolution
+
+
+def _check_references(kind: str, entity: Any, symbols: SymbolIndex) -> Iterator[ResolverError]:
+    """Validate the outgoing references of one resolved entity."""
+    ns = entity.namespace
+    if kind in ("satellites", "nhsats", "effsats"):
+        if symbols.resolve(entity.parent_ref, ns, PARENT_KINDS) is None:
+            yield ResolverError(
+                message=(
+                    f"{_REFERENCE_LABELS[kind]} '{entity.qualified_name}'"
+                    f" references unknown parent '{entity.parent_ref}'"
+                ),
+                code="unknown-parent",
+                subject=entity.parent_ref,
             )
 
-    # Post-resolution validation: nhsat parent refs
-    for nhsat in model.nhsats.values():
-        ref = nhsat.parent_ref
-        ns_ref = f"{nhsat.namespace}.{ref}" if nhsat.namespace else ref
-        if (
-            ref not in model.hubs
-            and ref not in model.links
-            and ns_ref not in model.hubs
-            and ns_ref not in model.links
-        ):
-            errors.append(
-                ResolverError(
+    elif kind == "bridges":
+        # LINT-04: bridge path must alternate Hub -> Link -> Hub ...
+        if len(entity.path) < 3:
+            yield ResolverError(
+                message=(
+                    f"Bridge '{entity.qualified_name}' path must have"
+                    f" at least 3 elements (Hub -> Link -> Hub)"
+                ),
+                code="bridge-path-length",
+                subject=entity.name,
+            )
+            return
+        for i, ref in enumerate(entity.path):
+            expected = "hub" if i % 2 == 0 else "link"
+            if symbols.resolve(ref, ns, (expected,)) is None:
+                yield ResolverError(
                     message=(
-                        f"NhSat '{nhsat.qualified_name}'"
-                        f" references unknown parent '{ref}'"
+                        f"Bridge '{entity.qualified_name}' path position"
+                        f" {i} ('{ref}') must be a {expected}"
                     ),
+                    code="bridge-path-kind",
+                    subject=ref,
                 )
-            )
 
-    # Post-resolution validation: effsat parent refs
-    for effsat in model.effsats.values():
-        ref = effsat.parent_ref
-        ns_ref = f"{effsat.namespace}.{ref}" if effsat.namespace else ref
-        if (
-            ref not in model.hubs
-            and ref not in model.links
-            and ns_ref not in model.hubs
-            and ns_ref not in model.links
-        ):
-            errors.append(
-                ResolverError(
+    elif kind == "pits":
+        # LINT-05: tracked satellites must belong to the PIT's anchor hub.
+        anchor = entity.anchor_ref
+        ns_anchor = f"{ns}.{anchor}" if ns else anchor
+        for sat_ref in entity.tracked_satellites:
+            found = symbols.resolve(sat_ref, ns, _PIT_SATELLITE_KINDS)
+            if found is None:
+                yield ResolverError(
                     message=(
-                        f"EffSat '{effsat.qualified_name}'"
-                        f" references unknown parent '{ref}'"
+                        f"PIT '{entity.qualified_name}' tracks"
+                        f" unknown satellite '{sat_ref}'"
                     ),
+                    code="pit-unknown-satellite",
+                    subject=sat_ref,
                 )
-            )
-
-    # Post-resolution validation: bridge path chain (LINT-04)
-    for bridge in model.bridges.values():
-        path = bridge.path
-        if len(path) < 3:
-            errors.append(
-                ResolverError(
+            elif found.entity.parent_ref not in (anchor, ns_anchor):
+                yield ResolverError(
                     message=(
-                        f"Bridge '{bridge.qualified_name}' path must have"
-                        f" at least 3 elements (Hub -> Link -> Hub)"
+                        f"PIT '{entity.qualified_name}' satellite '{sat_ref}'"
+                        f" does not belong to anchor hub '{anchor}'"
                     ),
+                    code="pit-satellite-anchor",
+                    subject=sat_ref,
                 )
-            )
-            continue
-        for i, ref in enumerate(path):
-            ns_ref = f"{bridge.namespace}.{ref}" if bridge.namespace else ref
-            if i % 2 == 0:  # even positions: must be a hub
-                if ref not in model.hubs and ns_ref not in model.hubs:
-                    errors.append(
-                        ResolverError(
-                            message=(
-                                f"Bridge '{bridge.qualified_name}' path position"
-                                f" {i} ('{ref}') must be a hub"
-                            ),
-                        )
-                    )
-            else:  # odd positions: must be a link
-                if ref not in model.links and ns_ref not in model.links:
-                    errors.append(
-                        ResolverError(
-                            message=(
-                                f"Bridge '{bridge.qualified_name}' path position"
-                                f" {i} ('{ref}') must be a link"
-                            ),
-                        )
-                    )
-
-    # Post-resolution validation: PIT satellite ownership (LINT-05)
-    for pit in model.pits.values():
-        anchor = pit.anchor_ref
-        ns_anchor = f"{pit.namespace}.{anchor}" if pit.namespace else anchor
-        for sat_ref in pit.tracked_satellites:
-            ns_sat_ref = f"{pit.namespace}.{sat_ref}" if pit.namespace else sat_ref
-            sat_or_none = (
-                model.satellites.get(sat_ref)
-                or model.satellites.get(ns_sat_ref)
-                or model.nhsats.get(sat_ref)
-                or model.nhsats.get(ns_sat_ref)
-            )
-            if sat_or_none is None:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"PIT '{pit.qualified_name}' tracks"
-                            f" unknown satellite '{sat_ref}'"
-                        ),
-                    )
-                )
-            elif sat_or_none.parent_ref != anchor and sat_or_none.parent_ref != ns_anchor:
-                errors.append(
-                    ResolverError(
-                        message=(
-                            f"PIT '{pit.qualified_name}' satellite '{sat_ref}'"
-                            f" does not belong to anchor hub '{anchor}'"
-                        ),
-                    )
-                )
-
-    if errors:
-        raise ResolverErrors(errors)
-
-    return model
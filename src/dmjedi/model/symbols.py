@@ -0,0 +1,172 @@
+"""Precomputed symbol index over a resolved DataVaultModel.
+
+``DataVaultModel.symbols`` answers the questions consumers used to answer by probing the
+nine entity dicts with both bare and namespace-qualified names: what is ``name`` (one probe
+per spelling), which entities share a short name, and which satellites/links hang off a
+hub or link. Name tables are built in one pass over the model and cached on it; reverse
+edges are derived from them on first use.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from dmjedi.model.core import DataVaultModel
+
+# DataVaultModel attribute -> entity kind, in model field order.
+ENTITY_KINDS: dict[str, str] = {
+    "hubs": "hub",
+    "satellites": "satellite",
+    "links": "link",
+    "nhsats": "nhsat",
+    "nhlinks": "nhlink",
+    "effsats": "effsat",
+    "samlinks": "samlink",
+    "bridges": "bridge",
+    "pits": "pit",
+}
+
+PARENT_KINDS = ("hub", "link")
+SATELLITE_KINDS = ("satellite", "nhsat", "effsat")
+LINK_KINDS = ("link", "nhlink", "samlink")
+
+
+def references(entity: Any, kind: str) -> list[tuple[str, tuple[str, ...]]]:
+    """Outgoing references of an entity as (name as written, kinds it may resolve to)."""
+    if kind in SATELLITE_KINDS:
+        return [(entity.parent_ref, PARENT_KINDS)]
+    if kind in ("link", "nhlink"):
+        return [(ref, ("hub",)) for ref in entity.hub_references]
+    if kind == "samlink":
+        return [(entity.master_ref, ("hub",)), (entity.duplicate_ref, ("hub",))]
+    if kind == "bridge":
+        return [
+            (ref, ("hub",) if i % 2 == 0 else ("link",)) for i, ref in enumerate(entity.path)
+        ]
+    if kind == "pit":
+        tracked = [(ref, ("satellite", "nhsat")) for ref in entity.tracked_satellites]
+        return [(entity.anchor_ref, ("hub",)), *tracked]
+    return []
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolEntry:
+    """One indexed entity and its kind (``"hub"``, ``"satellite"``, ...)."""
+
+    kind: str
+    entity: Any
+
+    @property
+    def qualified_name(self) -> str:
+        name: str = self.entity.qualified_name
+        return name
+
+
+_Edges = dict[str, list[SymbolEntry]]
+
+
+class SymbolIndex:
+    """Qualified-name, short-name and reverse-edge lookups for one model."""
+
+    def __init__(self, model: DataVaultModel) -> None:
+        self._by_qualified: dict[str, dict[str, SymbolEntry]] = {}
+        self._by_short: dict[str, list[SymbolEntry]] = defaultdict(list)
+        self._by_kind: dict[str, list[SymbolEntry]] = {}
+        for attr, kind in ENTITY_KINDS.items():
+            entries = self._by_kind[kind] = []
+            for qname, entity in getattr(model, attr).items():
+                entry = SymbolEntry(kind, entity)
+                entries.append(entry)
+                self._by_qualified.setdefault(qname, {})[kind] = entry
+                self._by_short[entity.name].append(entry)
+        # Reverse edges are only needed by some consumers; built on first use.
+        self._edges: tuple[_Edges, _Edges] | None = None
+
+    def _reverse_edges(self) -> tuple[_Edges, _Edges]:
+        """(parent -> satellites, hub -> links), keyed by the referenced qualified name."""
+        if self._edges is not None:
+            return self._edges
+        children: _Edges = defaultdict(list)
+        links: _Edges = defaultdict(list)
+        for kind in SATELLITE_KINDS:
+            for entry in self._by_kind[kind]:
+                sat = entry.entity
+                parent = self.resolve(sat.parent_ref, sat.namespace, PARENT_KINDS)
+                if parent is not None:
+                    children[parent.qualified_name].append(entry)
+        for kind in LINK_KINDS:
+            for entry in self._by_kind[kind]:
+                link = entry.entity
+                refs = (
+                    [link.master_ref, link.duplicate_ref]
+                    if kind == "samlink"
+                    else link.hub_references
+                )
+                seen: set[str] = set()
+                for ref in refs:
+                    hub = self.resolve(ref, link.namespace, ("hub",))
+                    if hub is not None and hub.qualified_name not in seen:
+                        seen.add(hub.qualified_name)
+                        links[hub.qualified_name].append(entry)
+        self._edges = (children, links)
+        return self._edges
+
+    def get(self, qualified_name: str, kinds: tuple[str, ...] | None = None) -> SymbolEntry | None:
+        """Return the entity registered under ``qualified_name``, optionally of ``kinds``."""
+        entries = self._by_qualified.get(qualified_name)
+        if not entries:
+            return None
+        if kinds is None:
+            return next(iter(entries.values()))
+        for kind in kinds:
+            if kind in entries:
+                return entries[kind]
+        return None
+
+    def resolve(
+        self, ref: str, namespace: str = "", kinds: tuple[str, ...] | None = None
+    ) -> SymbolEntry | None:
+        """Resolve a reference as written, then qualified with ``namespace``.
+
+        ``kinds`` is a preference order: the first kind matching either spelling wins,
+        mirroring how the resolver validates references.
+        """
+        bare = self._by_qualified.get(ref)
+        qualified = self._by_qualified.get(f"{namespace}.{ref}") if namespace else None
+        if kinds is None:
+            found = bare or qualified
+            return next(iter(found.values())) if found else None
+        for kind in kinds:
+            for entries in (bare, qualified):
+                if entries is not None and kind in entries:
+                    return entries[kind]
+        return None
+
+    def qualify(self, ref: str, namespace: str = "", kinds: tuple[str, ...] | None = None) -> str:
+        """Qualified name ``ref`` resolves to; unresolved refs are qualified textually."""
+        entry = self.resolve(ref, namespace, kinds)
+        if entry is not None:
+            return entry.qualified_name
+        if "." in ref or not namespace:
+            return ref
+        return f"{namespace}.{ref}"
+
+    def candidates(self, short_name: str) -> list[SymbolEntry]:
+        """All entities, of any kind and namespace, whose unqualified name is ``short_name``."""
+        return list(self._by_short.get(short_name, ()))
+
+    def satellites_of(self, parent: str) -> list[SymbolEntry]:
+        """Satellites, non-historized and effectivity satellites of a hub or link."""
+        return list(self._reverse_edges()[0].get(parent, ()))
+
+    def links_of(self, hub: str) -> list[SymbolEntry]:
+        """Links, non-historized links and same-as links referencing a hub."""
+        return list(self._reverse_edges()[1].get(hub, ()))
+
+    def effsats_of(self, link: str) -> list[SymbolEntry]:
+        """Effectivity satellites tracking a link."""
+        children = self._reverse_edges()[0]
+        return [entry for entry in children.get(link, ()) if entry.kind == "effsat"]
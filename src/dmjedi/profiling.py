@@ -0,0 +1,136 @@
+"""Opt-in stage instrumentation for the compile and generate pipeline.
+
+Pipeline code marks stages with ``with profiling.stage("parse"):``; this is a no-op unless a
+``profiling.session()`` is active in the current context. A session records wall time, CPU
+time, traced allocations and call counts per stage name, in first-seen order. Allocations
+are only measured for outermost stages, since tracemalloc has a single peak counter.
+
+Independently of profiling, ``listen(callback)`` reports every stage as it starts, which
+long-running callers use for progress updates and to abort at a stage boundary.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass
+class StageTiming:
+    """Accumulated measurements for one stage name."""
+
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    allocated_bytes: int | None = None
+    count: int = 0
+
+
+@dataclass
+class StageCall:
+    """Handle yielded by ``stage()``; set ``count`` to the number of items processed."""
+
+    count: int = 1
+
+
+class Profiler:
+    """Collects ``StageTiming`` records for a single profiling session."""
+
+    def __init__(self) -> None:
+        self._stages: dict[str, StageTiming] = {}
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageCall]:
+        timing = self._stages.setdefault(name, StageTiming(name=name))
+        call = StageCall()
+        trace = self._depth == 0 and tracemalloc.is_tracing()
+        if trace:
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._depth += 1
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield call
+        finally:
+            timing.wall_seconds += time.perf_counter() - wall
+            timing.cpu_seconds += time.process_time() - cpu
+            timing.count += call.count
+            self._depth -= 1
+            if trace:
+                allocated = max(0, tracemalloc.get_traced_memory()[1] - start_bytes)
+                timing.allocated_bytes = (timing.allocated_bytes or 0) + allocated
+
+    def record(self, name: str, wall_seconds: float, cpu_seconds: float, count: int) -> None:
+        """Add externally measured time (e.g. per lint rule) under ``name``."""
+        timing = self._stages.setdefault(name, StageTiming(name=name))
+        timing.wall_seconds += wall_seconds
+        timing.cpu_seconds += cpu_seconds
+        timing.count += count
+
+    def timings(self) -> list[StageTiming]:
+        return list(self._stages.values())
+
+
+_ACTIVE: ContextVar[Profiler | None] = ContextVar("dmjedi_profiler", default=None)
+_LISTENER: ContextVar[Callable[[str], None] | None] = ContextVar(
+    "dmjedi_stage_listener", default=None
+)
+
+
+def active() -> Profiler | None:
+    """Return the profiler of the current session, if any."""
+    return _ACTIVE.get()
+
+
+@contextmanager
+def session(trace_memory: bool = True) -> Iterator[Profiler]:
+    """Activate a profiler for the enclosed code; nested sessions reuse the outer one."""
+    current = _ACTIVE.get()
+    if current is not None:
+        yield current
+        return
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = Profiler()
+    token = _ACTIVE.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def listen(callback: Callable[[str], None]) -> Iterator[None]:
+    """Call ``callback(name)`` as each stage in the enclosed code starts.
+
+    Per-item stages (``parse:<file>``, ``render:<path>``) are reported too. An exception
+    raised by the callback propagates out of the stage, aborting the pipeline.
+    """
+    token = _LISTENER.set(callback)
+    try:
+        yield
+    finally:
+        _LISTENER.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[StageCall]:
+    """Record a stage on the active profiler; a cheap no-op when profiling is off."""
+    listener = _LISTENER.get()
+    if listener is not None:
+        listener(name)
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield StageCall()
+        return
+    with profiler.stage(name) as call:
+        yield call
@@ -0,0 +1,61 @@
+"""Compact JSON manifest describing a resolved Data Vault model.
+
+The manifest is the only artifact the ``manifest`` target emits. Runtime loaders read it
+at execution time instead of shipping one generated file per entity, so a model change
+redeploys a single file.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from dmjedi.model.core import DataVaultModel
+
+MANIFEST_FORMAT = "dmjedi-manifest"
+MANIFEST_VERSION = 1
+
+
+class Manifest(BaseModel):
+    """A versioned, serialized Data Vault model plus the settings loaders need."""
+
+    format: str = MANIFEST_FORMAT
+    version: int = MANIFEST_VERSION
+    hash_algo: str = "sha256"
+    model: DataVaultModel
+
+
+def dump_manifest(model: DataVaultModel, hash_algo: str = "sha256") -> str:
+    """Serialize a model to compact, deterministic manifest JSON.
+
+    Default-valued fields are omitted and object keys are sorted, so identical models
+    always produce byte-identical manifests.
+    """
+    payload = {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "hash_algo": hash_algo,
+        "model": model.model_dump(mode="json", exclude_defaults=True),
+    }
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False) + "\n"
+
+
+def load_manifest(source: str | Path | dict[str, Any]) -> Manifest:
+    """Load a manifest from a file path or an already-parsed JSON object.
+
+    Raises ValueError if the payload is not a DMJEDI manifest or uses a newer format version.
+    """
+    payload = source if isinstance(source, dict) else json.loads(Path(source).read_text())
+    if payload.get("format") != MANIFEST_FORMAT:
+        msg = f"Not a DMJEDI manifest (format={payload.get('format')!r})"
+        raise ValueError(msg)
+    if payload.get("version", 0) > MANIFEST_VERSION:
+        msg = (
+            f"Manifest version {payload['version']} is newer than supported "
+            f"version {MANIFEST_VERSION}"
+        )
+        raise ValueError(msg)
+    return Manifest.model_validate(payload)
@@ -0,0 +1,207 @@
+"""Dependency-wave load plan for a resolved Data Vault model, and a local DuckDB runner.
+
+A plan groups every SQL statement needed to load a model into waves. The first wave,
+``staging``, creates target tables and the staging views over ``src_*`` tables; neither
+depends on anything else. The following ``load-N`` waves come from the model's dependency
+graph (``DataVaultModel.graph``): hubs load first, then the links and satellites hanging off
+them, then effectivity satellites, PITs and bridges. Steps within a wave touch different
+tables and can run concurrently; waves run one after another.
+
+``plan.json`` (the ``plan`` target) is the serialized form, so a deployment can run the
+same ordering without a DMJEDI install; ``run_plan`` executes it on a DuckDB connection.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from pydantic import BaseModel, Field
+
+from dmjedi.model.core import DataVaultModel
+from dmjedi.model.symbols import ENTITY_KINDS
+from dmjedi.runtime import sql
+
+PLAN_FORMAT = "dmjedi-plan"
+PLAN_VERSION = 1
+STAGING_WAVE = "staging"
+
+
+class PlanStep(BaseModel):
+    """Statements for one entity, executed in order on a single cursor."""
+
+    entity: str
+    kind: str
+    statements: list[str] = Field(default_factory=list)
+
+
+class PlanWave(BaseModel):
+    """Steps with no dependencies on each other."""
+
+    name: str
+    steps: list[PlanStep] = Field(default_factory=list)
+
+
+class Plan(BaseModel):
+    """A versioned, ordered load plan."""
+
+    format: str = PLAN_FORMAT
+    version: int = PLAN_VERSION
+    dialect: str = "default"
+    hash_algo: str = "sha256"
+    waves: list[PlanWave] = Field(default_factory=list)
+
+    @property
+    def statement_count(self) -> int:
+        return sum(len(step.statements) for wave in self.waves for step in wave.steps)
+
+
+def build_plan(model: DataVaultModel, dialect: str = "default", hash_algo: str = "sha256") -> Plan:
+    """Derive the staging wave and dependency-ordered load waves for ``model``."""
+    graph_waves = model.graph.load_waves()
+    wave_of = {name: index for index, wave in enumerate(graph_waves) for name in wave}
+    staging: list[PlanStep] = []
+    loads: list[list[PlanStep]] = [[] for _ in graph_waves]
+
+    for attr, kind in ENTITY_KINDS.items():
+        for qname, entity in getattr(model, attr).items():
+            setup = [
+                sql.table_statement(kind, entity, dialect),
+                sql.staging_statement(kind, entity, dialect, hash_algo),
+            ]
+            load = [sql.load_statement(kind, entity), sql.view_statement(kind, entity)]
+            if any(setup):
+                staging.append(_step(qname, kind, setup))
+            if any(load):
+                loads[wave_of[qname]].append(_step(qname, kind, load))
+
+    waves = [PlanWave(name=STAGING_WAVE, steps=sorted(staging, key=_step_key))]
+    waves += [
+        PlanWave(name=f"load-{number}", steps=sorted(steps, key=_step_key))
+        for number, steps in enumerate((steps for steps in loads if steps), start=1)
+    ]
+    return Plan(dialect=dialect, hash_algo=hash_algo, waves=waves)
+
+
+def dump_plan(plan: Plan) -> str:
+    """Serialize a plan to deterministic, human-readable JSON."""
+    return json.dumps(plan.model_dump(mode="json"), indent=2, ensure_ascii=False) + "\n"
+
+
+def load_plan(source: str | Path | dict[str, Any]) -> Plan:
+    """Load a plan from a file path or an already-parsed JSON object.
+
+    Raises ValueError if the payload is not a DMJEDI plan or uses a newer format version.
+    """
+    payload = source if isinstance(source, dict) else json.loads(Path(source).read_text())
+    if payload.get("format") != PLAN_FORMAT:
+        msg = f"Not a DMJEDI plan (format={payload.get('format')!r})"
+        raise ValueError(msg)
+    if payload.get("version", 0) > PLAN_VERSION:
+        msg = f"Plan version {payload['version']} is newer than supported version {PLAN_VERSION}"
+        raise ValueError(msg)
+    return Plan.model_validate(payload)
+
+
+class PlanCursor(Protocol):
+    def execute(self, sql: str, /) -> object: ...
+
+    def close(self) -> object: ...
+
+
+class PlanConnection(Protocol):
+    def cursor(self) -> PlanCursor: ...
+
+
+@dataclass(frozen=True)
+class StatementTiming:
+    """Wall time of one executed plan statement."""
+
+    wave: str
+    entity: str
+    kind: str
+    index: int  # position within the step
+    seconds: float
+
+
+class PlanExecutionError(Exception):
+    """Raised when a plan statement fails; the rest of its wave still runs to completion."""
+
+    def __init__(self, wave: str, step: PlanStep, index: int, error: Exception) -> None:
+        self.wave = wave
+        self.step = step
+        self.index = index
+        self.error = error
+        super().__init__(
+            f"Plan wave '{wave}' failed at {step.kind} '{step.entity}'"
+            f" (statement {index + 1}): {error}"
+        )
+
+
+def run_plan(
+    conn: PlanConnection,
+    plan: Plan,
+    workers: int = 4,
+    on_statement: Callable[[StatementTiming], None] | None = None,
+) -> list[StatementTiming]:
+    """Execute ``plan`` wave by wave, running each wave's steps on up to ``workers`` cursors.
+
+    ``conn`` must hand out independent cursors that may be used from other threads, as
+    DuckDB connections do. Returns per-statement timings in execution order within each
+    step; ``on_statement`` is called as each statement finishes.
+    """
+    workers = max(1, workers)
+    cursors: queue.Queue[PlanCursor] = queue.Queue()
+    for _ in range(workers):
+        cursors.put(conn.cursor())
+
+    def run_step(wave: str, step: PlanStep) -> list[StatementTiming]:
+        cursor = cursors.get()
+        timings: list[StatementTiming] = []
+        try:
+            for index, statement in enumerate(step.statements):
+                start = time.perf_counter()
+                try:
+                    cursor.execute(statement)
+                except Exception as err:
+                    raise PlanExecutionError(wave, step, index, err) from err
+                timing = StatementTiming(
+                    wave, step.entity, step.kind, index, time.perf_counter() - start
+                )
+                timings.append(timing)
+                if on_statement is not None:
+                    on_statement(timing)
+        finally:
+            cursors.put(cursor)
+        return timings
+
+    results: list[StatementTiming] = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for wave in plan.waves:
+                futures = [pool.submit(run_step, wave.name, step) for step in wave.steps]
+                errors = [future.exception() for future in futures]
+                for future, error in zip(futures, errors, strict=True):
+                    if error is None:
+                        results.extend(future.result())
+                failed = next((error for error in errors if error is not None), None)
+                if failed is not None:
+                    raise failed
+    finally:
+        while not cursors.empty():
+            cursors.get_nowait().close()
+    return results
+
+
+def _step(entity: str, kind: str, statements: list[str | None]) -> PlanStep:
+    return PlanStep(entity=entity, kind=kind, statements=[s for s in statements if s])
+
+
+def _step_key(step: PlanStep) -> tuple[str, str]:
+    return (step.entity, step.kind)
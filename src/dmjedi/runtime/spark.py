@@ -0,0 +1,129 @@
+"""Generic PySpark loader driven by a DMJEDI manifest.
+
+Loads hubs, links and satellites insert-only from ``src_<entity>`` tables, merges
+non-historized and same-as entities through Delta Lake, and creates bridge/PIT views.
+PySpark and delta-spark are imported lazily so the rest of DMJEDI does not depend on them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from dmjedi.model.core import Column, EffSat, NhSat
+from dmjedi.model.types import map_type
+from dmjedi.runtime.manifest import Manifest
+from dmjedi.runtime.sql import view_statements
+
+# sha2 bit lengths accepted as ``sha<bits>`` hash algorithms.
+_SHA2_BITS = (224, 256, 384, 512)
+
+
+def load(spark: Any, manifest: Manifest) -> None:
+    """Load every entity in the manifest using the given SparkSession.
+
+    Raises ValueError if the manifest's ``hash_algo`` has no PySpark equivalent.
+    """
+    from pyspark.sql import functions as F
+
+    model = manifest.model
+    digest = _hash_function(F, manifest.hash_algo)
+
+    def source(name: str) -> Any:
+        return spark.table(f"src_{name}")
+
+    def system(df: Any) -> Any:
+        return df.withColumn("load_ts", F.current_timestamp()).withColumn(
+            "record_source", F.lit("dmjedi")
+        )
+
+    def hashed(names: list[str]) -> Any:
+        return digest(F.concat_ws("||", *[F.col(n).cast("string") for n in names]))
+
+    def typed(columns: list[Column]) -> list[Any]:
+        return [F.col(c.name).cast(map_type(c.data_type, "spark")) for c in columns]
+
+    for hub in model.hubs.values():
+        keys = [bk.name for bk in hub.business_keys]
+        df = source(hub.name).select(
+            hashed(keys).alias(f"{hub.name}_hk"), *typed(hub.business_keys)
+        )
+        _append_new(spark, hub.name, system(df).distinct(), [f"{hub.name}_hk"])
+
+    for link in model.links.values():
+        refs = [f"{ref}_hk" for ref in link.hub_references]
+        df = source(link.name).select(
+            hashed(refs).alias(f"{link.name}_hk"), *refs, *typed(link.columns)
+        )
+        _append_new(spark, link.name, system(df), [f"{link.name}_hk"])
+
+    for sat in model.satellites.values():
+        parent_hk = f"{sat.parent_ref}_hk"
+        df = source(sat.name).select(
+            parent_hk,
+            hashed([c.name for c in sat.columns]).alias("hash_diff"),
+            *typed(sat.columns),
+        )
+        _append_new(spark, sat.name, system(df), [parent_hk, "hash_diff"])
+
+    cdc_sats: list[NhSat | EffSat] = [*model.nhsats.values(), *model.effsats.values()]
+    for cdc_sat in cdc_sats:
+        parent_hk = f"{cdc_sat.parent_ref}_hk"
+        df = source(cdc_sat.name).select(parent_hk, *typed(cdc_sat.columns))
+        _merge(spark, cdc_sat.name, system(df), parent_hk)
+
+    for nhlink in model.nhlinks.values():
+        refs = [f"{ref}_hk" for ref in nhlink.hub_references]
+        df = source(nhlink.name).select(
+            hashed(refs).alias(f"{nhlink.name}_hk"), *refs, *typed(nhlink.columns)
+        )
+        _merge(spark, nhlink.name, system(df), f"{nhlink.name}_hk")
+
+    for samlink in model.samlinks.values():
+        master_hk, duplicate_hk = f"{samlink.master_ref}_hk", f"{samlink.duplicate_ref}_hk"
+        prefixed = master_hk == duplicate_hk
+        df = source(samlink.name).select(
+            hashed([master_hk, duplicate_hk]).alias(f"{samlink.name}_hk"),
+            F.col(master_hk).alias(f"master_{master_hk}" if prefixed else master_hk),
+            F.col(duplicate_hk).alias(f"duplicate_{duplicate_hk}" if prefixed else duplicate_hk),
+            *typed(samlink.columns),
+        )
+        _merge(spark, samlink.name, system(df), f"{samlink.name}_hk")
+
+    for statement in view_statements(model, quote="`"):
+        spark.sql(statement)
+
+
+def _hash_function(F: Any, hash_algo: str) -> Callable[[Any], Any]:
+    if hash_algo == "md5":
+        return F.md5  # type: ignore[no-any-return]
+    if hash_algo == "sha1":
+        return F.sha1  # type: ignore[no-any-return]
+    bits = hash_algo.removeprefix("sha")
+    if bits.isdigit() and int(bits) in _SHA2_BITS:
+        return lambda expr: F.sha2(expr, int(bits))
+    raise ValueError(f"Unsupported hash_algo '{hash_algo}' for the Spark runtime")
+
+
+def _append_new(spark: Any, table: str, df: Any, keys: list[str]) -> None:
+    if not spark.catalog.tableExists(table):
+        df.write.saveAsTable(table)
+        return
+    existing = spark.table(table).select(*keys)
+    df.join(existing, keys, "left_anti").write.mode("append").saveAsTable(table)
+
+
+def _merge(spark: Any, table: str, df: Any, key: str) -> None:
+    from delta.tables import DeltaTable
+
+    if not spark.catalog.tableExists(table):
+        df.write.format("delta").saveAsTable(table)
+        return
+    (
+        DeltaTable.forName(spark, table)
+        .alias("target")
+        .merge(df.alias("source"), f"target.`{key}` = source.`{key}`")
+        .whenMatchedUpdateAll()
+        .whenNotMatchedInsertAll()
+        .execute()
+    )
@@ -0,0 +1,302 @@
+"""Generic SQL loader driven by a DMJEDI manifest.
+
+Builds target tables, staging views, load statements and query-assist views for every
+entity in a manifest at run time. Statements mirror what the ``sql-jinja`` target renders
+per entity: hubs, links and satellites are insert-only, non-historized and same-as entities
+are merged, and bridges/PITs are views. Sources are read from ``src_<entity>`` tables.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import Any, Protocol
+
+from dmjedi.generators.sql_jinja.hash import build_hash_expr
+from dmjedi.model.core import Column, DataVaultModel
+from dmjedi.model.symbols import ENTITY_KINDS
+from dmjedi.model.types import map_type
+from dmjedi.runtime.manifest import Manifest
+
+
+class SqlConnection(Protocol):
+    def execute(self, sql: str, /) -> object: ...
+
+
+def build_statements(manifest: Manifest, dialect: str = "default") -> list[str]:
+    """Return every statement needed to load the manifest's model, in execution order."""
+    model = manifest.model
+    return [
+        *table_statements(model, dialect),
+        *staging_statements(model, dialect, manifest.hash_algo),
+        *load_statements(model),
+        *view_statements(model),
+    ]
+
+
+def run(conn: SqlConnection, manifest: Manifest, dialect: str = "default") -> int:
+    """Execute the manifest's statements on a DB-API style connection.
+
+    Returns the number of statements executed.
+    """
+    statements = build_statements(manifest, dialect)
+    for statement in statements:
+        conn.execute(statement)
+    return len(statements)
+
+
+def table_statements(model: DataVaultModel, dialect: str = "default") -> list[str]:
+    """CREATE TABLE IF NOT EXISTS statements for every persisted entity."""
+    return _collect(model, _TABLE_ORDER, lambda kind, e: table_statement(kind, e, dialect))
+
+
+def staging_statements(
+    model: DataVaultModel, dialect: str = "default", hash_algo: str = "sha256"
+) -> list[str]:
+    """CREATE OR REPLACE VIEW statements computing hash keys over ``src_*`` tables."""
+    return _collect(
+        model, _TABLE_ORDER, lambda kind, e: staging_statement(kind, e, dialect, hash_algo)
+    )
+
+
+def load_statements(model: DataVaultModel) -> list[str]:
+    """Insert-only loads for hubs, links and satellites; MERGEs for current-state entities."""
+    return _collect(model, _LOAD_ORDER, load_statement)
+
+
+def view_statements(model: DataVaultModel, quote: str = '"') -> list[str]:
+    """Bridge and PIT views over the loaded tables.
+
+    ``quote`` is the identifier quote character (use a backtick for Spark SQL).
+    """
+    return _collect(model, _VIEW_ORDER, lambda kind, e: view_statement(kind, e, quote))
+
+
+# Per-phase entity kind order (matches the order statements have always been emitted in).
+_TABLE_ORDER = ("hub", "link", "nhlink", "satellite", "nhsat", "effsat", "samlink")
+_LOAD_ORDER = ("hub", "link", "satellite", "nhsat", "effsat", "nhlink", "samlink")
+_VIEW_ORDER = ("bridge", "pit")
+_MODEL_ATTRS = {kind: attr for attr, kind in ENTITY_KINDS.items()}
+
+
+def table_statement(kind: str, entity: Any, dialect: str = "default") -> str | None:
+    """CREATE TABLE IF NOT EXISTS for one entity; None for view-only kinds."""
+    hk = map_type("hashkey", dialect)
+    header = [
+        f"{_q('load_ts')} {map_type('load_ts', dialect)} NOT NULL",
+        f"{_q('record_source')} {map_type('record_source', dialect)} NOT NULL",
+    ]
+    if kind == "hub":
+        columns = [f"{_q(entity.name + '_hk')} {hk} NOT NULL", *header]
+        return _create(entity.name, columns, entity.business_keys, dialect)
+    if kind in ("link", "nhlink"):
+        columns = [f"{_q(entity.name + '_hk')} {hk} NOT NULL", *header]
+        columns += [f"{_q(ref + '_hk')} {hk} NOT NULL" for ref in entity.hub_references]
+        return _create(entity.name, columns, entity.columns, dialect)
+    if kind == "satellite":
+        columns = [
+            f"{_q(entity.parent_ref + '_hk')} {hk} NOT NULL",
+            header[0],
+            f"{_q('load_end_ts')} {map_type('load_ts', dialect)}",
+            header[1],
+            f"{_q('hash_diff')} {map_type('hash_diff', dialect)} NOT NULL",
+        ]
+        return _create(entity.name, columns, entity.columns, dialect)
+    if kind in ("nhsat", "effsat"):
+        columns = [f"{_q(entity.parent_ref + '_hk')} {hk} NOT NULL", *header]
+        return _create(entity.name, columns, entity.columns, dialect)
+    if kind == "samlink":
+        master_col, duplicate_col = _samlink_columns(entity.master_ref, entity.duplicate_ref)
+        columns = [
+            f"{_q(entity.name + '_hk')} {hk} NOT NULL",
+            *header,
+            f"{_q(master_col)} {hk} NOT NULL",
+            f"{_q(duplicate_col)} {hk} NOT NULL",
+        ]
+        return _create(entity.name, columns, entity.columns, dialect)
+    return None
+
+
+def staging_statement(
+    kind: str, entity: Any, dialect: str = "default", hash_algo: str = "sha256"
+) -> str | None:
+    """Staging view over ``src_<entity>`` for one entity; None for view-only kinds."""
+    system = ["CURRENT_TIMESTAMP AS " + _q("load_ts"), "'dmjedi' AS " + _q("record_source")]
+
+    def hashed(columns: list[str], alias: str) -> str:
+        return f"{build_hash_expr(columns, dialect, hash_algo)} AS {_q(alias)}"
+
+    if kind == "hub":
+        keys = [bk.name for bk in entity.business_keys]
+        return _staging(entity.name, [hashed(keys, entity.name + "_hk"), *system, *map(_q, keys)])
+    if kind in ("link", "nhlink"):
+        refs = [ref + "_hk" for ref in entity.hub_references]
+        select = [hashed(refs, entity.name + "_hk"), *system, *map(_q, refs)]
+        return _staging(entity.name, select + _names(entity.columns))
+    if kind == "satellite":
+        select = [
+            _q(entity.parent_ref + "_hk"),
+            system[0],
+            "CURRENT_TIMESTAMP AS " + _q("load_end_ts"),
+            system[1],
+            hashed([col.name for col in entity.columns], "hash_diff"),
+        ]
+        return _staging(entity.name, select + _names(entity.columns))
+    if kind in ("nhsat", "effsat"):
+        select = [_q(entity.parent_ref + "_hk"), *system]
+        return _staging(entity.name, select + _names(entity.columns))
+    if kind == "samlink":
+        master_hk, duplicate_hk = entity.master_ref + "_hk", entity.duplicate_ref + "_hk"
+        master_col, duplicate_col = _samlink_columns(entity.master_ref, entity.duplicate_ref)
+        select = [
+            hashed([master_hk, duplicate_hk], entity.name + "_hk"),
+            *system,
+            f"{_q(master_hk)} AS {_q(master_col)}",
+            f"{_q(duplicate_hk)} AS {_q(duplicate_col)}",
+        ]
+        return _staging(entity.name, select + _names(entity.columns))
+    return None
+
+
+def load_statement(kind: str, entity: Any) -> str | None:
+    """Load from ``stg_<entity>`` into one entity's table; None for view-only kinds."""
+    if kind == "hub":
+        columns = [entity.name + "_hk", "load_ts", "record_source"]
+        columns += [bk.name for bk in entity.business_keys]
+        return _insert_new(entity.name, columns, [entity.name + "_hk"])
+    if kind == "link":
+        columns = [entity.name + "_hk", "load_ts", "record_source"]
+        columns += [ref + "_hk" for ref in entity.hub_references]
+        columns += [col.name for col in entity.columns]
+        return _insert_new(entity.name, columns, [entity.name + "_hk"])
+    if kind == "satellite":
+        columns = [entity.parent_ref + "_hk", "load_ts", "load_end_ts", "record_source"]
+        columns += ["hash_diff", *(col.name for col in entity.columns)]
+        keys = [entity.parent_ref + "_hk", "hash_diff"]
+        return _insert_new(entity.name, columns, keys)
+    if kind in ("nhsat", "effsat"):
+        key = entity.parent_ref + "_hk"
+        return _merge(entity.name, key, [col.name for col in entity.columns])
+    if kind == "nhlink":
+        columns = [ref + "_hk" for ref in entity.hub_references]
+        columns += [col.name for col in entity.columns]
+        return _merge(entity.name, entity.name + "_hk", columns)
+    if kind == "samlink":
+        columns = list(_samlink_columns(entity.master_ref, entity.duplicate_ref))
+        columns += [col.name for col in entity.columns]
+        return _merge(entity.name, entity.name + "_hk", columns)
+    return None
+
+
+def view_statement(kind: str, entity: Any, quote: str = '"') -> str | None:
+    """Bridge or PIT view for one entity; None for persisted kinds."""
+
+    def q(name: str) -> str:
+        return f"{quote}{name}{quote}"
+
+    if kind == "bridge":
+        path = entity.path
+        select = [f"{q(path[0])}.{q(path[0] + '_hk')}"]
+        joins: list[str] = []
+        for i in range(1, len(path), 2):
+            prev_hub, link_name, next_hub = path[i - 1], path[i], path[i + 1]
+            select.append(f"{q(link_name)}.{q(link_name + '_hk')}")
+            select.append(f"{q(next_hub)}.{q(next_hub + '_hk')}")
+            joins.append(
+                f"JOIN {q(link_name)} ON {q(link_name)}.{q(prev_hub + '_hk')}"
+                f" = {q(prev_hub)}.{q(prev_hub + '_hk')}"
+            )
+            joins.append(
+                f"JOIN {q(next_hub)} ON {q(link_name)}.{q(next_hub + '_hk')}"
+                f" = {q(next_hub)}.{q(next_hub + '_hk')}"
+            )
+        return (
+            f"CREATE OR REPLACE VIEW {q('bridge_' + entity.name)} AS "
+            f"SELECT {', '.join(select)} FROM {q(path[0])} {' '.join(joins)}"
+        )
+    if kind == "pit":
+        anchor_hk = q(entity.anchor_ref + "_hk")
+        select = [f"{q('h')}.{anchor_hk}", f"{q('h')}.{q('load_ts')} AS {q('snap_load_ts')}"]
+        joins = []
+        for sat in entity.tracked_satellites:
+            alias = q(sat + "_alias")
+            select.append(f"{alias}.{q('load_ts')} AS {q(sat + '_load_ts')}")
+            select.append(f"{alias}.{q('hash_diff')} AS {q(sat + '_hash_diff')}")
+            joins.append(
+                f"LEFT JOIN {q(sat)} AS {alias} ON {alias}.{anchor_hk} = {q('h')}.{anchor_hk}"
+                f" AND {alias}.{q('load_ts')} = (SELECT MAX({q('s2')}.{q('load_ts')})"
+                f" FROM {q(sat)} {q('s2')} WHERE {q('s2')}.{anchor_hk} = {q('h')}.{anchor_hk})"
+            )
+        return (
+            f"CREATE OR REPLACE VIEW {q('pit_' + entity.name)} AS "
+            f"SELECT {', '.join(select)} FROM {q(entity.anchor_ref)} {q('h')} {' '.join(joins)}"
+        )
+    return None
+
+
+def _collect(
+    model: DataVaultModel,
+    kinds: tuple[str, ...],
+    build: Callable[[str, Any], str | None],
+) -> list[str]:
+    statements: list[str] = []
+    for kind in kinds:
+        for entity in getattr(model, _MODEL_ATTRS[kind]).values():
+            statement = build(kind, entity)
+            if statement is not None:
+                statements.append(statement)
+    return statements
+
+
+def _q(name: str) -> str:
+    return f'"{name}"'
+
+
+def _names(columns: Sequence[Column]) -> list[str]:
+    return [_q(col.name) for col in columns]
+
+
+def _samlink_columns(master_ref: str, duplicate_ref: str) -> tuple[str, str]:
+    master_hk, duplicate_hk = master_ref + "_hk", duplicate_ref + "_hk"
+    if master_hk == duplicate_hk:
+        return "master_" + master_hk, "duplicate_" + duplicate_hk
+    return master_hk, duplicate_hk
+
+
+def _create(name: str, system: list[str], columns: Sequence[Column], dialect: str) -> str:
+    typed = [
+        f"{_q(col.name)} {map_type(col.data_type, dialect)}"
+        + ("" if col.nullable else " NOT NULL")
+        for col in columns
+    ]
+    return f"CREATE TABLE IF NOT EXISTS {_q(name)} ({', '.join([*system, *typed])})"
+
+
+def _staging(name: str, select: list[str]) -> str:
+    return (
+        f"CREATE OR REPLACE VIEW {_q('stg_' + name)} AS "
+        f"SELECT {', '.join(select)} FROM {_q('src_' + name)}"
+    )
+
+
+def _insert_new(name: str, columns: list[str], keys: list[str]) -> str:
+    column_list = ", ".join(map(_q, columns))
+    match = " AND ".join(f"t.{_q(key)} = s.{_q(key)}" for key in keys)
+    return (
+        f"INSERT INTO {_q(name)} ({column_list}) "
+        f"SELECT DISTINCT {', '.join(f's.{_q(col)}' for col in columns)} "
+        f"FROM {_q('stg_' + name)} AS s "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {_q(name)} AS t WHERE {match})"
+    )
+
+
+def _merge(name: str, key: str, columns: list[str]) -> str:
+    updated = ["load_ts", "record_source", *columns]
+    inserted = [key, *updated]
+    return (
+        f"MERGE INTO {_q(name)} AS target USING {_q('stg_' + name)} AS source "
+        f"ON target.{_q(key)} = source.{_q(key)} "
+        "WHEN MATCHED THEN UPDATE SET "
+        + ", ".join(f"{_q(col)} = source.{_q(col)}" for col in updated)
+        + f" WHEN NOT MATCHED THEN INSERT ({', '.join(map(_q, inserted))}) "
+        f"VALUES ({', '.join(f'source.{_q(col)}' for col in inserted)})"
+    )
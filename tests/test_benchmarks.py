@@ -0,0 +1,105 @@
+"""Tests for the synthetic benchmark harness."""
+
+import json
+from pathlib import Path
+
+from benchmarks import lsp as lsp_bench
+from benchmarks import resolver as resolver_bench
+from benchmarks.run import GENERATE_STAGES, compare, main, run_size
+from benchmarks.synthetic import ModelShape, single_file_source, write_model
+
+from dmjedi.lang.imports import resolve_imports
+from dmjedi.lang.parser import parse, parse_file
+from dmjedi.model.resolver import resolve
+
+
+def test_synthetic_model_resolves_across_files(tmp_path: Path):
+    shape = ModelShape(hubs=12, links=12, sats_per_hub=1, files=3)
+    paths = write_model(tmp_path, shape)
+    assert len(paths) == 3
+    assert 'import "part_0000.dv"' in paths[2].read_text()
+
+    model = resolve(resolve_imports([parse_file(p) for p in paths]))
+    assert len(model.hubs) == 12
+    assert len(model.links) == 12
+    assert len(model.satellites) == 12
+
+
+def test_run_size_reports_every_stage(tmp_path: Path):
+    report = run_size(10, tmp_path)
+    names = [stage["name"] for stage in report["stages"]]
+    assert names[:4] == ["parse", "imports", "lint", "resolve"]
+    assert names[-1] == "docs"
+    assert all(name in names for name, _, _ in GENERATE_STAGES)
+    assert all(stage["peak_bytes"] > 0 for stage in report["stages"])
+    json.dumps(report)
+
+
+def _report(seconds: float) -> dict[str, object]:
+    return {"runs": [{"requested_entities": 10, "stages": [{"name": "parse", "seconds": seconds}]}]}
+
+
+def test_compare_reports_stage_ratios():
+    rows = compare(_report(1.0), _report(2.0))
+    assert rows == [
+        {
+            "entities": 10,
+            "stage": "parse",
+            "baseline_seconds": 1.0,
+            "seconds": 2.0,
+            "ratio": 2.0,
+        }
+    ]
+
+
+def test_main_fails_on_regression(tmp_path: Path):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(_report(1e-9)))
+    output_path = tmp_path / "out.json"
+
+    exit_code = main(
+        [
+            "--sizes",
+            "10",
+            "--no-memory",
+            "--output",
+            str(output_path),
+            "--baseline",
+            str(baseline_path),
+            "--max-regression",
+            "1.5",
+        ]
+    )
+    assert exit_code == 1
+    assert json.loads(output_path.read_text())["runs"][0]["requested_entities"] == 10
+
+
+def test_resolver_benchmark_builds_resolvable_modules():
+    shape = ModelShape(hubs=10, links=10, sats_per_hub=2, files=3)
+    model = resolve(resolver_bench.build_modules(shape))
+    assert len(model.hubs) + len(model.links) + len(model.satellites) == shape.entities
+
+    report = resolver_bench.run([40, 80], repeat=1)
+    assert [entry["entities"] for entry in report["runs"]] == [40, 80]
+    assert report["growth"] > 0
+
+
+def test_resolver_benchmark_max_growth(capsys):
+    assert resolver_bench.main(["--sizes", "40", "--repeat", "1", "--max-growth", "10"]) == 0
+    assert json.loads(capsys.readouterr().out)["growth"] == 1.0
+
+
+def test_single_file_source_parses_to_requested_size():
+    source = single_file_source(200)
+    module = parse(source)
+    assert source.count("\n") + 1 >= 200
+    assert module.namespace == "bench"
+    assert len(module.links) == len(module.hubs) - 1
+
+
+def test_lsp_benchmark_hovers_hit_indexed_spans(capsys):
+    assert lsp_bench.main(["--lines", "150", "--hovers", "20", "--max-hover-us", "1e9"]) == 0
+    [entry] = json.loads(capsys.readouterr().out)["runs"]
+    assert entry["lines"] >= 150
+    assert entry["hovers"] == entry["hits"] == 20
+    assert 0 < entry["reanalyze_seconds"] < entry["analyze_seconds"]
@@ -99,6 +99,75 @@ def test_generate_streaming_mode(tmp_path: Path) -> None:
     assert generated_files
 
 
+def test_generate_quarantine_flag(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "examples/sales-domain.dv",
+            "--target",
+            "spark-declarative",
+            "--quarantine",
+            "--output",
+            str(tmp_path),
+        ],
+    )
+    assert result.exit_code == 0
+    hub_code = (tmp_path / "hubs" / "Customer.py").read_text()
+    assert 'name="hub_Customer_quarantine"' in hub_code
+
+
+def test_generate_layer_packaging(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "examples/sales-domain.dv",
+            "--target",
+            "spark-declarative",
+            "--packaging",
+            "layer",
+            "--output",
+            str(tmp_path),
+        ],
+    )
+    assert result.exit_code == 0
+    generated = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.py"))
+    assert generated == ["pipelines/hubs.py", "pipelines/links.py", "pipelines/satellites.py"]
+
+
+def test_generate_invalid_packaging(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        ["generate", "examples/sales-domain.dv", "--packaging", "bogus", "-o", str(tmp_path)],
+    )
+    assert result.exit_code == 1
+    assert "Invalid packaging" in result.output
+
+
+def test_generate_with_jobs(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "examples/sales-domain.dv",
+            "--target",
+            "sql-jinja",
+            "--jobs",
+            "2",
+            "--output",
+            str(tmp_path),
+        ],
+    )
+    assert result.exit_code == 0
+    assert (tmp_path / "hubs" / "Customer.sql").exists()
+
+
+def test_validate_with_jobs() -> None:
+    result = runner.invoke(app, ["validate", "examples/", "--jobs", "2"])
+    assert result.exit_code == 0
+
+
 def test_generate_invalid_mode(tmp_path: Path) -> None:
     result = runner.invoke(
         app,
@@ -148,6 +217,100 @@ def test_docs_passes_on_warnings_only(tmp_path: Path) -> None:
     assert (tmp_path / "model.md").exists()
 
 
+# --- explain command ---
+
+
+def test_explain_entity_graph() -> None:
+    result = runner.invoke(
+        app,
+        ["explain", "tests/fixtures/all_entity_types.dv", "--entity", "CustomerProduct"],
+    )
+    assert result.exit_code == 0
+    assert "Upstream of test.CustomerProduct: test.Customer, test.Product" in result.output
+    assert "Load wave 3" in result.output
+
+
+def test_explain_unknown_entity_json() -> None:
+    result = runner.invoke(
+        app, ["explain", "examples/sales-domain.dv", "--entity", "Nope", "--format", "json"]
+    )
+    assert result.exit_code == 1
+    assert "unknown-entity" in result.output
+
+
+# --- run command ---
+
+
+def _write_sources(directory: Path) -> None:
+    import duckdb
+
+    from tests.fixtures.all_entity_rows import ALL_ENTITY_SOURCE_ROWS
+    from tests.helpers.sql_execution import load_source_tables
+
+    conn = duckdb.connect(":memory:")
+    try:
+        load_source_tables(conn, ALL_ENTITY_SOURCE_ROWS)
+        for i, table in enumerate(sorted(ALL_ENTITY_SOURCE_ROWS)):
+            # Mix formats and both accepted file names: src_<Entity> and <Entity>.
+            name = table if i % 2 else table.removeprefix("src_")
+            options = "(FORMAT parquet)" if i % 2 else "(HEADER)"
+            suffix = "parquet" if i % 2 else "csv"
+            conn.execute(f"COPY \"{table}\" TO '{directory / name}.{suffix}' {options}")
+    finally:
+        conn.close()
+
+
+def test_run_loads_sources_in_waves(tmp_path: Path) -> None:
+    import json
+
+    import duckdb
+
+    _write_sources(tmp_path)
+    database = tmp_path / "vault.duckdb"
+    result = runner.invoke(
+        app,
+        [
+            "run",
+            "tests/fixtures/all_entity_types.dv",
+            "--sources",
+            str(tmp_path),
+            "--database",
+            str(database),
+            "--workers",
+            "3",
+            "--format",
+            "json",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    waves = [statement["wave"] for statement in payload["statements"]]
+    assert waves == sorted(waves, key=["sources", "staging", "load-1", "load-2", "load-3"].index)
+    assert waves.count("sources") == 8
+
+    conn = duckdb.connect(str(database))
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM "pit_CustomerPit"').fetchall() == [(2,)]
+    finally:
+        conn.close()
+
+
+def test_run_text_output_and_missing_sources(tmp_path: Path) -> None:
+    _write_sources(tmp_path)
+    result = runner.invoke(
+        app, ["run", "tests/fixtures/all_entity_types.dv", "--sources", str(tmp_path)]
+    )
+    assert result.exit_code == 0
+    assert "Slowest statements" in result.output
+
+    (tmp_path / "Customer.csv").unlink()
+    result = runner.invoke(
+        app, ["run", "tests/fixtures/all_entity_types.dv", "--sources", str(tmp_path)]
+    )
+    assert result.exit_code == 1
+    assert "src_Customer" in result.output
+
+
 # --- error formatting ---
 
 
@@ -321,6 +484,27 @@ def test_cli_dialect_invalid_value(tmp_path: Path) -> None:
     assert result.exit_code != 0
 
 
+def test_batch_commands_pause_gc_but_servers_do_not(monkeypatch) -> None:
+    import gc
+
+    from dmjedi.application.results import ValidateResult
+
+    seen: dict[str, bool] = {}
+
+    def fake_validate(*args, **kwargs) -> ValidateResult:
+        seen["validate"] = gc.isenabled()
+        return ValidateResult(ok=True, source_mode="paths", module_count=0)
+
+    monkeypatch.setattr(cli_main, "validate_request", fake_validate)
+    monkeypatch.setattr(cli_main, "start_mcp_server", lambda: seen.update(mcp=gc.isenabled()))
+
+    assert runner.invoke(app, ["validate", "examples/sales-domain.dv"]).exit_code == 0
+    assert runner.invoke(app, ["mcp"]).exit_code == 0
+
+    assert seen == {"validate": False, "mcp": True}
+    assert gc.isenabled()
+
+
 def test_lsp_command_starts_server(monkeypatch) -> None:
     started: list[bool] = []
 
@@ -72,6 +72,26 @@ def test_validate_request_resolver_error_code() -> None:
     assert [diag.code for diag in result.diagnostics] == ["resolver-error"]
 
 
+def test_validate_request_reports_invalid_lint_config(tmp_path: Path) -> None:
+    from dmjedi.application.cache import CompileCache
+    from dmjedi.application.services import validate_request
+
+    config = tmp_path / ".dvml-lint.toml"
+    config.write_text("root = true\n[rules]\nhub-requires-business-key = false\n")
+    (tmp_path / "model.dv").write_text("namespace test\nhub Empty {\n}\n")
+    request = CompileRequest(paths=[str(tmp_path)])
+    cache: CompileCache = CompileCache()
+    assert validate_request(request, cache=cache).ok is True
+
+    config.write_text('root = true\n[rules]\nhub-requires-business-key = "off"\n')
+    result = validate_request(request, cache=cache)
+
+    assert result.ok is False
+    assert [diag.code for diag in result.diagnostics] == ["config-error"]
+    assert result.diagnostics[0].file == str(config)
+    assert "rules.hub-requires-business-key" in result.diagnostics[0].message
+
+
 def test_generate_request_returns_artifacts_without_writing(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -177,3 +197,228 @@ def test_docs_json_returns_model_markdown_without_writing_output_dir(tmp_path: P
     ]
     assert "# Data Vault Model Documentation" in payload["artifacts"][0]["content"]
     assert output_dir.exists() is False
+
+
+def test_generate_json_profile_reports_stage_timings() -> None:
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "examples/sales-domain.dv",
+            "--target",
+            "sql-jinja",
+            "--format",
+            "json",
+            "--profile",
+        ],
+    )
+
+    assert result.exit_code == 0
+    payload = json.loads(result.stdout)
+    names = [timing["name"] for timing in payload["timings"]]
+    assert names[:3] == ["discovery", "parse", "parse:examples/sales-domain.dv"]
+    assert {"imports", "lint", "resolve", "model-lint", "render"} <= set(names)
+    assert "render:hubs/Customer.sql" in names
+    render = next(t for t in payload["timings"] if t["name"] == "render")
+    assert render["count"] == len(payload["artifacts"])
+    assert render["allocated_bytes"] > 0
+    assert all(t["wall_seconds"] >= 0 and t["cpu_seconds"] >= 0 for t in payload["timings"])
+
+
+def test_generate_json_profile_reports_render_stages_for_any_jobs() -> None:
+    def stage_names(jobs: str) -> list[str]:
+        result = runner.invoke(
+            app,
+            [
+                "generate",
+                "examples/sales-domain.dv",
+                "--target",
+                "sql-jinja",
+                "--format",
+                "json",
+                "--profile",
+                "--jobs",
+                jobs,
+            ],
+        )
+        assert result.exit_code == 0
+        names = [timing["name"] for timing in json.loads(result.stdout)["timings"]]
+        return [name for name in names if name.startswith("render:")]
+
+    serial = stage_names("1")
+    assert serial
+    assert stage_names("2") == serial
+
+
+def test_generate_text_profile_records_write_in_request_session(tmp_path: Path) -> None:
+    from dmjedi import profiling
+    from dmjedi.application.services import generate_request
+    from dmjedi.cli.main import _timed_write
+
+    request = CompileRequest(paths=[Path("examples/sales-domain.dv")])
+    with profiling.session():
+        result = generate_request(request, target="sql-jinja", dialect="default", mode="batch")
+        written = _timed_write(result, tmp_path)
+
+    assert result.timings is not None
+    names = [timing.name for timing in result.timings]
+    assert names.index("render") < names.index("write")
+    write = result.timings[names.index("write")]
+    assert write.count == len(written)
+    assert write.allocated_bytes is not None
+
+
+def test_validate_json_omits_timings_without_profile() -> None:
+    result = runner.invoke(app, ["validate", "examples/sales-domain.dv", "--format", "json"])
+
+    assert json.loads(result.stdout)["timings"] is None
+
+
+def test_generate_text_profile_prints_stage_table(tmp_path: Path) -> None:
+    result = runner.invoke(
+        app,
+        ["generate", "examples/sales-domain.dv", "--profile", "--output", str(tmp_path)],
+    )
+
+    assert result.exit_code == 0
+    assert "Stage timings" in result.output
+    assert "write" in result.output
+
+
+def test_generate_request_filters_and_pages_artifacts() -> None:
+    import hashlib
+
+    from dmjedi.application.requests import ResultFilter
+    from dmjedi.application.services import generate_request
+
+    request = CompileRequest(paths=[Path("examples/sales-domain.dv")])
+    full = generate_request(request, target="sql-jinja", dialect="default", mode="batch")
+    hubs = generate_request(
+        request,
+        target="sql-jinja",
+        dialect="default",
+        mode="batch",
+        filters=ResultFilter(kinds=["hub"], artifact_paths=["staging/*"]),
+    )
+    assert [artifact.path for artifact in hubs.artifacts] == [
+        "staging/hubs/Customer.sql",
+        "staging/hubs/Product.sql",
+        "staging/hubs/Store.sql",
+    ]
+    assert hubs.total == 3
+
+    pages: list[str] = []
+    cursor = None
+    while True:
+        page = generate_request(
+            request,
+            target="sql-jinja",
+            dialect="default",
+            mode="batch",
+            filters=ResultFilter(cursor=cursor, limit=5),
+            manifest_only=True,
+        )
+        assert page.ok is True
+        assert page.artifacts == []
+        assert page.total == len(full.artifacts)
+        assert page.manifest is not None
+        pages.extend(entry.path for entry in page.manifest)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert pages == [artifact.path for artifact in full.artifacts]
+
+    manifest = generate_request(
+        request,
+        target="sql-jinja",
+        dialect="default",
+        mode="batch",
+        filters=ResultFilter(entities=["Customer*"], limit=1),
+        manifest_only=True,
+    ).manifest
+    content = next(a.content for a in full.artifacts if a.path == "hubs/Customer.sql").encode()
+    assert manifest is not None
+    assert manifest[0].model_dump() == {
+        "path": "hubs/Customer.sql",
+        "size": len(content),
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "entities": ["sales.Customer"],
+    }
+
+
+def test_generate_request_reports_invalid_filters() -> None:
+    from dmjedi.application.requests import ResultFilter
+    from dmjedi.application.services import generate_request
+
+    request = CompileRequest(paths=[Path("examples/sales-domain.dv")])
+    for filters in (ResultFilter(kinds=["table"]), ResultFilter(cursor="%%%")):
+        result = generate_request(
+            request, target="sql-jinja", dialect="default", mode="batch", filters=filters
+        )
+        assert result.ok is False
+        assert [diag.code for diag in result.diagnostics] == ["invalid-filter"]
+
+
+def test_explain_json_filters_and_pages_entities() -> None:
+    args = ["explain", "examples/sales-domain.dv", "--format", "json", "--kind", "satellite"]
+
+    first = json.loads(runner.invoke(app, [*args, "--limit", "3"]).stdout)
+    second = json.loads(runner.invoke(app, [*args, "--cursor", first["next_cursor"]]).stdout)
+
+    assert first["total"] == second["total"] == 4
+    assert [entity["qualified_name"] for entity in first["entities"]] == [
+        "sales.CustomerDetails",
+        "sales.ProductInfo",
+        "sales.SaleContext",
+    ]
+    assert [entity["qualified_name"] for entity in second["entities"]] == ["sales.StoreInfo"]
+    assert second["next_cursor"] is None
+    assert first["entity_counts"]["hubs"] == 3
+
+
+def test_generate_manifest_only_text_lists_without_writing(tmp_path: Path) -> None:
+    output_dir = tmp_path / "output"
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "examples/sales-domain.dv",
+            "--target",
+            "sql-jinja",
+            "--output",
+            str(output_dir),
+            "--manifest-only",
+            "--entity",
+            "sales.Sale",
+        ],
+    )
+
+    assert result.exit_code == 0
+    assert "links/Sale.sql" in result.stdout
+    assert "SaleContext" not in result.stdout
+    assert not output_dir.exists()
+
+
+def test_generate_json_filters_artifacts_by_artifact_path() -> None:
+    result = runner.invoke(
+        app,
+        [
+            "generate",
+            "examples/sales-domain.dv",
+            "--target",
+            "sql-jinja",
+            "--format",
+            "json",
+            "--manifest-only",
+            "--artifact-path",
+            "staging/hubs/*",
+        ],
+    )
+
+    assert result.exit_code == 0
+    payload = json.loads(result.stdout)
+    assert [entry["path"] for entry in payload["manifest"]] == [
+        "staging/hubs/Customer.sql",
+        "staging/hubs/Product.sql",
+        "staging/hubs/Store.sql",
+    ]
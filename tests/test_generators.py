@@ -1,5 +1,10 @@
 """Tests for the generator registry and built-in generators."""
 
+import ast
+import json
+
+import pytest
+
 from dmjedi.generators import registry
 from dmjedi.generators.sql_jinja.generator import SqlJinjaGenerator
 from dmjedi.generators.sql_jinja.types import map_type
@@ -75,8 +80,6 @@ def test_sql_jinja_generates_files():
 
 
 def test_unknown_generator_raises():
-    import pytest
-
     with pytest.raises(KeyError, match="Unknown generator"):
         registry.get("nonexistent")
 
@@ -320,6 +323,131 @@ def test_spark_satellite_column_type_mapping():
     assert ".cast(" in sat_code, "typed columns should use .cast() in Spark output"
 
 
+def _sample_model_with_constraints() -> DataVaultModel:
+    return DataVaultModel(
+        hubs={
+            "sales.Customer": Hub(
+                name="Customer",
+                namespace="sales",
+                business_keys=[
+                    Column(name="customer_id", data_type="int", is_business_key=True)
+                ],
+            )
+        },
+        satellites={
+            "sales.CustomerDetails": Satellite(
+                name="CustomerDetails",
+                namespace="sales",
+                parent_ref="Customer",
+                columns=[
+                    Column(
+                        name="email",
+                        data_type="string",
+                        nullable=False,
+                        checks=["email LIKE '%@%'"],
+                    ),
+                    Column(name="age", data_type="int", checks=["age >= 0", "age < 150"]),
+                ],
+            )
+        },
+        links={
+            "sales.CustomerProduct": Link(
+                name="CustomerProduct",
+                namespace="sales",
+                hub_references=["Customer", "Product"],
+            )
+        },
+    )
+
+
+def test_spark_hub_expectations_drop_null_keys():
+    gen = registry.get("spark-declarative")
+    code = gen.generate(_sample_model_with_constraints()).files["hubs/Customer.py"]
+    assert '@dlt.expect_or_drop("valid_customer_id", "customer_id IS NOT NULL")' in code
+    # sha2(concat_ws(...)) never yields NULL, so the hub hash key needs no expectation.
+    assert "valid_Customer_hk" not in code
+    assert code.index("@dlt.expect_or_drop") < code.index("def hub_Customer")
+
+
+def test_spark_hub_selects_and_checks_declared_columns():
+    model = _sample_model_with_constraints()
+    model.hubs["sales.Customer"].columns = [
+        Column(name="segment", data_type="string", nullable=False, checks=["segment <> ''"])
+    ]
+    code = registry.get("spark-declarative").generate(model).files["hubs/Customer.py"]
+    assert 'F.col("segment").cast(StringType()),' in code
+    assert '@dlt.expect_or_drop("valid_segment", "segment IS NOT NULL")' in code
+    assert '@dlt.expect_or_drop("check_segment", "segment <> \'\'")' in code
+
+    consolidated = registry.get("spark-declarative", packaging="layer").generate(model)
+    hubs = consolidated.files["pipelines/hubs.py"]
+    assert '"columns": [("segment", StringType())],' in hubs
+    assert '"check_segment": "segment <> \'\'"}' in hubs
+    assert '*[F.col(name).cast(data_type) for name, data_type in spec["columns"]],' in hubs
+    compile(hubs, "hubs.py", "exec")
+
+
+def test_spark_link_expectations_cover_all_hash_keys():
+    gen = registry.get("spark-declarative")
+    code = gen.generate(_sample_model_with_constraints()).files["links/CustomerProduct.py"]
+    for hk in ("CustomerProduct_hk", "Customer_hk", "Product_hk"):
+        assert f'@dlt.expect_or_drop("valid_{hk}", "{hk} IS NOT NULL")' in code
+
+
+def test_spark_satellite_expectations_include_declared_constraints():
+    gen = registry.get("spark-declarative")
+    code = gen.generate(_sample_model_with_constraints()).files["satellites/CustomerDetails.py"]
+    assert '@dlt.expect_or_drop("valid_Customer_hk", "Customer_hk IS NOT NULL")' in code
+    assert '@dlt.expect_or_drop("valid_email", "email IS NOT NULL")' in code
+    assert '@dlt.expect_or_drop("check_email", "email LIKE \'%@%\'")' in code
+    assert '@dlt.expect_or_drop("check_age_1", "age >= 0")' in code
+    assert '@dlt.expect_or_drop("check_age_2", "age < 150")' in code
+    assert '"valid_age"' not in code
+    compile(code, "CustomerDetails.py", "exec")
+
+
+def test_spark_quarantine_tags_rows_in_single_pass():
+    gen = registry.get("spark-declarative", quarantine=True)
+    code = gen.generate(_sample_model_with_constraints()).files["satellites/CustomerDetails.py"]
+    assert "@dlt.expect_or_drop" not in code
+    assert '"check_age_2": "age < 150",' in code
+    assert 'name="sat_CustomerDetails_quarantine"' in code
+    assert 'partition_cols=["is_quarantined"]' in code
+    assert "@dlt.expect_all(_RULES)" in code
+    assert code.count('dlt.read("src_CustomerDetails")') == 1
+    assert 'dlt.read("sat_CustomerDetails_quarantine")' in code
+    assert 'df.filter(~F.col("is_quarantined")).drop("is_quarantined")' in code
+    compile(code, "CustomerDetails.py", "exec")
+
+
+def test_spark_expectations_quote_check_expressions():
+    check = "status != 'x\\' AND note <> \"n/a\""
+    model = _sample_model_with_constraints()
+    model.satellites["sales.CustomerDetails"].columns[1].checks = [check]
+
+    for options in ({}, {"quarantine": True}, {"packaging": "namespace"}):
+        result = registry.get("spark-declarative", **options).generate(model)
+        path = "pipelines/sales.py" if options.get("packaging") else "satellites/CustomerDetails.py"
+        tree = ast.parse(result.files[path])
+        strings = {
+            node.value
+            for node in ast.walk(tree)
+            if isinstance(node, ast.Constant) and isinstance(node.value, str)
+        }
+        assert check in strings
+        if options.get("quarantine"):
+            rules = "(Customer_hk IS NOT NULL) AND (email IS NOT NULL) AND (email LIKE '%@%')"
+            assert f"NOT ({rules} AND ({check}))" in strings
+
+
+def test_spark_quarantine_streaming_reads_quarantine_as_stream():
+    gen = registry.get("spark-declarative", mode="streaming", quarantine=True)
+    code = gen.generate(_sample_model_with_constraints()).files["hubs/Customer.py"]
+    assert 'dlt.read_stream("src_Customer")' in code
+    assert 'dlt.read_stream("hub_Customer_quarantine")' in code
+    assert code.rstrip().endswith('.drop("is_quarantined").distinct()')
+
+
 # --- Non-historized entity helpers ---
 
 
@@ -789,3 +917,125 @@ def test_spark_samlink_output_functional():
     assert "samlink_CustomerMatch" in code
     # apply_changes infers schema at runtime — column names must NOT appear
     assert "confidence" not in code
+
+
+# --- Consolidated Spark packaging ---
+
+
+def test_spark_namespace_packaging_emits_one_module_per_namespace(all_entity_model):
+    gen = registry.get("spark-declarative", packaging="namespace")
+    result = gen.generate(all_entity_model)
+    assert list(result.files) == ["pipelines/test.py"]
+    code = result.files["pipelines/test.py"]
+    assert code.count("import dlt") == 1
+    for spec_list in ("HUBS", "LINKS", "SATELLITES", "CDC_TABLES", "BRIDGES", "PITS"):
+        assert f"\n{spec_list} = [\n" in code
+    assert '"name": "hub_Customer",' in code
+    assert '"columns": [("quantity", IntegerType())],' in code
+    assert "for spec in HUBS:\n    _hub_table(spec)" in code
+    assert "@dlt.expect_all_or_drop(spec[\"rules\"])" in code
+    compile(code, "test.py", "exec")
+
+
+def test_spark_layer_packaging_groups_like_entity_directories(all_entity_model):
+    gen = registry.get("spark-declarative", packaging="layer")
+    result = gen.generate(all_entity_model)
+    assert sorted(result.files) == [
+        "pipelines/hubs.py",
+        "pipelines/links.py",
+        "pipelines/satellites.py",
+        "pipelines/views.py",
+    ]
+    links = result.files["pipelines/links.py"]
+    assert '"name": "samlink_CustomerMatch",' in links
+    assert "HUBS = [" not in links
+    assert "def _hub_table" not in links
+    assert "from pyspark.sql.window import Window" in result.files["pipelines/views.py"]
+    assert "Window" not in result.files["pipelines/hubs.py"]
+
+
+def test_spark_consolidated_packaging_honours_mode_and_quarantine(all_entity_model):
+    gen = registry.get(
+        "spark-declarative", packaging="layer", mode="streaming", quarantine=True
+    )
+    code = gen.generate(all_entity_model).files["pipelines/hubs.py"]
+    assert "_read = dlt.read_stream" in code
+    assert 'partition_cols=["is_quarantined"]' in code
+    assert "@dlt.expect_all(spec[\"rules\"])" in code
+    compile(code, "hubs.py", "exec")
+
+
+def test_spark_unknown_packaging_raises():
+    with pytest.raises(ValueError, match="Unknown packaging"):
+        registry.get("spark-declarative", packaging="bogus")
+
+
+def test_manifest_generates_single_compact_file(all_entity_model):
+    result = registry.get("manifest").generate(all_entity_model)
+    assert list(result.files) == ["manifest.json"]
+    content = result.files["manifest.json"]
+    assert content.count("\n") == 1
+    payload = json.loads(content)
+    assert payload["format"] == "dmjedi-manifest"
+    assert payload["hash_algo"] == "sha256"
+    assert sorted(payload["model"]["hubs"]) == ["test.Customer", "test.Product"]
+    # Default-valued fields are omitted to keep the manifest small.
+    assert "nullable" not in payload["model"]["satellites"]["test.CustomerDetails"]["columns"][0]
+
+
+def test_manifest_round_trips_model(all_entity_model):
+    from dmjedi.runtime.manifest import load_manifest
+
+    content = registry.get("manifest").generate(all_entity_model).files["manifest.json"]
+    manifest = load_manifest(json.loads(content))
+    assert manifest.model == all_entity_model
+    assert registry.get("manifest").generate(manifest.model).files["manifest.json"] == content
+
+
+def test_manifest_rejects_foreign_or_newer_payloads():
+    from dmjedi.runtime.manifest import load_manifest
+
+    with pytest.raises(ValueError, match="Not a DMJEDI manifest"):
+        load_manifest({"format": "other", "model": {}})
+    with pytest.raises(ValueError, match="newer than supported"):
+        load_manifest({"format": "dmjedi-manifest", "version": 99, "model": {}})
+
+
+def test_plan_orders_entities_into_dependency_waves(all_entity_model):
+    from dmjedi.runtime.plan import load_plan
+
+    content = registry.get("plan", dialect="duckdb").generate(all_entity_model).files["plan.json"]
+    plan = load_plan(json.loads(content))
+    assert plan.dialect == "duckdb"
+    waves = {wave.name: [step.entity for step in wave.steps] for wave in plan.waves}
+    assert list(waves) == ["staging", "load-1", "load-2", "load-3"]
+    assert waves["load-1"] == ["test.Customer", "test.Product"]
+    assert "test.CustomerProduct" in waves["load-2"]
+    assert waves["load-3"] == [
+        "test.CustomerPit",
+        "test.CustomerProductBridge",
+        "test.RelationValidity",
+    ]
+    # Staging creates tables and views only; views over tables wait for the load waves.
+    assert "test.CustomerPit" not in waves["staging"]
+    assert all(len(step.statements) == 2 for step in plan.waves[0].steps)
+
+
+def test_parallel_rendering_matches_serial_output(all_entity_model):
+    serial = registry.get("sql-jinja", dialect="duckdb").generate(all_entity_model)
+    parallel = registry.get("sql-jinja", dialect="duckdb", jobs=2).generate(all_entity_model)
+    assert list(parallel.files) == list(serial.files)
+    assert parallel.files == serial.files
+
+    spark_serial = registry.get("spark-declarative").generate(all_entity_model)
+    spark_parallel = registry.get("spark-declarative", jobs=2).generate(all_entity_model)
+    assert list(spark_parallel.files.items()) == list(spark_serial.files.items())
+
+
+def test_generator_accepts_pluggable_executor(all_entity_model):
+    from concurrent.futures import ThreadPoolExecutor
+
+    serial = registry.get("sql-jinja").generate(all_entity_model)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        threaded = registry.get("sql-jinja", executor=pool).generate(all_entity_model)
+    assert list(threaded.files.items()) == list(serial.files.items())
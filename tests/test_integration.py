@@ -1,8 +1,10 @@
 """End-to-end integration tests for the DMJEDI pipeline."""
 
+import sys
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
+from types import ModuleType
 
 import duckdb
 import pytest
@@ -350,6 +352,310 @@ def test_e2e_duckdb_executes_every_generated_sql_file(
         conn.close()
 
 
+def test_e2e_manifest_runtime_loads_duckdb(all_entity_model, all_entity_source_rows, tmp_path):
+    """The generic SQL runtime should load every entity from a single manifest file."""
+    from dmjedi.runtime import sql as sql_runtime
+    from dmjedi.runtime.manifest import load_manifest
+
+    registry.get("manifest").generate(all_entity_model).write(tmp_path)
+    manifest = load_manifest(tmp_path / "manifest.json")
+
+    conn = duckdb.connect(":memory:")
+    try:
+        load_source_tables(conn, all_entity_source_rows)
+        sql_runtime.run(conn, manifest, dialect="duckdb")
+        # Re-running is idempotent for insert-only and merged entities.
+        sql_runtime.run(conn, manifest, dialect="duckdb")
+
+        assert fetch_all(
+            conn, 'SELECT "Customer_hk", "customer_id" FROM "Customer" ORDER BY "customer_id"'
+        ) == [(CUSTOMER_1001_HK, 1001), (CUSTOMER_1002_HK, 1002)]
+        assert fetch_all(
+            conn,
+            'SELECT "CustomerProduct_hk", "Customer_hk", "Product_hk" '
+            'FROM "CustomerProduct" ORDER BY "quantity" DESC',
+        ) == [
+            (CUSTOMER_PRODUCT_1001_2001_HK, CUSTOMER_1001_HK, PRODUCT_2001_HK),
+            (CUSTOMER_PRODUCT_1002_2002_HK, CUSTOMER_1002_HK, PRODUCT_2002_HK),
+        ]
+        assert fetch_all(conn, 'SELECT COUNT(*) FROM "CustomerDetails"') == [(2,)]
+        assert fetch_all(conn, 'SELECT "status" FROM "CurrentStatus" ORDER BY "status"') == [
+            ("active",),
+            ("trial",),
+        ]
+        assert fetch_all(
+            conn, 'SELECT "CustomerMatch_hk", "master_Customer_hk" FROM "CustomerMatch"'
+        ) == [(CUSTOMER_MATCH_1001_HK, CUSTOMER_1001_HK)]
+        assert fetch_all(conn, 'SELECT COUNT(*) FROM "bridge_CustomerProductBridge"') == [(2,)]
+        assert fetch_all(conn, 'SELECT COUNT(*) FROM "pit_CustomerPit"') == [(2,)]
+    finally:
+        conn.close()
+
+
+class _Expr:
+    """Column expression stub that renders to the call it was built from."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def cast(self, data_type: str) -> "_Expr":
+        return _Expr(f"CAST({self.text} AS {data_type})")
+
+    def alias(self, name: str) -> "_Expr":
+        return _Expr(f"{self.text} AS {name}")
+
+
+def _fake_functions() -> ModuleType:
+    functions = ModuleType("pyspark.sql.functions")
+    functions.col = lambda name: _Expr(name)
+    functions.lit = lambda value: _Expr(repr(value))
+    functions.current_timestamp = lambda: _Expr("current_timestamp()")
+    functions.concat_ws = lambda sep, *cols: _Expr(
+        f"concat_ws({sep}, {', '.join(c.text for c in cols)})"
+    )
+    functions.sha2 = lambda col, bits: _Expr(f"sha2({col.text}, {bits})")
+    functions.sha1 = lambda col: _Expr(f"sha1({col.text})")
+    functions.md5 = lambda col: _Expr(f"md5({col.text})")
+    return functions
+
+
+class _FakeFrame:
+    def __init__(self, session: "_FakeSpark", name: str, how: str | None = None) -> None:
+        self.session = session
+        self.name = name
+        self.how = how
+        self.columns: list[str] = []
+
+    def select(self, *cols: "str | _Expr") -> "_FakeFrame":
+        self.columns = [c if isinstance(c, str) else c.text for c in cols]
+        return self
+
+    def withColumn(self, name: str, col: _Expr) -> "_FakeFrame":
+        self.columns.append(f"{col.text} AS {name}")
+        return self
+
+    def distinct(self) -> "_FakeFrame":
+        return self
+
+    def alias(self, name: str) -> "_FakeFrame":
+        return self
+
+    def join(self, other: "_FakeFrame", keys: list[str], how: str) -> "_FakeFrame":
+        joined = _FakeFrame(self.session, self.name, how)
+        joined.columns = self.columns
+        return joined
+
+    @property
+    def write(self) -> "_FakeWriter":
+        return _FakeWriter(self)
+
+
+class _FakeWriter:
+    def __init__(self, frame: _FakeFrame) -> None:
+        self.frame = frame
+        self.options: dict[str, str] = {}
+
+    def mode(self, mode: str) -> "_FakeWriter":
+        self.options["mode"] = mode
+        return self
+
+    def format(self, fmt: str) -> "_FakeWriter":
+        self.options["format"] = fmt
+        return self
+
+    def saveAsTable(self, table: str) -> None:
+        session = self.frame.session
+        session.writes.append((table, self.options, self.frame.how))
+        session.tables.add(table)
+
+
+class _FakeSpark:
+    """Records the tables, writes and SQL statements the Spark runtime issues."""
+
+    def __init__(self) -> None:
+        self.tables: set[str] = set()
+        self.frames: dict[str, _FakeFrame] = {}
+        self.writes: list[tuple[str, dict[str, str], str | None]] = []
+        self.merges: list[tuple[str, str]] = []
+        self.statements: list[str] = []
+        self.catalog = self
+
+    def tableExists(self, table: str) -> bool:
+        return table in self.tables
+
+    def table(self, name: str) -> _FakeFrame:
+        frame = _FakeFrame(self, name)
+        self.frames[name] = frame
+        return frame
+
+    def sql(self, statement: str) -> None:
+        self.statements.append(statement)
+
+
+class _FakeDeltaTable:
+    def __init__(self, spark: _FakeSpark, table: str) -> None:
+        self.spark = spark
+        self.table = table
+
+    @classmethod
+    def forName(cls, spark: _FakeSpark, table: str) -> "_FakeDeltaTable":
+        return cls(spark, table)
+
+    def alias(self, name: str) -> "_FakeDeltaTable":
+        return self
+
+    def merge(self, source: _FakeFrame, condition: str) -> "_FakeDeltaTable":
+        self.spark.merges.append((self.table, condition))
+        return self
+
+    def whenMatchedUpdateAll(self) -> "_FakeDeltaTable":
+        return self
+
+    def whenNotMatchedInsertAll(self) -> "_FakeDeltaTable":
+        return self
+
+    def execute(self) -> None:
+        return None
+
+
+@pytest.fixture
+def fake_spark(monkeypatch) -> _FakeSpark:
+    """Install stub ``pyspark`` and ``delta`` modules and return a recording session."""
+    pyspark, sql_module, delta, tables = (
+        ModuleType("pyspark"),
+        ModuleType("pyspark.sql"),
+        ModuleType("delta"),
+        ModuleType("delta.tables"),
+    )
+    sql_module.functions = _fake_functions()
+    pyspark.sql = sql_module
+    tables.DeltaTable = _FakeDeltaTable
+    delta.tables = tables
+    for name, module in {
+        "pyspark": pyspark,
+        "pyspark.sql": sql_module,
+        "pyspark.sql.functions": sql_module.functions,
+        "delta": delta,
+        "delta.tables": tables,
+    }.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return _FakeSpark()
+
+
+def test_spark_runtime_loads_manifest_through_stub_session(all_entity_model, fake_spark, tmp_path):
+    """The Spark runtime should create, append to and merge every manifest entity."""
+    from dmjedi.runtime import spark as spark_runtime
+    from dmjedi.runtime.manifest import load_manifest
+
+    registry.get("manifest").generate(all_entity_model).write(tmp_path)
+    manifest = load_manifest(tmp_path / "manifest.json")
+
+    spark_runtime.load(fake_spark, manifest)
+
+    created = {table: options.get("format") for table, options, _ in fake_spark.writes}
+    assert created == {
+        "Customer": None,
+        "Product": None,
+        "CustomerProduct": None,
+        "CustomerDetails": None,
+        "CurrentStatus": "delta",
+        "RelationValidity": "delta",
+        "ActiveRelation": "delta",
+        "CustomerMatch": "delta",
+    }
+    assert fake_spark.frames["src_Customer"].columns == [
+        "sha2(concat_ws(||, CAST(customer_id AS string)), 256) AS Customer_hk",
+        "CAST(customer_id AS INT)",
+        "current_timestamp() AS load_ts",
+        "'dmjedi' AS record_source",
+    ]
+    assert fake_spark.frames["src_CustomerMatch"].columns[:3] == [
+        "sha2(concat_ws(||, CAST(Customer_hk AS string), CAST(Customer_hk AS string)), 256)"
+        " AS CustomerMatch_hk",
+        "Customer_hk AS master_Customer_hk",
+        "Customer_hk AS duplicate_Customer_hk",
+    ]
+    assert len(fake_spark.statements) == 2
+    assert all("`" in statement for statement in fake_spark.statements)
+    assert fake_spark.merges == []
+
+    fake_spark.writes.clear()
+    spark_runtime.load(fake_spark, manifest)
+
+    assert [(table, options, how) for table, options, how in fake_spark.writes] == [
+        ("Customer", {"mode": "append"}, "left_anti"),
+        ("Product", {"mode": "append"}, "left_anti"),
+        ("CustomerProduct", {"mode": "append"}, "left_anti"),
+        ("CustomerDetails", {"mode": "append"}, "left_anti"),
+    ]
+    assert fake_spark.merges == [
+        ("CurrentStatus", "target.`Customer_hk` = source.`Customer_hk`"),
+        ("RelationValidity", "target.`CustomerProduct_hk` = source.`CustomerProduct_hk`"),
+        ("ActiveRelation", "target.`ActiveRelation_hk` = source.`ActiveRelation_hk`"),
+        ("CustomerMatch", "target.`CustomerMatch_hk` = source.`CustomerMatch_hk`"),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("hash_algo", "digest"),
+    [("md5", "md5({})"), ("sha1", "sha1({})"), ("sha512", "sha2({}, 512)")],
+)
+def test_spark_runtime_honours_manifest_hash_algo(
+    all_entity_model, fake_spark, tmp_path, hash_algo, digest
+):
+    """Hash keys and hash diffs should use the manifest's hash algorithm."""
+    from dmjedi.runtime import spark as spark_runtime
+    from dmjedi.runtime.manifest import load_manifest
+
+    registry.get("manifest", hash_algo=hash_algo).generate(all_entity_model).write(tmp_path)
+    spark_runtime.load(fake_spark, load_manifest(tmp_path / "manifest.json"))
+
+    key_input = "concat_ws(||, CAST(customer_id AS string))"
+    assert fake_spark.frames["src_Customer"].columns[0] == (
+        f"{digest.format(key_input)} AS Customer_hk"
+    )
+    casts = ", ".join(f"CAST({c} AS string)" for c in ("first_name", "last_name", "email"))
+    hash_diff = f"{digest.format(f'concat_ws(||, {casts})')} AS hash_diff"
+    assert fake_spark.frames["src_CustomerDetails"].columns[1] == hash_diff
+
+
+def test_spark_runtime_rejects_unsupported_hash_algo(all_entity_model, fake_spark, tmp_path):
+    from dmjedi.runtime import spark as spark_runtime
+    from dmjedi.runtime.manifest import load_manifest
+
+    registry.get("manifest", hash_algo="sha3").generate(all_entity_model).write(tmp_path)
+    with pytest.raises(ValueError, match="Unsupported hash_algo 'sha3'"):
+        spark_runtime.load(fake_spark, load_manifest(tmp_path / "manifest.json"))
+    assert fake_spark.writes == []
+
+
+def test_e2e_plan_runner_loads_duckdb_in_parallel(all_entity_model, all_entity_source_rows):
+    """The wave plan should load every entity on a pool of DuckDB cursors."""
+    from dmjedi.runtime.plan import PlanExecutionError, build_plan, run_plan
+
+    plan = build_plan(all_entity_model, dialect="duckdb")
+    conn = duckdb.connect(":memory:")
+    try:
+        load_source_tables(conn, all_entity_source_rows)
+        timings = run_plan(conn, plan, workers=4)
+        run_plan(conn, plan, workers=4)
+
+        assert len(timings) == plan.statement_count
+        assert next(iter(timings)).wave == "staging"
+        assert fetch_all(
+            conn, 'SELECT "Customer_hk", "customer_id" FROM "Customer" ORDER BY "customer_id"'
+        ) == [(CUSTOMER_1001_HK, 1001), (CUSTOMER_1002_HK, 1002)]
+        assert fetch_all(conn, 'SELECT COUNT(*) FROM "CustomerDetails"') == [(2,)]
+        assert fetch_all(conn, 'SELECT COUNT(*) FROM "bridge_CustomerProductBridge"') == [(2,)]
+        assert fetch_all(conn, 'SELECT COUNT(*) FROM "pit_CustomerPit"') == [(2,)]
+
+        conn.execute('DROP TABLE "src_Product"')
+        with pytest.raises(PlanExecutionError, match="src_Product"):
+            run_plan(conn, plan, workers=2)
+    finally:
+        conn.close()
+
+
 def _create_non_historized_targets(conn: duckdb.DuckDBPyConnection) -> None:
     conn.execute(
         'CREATE TABLE "CurrentStatus" ('
@@ -2,6 +2,8 @@
 
 from pathlib import Path
 
+import pytest
+
 from dmjedi.lang.ast import (
     BridgeDecl,
     BusinessKeyDef,
@@ -15,8 +17,18 @@ from dmjedi.lang.ast import (
     PitDecl,
     SamLinkDecl,
     SatelliteDecl,
+    SourceLocation,
+)
+from dmjedi.lang.linter import (
+    LintConfig,
+    LintDiagnostic,
+    LintRule,
+    RuleScope,
+    Severity,
+    available_rules,
+    lint,
+    select_rules,
 )
-from dmjedi.lang.linter import Severity, lint
 from dmjedi.model.core import Column, DataVaultModel, Hub, Link
 
 
@@ -334,3 +346,346 @@ def test_naming_pit_correct_prefix(tmp_path: Path) -> None:
     )
     diags = [d for d in lint(module, config_path=toml_file) if d.rule == "naming-convention"]
     assert len(diags) == 0
+
+
+# ---------------------------------------------------------------------------
+# Rule registry and selection
+# ---------------------------------------------------------------------------
+
+
+def test_rule_registry_scopes() -> None:
+    assert available_rules(RuleScope.MODEL) == ["effsat-parent-must-be-link"]
+    assert "hub-requires-business-key" in available_rules(RuleScope.MODULE)
+    assert set(available_rules()) == {
+        *available_rules(RuleScope.MODULE),
+        *available_rules(RuleScope.MODEL),
+    }
+
+
+def test_select_rules_by_name_and_unknown() -> None:
+    module = DVMLModule(hubs=[HubDecl(name="NoKeys")])
+    rules = select_rules(["hub-requires-business-key"])
+    assert [d.rule for d in lint(module, rules=rules)] == ["hub-requires-business-key"]
+    with pytest.raises(KeyError, match="Unknown lint rule"):
+        select_rules(["no-such-rule"])
+
+
+def test_lint_uses_preloaded_config() -> None:
+    module = DVMLModule(
+        namespace="test",
+        hubs=[HubDecl(name="Customer", business_keys=[BusinessKeyDef(name="id", data_type="int")])],
+    )
+    config = LintConfig(naming={"hub": "hub_"})
+    diags = lint(module, config=config)
+    assert [d.rule for d in diags] == ["naming-convention"]
+
+
+def test_compile_runs_each_rule_once_and_loads_config_once(monkeypatch, tmp_path: Path) -> None:
+    from dmjedi.application import services
+    from dmjedi.application.requests import CompileRequest
+    from dmjedi.lang import lint_config, linter
+
+    calls: list[str] = []
+
+    def counting(name: str, scope: RuleScope) -> LintRule:
+        def check(module: DVMLModule, context: object) -> list:
+            calls.append(name)
+            return []
+
+        return LintRule(name=name, scope=scope, node_kinds=("module",), check=check)
+
+    monkeypatch.setattr(
+        linter,
+        "_RULES",
+        {
+            "local": counting("local", RuleScope.MODULE),
+            "global": counting("global", RuleScope.MODEL),
+        },
+    )
+    monkeypatch.setattr(lint_config, "_DEFAULT_LOADER", lint_config.LintConfigLoader())
+    config_loads: list[object] = []
+    original_load = lint_config.tomllib.load
+    monkeypatch.setattr(
+        lint_config.tomllib,
+        "load",
+        lambda f: config_loads.append(f) or original_load(f),
+    )
+
+    (tmp_path / ".dvml-lint.toml").write_text("root = true\n")
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.dv").write_text(
+            f"namespace {name}\nhub Customer {{\n    business_key id : int\n}}\n"
+        )
+    result = services.validate_request(CompileRequest(paths=[tmp_path]))
+
+    assert result.ok
+    assert calls == ["local", "local", "global", "global"]
+    assert len(config_loads) == 1
+
+
+# ---------------------------------------------------------------------------
+# Node-kind dispatch, enable/disable and per-rule timings
+# ---------------------------------------------------------------------------
+
+
+def test_lint_visits_each_node_once_per_subscribed_rule(monkeypatch) -> None:
+    from dmjedi.lang import linter
+
+    seen: list[tuple[str, str]] = []
+
+    def recording(name: str, kinds: tuple[str, ...]) -> LintRule:
+        def check(node: object, context: object) -> list:
+            seen.append((name, getattr(node, "name", "<module>")))
+            return []
+
+        return LintRule(name=name, scope=RuleScope.MODULE, node_kinds=kinds, check=check)
+
+    monkeypatch.setattr(
+        linter,
+        "_RULES",
+        {
+            "hubs-only": recording("hubs-only", ("hub",)),
+            "module-and-links": recording("module-and-links", ("module", "link")),
+        },
+    )
+    module = DVMLModule(
+        namespace="t",
+        hubs=[HubDecl(name="A"), HubDecl(name="B")],
+        links=[LinkDecl(name="L", references=["A", "B"])],
+        satellites=[SatelliteDecl(name="S", parent_ref="A")],
+    )
+    lint(module, config=LintConfig())
+    assert seen == [
+        ("module-and-links", "<module>"),
+        ("hubs-only", "A"),
+        ("hubs-only", "B"),
+        ("module-and-links", "L"),
+    ]
+
+
+def test_register_rule_rejects_unknown_node_kind() -> None:
+    from dmjedi.lang.linter import register_rule
+
+    with pytest.raises(ValueError, match="Unknown node kind"):
+        register_rule("bad", nodes=["table"])
+
+
+def test_rules_disabled_in_toml(tmp_path: Path) -> None:
+    toml_file = tmp_path / ".dvml-lint.toml"
+    toml_file.write_text('[rules]\nhub-requires-business-key = false\n')
+    module = DVMLModule(hubs=[HubDecl(name="NoKeys")])
+    assert [d.rule for d in lint(module, config_path=toml_file)] == ["missing-namespace"]
+
+
+def test_rule_disabled_by_default_can_be_enabled(monkeypatch) -> None:
+    from dmjedi.lang import linter
+
+    def check(node: object, context: object) -> list:
+        return [LintDiagnostic("opt-in", Severity.INFO, SourceLocation(), "opt-in")]
+
+    rule = LintRule(
+        name="opt-in",
+        scope=RuleScope.MODULE,
+        node_kinds=("module",),
+        check=check,
+        enabled_by_default=False,
+    )
+    monkeypatch.setattr(linter, "_RULES", {"opt-in": rule})
+    module = DVMLModule(namespace="t")
+    assert lint(module, config=LintConfig()) == []
+    enabled = LintConfig(rules={"opt-in": True})
+    assert [d.rule for d in lint(module, config=enabled)] == ["opt-in"]
+
+
+def test_lint_collects_per_rule_stats() -> None:
+    from dmjedi.lang.linter import RuleStats
+
+    module = DVMLModule(
+        namespace="t",
+        hubs=[HubDecl(name="A"), HubDecl(name="B")],
+        satellites=[SatelliteDecl(name="S", parent_ref="A")],
+    )
+    stats: dict[str, RuleStats] = {}
+    lint(module, config=LintConfig(), stats=stats)
+    lint(module, config=LintConfig(), stats=stats)
+    assert stats["missing-namespace"].calls == 2
+    assert stats["hub-requires-business-key"].calls == 4
+    assert stats["satellite-requires-fields"].calls == 2
+    assert stats["naming-convention"].calls == 6
+    assert "link-requires-two-refs" not in stats
+    assert all(entry.wall_seconds >= 0 for entry in stats.values())
+
+
+def test_profiled_validate_reports_lint_rule_timings() -> None:
+    from dmjedi.application import services
+    from dmjedi.application.requests import CompileRequest
+
+    source = "namespace t\nhub Customer {\n    business_key id : int\n}\n"
+    result = services.validate_request(CompileRequest(source=source), profile=True)
+    names = {t.name: t for t in result.timings or []}
+    assert names["lint-rule:hub-requires-business-key"].count == 1
+    assert "lint-rule:effsat-parent-must-be-link" not in names
+
+
+# ---------------------------------------------------------------------------
+# Parallel lint across modules
+# ---------------------------------------------------------------------------
+
+
+def _lint_corpus() -> list[DVMLModule]:
+    modules = []
+    for i in reversed(range(12)):
+        loc = SourceLocation(file=f"m{i:02d}.dv", line=3)
+        modules.append(
+            DVMLModule(
+                namespace="" if i % 3 == 0 else f"ns{i}",
+                source_file=f"m{i:02d}.dv",
+                hubs=[HubDecl(name=f"H{i}", loc=loc)],
+                satellites=[
+                    SatelliteDecl(
+                        name=f"S{i}", parent_ref=f"H{i}", loc=loc.model_copy(update={"line": 1})
+                    )
+                ],
+            )
+        )
+    return modules
+
+
+def test_lint_modules_orders_by_file_and_line() -> None:
+    from dmjedi.lang.linter import lint_modules
+
+    diags = lint_modules(_lint_corpus(), config=LintConfig())
+    keys = [(d.loc.file, d.loc.line, d.loc.column) for d in diags]
+    assert keys == sorted(keys)
+    assert [d.rule for d in diags if d.loc.file == "m04.dv"] == [
+        "satellite-requires-fields",
+        "hub-requires-business-key",
+    ]
+
+
+def test_lint_modules_parallel_matches_serial() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dmjedi.lang.linter import RuleStats, lint_modules
+
+    modules = _lint_corpus()
+    serial_stats: dict[str, RuleStats] = {}
+    serial = lint_modules(modules, config=LintConfig(), stats=serial_stats)
+    assert lint_modules(modules, config=LintConfig(), jobs=2) == serial
+
+    thread_stats: dict[str, RuleStats] = {}
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        threaded = lint_modules(modules, config=LintConfig(), executor=pool, stats=thread_stats)
+    assert threaded == serial
+    assert {k: v.calls for k, v in thread_stats.items()} == {
+        k: v.calls for k, v in serial_stats.items()
+    }
+
+
+def test_lint_modules_parallel_model_rules() -> None:
+    from dmjedi.lang.linter import lint_modules
+
+    model = DataVaultModel(
+        hubs={"t.Customer": Hub(name="Customer", namespace="t", business_keys=[])},
+    )
+    modules = [
+        DVMLModule(
+            namespace="t",
+            source_file=f"e{i}.dv",
+            effsats=[EffSatDecl(name=f"E{i}", parent_ref="Customer")],
+        )
+        for i in range(4)
+    ]
+    rules = select_rules(scope=RuleScope.MODEL)
+    diags = lint_modules(modules, model, config=LintConfig(), rules=rules, jobs=2)
+    assert [d.rule for d in diags] == ["effsat-parent-must-be-link"] * 4
+
+
+# ---------------------------------------------------------------------------
+# Config discovery
+# ---------------------------------------------------------------------------
+
+
+def test_config_discovered_per_directory(tmp_path: Path) -> None:
+    from dmjedi.lang.lint_config import LintConfigLoader
+
+    (tmp_path / ".dvml-lint.toml").write_text(
+        'root = true\n[naming]\nhub = "hub_"\nsat = "sat_"\n'
+    )
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / ".dvml-lint.toml").write_text(
+        '[naming]\nhub = "h_"\n[rules]\nsamlink-same-hub = false\n'
+    )
+    (nested / "model.dv").write_text("")
+
+    loader = LintConfigLoader()
+    outer = loader.for_path(tmp_path / "top.dv")
+    inner = loader.for_path(nested / "model.dv")
+    assert outer == LintConfig(naming={"hub": "hub_", "sat": "sat_"})
+    assert inner == LintConfig(
+        naming={"hub": "h_", "sat": "sat_"}, rules={"samlink-same-hub": False}
+    )
+
+
+def test_config_root_stops_search(tmp_path: Path) -> None:
+    from dmjedi.lang.lint_config import LintConfigLoader
+
+    (tmp_path / ".dvml-lint.toml").write_text('[naming]\nhub = "hub_"\n')
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / ".dvml-lint.toml").write_text("root = true\n")
+    assert LintConfigLoader().for_path(nested) == LintConfig()
+
+
+def test_config_rejects_non_boolean_rule_values(tmp_path: Path) -> None:
+    from dmjedi.lang.lint_config import LintConfigError, LintConfigLoader
+
+    (tmp_path / ".dvml-lint.toml").write_text('[rules]\nsamlink-same-hub = "off"\n')
+    nested = tmp_path / "nested"
+    nested.mkdir()
+    (nested / ".dvml-lint.toml").write_text("[rules]\nsamlink-same-hub = false\n")
+
+    loader = LintConfigLoader()
+    with pytest.raises(LintConfigError) as excinfo:
+        loader.for_path(nested / "model.dv")
+    assert excinfo.value.path == tmp_path / ".dvml-lint.toml"
+    assert excinfo.value.key == "rules.samlink-same-hub"
+    assert "expected true or false, got 'off'" in str(excinfo.value)
+    with pytest.raises(LintConfigError):
+        loader.load(tmp_path / ".dvml-lint.toml")
+
+
+def test_config_cache_revalidates_on_change(tmp_path: Path, monkeypatch) -> None:
+    import os
+
+    from dmjedi.lang import lint_config
+
+    config_file = tmp_path / ".dvml-lint.toml"
+    config_file.write_text('[naming]\nhub = "hub_"\n')
+    loads: list[object] = []
+    original_load = lint_config.tomllib.load
+    monkeypatch.setattr(
+        lint_config.tomllib, "load", lambda f: loads.append(f) or original_load(f)
+    )
+
+    loader = lint_config.LintConfigLoader()
+    assert loader.load(config_file).naming == {"hub": "hub_"}
+    assert loader.load(config_file).naming == {"hub": "hub_"}
+    assert len(loads) == 1
+
+    config_file.write_text('[naming]\nhub = "h_"\n')
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert loader.load(config_file).naming == {"hub": "h_"}
+    assert len(loads) == 2
+
+
+def test_lint_uses_config_governing_source_file(tmp_path: Path) -> None:
+    (tmp_path / ".dvml-lint.toml").write_text('root = true\n[naming]\nhub = "hub_"\n')
+    module = DVMLModule(
+        namespace="t",
+        source_file=str(tmp_path / "model.dv"),
+        hubs=[HubDecl(name="Customer", business_keys=[BusinessKeyDef(name="id", data_type="int")])],
+    )
+    assert [d.rule for d in lint(module)] == ["naming-convention"]
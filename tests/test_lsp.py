@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+import threading
+
+import pytest
 from lsprotocol import types
+from pygls.uris import from_fs_path
 from pygls.workspace import TextDocument
 
 from dmjedi.lang.ast import SourceLocation
 from dmjedi.lang.linter import LintDiagnostic, Severity
 from dmjedi.lang.parser import DVMLParseError, parse
+from dmjedi.lsp import server as lsp_server
 from dmjedi.lsp.analysis import analyze_document, completion_context
+from dmjedi.lsp.folding import folding_ranges
+from dmjedi.lsp.incremental import IncrementalParser, split_blocks
+from dmjedi.lsp.lines import LineIndex
 from dmjedi.lsp.protocol import (
     build_document_symbol,
     build_hover,
@@ -15,15 +23,35 @@ from dmjedi.lsp.protocol import (
     parse_error_to_lsp,
     range_from_location,
 )
+from dmjedi.lsp.scheduler import AnalysisScheduler
+from dmjedi.lsp.semantic_tokens import (
+    TOKEN_TYPES,
+    SemanticTokensCache,
+    semantic_token_data,
+    token_edits,
+)
 from dmjedi.lsp.server import (
     document_completions,
     document_definition,
     document_hover,
+    document_references,
     document_symbols,
     get_analysis,
+    publish_analysis,
     publish_document_diagnostics,
     refresh_document,
+    workspace_symbols,
 )
+from dmjedi.lsp.spans import Span, SpanIndex
+from dmjedi.lsp.workspace import WorkspaceIndex, file_symbols, read_file_symbols
+
+
+@pytest.fixture(autouse=True)
+def fresh_workspace(monkeypatch: pytest.MonkeyPatch) -> WorkspaceIndex:
+    """Give each test its own server-wide workspace index and compile session."""
+    workspace = WorkspaceIndex()
+    monkeypatch.setattr(lsp_server, "_WORKSPACE", workspace)
+    return workspace
 
 
 class RecordingServer:
@@ -89,7 +117,7 @@ def test_lint_diagnostic_to_lsp_maps_severity_and_range() -> None:
     )
 
 
-def test_analyze_document_returns_parse_diagnostics_without_module() -> None:
+def test_analyze_document_returns_parse_diagnostics_for_broken_declaration() -> None:
     source = "namespace sales\nhub Customer {\n  business_key id int\n}\n"
 
     analysis = analyze_document(
@@ -100,7 +128,8 @@ def test_analyze_document_returns_parse_diagnostics_without_module() -> None:
 
     assert analysis.uri == "file:///tmp/broken.dv"
     assert analysis.version == 7
-    assert analysis.module is None
+    assert analysis.module.namespace == "sales"
+    assert analysis.module.hubs == []
     assert len(analysis.diagnostics) == 1
     assert analysis.diagnostics[0].severity == types.DiagnosticSeverity.Error
 
@@ -120,6 +149,32 @@ def test_analyze_document_returns_lint_diagnostics_for_current_document() -> Non
     assert [diag.code for diag in analysis.diagnostics] == ["hub-requires-business-key"]
 
 
+def test_analyze_document_uses_config_from_document_directory(tmp_path) -> None:
+    (tmp_path / ".dvml-lint.toml").write_text(
+        'root = true\n[rules]\nhub-requires-business-key = false\n[naming]\nhub = "hub_"\n'
+    )
+    source = "namespace sales\nhub Customer {\n}\n"
+
+    analysis = analyze_document(uri=(tmp_path / "model.dv").as_uri(), source=source, version=1)
+
+    assert [diag.code for diag in analysis.diagnostics] == ["naming-convention"]
+
+
+def test_analyze_document_reports_invalid_config_and_lints_with_defaults(tmp_path) -> None:
+    (tmp_path / ".dvml-lint.toml").write_text(
+        'root = true\n[rules]\nhub-requires-business-key = "off"\n'
+    )
+    source = "namespace sales\nhub Customer {\n}\n"
+
+    analysis = analyze_document(uri=(tmp_path / "model.dv").as_uri(), source=source, version=1)
+
+    assert [diag.code for diag in analysis.diagnostics] == [
+        "config-error",
+        "hub-requires-business-key",
+    ]
+    assert "rules.hub-requires-business-key" in analysis.diagnostics[0].message
+
+
 def test_analyze_document_returns_semantic_diagnostic_for_invalid_satellite_parent() -> None:
     source = (
         "namespace sales\n"
@@ -348,3 +403,369 @@ def test_document_symbols_outline_entities_in_source_order() -> None:
 
     assert [symbol.name for symbol in symbols] == ["Customer", "CustomerProduct", "Product"]
     assert [symbol.detail for symbol in symbols] == ["hub", "link", "hub"]
+
+
+def test_line_index_splits_crlf_and_converts_utf16_columns() -> None:
+    lines = LineIndex('hub A {\r\n  "é😀" x\r\n}')
+
+    assert len(lines) == 3
+    assert lines.line(0) == "hub A {"
+    assert lines.line(5) == ""
+    assert lines.offset(1, 2) == 11
+    # "é" is one UTF-16 unit, the emoji is a surrogate pair.
+    assert lines.to_utf16(1, 4) == 4
+    assert lines.to_utf16(1, 5) == 6
+    assert lines.to_utf16(1, 7) == 8
+    assert lines.from_utf16(1, 6) == 5
+    assert lines.from_utf16(1, 8) == 7
+    assert lines.to_utf16(0, 3) == 3
+
+
+def test_analyze_document_reports_utf16_columns_after_non_ascii_text() -> None:
+    source = 'namespace sales\nimport "😀.dv" hub @ {\n}\n'
+
+    analysis = analyze_document("file:///tmp/utf16.dv", source, version=1)
+
+    assert analysis.lines.source == source
+    assert analysis.diagnostics[0].range.start == types.Position(line=1, character=19)
+
+
+def test_scheduler_debounces_edits_and_publishes_latest_version() -> None:
+    server = RecordingServer()
+    analyzed: list[int | None] = []
+
+    def analyze(uri: str, source: str, version: int | None):
+        analyzed.append(version)
+        return analyze_document(uri, source, version)
+
+    scheduler = AnalysisScheduler(analyze, lambda a: publish_analysis(server, a), delay=0.05)
+    try:
+        for version in range(1, 6):
+            scheduler.schedule("file:///tmp/typing.dv", f"hub H{version} {{\n}}\n", version)
+        assert scheduler.wait(timeout=5)
+    finally:
+        scheduler.shutdown()
+
+    assert analyzed == [5]
+    assert [params.version for params in server.published] == [5]
+    assert get_analysis("file:///tmp/typing.dv").version == 5
+
+
+def test_scheduler_drops_results_superseded_while_analyzing() -> None:
+    server = RecordingServer()
+    started = threading.Event()
+    release = threading.Event()
+
+    def analyze(uri: str, source: str, version: int | None):
+        if version == 1:
+            started.set()
+            release.wait(timeout=5)
+        return analyze_document(uri, source, version)
+
+    scheduler = AnalysisScheduler(analyze, lambda a: publish_analysis(server, a), delay=0)
+    try:
+        scheduler.schedule("file:///tmp/slow.dv", "hub Old {\n}\n", 1)
+        assert started.wait(timeout=5)
+        scheduler.schedule("file:///tmp/slow.dv", "hub New {\n}\n", 2)
+        release.set()
+        assert scheduler.wait(timeout=5)
+
+        scheduler.schedule("file:///tmp/slow.dv", "hub Closed {\n}\n", 3, delay=60)
+        scheduler.cancel("file:///tmp/slow.dv")
+        assert scheduler.wait(timeout=5)
+    finally:
+        scheduler.shutdown()
+
+    assert [params.version for params in server.published] == [2]
+
+
+def test_split_blocks_cuts_at_top_level_declarations() -> None:
+    source = (
+        "# model\nnamespace sales\n"
+        "hub Customer {\n  business_key id: int\n}\n"
+        "hub Broken {\n  business_key id: int\n"
+        "satellite Details of Customer {\n  email: string\n}\n"
+    )
+
+    blocks = split_blocks(source)
+
+    assert [block.line for block in blocks] == [0, 2, 5, 7]
+    assert blocks[2].text == "hub Broken {\n  business_key id: int"
+
+
+def test_incremental_parser_reparses_only_edited_blocks() -> None:
+    parser = IncrementalParser(source_file="file:///tmp/blocks.dv")
+    hub = "hub Customer {\n  business_key id: int\n}\n"
+    sat = "satellite Details of Customer {\n  email: string\n}\n"
+
+    first = parser.parse("namespace sales\n" + hub + sat)
+    edited = parser.parse("namespace sales\n\n" + hub + sat.replace("email", "mail"))
+
+    assert (first.blocks, first.reparsed) == (3, 3)
+    assert (edited.blocks, edited.reparsed) == (3, 1)
+    assert edited.module.hubs[0].loc.line == 3
+    assert edited.module.hubs[0].business_keys[0].loc.line == 4
+    assert edited.module.satellites[0].fields[0].name == "mail"
+    assert edited.module == parse(
+        "namespace sales\n\n" + hub + sat.replace("email", "mail"),
+        source_file="file:///tmp/blocks.dv",
+    )
+
+
+def test_analyze_document_keeps_valid_declarations_around_broken_block() -> None:
+    source = (
+        "namespace sales\n"
+        "hub Customer {\n  business_key customer_id: int\n}\n"
+        "hub Product {\n  business_key product_id int\n}\n"
+        "satellite CustomerDetails of Customer {\n  email: string\n}\n"
+    )
+
+    analysis = analyze_document("file:///tmp/partial.dv", source, version=1)
+    hover = document_hover(analysis, types.Position(line=7, character=31))
+
+    assert sorted(analysis.declarations) == ["Customer", "CustomerDetails"]
+    assert [diag.range.start.line for diag in analysis.diagnostics] == [5]
+    assert hover is not None
+    assert "hub Customer" in hover.contents.value
+
+
+def test_workspace_index_resolves_definitions_and_references_across_files(tmp_path) -> None:
+    hubs = tmp_path / "hubs.dv"
+    hubs.write_text("namespace sales\nhub Customer {\n  business_key id: int\n}\n")
+    sats_source = "namespace sales\nsatellite Details of Customer {\n  email: string\n}\n"
+    (tmp_path / "nested").mkdir()
+    sats = tmp_path / "nested" / "sats.dv"
+    sats.write_text(sats_source)
+    hubs_uri, sats_uri = from_fs_path(str(hubs)), from_fs_path(str(sats))
+    index = WorkspaceIndex()
+
+    assert index.scan([tmp_path]) == 2
+    analysis = analyze_document(sats_uri, sats_source, version=1, workspace=index)
+    position = types.Position(line=1, character=len("satellite Details of Cu"))
+    definition = document_definition(analysis, position, index)
+    found = document_references(analysis, position, index)
+
+    assert analysis.diagnostics == []
+    assert definition == types.Location(
+        uri=hubs_uri,
+        range=types.Range(
+            start=types.Position(line=1, character=4),
+            end=types.Position(line=1, character=12),
+        ),
+    )
+    assert [(location.uri, location.range.start.line) for location in found] == [
+        (hubs_uri, 1),
+        (sats_uri, 1),
+    ]
+    symbols = workspace_symbols(index, "cust")
+    assert [(symbol.name, symbol.container_name) for symbol in symbols] == [("Customer", "sales")]
+
+
+def test_workspace_index_update_reports_documents_affected_by_removed_declarations() -> None:
+    index = WorkspaceIndex()
+    hub_source = "namespace sales\nhub Customer {\n  business_key id: int\n}\n"
+    sat_source = "namespace sales\nsatellite Details of sales.Customer {\n  email: string\n}\n"
+    index.update("file:///ws/hubs.dv", read_file_symbols("file:///ws/hubs.dv", hub_source))
+    index.update("file:///ws/sats.dv", read_file_symbols("file:///ws/sats.dv", sat_source))
+
+    assert index.resolve("Customer", "sales", ("hub",)).uri == "file:///ws/hubs.dv"
+    assert len(index.references("sales.Customer")) == 1
+
+    affected = index.update(
+        "file:///ws/hubs.dv", read_file_symbols("file:///ws/hubs.dv", "namespace sales\n")
+    )
+    analysis = analyze_document("file:///ws/sats.dv", sat_source, version=2, workspace=index)
+
+    assert affected == {"file:///ws/sats.dv"}
+    assert index.definitions("sales.Customer") == []
+    assert [diagnostic.code for diagnostic in analysis.diagnostics] == ["unknown-parent"]
+
+
+def test_span_index_finds_the_span_under_a_position() -> None:
+    index = SpanIndex([Span(2, 10, 14, "b"), Span(0, 4, 8, "a"), Span(2, 0, 3, "c")])
+
+    assert [span.payload for span in index] == ["a", "c", "b"]
+    assert index.at(0, 4).payload == "a"
+    assert index.at(0, 8).payload == "a"
+    assert index.at(0, 9) is None
+    assert index.at(1, 5) is None
+    assert index.at(2, 12).payload == "b"
+    assert index.at(2, 0).payload == "c"
+    assert SpanIndex([]).at(0, 0) is None
+
+
+def test_analysis_indexes_declaration_names_and_reference_tokens() -> None:
+    source = (
+        "namespace sales\n"
+        "hub Customer {\n  business_key customer_id: int\n}\n"
+        "hub Product {\n  business_key product_id: int\n}\n"
+        "link CustomerProduct {\n  references Customer, Product\n}\n"
+    )
+    analysis = analyze_document("file:///tmp/spans.dv", source, version=1)
+
+    assert [(span.line, span.start, span.end) for span in analysis.spans] == [
+        (1, 4, 12),
+        (4, 4, 11),
+        (7, 5, 20),
+        (8, 13, 21),
+        (8, 23, 30),
+    ]
+    definition = document_definition(analysis, types.Position(line=8, character=25))
+    assert definition is not None
+    assert definition.range.start == types.Position(line=4, character=4)
+
+
+def _decode_tokens(source: str, data: list[int]) -> list[tuple[int, str, str, int]]:
+    lines = source.split("\n")
+    decoded: list[tuple[int, str, str, int]] = []
+    line = column = 0
+    for index in range(0, len(data), 5):
+        delta_line, delta_start, length, token_type, modifiers = data[index : index + 5]
+        line += delta_line
+        column = column + delta_start if delta_line == 0 else delta_start
+        text = lines[line][column : column + length]
+        decoded.append((line, text, TOKEN_TYPES[token_type], modifiers))
+    return decoded
+
+
+def test_semantic_tokens_classify_declarations_references_and_syntax() -> None:
+    source = (
+        "namespace sales\n"
+        "hub Customer {  # root\n"
+        "  business_key customer_id : int\n"
+        "}\n"
+        "satellite Details of Customer {\n"
+        '  amount : decimal(10,2) check "a # b"\n'
+        "}\n"
+        "link Order {\n  references Customer, crm.Product\n}\n"
+    )
+    analysis = analyze_document("file:///tmp/tokens.dv", source, version=1)
+
+    assert _decode_tokens(source, semantic_token_data(analysis)) == [
+        (0, "namespace", "keyword", 0),
+        (0, "sales", "namespace", 0),
+        (1, "hub", "keyword", 0),
+        (1, "Customer", "class", 1),
+        (1, "# root", "comment", 0),
+        (2, "business_key", "keyword", 0),
+        (2, "customer_id", "property", 0),
+        (2, "int", "type", 0),
+        (4, "satellite", "keyword", 0),
+        (4, "Details", "struct", 1),
+        (4, "of", "keyword", 0),
+        (4, "Customer", "class", 0),
+        (5, "amount", "property", 0),
+        (5, "decimal", "type", 0),
+        (5, "10", "number", 0),
+        (5, "2", "number", 0),
+        (5, "check", "keyword", 0),
+        (5, '"a # b"', "string", 0),
+        (7, "link", "keyword", 0),
+        (7, "Order", "interface", 1),
+        (8, "references", "keyword", 0),
+        (8, "Customer", "class", 0),
+        (8, "crm.Product", "class", 0),
+    ]
+
+
+def test_semantic_tokens_use_utf16_columns() -> None:
+    source = '# \U0001f600\nhub Customer {\n  note : string check "\U0001f600"\n}\n'
+    analysis = analyze_document("file:///tmp/tokens_utf16.dv", source, version=1)
+    data = semantic_token_data(analysis)
+
+    assert data[:5] == [0, 0, 4, TOKEN_TYPES.index("comment"), 0]
+    assert data[-5:] == [0, 6, 4, TOKEN_TYPES.index("string"), 0]
+
+
+def test_semantic_token_edits_replace_only_the_changed_middle() -> None:
+    assert token_edits([1, 2, 3, 4, 5], [1, 2, 3, 4, 5]) == []
+    [edit] = token_edits([1, 2, 3, 4, 5], [1, 2, 9, 9, 4, 5])
+    assert (edit.start, edit.delete_count, edit.data) == (2, 1, [9, 9])
+    [edit] = token_edits([1, 2, 3], [1, 2])
+    assert (edit.start, edit.delete_count, edit.data) == (2, 1, [])
+
+    previous = list(range(20))
+    current = [*previous[:7], 99, *previous[7:]]
+    [edit] = token_edits(previous, current)
+    assert (
+        current == previous[: edit.start] + edit.data + previous[edit.start + edit.delete_count :]
+    )
+
+
+def test_semantic_tokens_cache_answers_deltas_against_the_last_result() -> None:
+    uri = "file:///tmp/tokens_delta.dv"
+    source = "".join(f"hub Hub{index} {{\n  business_key id : int\n}}\n" for index in range(50))
+    cache = SemanticTokensCache()
+    first = analyze_document(uri, source, version=1)
+    full = cache.full(first)
+    assert cache.full(first).result_id == full.result_id
+
+    second = analyze_document(uri, "# note\n" + source, version=2)
+    delta = cache.delta(second, full.result_id)
+    assert isinstance(delta, types.SemanticTokensDelta)
+    assert delta.result_id != full.result_id
+    assert sum(len(edit.data) for edit in delta.edits) <= 10
+    [edit] = delta.edits
+    patched = full.data[: edit.start] + edit.data + full.data[edit.start + edit.delete_count :]
+    assert patched == semantic_token_data(second)
+
+    unknown = cache.delta(second, "stale")
+    assert isinstance(unknown, types.SemanticTokens)
+    assert unknown.result_id == delta.result_id
+    cache.forget(uri)
+    assert isinstance(cache.delta(second, delta.result_id), types.SemanticTokens)
+
+
+def test_folding_ranges_cover_bodies_comments_and_imports() -> None:
+    source = (
+        "# Sales model\n"
+        "# owned by finance\n"
+        "namespace sales\n"
+        'import "a.dv"\n'
+        'import "b.dv"\n'
+        "hub Customer {\n"
+        "  business_key customer_id : int\n"
+        "}\n"
+        "hub Empty {}\n"
+        "# single comment\n"
+    )
+    analysis = analyze_document("file:///tmp/folding.dv", source, version=1)
+
+    assert [
+        (folding.start_line, folding.end_line, folding.kind) for folding in folding_ranges(analysis)
+    ] == [
+        (0, 1, types.FoldingRangeKind.Comment),
+        (3, 4, types.FoldingRangeKind.Imports),
+        (5, 7, None),
+    ]
+
+
+def test_workspace_compile_reports_cross_file_resolver_diagnostics() -> None:
+    index = WorkspaceIndex()
+    hubs_uri, model_uri = "file:///ws/hubs.dv", "file:///ws/model.dv"
+    hub_source = "namespace sales\nhub Customer {\n  business_key id: int\n}\n"
+    index.update(hubs_uri, read_file_symbols(hubs_uri, hub_source))
+    source = (
+        "namespace sales\n"
+        "hub Customer {\n  business_key id: int\n}\n"
+        "satellite Details of Customer {\n  email: string\n}\n"
+        "pit Snapshot {\n  of Customer\n  tracks Details, Missing\n}\n"
+    )
+
+    analysis = analyze_document(model_uri, source, version=1, workspace=index)
+
+    assert [(diag.code, diag.range.start.line) for diag in analysis.diagnostics] == [
+        ("duplicate-definition", 1),
+        ("pit-unknown-satellite", 9),
+    ]
+    assert analysis.diagnostics[1].range == types.Range(
+        start=types.Position(line=9, character=18),
+        end=types.Position(line=9, character=25),
+    )
+    index.update(model_uri, file_symbols(analysis))
+    # Removing the other definition affects the file that redefined it.
+    assert index.update(hubs_uri, read_file_symbols(hubs_uri, "namespace sales\n")) == {
+        model_uri
+    }
+    analysis = analyze_document(model_uri, source, version=2, workspace=index)
+    assert [diag.code for diag in analysis.diagnostics] == ["pit-unknown-satellite"]
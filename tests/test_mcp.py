@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
 import pytest
@@ -21,11 +22,13 @@ def test_mcp_validate_accepts_source_and_path_inputs(tmp_path: Path) -> None:
     path = tmp_path / "sales.dv"
     path.write_text("namespace sales\nhub Customer {\n  business_key customer_id: int\n}\n")
 
-    source_result = validate(
-        source="namespace sales\nhub Product {\n  business_key product_id: int\n}\n",
-        source_name="inline.dv",
+    source_result = asyncio.run(
+        validate(
+            source="namespace sales\nhub Product {\n  business_key product_id: int\n}\n",
+            source_name="inline.dv",
+        )
     )
-    path_result = validate(path=str(path))
+    path_result = asyncio.run(validate(path=str(path)))
 
     assert source_result["ok"] is True
     assert source_result["source_mode"] == "inline"
@@ -53,7 +56,7 @@ def test_mcp_generate_returns_artifacts_without_disk_writes(
         "satellite CustomerDetails of Customer {\n  email: string\n}\n"
     )
 
-    result = generate(path=str(model_path), target="sql-jinja", dialect="postgres")
+    result = asyncio.run(generate(path=str(model_path), target="sql-jinja", dialect="postgres"))
 
     assert result["ok"] is True
     assert result["source_mode"] == "paths"
@@ -70,7 +73,9 @@ def test_mcp_generate_accepts_mode(tmp_path: Path) -> None:
     model_path = tmp_path / "sales.dv"
     model_path.write_text("namespace sales\nhub Customer {\n  business_key customer_id: int\n}\n")
 
-    result = generate(path=str(model_path), target="spark-declarative", mode="streaming")
+    result = asyncio.run(
+        generate(path=str(model_path), target="spark-declarative", mode="streaming")
+    )
 
     assert result["ok"] is True
     assert result["mode"] == "streaming"
@@ -80,17 +85,19 @@ def test_mcp_generate_accepts_mode(tmp_path: Path) -> None:
 def test_mcp_explain_returns_summary_and_entity_counts() -> None:
     from dmjedi.mcp.tools import explain
 
-    result = explain(
-        source=(
-            "namespace sales\n"
-            "hub Customer {\n  business_key customer_id: int\n}\n"
-            "hub Product {\n  business_key product_id: int\n}\n"
-            "link CustomerProduct {\n"
-            "  references Customer, Product\n"
-            "}\n"
-            "satellite CustomerDetails of Customer {\n  email: string\n}\n"
-        ),
-        source_name="inline.dv",
+    result = asyncio.run(
+        explain(
+            source=(
+                "namespace sales\n"
+                "hub Customer {\n  business_key customer_id: int\n}\n"
+                "hub Product {\n  business_key product_id: int\n}\n"
+                "link CustomerProduct {\n"
+                "  references Customer, Product\n"
+                "}\n"
+                "satellite CustomerDetails of Customer {\n  email: string\n}\n"
+            ),
+            source_name="inline.dv",
+        )
     )
 
     assert result["ok"] is True
@@ -132,3 +139,201 @@ def test_mcp_explain_returns_summary_and_entity_counts() -> None:
             "references": [],
         },
     ]
+
+
+def test_mcp_explain_entity_graph() -> None:
+    from dmjedi.mcp.tools import explain
+
+    result = asyncio.run(
+        explain(
+            source=(
+                "namespace sales\n"
+                "hub Customer {\n  business_key customer_id: int\n}\n"
+                "hub Product {\n  business_key product_id: int\n}\n"
+                "link CustomerProduct {\n  references Customer, Product\n}\n"
+                "satellite CustomerDetails of Customer {\n  email: string\n}\n"
+            ),
+            source_name="inline.dv",
+            entity="sales.Customer",
+            depth=1,
+            graph=True,
+        )
+    )
+
+    assert result["ok"] is True
+    assert [entity["qualified_name"] for entity in result["entities"]] == [
+        "sales.Customer",
+        "sales.CustomerDetails",
+        "sales.CustomerProduct",
+    ]
+    assert result["graph"] == {
+        "focus": "sales.Customer",
+        "upstream": [],
+        "downstream": ["sales.CustomerDetails", "sales.CustomerProduct"],
+        "load_order": [["sales.Customer"], ["sales.CustomerDetails", "sales.CustomerProduct"]],
+        "components": [["sales.Customer", "sales.CustomerDetails", "sales.CustomerProduct"]],
+    }
+
+
+def test_mcp_tools_reuse_compiled_model_until_files_change(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    import os
+
+    from dmjedi.application import cache as cache_module
+    from dmjedi.application.cache import CompileCache
+    from dmjedi.mcp import tools
+
+    monkeypatch.setattr(tools, "_CACHE", CompileCache())
+    parsed: list[str] = []
+    real_parse = cache_module.parse
+
+    def counting_parse(text: str, source_file: str = "<string>") -> object:
+        parsed.append(Path(source_file).name)
+        return real_parse(text, source_file=source_file)
+
+    monkeypatch.setattr(cache_module, "parse", counting_parse)
+    hubs = tmp_path / "hubs.dv"
+    hubs.write_text("namespace sales\nhub Customer {\n  business_key customer_id: int\n}\n")
+    sats = tmp_path / "sats.dv"
+    sats.write_text(
+        "namespace sales\nsatellite CustomerDetails of Customer {\n  email: string\n}\n"
+    )
+
+    assert asyncio.run(tools.explain(path=str(tmp_path)))["ok"] is True
+    assert asyncio.run(tools.generate(path=str(tmp_path), target="sql-jinja"))["ok"] is True
+    assert (tools._CACHE.hits, tools._CACHE.misses) == (1, 1)
+    assert sorted(parsed) == ["hubs.dv", "sats.dv"]
+
+    # Same bytes with a new mtime: the content hash still matches.
+    stat = hubs.stat()
+    os.utime(hubs, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert asyncio.run(tools.validate(path=str(tmp_path)))["ok"] is True
+    assert tools._CACHE.hits == 2
+
+    # A changed file invalidates the entry; only that file is parsed again.
+    sats.write_text("namespace sales\nsatellite CustomerDetails of Missing {\n  email: string\n}\n")
+    assert asyncio.run(tools.validate(path=str(tmp_path)))["ok"] is False
+    assert tools._CACHE.misses == 2
+    assert sorted(parsed) == ["hubs.dv", "sats.dv", "sats.dv"]
+
+    # So does a new file.
+    (tmp_path / "more.dv").write_text(
+        "namespace sales\nhub Missing {\n  business_key missing_id: int\n}\n"
+    )
+    result = asyncio.run(tools.validate(path=str(tmp_path)))
+    assert result["ok"] is True
+    assert result["module_count"] == 3
+    assert tools._CACHE.misses == 3
+
+
+def test_mcp_generate_filters_consolidated_modules_by_entity(tmp_path: Path) -> None:
+    from dmjedi.mcp.tools import generate
+
+    (tmp_path / "sales.dv").write_text(
+        "namespace sales\nhub Customer {\n  business_key customer_id: int\n}\n"
+    )
+    (tmp_path / "billing.dv").write_text(
+        "namespace billing\nhub Invoice {\n  business_key invoice_id: int\n}\n"
+    )
+
+    result = asyncio.run(
+        generate(
+            path=str(tmp_path), packaging="namespace", entities=["Invoice"], manifest_only=True
+        )
+    )
+
+    assert result["ok"] is True
+    assert result["artifacts"] == []
+    assert [(entry["path"], entry["entities"]) for entry in result["manifest"]] == [
+        ("pipelines/billing.py", ["billing.Invoice"])
+    ]
+
+
+def test_mcp_generate_filters_artifacts_by_artifact_path() -> None:
+    from dmjedi.mcp.tools import generate
+
+    result = asyncio.run(
+        generate(
+            path="examples/sales-domain.dv",
+            target="sql-jinja",
+            artifact_paths=["staging/hubs/*"],
+            manifest_only=True,
+        )
+    )
+
+    assert result["ok"] is True
+    assert [entry["path"] for entry in result["manifest"]] == [
+        "staging/hubs/Customer.sql",
+        "staging/hubs/Product.sql",
+        "staging/hubs/Store.sql",
+    ]
+
+
+def test_mcp_tools_report_stages_as_progress(tmp_path: Path) -> None:
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    from dmjedi.mcp.server import SERVER
+
+    model_path = tmp_path / "sales.dv"
+    model_path.write_text("namespace sales\nhub Customer {\n  business_key customer_id: int\n}\n")
+    reported: list[tuple[float, str | None]] = []
+
+    async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+        reported.append((progress, message))
+
+    async def scenario() -> dict[str, object] | None:
+        async with create_connected_server_and_client_session(SERVER._mcp_server) as client:
+            result = await client.call_tool(
+                "generate",
+                {"path": str(model_path), "target": "sql-jinja"},
+                progress_callback=on_progress,
+            )
+            return result.structuredContent
+
+    result = asyncio.run(scenario())
+
+    assert result is not None
+    assert result["ok"] is True
+    assert [progress for progress, _ in reported] == list(range(1, len(reported) + 1))
+    messages = [message for _, message in reported]
+    assert messages[:2] == ["cache", "discovery"]
+    assert {"parse", "lint", "resolve", "render"} <= set(messages)
+    assert not any(":" in message for message in messages if message)
+
+
+def test_mcp_cancelled_call_stops_worker_at_next_stage() -> None:
+    import threading
+
+    from dmjedi import profiling
+    from dmjedi.mcp.tools import _in_worker
+
+    parsed = threading.Event()
+    release = threading.Event()
+    finished = threading.Event()
+    stages: list[str] = []
+
+    def work() -> object:
+        try:
+            with profiling.stage("parse"):
+                parsed.set()
+            release.wait(5)
+            with profiling.stage("render"):
+                stages.append("render")
+        finally:
+            finished.set()
+        return None
+
+    async def scenario() -> None:
+        task = asyncio.create_task(_in_worker(None, work))  # type: ignore[arg-type]
+        while not parsed.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    release.set()
+
+    assert finished.wait(5)
+    assert stages == []
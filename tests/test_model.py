@@ -3,6 +3,8 @@
 import pytest
 from pydantic import ValidationError
 
+from dmjedi.application import session as session_module
+from dmjedi.application.session import CompileSession
 from dmjedi.lang.parser import parse
 from dmjedi.model.core import Bridge, EffSat, Link, NhLink, NhSat, Pit, SamLink
 from dmjedi.model.resolver import ResolverErrors, resolve
@@ -46,6 +48,25 @@ def test_resolve_single_module():
     assert hub.business_keys[0].is_business_key is True
 
 
+def test_resolve_carries_field_constraints():
+    source = """
+    namespace sales
+    hub Customer { business_key customer_id : int }
+    satellite CustomerDetails of Customer {
+        email : string not null check "email LIKE '%@%'"
+        nickname : string
+    }
+    """
+    model = resolve([parse(source)])
+
+    assert model.hubs["sales.Customer"].business_keys[0].nullable is False
+    email, nickname = model.satellites["sales.CustomerDetails"].columns
+    assert email.nullable is False
+    assert email.checks == ["email LIKE '%@%'"]
+    assert nickname.nullable is True
+    assert nickname.checks == []
+
+
 def test_resolve_multiple_modules():
     mod1 = parse("namespace crm\nhub Customer { business_key cid : int }")
     mod2 = parse("namespace sales\nhub Product { business_key pid : int }")
@@ -591,3 +612,258 @@ def test_bridge_and_pit_integration():
     model = resolve([module])
     assert len(model.bridges) == 1
     assert len(model.pits) == 1
+
+
+def test_resolver_errors_keep_declaration_order_across_kinds():
+    """Reference errors are reported kind by kind, in declaration order."""
+    src = (
+        "namespace test\n"
+        "hub Customer { business_key customer_id : int }\n"
+        "satellite A of Missing { x : int }\n"
+        "nhsat B of Missing { x : int }\n"
+        "satellite C of Customer { x : int }\n"
+        "pit P {\n"
+        "    of Customer\n"
+        "    tracks Nope\n"
+        "}"
+    )
+    with pytest.raises(ResolverErrors) as err:
+        resolve([parse(src)])
+    assert [e.message for e in err.value.errors] == [
+        "Satellite 'test.A' references unknown parent 'Missing'",
+        "NhSat 'test.B' references unknown parent 'Missing'",
+        "PIT 'test.P' tracks unknown satellite 'Nope'",
+    ]
+
+
+def test_resolve_leaves_garbage_collector_alone(monkeypatch):
+    """GC is process-wide, so resolving (e.g. on an LSP worker thread) must not pause it."""
+    import gc
+
+    def disable() -> None:
+        raise AssertionError("resolve() must not disable the garbage collector")
+
+    monkeypatch.setattr(gc, "disable", disable)
+    module = parse("hub Customer { business_key id : int }\nsatellite S of Nope { x : int }")
+    with pytest.raises(ResolverErrors):
+        resolve([module])
+    assert gc.isenabled()
+
+
+def test_gc_paused_restores_garbage_collector_state():
+    import gc
+
+    from dmjedi.model.resolver import gc_paused
+
+    with pytest.raises(RuntimeError), gc_paused():
+        assert not gc.isenabled()
+        raise RuntimeError
+    assert gc.isenabled()
+
+
+_INDEX_SRC = (
+    "namespace sales\n"
+    "hub Customer { business_key customer_id : int }\n"
+    "hub Product { business_key product_id : int }\n"
+    "satellite CustomerDetails of Customer { name : string }\n"
+    "nhsat CustomerState of Customer { state : string }\n"
+    "link CustomerProduct { references Customer, Product }\n"
+    "effsat CustomerProductValidity of CustomerProduct { valid_from : timestamp }\n"
+    "samlink CustomerSame { master Customer duplicate Customer }\n"
+)
+
+
+def test_symbol_index_lookups():
+    model = resolve([parse(_INDEX_SRC)])
+    symbols = model.symbols
+
+    entry = symbols.get("sales.Customer")
+    assert entry is not None and entry.kind == "hub"
+    assert symbols.resolve("Customer", "sales").qualified_name == "sales.Customer"
+    assert symbols.resolve("Customer", "other") is None
+    assert symbols.resolve("CustomerProduct", "sales", ("hub",)) is None
+    assert [e.kind for e in symbols.candidates("Customer")] == ["hub"]
+    assert symbols.qualify("Missing", "sales") == "sales.Missing"
+
+    assert [e.qualified_name for e in symbols.satellites_of("sales.Customer")] == [
+        "sales.CustomerDetails",
+        "sales.CustomerState",
+    ]
+    assert [e.qualified_name for e in symbols.links_of("sales.Product")] == [
+        "sales.CustomerProduct"
+    ]
+    assert [e.kind for e in symbols.links_of("sales.Customer")] == ["link", "samlink"]
+    assert [e.qualified_name for e in symbols.effsats_of("sales.CustomerProduct")] == [
+        "sales.CustomerProductValidity"
+    ]
+
+
+def test_symbol_index_is_cached_and_not_serialized():
+    import pickle
+
+    model = resolve([parse(_INDEX_SRC)])
+    assert model.symbols is model.symbols
+    assert "symbols" not in model.model_dump()
+    assert model == model.model_copy(deep=True)
+    assert pickle.loads(pickle.dumps(model)) == model
+
+    index = model.symbols
+    model.hubs.pop("sales.Product")
+    assert model.symbols is not index
+    assert model.symbols.get("sales.Product") is None
+
+
+def test_symbol_index_rebuilt_when_entry_replaced_in_place():
+    import pickle
+
+    model = resolve([parse(_INDEX_SRC)])
+    index = model.symbols
+    replacement = model.hubs["sales.Product"].model_copy(deep=True)
+    model.hubs["sales.Product"] = replacement
+    assert model.symbols is not index
+    assert model.symbols.get("sales.Product").entity is replacement
+
+    index = model.symbols
+    model.hubs = dict(model.hubs)
+    assert model.symbols is not index
+    assert pickle.loads(pickle.dumps(model)).hubs == model.hubs
+
+
+def test_model_graph_traversal_and_ordering():
+    model = resolve([parse(_INDEX_SRC + "hub Store { business_key store_id : int }\n")])
+    graph = model.graph
+
+    assert graph is model.graph
+    assert graph.kind("sales.CustomerProduct") == "link"
+    assert graph.dependencies("sales.CustomerProductValidity") == ["sales.CustomerProduct"]
+    assert graph.upstream("sales.CustomerProductValidity") == [
+        "sales.CustomerProduct",
+        "sales.Customer",
+        "sales.Product",
+    ]
+    assert graph.downstream("sales.Customer", depth=1) == [
+        "sales.CustomerDetails",
+        "sales.CustomerProduct",
+        "sales.CustomerState",
+        "sales.CustomerSame",
+    ]
+    assert "sales.CustomerProductValidity" in graph.downstream("sales.Customer")
+    assert graph.load_waves() == [
+        ["sales.Customer", "sales.Product", "sales.Store"],
+        [
+            "sales.CustomerDetails",
+            "sales.CustomerProduct",
+            "sales.CustomerSame",
+            "sales.CustomerState",
+        ],
+        ["sales.CustomerProductValidity"],
+    ]
+    assert graph.load_waves(["sales.CustomerProductValidity", "sales.Product"]) == [
+        ["sales.CustomerProductValidity", "sales.Product"]
+    ]
+    order = graph.topological_order()
+    assert order.index("sales.Product") < order.index("sales.CustomerProduct")
+    assert graph.components() == [
+        [
+            "sales.Customer",
+            "sales.CustomerDetails",
+            "sales.CustomerProduct",
+            "sales.CustomerProductValidity",
+            "sales.CustomerSame",
+            "sales.CustomerState",
+            "sales.Product",
+        ],
+        ["sales.Store"],
+    ]
+    with pytest.raises(KeyError):
+        graph.upstream("sales.Missing")
+
+
+def test_resolver_errors_carry_code_location_and_subject():
+    """Reference errors point at the declaring file and line of the entity."""
+    source = (
+        "namespace test\n"
+        "hub Customer { business_key id : int }\n"
+        "satellite Bad of Missing { x : string }\n"
+        "pit Snapshot {\n  of Customer\n  tracks Nope\n}\n"
+    )
+    with pytest.raises(ResolverErrors) as err:
+        resolve([parse(source, source_file="model.dv")])
+
+    assert [(e.code, e.source_file, e.line, e.subject) for e in err.value.errors] == [
+        ("unknown-parent", "model.dv", 3, "Missing"),
+        ("pit-unknown-satellite", "model.dv", 4, "Nope"),
+    ]
+
+
+def test_compile_session_rebuilds_only_updated_modules(monkeypatch):
+    """Each module version is resolved once; diagnostics are reported per module."""
+    built: list[str] = []
+    resolve_module = session_module.resolve_module
+
+    def recording(module):
+        built.append(module.source_file)
+        return resolve_module(module)
+
+    monkeypatch.setattr(session_module, "resolve_module", recording)
+    hubs = parse("namespace s\nhub Customer { business_key id : int }", source_file="hubs.dv")
+    sats = parse(
+        "namespace s\n"
+        "satellite Details of Customer { x : string }\n"
+        "bridge Walk {\n  path Customer -> Missing -> Customer\n}\n",
+        source_file="sats.dv",
+    )
+    session = CompileSession()
+    session.update("hubs", hubs)
+    session.update("sats", sats)
+    session.update("sats", sats)
+
+    assert [e.code for e in session.diagnostics("sats").resolver] == ["bridge-path-kind"]
+    assert session.diagnostics("hubs").resolver == []
+    assert "s.Customer" in session.model().hubs
+
+    session.update("dup", parse("namespace s\nhub Customer { business_key id : int }", "dup.dv"))
+    [duplicate] = session.diagnostics("dup").resolver
+    assert (duplicate.code, duplicate.line, duplicate.subject) == (
+        "duplicate-definition",
+        2,
+        "Customer",
+    )
+
+    session.remove("hubs")
+    session.remove("dup")
+    assert [e.code for e in session.diagnostics("sats").resolver] == [
+        "unknown-parent",
+        "bridge-path-kind",
+        "bridge-path-kind",
+        "bridge-path-kind",
+    ]
+    assert session.diagnostics("hubs").resolver == []
+    assert built == ["hubs.dv", "sats.dv", "dup.dv"]
+    assert len(session) == 1
+
+
+def test_module_errors_are_reported_in_spec_order():
+    """Redefinitions and samlink errors keep the historical kind-then-declaration order."""
+    from dmjedi.lang.ast import SamLinkDecl, SourceLocation
+
+    module = parse(
+        "namespace s\n"
+        "hub Customer { business_key id : int }\n"
+        "hub Customer { business_key id : int }\n",
+        source_file="m.dv",
+    )
+    module.samlinks.append(
+        SamLinkDecl(
+            name="Match", master_ref="", duplicate_ref="Customer", loc=SourceLocation(line=1)
+        )
+    )
+    expected = ["duplicate-definition", "samlink-missing-reference"]
+
+    with pytest.raises(ResolverErrors) as exc_info:
+        resolve([module])
+    assert [e.code for e in exc_info.value.errors] == expected
+
+    session = CompileSession()
+    session.update("m", module)
+    assert [e.code for e in session.diagnostics("m").resolver] == expected
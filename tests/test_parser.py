@@ -133,6 +133,31 @@ def test_parse_parameterized_decimal():
     assert module.hubs[0].business_keys[0].data_type == "decimal(10,4)"
 
 
+def test_parse_field_constraints():
+    """Fields accept trailing `not null` and `check "<expr>"` constraints."""
+    source = """
+    satellite Details of Customer {
+        email : string not null check "email LIKE '%@%'"
+        age   : int check "age >= 0" check "age < 150"
+        note  : string
+    }
+    """
+    fields = parse(source).satellites[0].fields
+    assert fields[0].not_null is True
+    assert fields[0].checks == ["email LIKE '%@%'"]
+    assert fields[1].not_null is False
+    assert fields[1].checks == ["age >= 0", "age < 150"]
+    assert fields[2].not_null is False
+    assert fields[2].checks == []
+
+
+def test_parse_constraint_keywords_remain_valid_field_names():
+    source = "satellite S of H {\n  check : int\n  not : string not null\n}"
+    fields = parse(source).satellites[0].fields
+    assert [field.name for field in fields] == ["check", "not"]
+    assert fields[1].not_null is True
+
+
 def test_parse_unknown_type_rejected():
     """D-08: unknown types must be rejected at parse time."""
     source = "hub H { business_key k : unknowntype }"